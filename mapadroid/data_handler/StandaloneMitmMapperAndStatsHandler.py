@@ -1,9 +1,12 @@
 import asyncio
+import time
 from datetime import datetime
 from typing import Dict, List, Optional, Union
 
 from mapadroid.data_handler.mitm_data.AbstractMitmMapper import \
     AbstractMitmMapper
+from mapadroid.data_handler.mitm_data.DataUpdateNotifier import \
+    DataUpdateNotifier
 from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.LatestMitmDataEntry import \
     LatestMitmDataEntry
 from mapadroid.data_handler.mitm_data.MitmDataHandler import MitmDataHandler
@@ -28,6 +31,7 @@ class StandaloneMitmMapperAndStatsHandler(AbstractMitmMapper, AbstractStatsHandl
         else:
             self.__stats_handler: Optional[StatsHandler] = None
         self.__mitm_data_handler: MitmDataHandler = MitmDataHandler()
+        self.__data_update_notifier: DataUpdateNotifier = DataUpdateNotifier()
 
     async def start(self):
         if self.__stats_handler:
@@ -83,14 +87,27 @@ class StandaloneMitmMapperAndStatsHandler(AbstractMitmMapper, AbstractStatsHandl
 
     async def update_latest(self, worker: str, key: str, value: Union[list, dict], timestamp_received_raw: float = None,
                             timestamp_received_receiver: float = None, location: Location = None) -> None:
+        if timestamp_received_receiver is None:
+            timestamp_received_receiver = int(time.time())
         loop = asyncio.get_running_loop()
-        loop.run_in_executor(None, self.__mitm_data_handler.update_latest, worker, key, value, timestamp_received_raw,
-                             timestamp_received_receiver, location)
+        update = loop.run_in_executor(None, self.__mitm_data_handler.update_latest, worker, key, value,
+                                      timestamp_received_raw, timestamp_received_receiver, location)
+        update.add_done_callback(
+            lambda _: self.__data_update_notifier.notify(worker, str(key), int(timestamp_received_receiver)))
 
     async def request_latest(self, worker: str, key: str,
                              timestamp_earliest: Optional[int] = None) -> Optional[LatestMitmDataEntry]:
         return self.__mitm_data_handler.request_latest(worker, key, timestamp_earliest)
 
+    async def request_latest_digest(self, worker: str, key: str,
+                                    timestamp_earliest: Optional[int] = None) -> Optional[LatestMitmDataEntry]:
+        # Entries are held in memory, no need to strip the payload
+        return self.__mitm_data_handler.request_latest(worker, key, timestamp_earliest)
+
+    async def wait_for_data_update(self, worker: str, key: str, timestamp_earliest: int,
+                                   timeout: float) -> Optional[int]:
+        return await self.__data_update_notifier.wait_for_timestamp(worker, str(key), timestamp_earliest, timeout)
+
     async def get_full_latest_data(self, worker: str) -> Dict[str, LatestMitmDataEntry]:
         return self.__mitm_data_handler.get_full_latest_data(worker)
 
@@ -1,25 +1,34 @@
 import asyncio
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
+import grpc
 from aiocache import cached
 from google.protobuf import json_format
 from grpc.aio import AioRpcError
 from loguru import logger
+from orjson import orjson
 
 from mapadroid.data_handler.mitm_data.AbstractMitmMapper import \
     AbstractMitmMapper
+from mapadroid.data_handler.mitm_data.DataUpdateNotifier import \
+    DataUpdateNotifier
+from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.GmoDigest import \
+    GmoDigest
 from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.LatestMitmDataEntry import \
     LatestMitmDataEntry
 from mapadroid.grpc.compiled.mitm_mapper import mitm_mapper_pb2
 from mapadroid.grpc.compiled.mitm_mapper.mitm_mapper_pb2 import (
-    GetQuestsHeldResponse, InjectedRequest, InjectionStatus,
-    LastKnownLocationResponse, LastMoved, LatestMitmDataEntryRequest,
+    DataUpdate, GetQuestsHeldResponse, InjectedRequest, InjectionStatus,
+    LastKnownLocationResponse, LastMoved, LatestMitmDataDigestResponse,
+    LatestMitmDataEntryRequest,
     LatestMitmDataEntryResponse, LevelResponse, PokestopVisitsResponse,
-    SetLevelRequest, SetPokestopVisitsRequest, SetQuestsHeldRequest)
+    SetLevelRequest, SetPokestopVisitsRequest, SetQuestsHeldRequest,
+    TransportCapabilities)
 from mapadroid.grpc.compiled.shared.Worker_pb2 import Worker
 from mapadroid.grpc.stubs.mitm_mapper.mitm_mapper_pb2_grpc import \
     MitmMapperStub
 from mapadroid.utils.collections import Location
+from mapadroid.utils.madGlobals import MadGlobals
 
 
 class MitmMapperClient(MitmMapperStub, AbstractMitmMapper):
@@ -27,6 +36,30 @@ class MitmMapperClient(MitmMapperStub, AbstractMitmMapper):
         super().__init__(channel)
         self._level_cache: Dict[str, int] = {}
         self._pokestop_visits_cache: Dict[str, int] = {}
+        self._data_update_notifier: DataUpdateNotifier = DataUpdateNotifier()
+        # worker -> task consuming the stream of updates of data of the worker
+        self._data_update_subscriptions: Dict[str, asyncio.Task] = {}
+        # Whether data is transported as raw JSON, None until negotiated with the server
+        self._raw_json: Optional[bool] = None
+
+    async def __use_raw_json(self) -> bool:
+        if self._raw_json is not None:
+            return self._raw_json
+        if not MadGlobals.application_args.mitmmapper_raw_json:
+            self._raw_json = False
+            return False
+        try:
+            response: TransportCapabilities = await self.NegotiateTransport(TransportCapabilities(raw_json=True))
+        except AioRpcError as e:
+            if e.code() == grpc.StatusCode.UNIMPLEMENTED:
+                logger.info("MitmMapper server does not support raw JSON transport, using protobuf Struct")
+                self._raw_json = False
+            else:
+                # Negotiate again with the next request
+                logger.warning("Failed negotiating transport of data with MitmMapper server: {}", e)
+            return False
+        self._raw_json = response.raw_json
+        return self._raw_json
 
     # Cache the update parameters to not spam it...
     @cached(ttl=30)
@@ -82,12 +115,14 @@ class MitmMapperClient(MitmMapperStub, AbstractMitmMapper):
             request.data.timestamp_received = int(timestamp_received_raw)
         if timestamp_received_receiver:
             request.data.timestamp_of_data_retrieval = int(timestamp_received_receiver)
-        if isinstance(value, list):
+        if not isinstance(value, (list, dict)):
+            raise ValueError("Cannot handle data")
+        elif await self.__use_raw_json():
+            request.data.raw_json = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        elif isinstance(value, list):
             request.data.some_list.extend(value)
-        elif isinstance(value, dict):
-            request.data.some_dictionary.update(value)
         else:
-            raise ValueError("Cannot handle data")
+            request.data.some_dictionary.update(value)
         try:
             await self.UpdateLatest(request)
         except AioRpcError as e:
@@ -100,6 +135,7 @@ class MitmMapperClient(MitmMapperStub, AbstractMitmMapper):
         request.key = str(key)
         if timestamp_earliest:
             request.timestamp_earliest = timestamp_earliest
+        request.accepts_raw_json = await self.__use_raw_json()
         try:
             response: LatestMitmDataEntryResponse = await self.RequestLatest(request)
         except AioRpcError as e:
@@ -108,25 +144,101 @@ class MitmMapperClient(MitmMapperStub, AbstractMitmMapper):
             return None
         if not response.HasField("entry"):
             return None
+        if response.entry.HasField("raw_json"):
+            return self.__transform_proto_data_entry(response.entry)
         loop = asyncio.get_running_loop()
         latest: LatestMitmDataEntry = await loop.run_in_executor(
             None, self.__transform_proto_data_entry, response.entry)
         return latest
 
+    async def request_latest_digest(self, worker: str, key: str,
+                                    timestamp_earliest: Optional[int] = None) -> Optional[LatestMitmDataEntry]:
+        request = LatestMitmDataEntryRequest()
+        request.worker.name = worker
+        request.key = str(key)
+        if timestamp_earliest:
+            request.timestamp_earliest = timestamp_earliest
+        try:
+            response: LatestMitmDataDigestResponse = await self.RequestLatestDigest(request)
+        except AioRpcError as e:
+            logger.warning("Failed requesting latest digest {}", e)
+            return None
+        if not response.HasField("entry"):
+            return None
+        if not response.entry.HasField("digest"):
+            # No digest is computed for the data of the key
+            return await self.request_latest(worker, key, timestamp_earliest)
+        location: Optional[Location] = None
+        if response.entry.HasField("location"):
+            location = Location(response.entry.location.latitude, response.entry.location.longitude)
+        digest_message: mitm_mapper_pb2.GmoDigest = response.entry.digest
+        digest: GmoDigest = GmoDigest(
+            cell_ids=list(digest_message.cell_ids),
+            fort_counts=list(digest_message.fort_counts),
+            wild_mon_counts=list(digest_message.wild_mon_counts),
+            nearby_mon_counts=list(digest_message.nearby_mon_counts),
+            fort_ids=list(digest_message.fort_ids),
+            fort_types=list(digest_message.fort_types),
+            encounter_ids=list(digest_message.encounter_ids),
+            mon_ids=list(digest_message.mon_ids),
+            weather_boosted=[None if weather_boosted < 0 else weather_boosted
+                             for weather_boosted in digest_message.weather_boosted],
+            latitudes=list(digest_message.latitudes),
+            longitudes=list(digest_message.longitudes))
+        return LatestMitmDataEntry(location=location,
+                                   timestamp_received=response.entry.timestamp_received,
+                                   timestamp_of_data_retrieval=response.entry.timestamp_of_data_retrieval,
+                                   data=None,
+                                   digest=digest)
+
+    async def wait_for_data_update(self, worker: str, key: str, timestamp_earliest: int,
+                                   timeout: float) -> Optional[int]:
+        if worker not in self._data_update_subscriptions:
+            self._data_update_subscriptions[worker] = asyncio.create_task(self.__subscribe_data_updates(worker))
+        return await self._data_update_notifier.wait_for_timestamp(worker, str(key), timestamp_earliest, timeout)
+
+    async def shutdown(self) -> None:
+        subscriptions: List[asyncio.Task] = list(self._data_update_subscriptions.values())
+        for subscription in subscriptions:
+            subscription.cancel()
+        await asyncio.gather(*subscriptions, return_exceptions=True)
+
+    async def __subscribe_data_updates(self, worker: str) -> None:
+        request: Worker = Worker()
+        request.name = worker
+        # key -> (timestamp, sequence) received, updates are sent again upon resubscribing
+        updates_received: Dict[str, Tuple[int, int]] = {}
+        try:
+            while True:
+                try:
+                    # The server sends the timestamps of the data known first, nothing prior to subscribing is missed
+                    update: DataUpdate
+                    async for update in self.SubscribeDataUpdates(request):
+                        if updates_received.get(update.key) == (update.timestamp, update.sequence):
+                            continue
+                        updates_received[update.key] = (update.timestamp, update.sequence)
+                        self._data_update_notifier.notify(worker, update.key, update.timestamp)
+                except AioRpcError as e:
+                    logger.warning("Subscription to updates of data of {} failed, retrying: {}", worker, e)
+                await asyncio.sleep(5)
+        finally:
+            self._data_update_subscriptions.pop(worker, None)
+
     def __transform_proto_data_entry(self, entry: mitm_mapper_pb2.LatestMitmDataEntry) -> LatestMitmDataEntry:
         location: Optional[Location] = None
         if entry.location:
             location: Location = Location(entry.location.latitude, entry.location.longitude)
 
+        data = None
         if entry.HasField(
                 "some_dictionary"):
             data = entry.some_dictionary
         elif entry.HasField(
                 "some_list"):
             data = entry.some_list
-        else:
-            data = None
-        if data:
+        if entry.HasField("raw_json"):
+            formatted = orjson.loads(entry.raw_json)
+        elif data:
             formatted = json_format.MessageToDict(data)
         else:
             formatted = None
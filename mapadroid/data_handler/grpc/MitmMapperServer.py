@@ -1,20 +1,24 @@
 import asyncio
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 import grpc
 from google.protobuf import json_format
 from grpc._cython.cygrpc import CompressionAlgorithm, CompressionLevel
+from orjson import orjson
 
+from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.GmoDigest import \
+    GmoDigest
 from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.LatestMitmDataEntry import \
     LatestMitmDataEntry
 from mapadroid.data_handler.mitm_data.MitmMapper import MitmMapper
 from mapadroid.grpc.compiled.mitm_mapper import mitm_mapper_pb2
 from mapadroid.grpc.compiled.mitm_mapper.mitm_mapper_pb2 import (
-    GetQuestsHeldResponse, InjectedRequest, InjectionStatus,
-    LastKnownLocationResponse, LastMoved, LatestMitmDataEntryRequest,
+    DataUpdate, GetQuestsHeldResponse, InjectedRequest, InjectionStatus,
+    LastKnownLocationResponse, LastMoved, LatestMitmDataDigestResponse,
+    LatestMitmDataEntryRequest,
     LatestMitmDataEntryResponse, LatestMitmDataEntryUpdateRequest,
     LevelResponse, PokestopVisitsResponse, SetLevelRequest,
-    SetPokestopVisitsRequest, SetQuestsHeldRequest)
+    SetPokestopVisitsRequest, SetQuestsHeldRequest, TransportCapabilities)
 from mapadroid.grpc.compiled.shared.Ack_pb2 import Ack
 from mapadroid.grpc.compiled.shared.Worker_pb2 import Worker
 from mapadroid.grpc.stubs.mitm_mapper.mitm_mapper_pb2_grpc import (
@@ -74,16 +78,23 @@ class MitmMapperServer(MitmMapperServicer, MitmMapper):
         response.timestamp = await self.get_last_possibly_moved(request.name)
         return response
 
+    async def NegotiateTransport(self, request: TransportCapabilities,
+                                 context: grpc.aio.ServicerContext) -> TransportCapabilities:
+        logger.debug("NegotiateTransport called")
+        return TransportCapabilities(raw_json=request.raw_json and MadGlobals.application_args.mitmmapper_raw_json)
+
     async def UpdateLatest(self, request: LatestMitmDataEntryUpdateRequest,
                            context: grpc.aio.ServicerContext) -> Ack:
-        value = None
-        if request.data.HasField("some_dictionary"):
-            value = request.data.some_dictionary
-        else:
-            value = request.data.some_list
         logger.debug("UpdateLatest called")
-        loop = asyncio.get_running_loop()
-        json_formatted = await loop.run_in_executor(None, json_format.MessageToDict, value)
+        if request.data.HasField("raw_json"):
+            json_formatted = orjson.loads(request.data.raw_json)
+        else:
+            if request.data.HasField("some_dictionary"):
+                value = request.data.some_dictionary
+            else:
+                value = request.data.some_list
+            loop = asyncio.get_running_loop()
+            json_formatted = await loop.run_in_executor(None, json_format.MessageToDict, value)
         await self.update_latest(
             worker=request.worker.name, key=request.key,
             timestamp_received_raw=request.data.timestamp_received,
@@ -103,20 +114,59 @@ class MitmMapperServer(MitmMapperServicer, MitmMapper):
         logger.debug("Checking for proto after {}", timestamp_earliest)
         latest: Optional[LatestMitmDataEntry] = await self.request_latest(
             request.worker.name, request.key, timestamp_earliest)
+        if request.accepts_raw_json and MadGlobals.application_args.mitmmapper_raw_json:
+            return self.__transform_single_response(latest, raw_json=True)
         loop = asyncio.get_running_loop()
         result = await loop.run_in_executor(
             None, self.__transform_single_response, latest)
         return result
 
-    def __transform_single_response(self, latest):
+    async def RequestLatestDigest(self, request: LatestMitmDataEntryRequest,
+                                  context: grpc.aio.ServicerContext) -> LatestMitmDataDigestResponse:
+        logger.debug("RequestLatestDigest called")
+        timestamp_earliest: Optional[int] = None
+        if request.HasField("timestamp_earliest"):
+            timestamp_earliest = request.timestamp_earliest
+        latest: Optional[LatestMitmDataEntry] = await self.request_latest_digest(
+            request.worker.name, request.key, timestamp_earliest)
+        response: LatestMitmDataDigestResponse = LatestMitmDataDigestResponse()
+        if not latest:
+            return response
+        if latest.location:
+            response.entry.location.latitude = latest.location.lat
+            response.entry.location.longitude = latest.location.lng
+        if latest.timestamp_of_data_retrieval:
+            response.entry.timestamp_of_data_retrieval = latest.timestamp_of_data_retrieval
+        if latest.timestamp_received:
+            response.entry.timestamp_received = latest.timestamp_received
+        if latest.digest:
+            self.__transform_gmo_digest(response.entry.digest, latest.digest)
+        return response
+
+    @staticmethod
+    def __transform_gmo_digest(digest_message: mitm_mapper_pb2.GmoDigest, digest: GmoDigest) -> None:
+        digest_message.cell_ids.extend(digest.cell_ids)
+        digest_message.fort_counts.extend(digest.fort_counts)
+        digest_message.wild_mon_counts.extend(digest.wild_mon_counts)
+        digest_message.nearby_mon_counts.extend(digest.nearby_mon_counts)
+        digest_message.fort_ids.extend(digest.fort_ids)
+        digest_message.fort_types.extend(digest.fort_types)
+        digest_message.encounter_ids.extend(digest.encounter_ids)
+        digest_message.mon_ids.extend(digest.mon_ids)
+        digest_message.weather_boosted.extend(-1 if weather_boosted is None else weather_boosted
+                                              for weather_boosted in digest.weather_boosted)
+        digest_message.latitudes.extend(digest.latitudes)
+        digest_message.longitudes.extend(digest.longitudes)
+
+    def __transform_single_response(self, latest, raw_json: bool = False):
         response: LatestMitmDataEntryResponse = LatestMitmDataEntryResponse()
         if not latest:
             return response
-        self.__transform_latest_mitm_data_entry(response.entry, latest)
+        self.__transform_latest_mitm_data_entry(response.entry, latest, raw_json)
         return response
 
     def __transform_latest_mitm_data_entry(self, entry_message: mitm_mapper_pb2.LatestMitmDataEntry,
-                                           latest) -> mitm_mapper_pb2.LatestMitmDataEntry:
+                                           latest, raw_json: bool) -> mitm_mapper_pb2.LatestMitmDataEntry:
         if latest.location:
             entry_message.location.latitude = latest.location.lat
             entry_message.location.longitude = latest.location.lng
@@ -124,7 +174,9 @@ class MitmMapperServer(MitmMapperServicer, MitmMapper):
             entry_message.timestamp_of_data_retrieval = latest.timestamp_of_data_retrieval
         if latest.timestamp_received:
             entry_message.timestamp_received = latest.timestamp_received
-        if isinstance(latest.data, list):
+        if raw_json and latest.data is not None:
+            entry_message.raw_json = orjson.dumps(latest.data, option=orjson.OPT_NON_STR_KEYS)
+        elif isinstance(latest.data, list):
             entry_message.some_list.extend(latest.data)
         elif isinstance(latest.data, dict):
             logger.debug("Placing dict data")
@@ -197,3 +249,23 @@ class MitmMapperServer(MitmMapperServicer, MitmMapper):
         else:
             response.ClearField("quests_held")
         return response
+
+    async def SubscribeDataUpdates(self, request: Worker,
+                                   context: grpc.aio.ServicerContext) -> AsyncIterator[DataUpdate]:
+        logger.debug("SubscribeDataUpdates called by {}", request.name)
+        # key -> (timestamp, sequence) sent, the sequence tells apart updates within the same second
+        updates_sent: Dict[str, Tuple[int, int]] = {}
+        while True:
+            sequences: Dict[str, int] = self._data_update_notifier.get_sequences(request.name)
+            updates: Dict[str, Tuple[int, int]] = {}
+            for key, timestamp in self._data_update_notifier.get_timestamps(request.name).items():
+                update: Tuple[int, int] = (timestamp, sequences.get(key, 0))
+                if updates_sent.get(key) != update:
+                    updates[key] = update
+            if not updates:
+                # Nothing is awaited in between checking for updates and waiting, no update can be missed
+                await self._data_update_notifier.wait_for_update(request.name)
+                continue
+            for key, (timestamp, sequence) in updates.items():
+                updates_sent[key] = (timestamp, sequence)
+                yield DataUpdate(key=key, timestamp=timestamp, sequence=sequence)
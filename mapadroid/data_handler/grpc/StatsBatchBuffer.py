@@ -0,0 +1,81 @@
+from typing import Dict, List, Tuple
+
+from mapadroid.grpc.compiled.stats_handler.stats_handler_pb2 import Stats
+
+
+class StatsBatchBuffer:
+    """
+    Bounded buffer of stats to be submitted to the StatsHandler in batches.
+    Stats of the same worker, kind and timestamp (the resolution of timestamps of Stats are seconds) listing encounter
+    IDs or amounts are coalesced into a single message at the position of the first one. Others are kept as they are.
+    Thus, the StatsHandler processes the same data as if each stat had been submitted on its own.
+    """
+    # Kinds of stats (data_to_collect) which are coalesced
+    __COALESCED_KINDS = frozenset({"wild_mons", "raid", "seen_type"})
+
+    def __init__(self, max_items: int):
+        # Amount of stats buffered at most (each encounter ID counting as one), further stats are dropped
+        self._max_items: int = max_items
+        self._stats: List[Stats] = []
+        # (worker, kind, timestamp, type of detection) -> message in _stats to coalesce further stats into
+        self._coalesced: Dict[Tuple[str, str, int, int], Stats] = {}
+        self._items: int = 0
+        self.dropped: int = 0
+
+    def __len__(self) -> int:
+        return self._items
+
+    def is_full(self) -> bool:
+        return self._items >= self._max_items
+
+    def add(self, stats: Stats) -> bool:
+        """
+        Returns: False if the stats have been dropped as the buffer is full
+        """
+        if self.is_full():
+            self.dropped += 1
+            return False
+        kind: str = stats.WhichOneof("data_to_collect")
+        self._items += StatsBatchBuffer.__count_items(stats, kind)
+        if kind not in StatsBatchBuffer.__COALESCED_KINDS:
+            self._stats.append(stats)
+            return True
+        key = (stats.worker.name, kind, stats.timestamp, stats.seen_type.type_of_detection)
+        pending: Stats = self._coalesced.get(key)
+        if pending is None:
+            self._coalesced[key] = stats
+            self._stats.append(stats)
+        elif kind == "wild_mons":
+            pending.wild_mons.encounter_ids.extend(stats.wild_mons.encounter_ids)
+        elif kind == "raid":
+            pending.raid.amount += stats.raid.amount
+        else:
+            pending.seen_type.encounter_ids.extend(stats.seen_type.encounter_ids)
+        return True
+
+    def drain(self) -> List[Stats]:
+        """
+        Returns: The stats buffered in the order added, the buffer is emptied
+        """
+        stats: List[Stats] = self._stats
+        self._stats = []
+        self._coalesced = {}
+        self._items = 0
+        return stats
+
+    def restore(self, stats: List[Stats]) -> None:
+        """
+        Places stats drained before in front of the stats buffered, e.g. if submitting them has been cancelled.
+        Restored stats are kept even if the buffer is full, further stats are not coalesced into them.
+        """
+        self._stats = stats + self._stats
+        self._items += sum(StatsBatchBuffer.__count_items(entry, entry.WhichOneof("data_to_collect"))
+                           for entry in stats)
+
+    @staticmethod
+    def __count_items(stats: Stats, kind: str) -> int:
+        if kind == "wild_mons":
+            return max(len(stats.wild_mons.encounter_ids), 1)
+        elif kind == "seen_type":
+            return max(len(stats.seen_type.encounter_ids), 1)
+        return 1
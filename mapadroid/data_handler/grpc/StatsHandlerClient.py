@@ -1,33 +1,128 @@
+import asyncio
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
+import grpc
 from grpc.aio import AioRpcError
 from loguru import logger
 
+from mapadroid.data_handler.grpc.StatsBatchBuffer import StatsBatchBuffer
 from mapadroid.data_handler.stats.AbstractStatsHandler import \
     AbstractStatsHandler
-from mapadroid.grpc.compiled.stats_handler.stats_handler_pb2 import Stats
+from mapadroid.grpc.compiled.stats_handler.stats_handler_pb2 import (
+    Stats, StatsBatch)
 from mapadroid.grpc.stubs.stats_handler.stats_handler_pb2_grpc import \
     StatsHandlerStub
 from mapadroid.utils.collections import Location
-from mapadroid.utils.madGlobals import (MonSeenTypes, PositionType,
-                                        TransportType)
+from mapadroid.utils.madGlobals import (MadGlobals, MonSeenTypes,
+                                        PositionType, TransportType)
 from mapadroid.worker.WorkerType import WorkerType
 
 
 class StatsHandlerClient(StatsHandlerStub, AbstractStatsHandler):
+    """
+    Stats are buffered and submitted periodically in batches rather than per call, see StatsBatchBuffer
+    """
+    # Amount of stats buffered at most until further stats are dropped
+    MAX_BUFFERED_ITEMS: int = 200000
+    # Amount of stats sent per message of the stream
+    STATS_PER_BATCH: int = 1000
+
     def __init__(self, channel):
         super().__init__(channel)
+        self._buffer: StatsBatchBuffer = StatsBatchBuffer(StatsHandlerClient.MAX_BUFFERED_ITEMS)
+        self._flush_interval: float = MadGlobals.application_args.statshandler_flush_interval
+        self._flush_requested: asyncio.Event = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        # Flushes are serialised, a flush in flight is not cancelled upon shutdown
+        self._flush_lock: asyncio.Lock = asyncio.Lock()
+        # Stats are dropped once shut down until started again
+        self._shut_down: bool = False
+        # Servers not implementing StatsCollectStream are sent every stats on its own
+        self._streaming_supported: bool = True
+
+    async def start(self) -> None:
+        self._shut_down = False
+        if not self._flush_task:
+            loop = asyncio.get_running_loop()
+            self._flush_task = loop.create_task(self.__flush_loop())
+
+    async def shutdown(self) -> None:
+        self._shut_down = True
+        async with self._flush_lock:
+            if self._flush_task:
+                self._flush_task.cancel()
+                self._flush_task = None
+            await self.__flush()
+
+    def __add(self, request: Stats) -> None:
+        if self._shut_down:
+            logger.debug("Dropping stats submitted after shutdown")
+            return
+        if not self._buffer.add(request):
+            if self._buffer.dropped % 1000 == 1:
+                logger.warning("Stats buffer is full, dropped {} stats so far", self._buffer.dropped)
+            return
+        if self._flush_task is None:
+            # Not started explicitly, nothing would submit the stats otherwise
+            self._flush_task = asyncio.get_running_loop().create_task(self.__flush_loop())
+        if self._buffer.is_full():
+            self._flush_requested.set()
+
+    async def __flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                async with self._flush_lock:
+                    await self.__flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Failed flushing stats: {}", e)
+
+    async def __flush(self) -> None:
+        stats: List[Stats] = self._buffer.drain()
+        if not stats:
+            return
+        logger.debug("Submitting {} batched stats", len(stats))
+        if self._streaming_supported:
+            try:
+                await self.StatsCollectStream(self.__split_into_batches(stats))
+                return
+            except asyncio.CancelledError:
+                # Batches streamed before being cancelled may be submitted again
+                self._buffer.restore(stats)
+                raise
+            except AioRpcError as e:
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                    logger.warning("Failed submitting {} stats: {}", len(stats), e)
+                    return
+                logger.info("StatsHandler server does not support batches of stats, submitting one by one")
+                self._streaming_supported = False
+        for index, request in enumerate(stats):
+            try:
+                await self.StatsCollect(request)
+            except asyncio.CancelledError:
+                self._buffer.restore(stats[index:])
+                raise
+            except AioRpcError as e:
+                logger.warning("Failed submitting stats {}", e)
+
+    @staticmethod
+    async def __split_into_batches(stats: List[Stats]) -> AsyncIterator[StatsBatch]:
+        for start in range(0, len(stats), StatsHandlerClient.STATS_PER_BATCH):
+            yield StatsBatch(stats=stats[start:start + StatsHandlerClient.STATS_PER_BATCH])
 
     async def stats_collect_wild_mon(self, worker: str, encounter_ids: List[int], time_scanned: datetime) -> None:
         request: Stats = Stats()
         request.worker.name = worker
         request.timestamp = int(time_scanned.timestamp())
         request.wild_mons.encounter_ids.extend(encounter_ids)
-        try:
-            await self.StatsCollect(request)
-        except AioRpcError as e:
-            logger.warning("Failed submitting wild mon stats {}", e)
+        self.__add(request)
 
     async def stats_collect_mon_iv(self, worker: str, encounter_id: int, time_scanned: datetime,
                                    is_shiny: bool) -> None:
@@ -36,30 +131,21 @@ class StatsHandlerClient(StatsHandlerStub, AbstractStatsHandler):
         request.timestamp = int(time_scanned.timestamp())
         request.mon_iv.encounter_id = encounter_id
         request.mon_iv.is_shiny = is_shiny
-        try:
-            await self.StatsCollect(request)
-        except AioRpcError as e:
-            logger.warning("Failed submitting mon IV stats {}", e)
+        self.__add(request)
 
     async def stats_collect_quest(self, worker: str, time_scanned: datetime) -> None:
         request: Stats = Stats()
         request.worker.name = worker
         request.timestamp = int(time_scanned.timestamp())
         request.quest.SetInParent()
-        try:
-            await self.StatsCollect(request)
-        except AioRpcError as e:
-            logger.warning("Failed submitting quest stats {}", e)
+        self.__add(request)
 
     async def stats_collect_raid(self, worker: str, time_scanned: datetime, amount: int = 1) -> None:
         request: Stats = Stats()
         request.worker.name = worker
         request.timestamp = int(time_scanned.timestamp())
         request.raid.amount = amount
-        try:
-            await self.StatsCollect(request)
-        except AioRpcError as e:
-            logger.warning("Failed submitting raid stats {}", e)
+        self.__add(request)
 
     async def stats_collect_location_data(self, worker: str, location: Optional[Location], success: bool, fix_timestamp: int,
                                           position_type: PositionType, data_timestamp: int, walker: WorkerType,
@@ -77,10 +163,7 @@ class StatsHandlerClient(StatsHandlerStub, AbstractStatsHandler):
         # TODO: Probably gotta set it some other way...
         request.location_data.position_type = position_type.value
         request.location_data.transport_type = transport_type.value
-        try:
-            await self.StatsCollect(request)
-        except AioRpcError as e:
-            logger.warning("Failed submitting location data {}", e)
+        self.__add(request)
 
     async def stats_collect_seen_type(self, encounter_ids: List[int], type_of_detection: MonSeenTypes,
                                       time_of_scan: datetime) -> None:
@@ -89,7 +172,4 @@ class StatsHandlerClient(StatsHandlerStub, AbstractStatsHandler):
         request.seen_type.encounter_ids.extend(encounter_ids)
         # TODO: Probably gotta set it some other way...
         request.seen_type.type_of_detection = type_of_detection.value
-        try:
-            await self.StatsCollect(request)
-        except AioRpcError as e:
-            logger.warning("Failed submitting seen type stats {}", e)
+        self.__add(request)
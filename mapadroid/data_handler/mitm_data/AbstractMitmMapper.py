@@ -25,6 +25,33 @@ class AbstractMitmMapper(ABC):
                              timestamp_earliest: Optional[int] = None) -> Optional[LatestMitmDataEntry]:
         pass
 
+    @abstractmethod
+    async def request_latest_digest(self, worker: str, key: str,
+                                    timestamp_earliest: Optional[int] = None) -> Optional[LatestMitmDataEntry]:
+        """
+        Same as request_latest but the entry returned only carries the digest computed upon ingestion (if any) along
+        with the location and timestamps rather than the full payload. The data of the entry is to be considered
+        unset.
+        """
+        pass
+
+    @abstractmethod
+    async def wait_for_data_update(self, worker: str, key: str, timestamp_earliest: int,
+                                   timeout: float) -> Optional[int]:
+        """
+        Waits until data of the given key is received for the worker with a timestamp of retrieval newer than
+        timestamp_earliest or with a timestamp equal to timestamp_earliest while waiting (i.e., more data within the
+        same second). Returns right away if newer data is present already.
+        Args:
+            worker: Name of the worker
+            key: Key of the data (e.g., the proto ID)
+            timestamp_earliest: Timestamp the data needs to be newer than
+            timeout: Maximum time in seconds to wait
+
+        Returns: The timestamp of retrieval of the latest data of the key or None if no newer data arrived in time
+        """
+        pass
+
     @abstractmethod
     async def get_poke_stop_visits(self, worker: str) -> int:
         pass
@@ -0,0 +1,75 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, Optional
+
+
+class DataUpdateNotifier:
+    """
+    Keeps track of the timestamps (of retrieval) of the latest data per worker and key and wakes up coroutines waiting
+    for data of a worker to be updated. Needs to be used within a single event loop.
+    Timestamps are whole seconds (as transported), updates within the same second are told apart by a sequence number
+    counting the updates per key.
+    """
+    def __init__(self):
+        # worker -> key -> timestamp
+        self._timestamps: Dict[str, Dict[str, int]] = defaultdict(dict)
+        # worker -> key -> amount of updates
+        self._sequences: Dict[str, Dict[str, int]] = defaultdict(dict)
+        # worker -> event set (and dropped) on the next update of data of the worker
+        self._update_events: Dict[str, asyncio.Event] = {}
+
+    def notify(self, worker: str, key: str, timestamp: int) -> None:
+        timestamp = int(timestamp)
+        if timestamp < self._timestamps[worker].get(key, 0):
+            return
+        self._timestamps[worker][key] = timestamp
+        self._sequences[worker][key] = self._sequences[worker].get(key, 0) + 1
+        event: Optional[asyncio.Event] = self._update_events.pop(worker, None)
+        if event:
+            event.set()
+
+    def get_timestamp(self, worker: str, key: str) -> int:
+        return self._timestamps[worker].get(key, 0)
+
+    def get_timestamps(self, worker: str) -> Dict[str, int]:
+        return dict(self._timestamps[worker])
+
+    def get_sequences(self, worker: str) -> Dict[str, int]:
+        return dict(self._sequences[worker])
+
+    async def wait_for_update(self, worker: str) -> None:
+        """
+        Waits until any data of the worker is updated
+        """
+        await self.__get_update_event(worker).wait()
+
+    def __get_update_event(self, worker: str) -> asyncio.Event:
+        event: Optional[asyncio.Event] = self._update_events.get(worker)
+        if event is None:
+            event = asyncio.Event()
+            self._update_events[worker] = event
+        return event
+
+    async def wait_for_timestamp(self, worker: str, key: str, timestamp_earliest: int,
+                                 timeout: float) -> Optional[int]:
+        """
+        Waits until data of the given key is known with a timestamp newer than timestamp_earliest or data of the key
+        with a timestamp equal to timestamp_earliest has been updated while waiting
+        Returns: The timestamp of the latest data of the key or None if no newer data arrived within the timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline: float = loop.time() + timeout
+        sequence_start: int = self._sequences[worker].get(key, 0)
+        while (self.get_timestamp(worker, key) < timestamp_earliest
+               or self.get_timestamp(worker, key) == timestamp_earliest
+               and self._sequences[worker].get(key, 0) == sequence_start):
+            remaining: float = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            # The event is registered before yielding to the loop, wait_for only starts waiting in a task later on.
+            # Updates notified in between would be missed otherwise.
+            try:
+                await asyncio.wait_for(self.__get_update_event(worker).wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+        return self.get_timestamp(worker, key)
@@ -1,8 +1,11 @@
 import asyncio
+import time
 from typing import Dict, List, Optional, Union
 
 from mapadroid.data_handler.mitm_data.AbstractMitmMapper import \
     AbstractMitmMapper
+from mapadroid.data_handler.mitm_data.DataUpdateNotifier import \
+    DataUpdateNotifier
 from mapadroid.data_handler.mitm_data.MitmDataHandler import MitmDataHandler
 from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.LatestMitmDataEntry import \
     LatestMitmDataEntry
@@ -12,6 +15,7 @@ from mapadroid.utils.collections import Location
 class MitmMapper(AbstractMitmMapper):
     def __init__(self):
         self._mitm_data_handler: MitmDataHandler = MitmDataHandler()
+        self._data_update_notifier: DataUpdateNotifier = DataUpdateNotifier()
 
     # ##
     # Data related methods
@@ -22,14 +26,28 @@ class MitmMapper(AbstractMitmMapper):
     async def update_latest(self, worker: str, key: str, value: Union[List, Dict],
                             timestamp_received_raw: float = None,
                             timestamp_received_receiver: float = None, location: Location = None) -> None:
+        if timestamp_received_receiver is None:
+            timestamp_received_receiver = int(time.time())
         loop = asyncio.get_running_loop()
-        loop.run_in_executor(None, self._mitm_data_handler.update_latest, worker, key, value, timestamp_received_raw,
-                             timestamp_received_receiver, location)
+        update = loop.run_in_executor(None, self._mitm_data_handler.update_latest, worker, key, value,
+                                      timestamp_received_raw, timestamp_received_receiver, location)
+        # Callbacks of the future are run within the loop, thus waiters are only woken up once the data is in place
+        update.add_done_callback(
+            lambda _: self._data_update_notifier.notify(worker, str(key), int(timestamp_received_receiver)))
 
     async def request_latest(self, worker: str, key: str,
                              timestamp_earliest: Optional[int] = None) -> Optional[LatestMitmDataEntry]:
         return self._mitm_data_handler.request_latest(worker, key, timestamp_earliest)
 
+    async def request_latest_digest(self, worker: str, key: str,
+                                    timestamp_earliest: Optional[int] = None) -> Optional[LatestMitmDataEntry]:
+        # Entries are held in memory, no need to strip the payload
+        return self._mitm_data_handler.request_latest(worker, key, timestamp_earliest)
+
+    async def wait_for_data_update(self, worker: str, key: str, timestamp_earliest: int,
+                                   timeout: float) -> Optional[int]:
+        return await self._data_update_notifier.wait_for_timestamp(worker, str(key), timestamp_earliest, timeout)
+
     async def get_poke_stop_visits(self, worker: str) -> int:
         return await self._mitm_data_handler.get_poke_stop_visits(worker)
 
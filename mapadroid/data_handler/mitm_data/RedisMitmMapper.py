@@ -1,3 +1,4 @@
+import asyncio
 import time
 from typing import Dict, List, Optional, Union
 
@@ -8,6 +9,10 @@ from loguru import logger
 
 from mapadroid.data_handler.mitm_data.AbstractMitmMapper import \
     AbstractMitmMapper
+from mapadroid.data_handler.mitm_data.DataUpdateNotifier import \
+    DataUpdateNotifier
+from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.GmoDigest import \
+    GmoDigest
 from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.LatestMitmDataEntry import \
     LatestMitmDataEntry
 from mapadroid.db.DbWrapper import DbWrapper
@@ -19,6 +24,12 @@ class RedisMitmMapper(AbstractMitmMapper):
     LAST_POSSIBLY_MOVED_KEY = "last_possibly_moved:{}"
     # latest_data:{worker}:{data_key}
     LATEST_DATA_KEY = "latest_data:{}:{}"
+    # latest_digest:{worker}:{data_key}, only set for GMOs
+    LATEST_DIGEST_KEY = "latest_digest:{}:{}"
+    # latest_data_timestamp:{worker}:{data_key}
+    LATEST_DATA_TIMESTAMP_KEY = "latest_data_timestamp:{}:{}"
+    # Messages published are JSON lists of [worker, data_key, timestamp]
+    LATEST_DATA_UPDATED_CHANNEL = "latest_data_updated"
     # latest_data:{worker}
     LAST_KNOWN_LOCATION_KEY = "last_known_location:{}"
     # injected:{worker}
@@ -35,6 +46,9 @@ class RedisMitmMapper(AbstractMitmMapper):
     def __init__(self, db_wrapper: DbWrapper):
         self.__db_wrapper: DbWrapper = db_wrapper
         self.__cache: Optional[Redis] = None
+        self.__data_update_notifier: DataUpdateNotifier = DataUpdateNotifier()
+        self.__data_update_listener: Optional[asyncio.Task] = None
+        self.__data_update_listener_subscribed: asyncio.Event = asyncio.Event()
 
     async def start(self):
         self.__cache: Redis = await self.__db_wrapper.get_cache()
@@ -63,8 +77,22 @@ class RedisMitmMapper(AbstractMitmMapper):
             mitm_data_entry: LatestMitmDataEntry = LatestMitmDataEntry(location, timestamp_received_raw,
                                                                        timestamp_received_receiver, value)
             json_data: bytes = await mitm_data_entry.to_json()
+            json_digest: Optional[bytes] = None
+            if key == str(ProtoIdentifier.GMO.value) and isinstance(value, dict):
+                digest_entry: LatestMitmDataEntry = LatestMitmDataEntry(location, timestamp_received_raw,
+                                                                        timestamp_received_receiver, None,
+                                                                        GmoDigest.from_gmo(value))
+                json_digest = await digest_entry.to_json()
             try:
-                await self.__cache.set(RedisMitmMapper.LATEST_DATA_KEY.format(worker, key), json_data)
+                async with self.__cache.pipeline(transaction=False) as pipe:
+                    pipe.set(RedisMitmMapper.LATEST_DATA_KEY.format(worker, key), json_data)
+                    if json_digest:
+                        pipe.set(RedisMitmMapper.LATEST_DIGEST_KEY.format(worker, key), json_digest)
+                    pipe.set(RedisMitmMapper.LATEST_DATA_TIMESTAMP_KEY.format(worker, key),
+                             int(timestamp_received_receiver))
+                    pipe.publish(RedisMitmMapper.LATEST_DATA_UPDATED_CHANNEL,
+                                 ujson.dumps([worker, str(key), int(timestamp_received_receiver)]))
+                    await pipe.execute()
             except Exception as e:
                 logger.exception(e)
         if key == str(ProtoIdentifier.GMO.value):
@@ -99,6 +127,56 @@ class RedisMitmMapper(AbstractMitmMapper):
         else:
             return latest_entry
 
+    async def request_latest_digest(self, worker: str, key: str,
+                                    timestamp_earliest: Optional[int] = None) -> Optional[LatestMitmDataEntry]:
+        latest_digest: Optional[bytes] = await self.__cache.get(RedisMitmMapper.LATEST_DIGEST_KEY.format(worker, key))
+        if not latest_digest:
+            # No digest is computed for the data of the key
+            return await self.request_latest(worker, key, timestamp_earliest)
+        latest_entry: Optional[LatestMitmDataEntry] = await LatestMitmDataEntry.from_json(latest_digest)
+        if not latest_entry or (timestamp_earliest and latest_entry.timestamp_of_data_retrieval
+                                and int(timestamp_earliest) >= int(latest_entry.timestamp_of_data_retrieval)):
+            return None
+        else:
+            return latest_entry
+
+    async def wait_for_data_update(self, worker: str, key: str, timestamp_earliest: int,
+                                   timeout: float) -> Optional[int]:
+        key = str(key)
+        if not self.__data_update_listener:
+            self.__data_update_listener = asyncio.create_task(self.__listen_for_data_updates())
+        try:
+            await asyncio.wait_for(self.__data_update_listener_subscribed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        # Updates published before subscribing or while reconnecting would be missed otherwise
+        timestamp: Optional[bytes] = await self.__cache.get(
+            RedisMitmMapper.LATEST_DATA_TIMESTAMP_KEY.format(worker, key))
+        if timestamp:
+            self.__data_update_notifier.notify(worker, key, int(timestamp))
+        return await self.__data_update_notifier.wait_for_timestamp(worker, key, timestamp_earliest, timeout)
+
+    async def __listen_for_data_updates(self) -> None:
+        """
+        Single subscription per process feeding the updates of data published to the local notifier
+        """
+        while True:
+            try:
+                async with self.__cache.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(RedisMitmMapper.LATEST_DATA_UPDATED_CHANNEL)
+                    self.__data_update_listener_subscribed.set()
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        worker, key, timestamp = ujson.loads(message["data"])
+                        self.__data_update_notifier.notify(worker, key, timestamp)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Subscription to updates of data failed, retrying: {}", e)
+            self.__data_update_listener_subscribed.clear()
+            await asyncio.sleep(5)
+
     async def get_poke_stop_visits(self, worker: str) -> int:
         pokestops_visited: Optional[int] = await self.__cache.get(RedisMitmMapper.POKESTOPS_VISITED_KEY.format(worker))
         return int(pokestops_visited) if pokestops_visited else 0
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Collection, Dict, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+from mapadroid.utils.geo import get_distances_in_meters
+
+
+class WildMonDigest(NamedTuple):
+    encounter_id: int
+    mon_id: int
+    weather_boosted: Optional[int]
+    latitude: float
+    longitude: float
+
+
+@dataclass
+class GmoDigest:
+    """
+    Compact, columnar representation of the facts of a GMO the workers decide upon, computed once upon ingestion.
+    All lists of cells and wild mons respectively are of equal length and aligned by index.
+    """
+    # Unsigned cell IDs
+    cell_ids: List[int] = field(default_factory=list)
+    # Amount of forts, wild_pokemon and nearby_pokemon per cell
+    fort_counts: List[int] = field(default_factory=list)
+    wild_mon_counts: List[int] = field(default_factory=list)
+    nearby_mon_counts: List[int] = field(default_factory=list)
+    fort_ids: List[str] = field(default_factory=list)
+    fort_types: List[int] = field(default_factory=list)
+    # Unsigned encounter IDs
+    encounter_ids: List[int] = field(default_factory=list)
+    mon_ids: List[int] = field(default_factory=list)
+    weather_boosted: List[Optional[int]] = field(default_factory=list)
+    latitudes: List[float] = field(default_factory=list)
+    longitudes: List[float] = field(default_factory=list)
+
+    @staticmethod
+    def from_gmo(gmo: Dict) -> GmoDigest:
+        digest: GmoDigest = GmoDigest()
+        cells = gmo.get("cells", None)
+        if not cells or not isinstance(cells, list):
+            return digest
+        for cell in cells:
+            # Numbers may have been transported as doubles (e.g. google.protobuf.Struct)
+            cell_id: int = int(cell["id"])
+            if cell_id < 0:
+                cell_id = cell_id + 2 ** 64
+            digest.cell_ids.append(cell_id)
+            forts: List[Dict] = GmoDigest.__get_list(cell, "forts")
+            wild_mons: List[Dict] = GmoDigest.__get_list(cell, "wild_pokemon")
+            digest.fort_counts.append(len(forts))
+            digest.wild_mon_counts.append(len(wild_mons))
+            digest.nearby_mon_counts.append(len(GmoDigest.__get_list(cell, "nearby_pokemon")))
+            for fort in forts:
+                digest.fort_ids.append(fort.get("id"))
+                digest.fort_types.append(int(fort.get("type", 0)))
+            for wild_mon in wild_mons:
+                encounter_id: int = int(wild_mon["encounter_id"])
+                if encounter_id < 0:
+                    encounter_id = encounter_id + 2 ** 64
+                pokemon_data: Dict = wild_mon.get("pokemon_data", {})
+                digest.encounter_ids.append(encounter_id)
+                weather_boosted: Optional[int] = pokemon_data.get("display", {}).get("weather_boosted_value", None)
+                digest.mon_ids.append(int(pokemon_data.get("id", 0)))
+                digest.weather_boosted.append(int(weather_boosted) if weather_boosted is not None else None)
+                digest.latitudes.append(wild_mon["latitude"])
+                digest.longitudes.append(wild_mon["longitude"])
+        return digest
+
+    @staticmethod
+    def __get_list(cell: Dict, key: str) -> List:
+        value = cell.get(key, None)
+        return value if value and isinstance(value, list) else []
+
+    @staticmethod
+    def from_dict(digest_raw: Dict) -> GmoDigest:
+        return GmoDigest(**digest_raw)
+
+    def cells_contain_any_of(self, keys_in_cell: Union[str, Collection[str]]) -> bool:
+        """
+        Equivalent of checking whether any cell of the GMO contains a non-empty list of any of the keys given
+        """
+        if isinstance(keys_in_cell, str):
+            keys_in_cell = [keys_in_cell]
+        counts_of_keys: Dict[str, List[int]] = {"forts": self.fort_counts,
+                                                "wild_pokemon": self.wild_mon_counts,
+                                                "nearby_pokemon": self.nearby_mon_counts}
+        return any(any(counts_of_keys.get(key, [])) for key in keys_in_cell)
+
+    def wild_mons(self) -> Iterator[WildMonDigest]:
+        for wild_mon in zip(self.encounter_ids, self.mon_ids, self.weather_boosted, self.latitudes,
+                            self.longitudes):
+            yield WildMonDigest(*wild_mon)
+
+    def wild_mon_distances(self, lat: float, lng: float) -> np.ndarray:
+        """
+        Returns: Distances in meters of the location given to the wild mons, aligned with wild_mons()
+        """
+        return get_distances_in_meters(lat, lng, np.column_stack((self.latitudes, self.longitudes)))
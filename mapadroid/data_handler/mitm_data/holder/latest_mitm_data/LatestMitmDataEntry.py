@@ -4,18 +4,23 @@ from typing import Dict, List, Optional, Union
 
 from orjson import orjson
 
+from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.GmoDigest import \
+    GmoDigest
 from mapadroid.utils.collections import Location
 
 
 class LatestMitmDataEntry:
     def __init__(self, location: Optional[Location], timestamp_received: Optional[int],
-                 timestamp_of_data_retrieval: Optional[int], data: Union[List, Dict]):
+                 timestamp_of_data_retrieval: Optional[int], data: Union[List, Dict],
+                 digest: Optional[GmoDigest] = None):
         self.location: Optional[Location] = location
         # The time MAD received the data from a device/worker
         self.timestamp_received: Optional[int] = timestamp_received
         # The time that the device/worker received the data
         self.timestamp_of_data_retrieval: Optional[int] = timestamp_of_data_retrieval
         self.data: Union[List, Dict] = data
+        # Only present for GMOs, data may be omitted if merely the digest has been requested
+        self.digest: Optional[GmoDigest] = digest
 
     @staticmethod
     async def from_json(json_data: Union[bytes, str]) -> Optional[LatestMitmDataEntry]:
@@ -36,10 +41,12 @@ class LatestMitmDataEntry:
         timestamp_received: Optional[int] = loaded.get("timestamp_received")
         timestamp_of_data_retrieval: Optional[int] = loaded.get("timestamp_of_data_retrieval")
         data: Union[List, Dict] = loaded.get("data")
+        digest_raw: Optional[Dict] = loaded.get("digest")
         obj: LatestMitmDataEntry = LatestMitmDataEntry(location,
                                                        timestamp_received,
                                                        timestamp_of_data_retrieval,
-                                                       data)
+                                                       data,
+                                                       GmoDigest.from_dict(digest_raw) if digest_raw else None)
         return obj
 
     async def to_json(self) -> bytes:
@@ -1,9 +1,12 @@
 from typing import Dict, List, Optional, Union
 
 from mapadroid.data_handler.AbstractWorkerHolder import AbstractWorkerHolder
+from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.GmoDigest import \
+    GmoDigest
 from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.LatestMitmDataEntry import \
     LatestMitmDataEntry
 from mapadroid.utils.collections import Location
+from mapadroid.utils.ProtoIdentifier import ProtoIdentifier
 
 
 class LatestMitmDataHolder(AbstractWorkerHolder):
@@ -23,8 +26,11 @@ class LatestMitmDataHolder(AbstractWorkerHolder):
             return
         if key in self.__entries:
             del self.__entries[key]
+        digest: Optional[GmoDigest] = None
+        if str(key) == str(ProtoIdentifier.GMO.value) and isinstance(value, dict):
+            digest = GmoDigest.from_gmo(value)
         self.__entries[key] = LatestMitmDataEntry(location, timestamp_received,
-                                                  timestamp_of_data_retrieval, value)
+                                                  timestamp_of_data_retrieval, value, digest)
 
     def get_latest(self, key: Union[int, str]) -> Optional[LatestMitmDataEntry]:
         return self.__entries.get(key)
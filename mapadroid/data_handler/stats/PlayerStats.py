@@ -35,7 +35,10 @@ class PlayerStats(AbstractStatsHolder):
             self._wild_mon_stats_holder: WildMonStatsHolder = WildMonStatsHolder(self._worker)
             self._stats_location_raw_holder: StatsLocationRawHolder = StatsLocationRawHolder(self._worker)
 
-    async def submit(self, session: AsyncSession) -> None:
+    def take_holders(self) -> List[AbstractStatsHolder]:
+        """
+        Returns: The holders of the stats collected so far to be submitted, new stats are collected in new holders
+        """
         holders_to_submit: List[AbstractStatsHolder] = [self._stats_detect_holder, self._stats_location_holder]
         if self._wild_mon_stats_holder:
             holders_to_submit.append(self._wild_mon_stats_holder)
@@ -46,7 +49,10 @@ class PlayerStats(AbstractStatsHolder):
         del self._wild_mon_stats_holder
         del self._stats_location_raw_holder
         self.__init_holders()
+        return holders_to_submit
 
+    async def submit(self, session: AsyncSession) -> None:
+        holders_to_submit: List[AbstractStatsHolder] = self.take_holders()
         for holder in holders_to_submit:
             async with session.begin_nested() as nested:
                 try:
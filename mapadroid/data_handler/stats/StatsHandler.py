@@ -1,8 +1,9 @@
 import asyncio
 import time
 from asyncio import Task
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Type
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -121,11 +122,24 @@ class StatsHandler(AbstractStatsHandler):
         if self.__stats_detect_seen_type_holder:
             submittable_stats.append(self.__stats_detect_seen_type_holder)
             self.__stats_detect_seen_type_holder = None
-        submittable_stats.extend(self.__worker_stats.values())
+        for player_stats in self.__worker_stats.values():
+            submittable_stats.extend(player_stats.take_holders())
         self.__worker_stats = None
         self.__init_stats_holders()
+        # Holders of a type are submitted together, e.g. as multi-row statements of all workers
+        holders_by_type: Dict[Type[AbstractStatsHolder], List[AbstractStatsHolder]] = defaultdict(list)
         for submittable in submittable_stats:
-            await submittable.submit(session)
+            holders_by_type[type(submittable)].append(submittable)
+        for holder_type, holders in holders_by_type.items():
+            start: float = time.perf_counter()
+            async with session.begin_nested() as nested:
+                try:
+                    await holder_type.submit_all(session, holders)
+                    await nested.commit()
+                except Exception as e:
+                    await nested.rollback()
+                    logger.warning("Failed submitting stats of {}: {}", holder_type.__name__, e)
+            logger.info("Submitted {} {} in {:.3f}s", len(holders), holder_type.__name__, time.perf_counter() - start)
 
         await self.__cleanup_stats(session)
         logger.info("Done submitting stats")
@@ -1,9 +1,29 @@
 from abc import ABC, abstractmethod
+from typing import Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.stats_handler)
+
 
 class AbstractStatsHolder(ABC):
     @abstractmethod
     async def submit(self, session: AsyncSession) -> None:
         pass
+
+    @classmethod
+    async def submit_all(cls, session: AsyncSession, holders: Sequence["AbstractStatsHolder"]) -> None:
+        """
+        Submits the holders of this type. Holders writing a single row override this to write the rows of all holders
+        at once, the holders are submitted one by one (each in a savepoint) otherwise.
+        """
+        for holder in holders:
+            async with session.begin_nested() as nested:
+                try:
+                    await holder.submit(session)
+                    await nested.commit()
+                except Exception as e:
+                    await nested.rollback()
+                    logger.warning("Failed submitting stats of {}: {}", cls.__name__, e)
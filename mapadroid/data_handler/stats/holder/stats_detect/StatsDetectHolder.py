@@ -1,11 +1,14 @@
 import time
 from datetime import datetime
+from typing import Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from mapadroid.data_handler.AbstractWorkerHolder import AbstractWorkerHolder
 from mapadroid.data_handler.stats.holder.AbstractStatsHolder import AbstractStatsHolder
 from mapadroid.data_handler.stats.holder.stats_detect.StatsDetectEntry import StatsDetectEntry
+from mapadroid.db.helper.TrsStatsDetectHelper import TrsStatsDetectHelper
+from mapadroid.utils.madGlobals import MadGlobals
 
 
 class StatsDetectHolder(AbstractStatsHolder, AbstractWorkerHolder):
@@ -15,11 +18,17 @@ class StatsDetectHolder(AbstractStatsHolder, AbstractWorkerHolder):
         self._entry: StatsDetectEntry = StatsDetectEntry(worker)
 
     async def submit(self, session: AsyncSession) -> None:
-        self._entry.timestamp_scan = int(time.time())
-        async with session.begin_nested() as nested:
-            session.add(self._entry)
-            await nested.commit()
-        del self._entry
+        await StatsDetectHolder.submit_all(session, [self])
+
+    @classmethod
+    async def submit_all(cls, session: AsyncSession, holders: Sequence["StatsDetectHolder"]) -> None:
+        entries = []
+        for holder in holders:
+            holder._entry.timestamp_scan = int(time.time())
+            entries.append(holder._entry)
+            del holder._entry
+        await TrsStatsDetectHelper.add_bulk(session, entries,
+                                            MadGlobals.application_args.game_stats_submit_batch_size)
 
     def add_mon(self, time_scanned: datetime) -> None:
         self._entry.update(time_scanned, new_mons=1)
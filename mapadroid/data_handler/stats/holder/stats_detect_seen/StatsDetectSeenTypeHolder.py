@@ -1,14 +1,13 @@
 from datetime import datetime
 from typing import Dict
 
-import sqlalchemy
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from mapadroid.data_handler.stats.holder.AbstractStatsHolder import AbstractStatsHolder
 from mapadroid.data_handler.stats.holder.stats_detect_seen.StatsDetectSeenTypeEntry import StatsDetectSeenTypeEntry
 from mapadroid.db.helper.TrsStatsDetectSeenTypeHelper import TrsStatsDetectSeenTypeHelper
 from mapadroid.utils.logging import get_logger, LoggerEnums
-from mapadroid.utils.madGlobals import MonSeenTypes
+from mapadroid.utils.madGlobals import MadGlobals, MonSeenTypes
 
 logger = get_logger(LoggerEnums.mitm_mapper)
 
@@ -18,14 +17,8 @@ class StatsDetectSeenTypeHolder(AbstractStatsHolder):
         self._entries: Dict[int, StatsDetectSeenTypeEntry] = {}
 
     async def submit(self, session: AsyncSession) -> None:
-        for encounter_id, stat_entry in self._entries.items():
-            async with session.begin_nested() as nested:
-                try:
-                    await TrsStatsDetectSeenTypeHelper.create_or_update(session, stat_entry)
-                    await nested.commit()
-                except sqlalchemy.exc.IntegrityError as e:
-                    logger.warning("Failed submitting seen type stats. {}", e)
-                    await nested.rollback()
+        await TrsStatsDetectSeenTypeHelper.create_or_update_bulk(
+            session, list(self._entries.values()), MadGlobals.application_args.game_stats_submit_batch_size)
         del self._entries
 
     def __ensure_entry_available(self, encounter_id: int) -> StatsDetectSeenTypeEntry:
@@ -1,9 +1,13 @@
+from typing import Sequence
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from mapadroid.data_handler.AbstractWorkerHolder import AbstractWorkerHolder
 from mapadroid.data_handler.stats.holder.AbstractStatsHolder import AbstractStatsHolder
 from mapadroid.data_handler.stats.holder.stats_location.StatsLocationEntry import StatsLocationEntry
+from mapadroid.db.helper.TrsStatsLocationHelper import TrsStatsLocationHelper
 from mapadroid.utils.logging import get_logger, LoggerEnums
+from mapadroid.utils.madGlobals import MadGlobals
 
 logger = get_logger(LoggerEnums.mitm_mapper)
 
@@ -14,13 +18,16 @@ class StatsLocationHolder(AbstractStatsHolder, AbstractWorkerHolder):
         self._entry: StatsLocationEntry = StatsLocationEntry(worker)
 
     async def submit(self, session: AsyncSession) -> None:
-        async with session.begin_nested() as nested:
-            try:
-                session.add(self._entry)
-                await nested.commit()
-            except Exception as e:
-                logger.warning("Failed submitting location data of {}", self._worker)
-        del self._entry
+        await StatsLocationHolder.submit_all(session, [self])
+
+    @classmethod
+    async def submit_all(cls, session: AsyncSession, holders: Sequence["StatsLocationHolder"]) -> None:
+        entries = []
+        for holder in holders:
+            entries.append(holder._entry)
+            del holder._entry
+        await TrsStatsLocationHelper.add_bulk(session, entries,
+                                              MadGlobals.application_args.game_stats_submit_batch_size)
 
     def add_location_ok(self, time_of_scan: int) -> None:
         self._entry.update(time_of_scan, location_ok=True)
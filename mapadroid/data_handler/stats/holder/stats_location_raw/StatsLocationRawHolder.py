@@ -4,10 +4,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from mapadroid.data_handler.AbstractWorkerHolder import AbstractWorkerHolder
 from mapadroid.data_handler.stats.holder.AbstractStatsHolder import AbstractStatsHolder
+from mapadroid.db.helper.TrsStatsLocationRawHelper import TrsStatsLocationRawHelper
 from mapadroid.db.model import TrsStatsLocationRaw
 from mapadroid.utils.collections import Location
 from mapadroid.utils.logging import get_logger, LoggerEnums
-from mapadroid.utils.madGlobals import PositionType, TransportType
+from mapadroid.utils.madGlobals import MadGlobals, PositionType, TransportType
 from mapadroid.worker.WorkerType import WorkerType
 
 logger = get_logger(LoggerEnums.mitm_mapper)
@@ -19,14 +20,8 @@ class StatsLocationRawHolder(AbstractStatsHolder, AbstractWorkerHolder):
         self._entries: List[TrsStatsLocationRaw] = []
 
     async def submit(self, session: AsyncSession) -> None:
-        for entry in self._entries:
-            async with session.begin_nested() as nested:
-                try:
-                    session.add(entry)
-                    await nested.commit()
-                except Exception as e:
-                    logger.info("Failed submitting raw location stats: {}", e)
-                    await nested.rollback()
+        await TrsStatsLocationRawHelper.add_bulk(session, self._entries,
+                                                 MadGlobals.application_args.game_stats_submit_batch_size)
         del self._entries
 
     def add_location(self, location: Location, success: bool, fix_timestamp: int,
@@ -1,7 +1,6 @@
 from datetime import datetime
 from typing import Dict
 
-import sqlalchemy
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from mapadroid.data_handler.AbstractWorkerHolder import AbstractWorkerHolder
@@ -9,6 +8,7 @@ from mapadroid.data_handler.stats.holder.AbstractStatsHolder import AbstractStat
 from mapadroid.data_handler.stats.holder.wild_mon_stats.WildMonStatsEntry import WildMonStatsEntry
 from mapadroid.db.helper.TrsStatsDetectWildMonRawHelper import TrsStatsDetectWildMonRawHelper
 from mapadroid.utils.logging import get_logger, LoggerEnums
+from mapadroid.utils.madGlobals import MadGlobals
 
 logger = get_logger(LoggerEnums.mitm_mapper)
 
@@ -20,14 +20,8 @@ class WildMonStatsHolder(AbstractStatsHolder, AbstractWorkerHolder):
         self._wild_mons_seen: Dict[int, WildMonStatsEntry] = {}
 
     async def submit(self, session: AsyncSession) -> None:
-        for encounter_id, mon_entry in self._wild_mons_seen.items():
-            async with session.begin_nested() as nested:
-                try:
-                    await TrsStatsDetectWildMonRawHelper.create_or_update(session, mon_entry)
-                    await nested.commit()
-                except sqlalchemy.exc.IntegrityError as e:
-                    logger.warning("Failed submitting wild mon stats. {}", e)
-                    await nested.rollback()
+        await TrsStatsDetectWildMonRawHelper.create_or_update_bulk(
+            session, list(self._wild_mons_seen.values()), MadGlobals.application_args.game_stats_submit_batch_size)
         del self._wild_mons_seen
 
     def add(self, encounter_id: int, scanned: datetime, is_shiny: bool = False) -> None:
@@ -2,7 +2,7 @@ import json
 import math
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import sqlalchemy
 from bitstring import BitArray
@@ -10,6 +10,7 @@ from redis import Redis
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from mapadroid.db.DedupCache import DedupCache
 from mapadroid.db.helper.GymDetailHelper import GymDetailHelper
 from mapadroid.db.helper.GymHelper import GymHelper
 from mapadroid.db.helper.PokemonDisplayHelper import PokemonDisplayHelper
@@ -45,6 +46,7 @@ from mapadroid.utils.madConstants import (REDIS_CACHETIME_CELLS,
 from mapadroid.utils.madGlobals import MonSeenTypes, QuestLayer
 from mapadroid.utils.questGen import QuestGen
 from mapadroid.utils.s2Helper import S2Helper
+from mapadroid.webhook.WebhookEventStream import WebhookEventStream
 
 logger = get_logger(LoggerEnums.database)
 
@@ -61,94 +63,105 @@ class DbPogoProtoSubmit:
         self._db_exec: PooledQueryExecutor = db_exec
         self._args = args
         self._cache: Redis = None
+        self._dedup_cache: Optional[DedupCache] = None
+        self._record_webhook_events: bool = args.webhook_event_stream
 
     async def setup(self):
         self._cache: Redis = await self._db_exec.get_cache()
+        self._dedup_cache: DedupCache = DedupCache(self._cache, self._args.cache_local_dedup_size)
+
+    def get_dedup_cache(self) -> Optional[DedupCache]:
+        return self._dedup_cache
+
+    def _record_webhook_event(self, session: AsyncSession, entity_type: str, *entity_ids) -> None:
+        if self._record_webhook_events:
+            WebhookEventStream.record(session, entity_type, entity_ids)
 
     async def mons(self, session: AsyncSession, timestamp: float,
                    map_proto: dict) -> List[int]:
         """
-        Update/Insert mons from a map_proto dict
+        Update/Insert mons from a map_proto dict. All wild mons of the GMO not cached yet are written using a single
+        statement.
 
         Returns: List of encounterIDs of wild mons in GMO
         """
         logger.debug3("DbPogoProtoSubmit::mons called with data received")
         cells = map_proto.get("cells", None)
         encounter_ids_in_gmo = []
-        now = DatetimeWrapper.fromtimestamp(timestamp)
         if not cells:
             return encounter_ids_in_gmo
+        wild_mons: Dict[str, Tuple[int, Dict]] = {}
         for cell in cells:
             for wild_mon in cell["wild_pokemon"]:
-                spawnid = int(str(wild_mon["spawnpoint_id"]), 16)
-                lat = wild_mon["latitude"]
-                lon = wild_mon["longitude"]
-                mon_id = wild_mon["pokemon_data"]["id"]
                 encounter_id = wild_mon["encounter_id"]
-
                 if encounter_id < 0:
                     encounter_id = encounter_id + 2 ** 64
                 encounter_ids_in_gmo.append(encounter_id)
+                cache_key = "mon{}-{}".format(encounter_id, wild_mon["pokemon_data"]["id"])
+                wild_mons[cache_key] = (encounter_id, wild_mon)
+        if not wild_mons:
+            return encounter_ids_in_gmo
 
-                cache_key = "mon{}-{}".format(encounter_id, mon_id)
-                if await self._cache.exists(cache_key):
-                    continue
+        cached: Set[str] = await self._dedup_cache.get_cached("mon", wild_mons.keys())
+        mons_to_submit: Dict[str, Tuple[int, Dict]] = {cache_key: wild_mon for cache_key, wild_mon in wild_mons.items()
+                                                       if cache_key not in cached}
+        if not mons_to_submit:
+            return encounter_ids_in_gmo
 
-                # get known spawn end time and feed into despawn time calculation
-                # getdetspawntime = self._get_detected_endtime(str(spawnid))
-                spawnpoint: Optional[TrsSpawn] = await TrsSpawnHelper.get(session, spawnid)
-                despawn_time_unix = gen_despawn_timestamp(spawnpoint.calc_endminsec if spawnpoint else None, timestamp,
-                                                          self._args.default_unknown_timeleft)
-                despawn_time = DatetimeWrapper.fromtimestamp(despawn_time_unix)
+        spawn_endtimes: Dict[int, Optional[str]] = await TrsSpawnHelper.get_calc_endminsec(
+            session, {int(str(wild_mon["spawnpoint_id"]), 16) for _, wild_mon in mons_to_submit.values()})
+        now = DatetimeWrapper.fromtimestamp(timestamp)
+        mons_to_upsert: List[Dict] = []
+        cache_times: Dict[str, int] = {}
+        for cache_key, (encounter_id, wild_mon) in mons_to_submit.items():
+            spawnid = int(str(wild_mon["spawnpoint_id"]), 16)
+            lat = wild_mon["latitude"]
+            lon = wild_mon["longitude"]
+            mon_id = wild_mon["pokemon_data"]["id"]
+            display = wild_mon["pokemon_data"]["display"]
+
+            # get known spawn end time and feed into despawn time calculation
+            despawn_time_unix = gen_despawn_timestamp(spawn_endtimes.get(spawnid, None), timestamp,
+                                                      self._args.default_unknown_timeleft)
+            despawn_time = DatetimeWrapper.fromtimestamp(despawn_time_unix)
+            logger.debug3("adding mon (#{}) at {}, {}. Despawns at {} ({}) ({})", mon_id, lat, lon,
+                          despawn_time.strftime("%Y-%m-%d %H:%M:%S"),
+                          "non-init" if spawnid in spawn_endtimes else "init", spawnid)
+
+            if mon_id == 132:
+                # handle ditto
+                gender, costume, form = 3, 0, 0
+            else:
+                gender = display["gender_value"]
+                costume = display["costume_value"]
+                form = display["form_value"]
+            # TODO handle weather boost condition changes for redoing IV+ditto (set ivs to null again)
+            #  Further we should probably reset IVs if pokemon_id changes as well
+            mons_to_upsert.append({
+                "encounter_id": encounter_id,
+                "spawnpoint_id": spawnid,
+                "latitude": lat,
+                "longitude": lon,
+                "pokemon_id": mon_id,
+                "gender": gender,
+                "costume": costume,
+                "form": form,
+                "disappear_time": despawn_time,
+                "weather_boosted_condition": display["weather_boosted_value"],
+                "last_modified": now
+            })
+            cache_times[cache_key] = int(despawn_time_unix - int(DatetimeWrapper.now().timestamp()))
 
-                if spawnpoint is None:
-                    logger.debug3("adding mon (#{}) at {}, {}. Despawns at {} (init) ({})", mon_id, lat, lon,
-                                  despawn_time.strftime("%Y-%m-%d %H:%M:%S"), spawnid)
-                else:
-                    logger.debug3("adding mon (#{}) at {}, {}. Despawns at {} (non-init) ({})", mon_id, lat, lon,
-                                  despawn_time.strftime("%Y-%m-%d %H:%M:%S"), spawnid)
-
-                async with session.begin_nested() as nested_transaction:
-                    mon: Optional[Pokemon] = await PokemonHelper.get(session, encounter_id)
-                    if not mon:
-                        mon: Pokemon = Pokemon()
-                        mon.encounter_id = encounter_id
-                        mon.spawnpoint_id = spawnid
-                        mon.latitude = lat
-                        mon.longitude = lon
-                    mon.pokemon_id = mon_id
-                    if mon.seen_type not in [MonSeenTypes.encounter.name, MonSeenTypes.lure_encounter.name]:
-                        # TODO: Any other types not to overwrite?
-                        mon.seen_type = MonSeenTypes.wild.name
-                    if mon_id == 132:
-                        # handle ditto
-                        mon.pokemon_id = 132
-                        mon.gender = 3
-                        mon.costume = 0
-                        mon.form = 0
-                    else:
-                        mon.pokemon_id = mon_id
-                        mon.gender = wild_mon["pokemon_data"]["display"]["gender_value"]
-                        mon.costume = wild_mon["pokemon_data"]["display"]["costume_value"]
-                        mon.form = wild_mon["pokemon_data"]["display"]["form_value"]
-
-                    # TODO handle weather boost condition changes for redoing IV+ditto (set ivs to null again)
-                    #  Further we should probably reset IVs if pokemon_id changes as well
-
-                    mon.disappear_time = despawn_time
-                    mon.weather_boosted_condition = wild_mon["pokemon_data"]["display"]["weather_boosted_value"]
-                    mon.last_modified = now
-                    try:
-                        session.add(mon)
-                        await nested_transaction.commit()
-                        cache_time = int(despawn_time_unix - int(DatetimeWrapper.now().timestamp()))
-                        if cache_time > 0:
-                            await self._cache.set(cache_key, 1, ex=cache_time)
-                    except sqlalchemy.exc.IntegrityError as e:
-                        logger.debug("Failed committing mon {} ({}). Safe to ignore.", encounter_id, str(e))
-                        await nested_transaction.rollback()
-                        continue
-                await session.commit()
+        async with session.begin_nested() as nested_transaction:
+            try:
+                await PokemonHelper.upsert_wild(session, mons_to_upsert)
+                await nested_transaction.commit()
+                self._record_webhook_event(session, "pokemon", *(mon["encounter_id"] for mon in mons_to_upsert))
+            except sqlalchemy.exc.IntegrityError as e:
+                logger.debug("Failed committing {} mons ({}). Safe to ignore.", len(mons_to_upsert), str(e))
+                await nested_transaction.rollback()
+                return encounter_ids_in_gmo
+        await self._dedup_cache.set_many(cache_times)
         return encounter_ids_in_gmo
 
     async def mons_nearby(self, session: AsyncSession, timestamp: float,
@@ -163,6 +176,12 @@ class DbPogoProtoSubmit:
         if not cells:
             return cell_encounters, stop_encounters
 
+        all_cache_keys: List[str] = []
+        for cell in cells:
+            for nearby_mon in cell.get("nearby_pokemon", []):
+                all_cache_keys.extend(self.__get_nearby_mon_cache_keys(nearby_mon))
+        cached: Set[str] = await self._dedup_cache.get_cached("mon_nearby", all_cache_keys)
+        cache_keys_to_set: Dict[str, int] = {}
         for cell in cells:
             cell_id = cell.get("id")
             nearby_mons = cell.get("nearby_pokemon", [])
@@ -174,12 +193,10 @@ class DbPogoProtoSubmit:
                 if encounter_id < 0:
                     encounter_id = encounter_id + 2 ** 64
 
-                cache_key = "monnear{}-{}".format(encounter_id, mon_id)
-                encounter_key = "moniv{}-{}-{}".format(encounter_id, weather_boosted, mon_id)
-                wild_key = "mon{}-{}".format(encounter_id, mon_id)
-                if (await self._cache.exists(wild_key) or await self._cache.exists(encounter_key)
-                        or await self._cache.exists(cache_key)):
+                cache_keys: Tuple[str, str, str] = self.__get_nearby_mon_cache_keys(nearby_mon)
+                if any(key in cached for key in cache_keys):
                     continue
+                cache_key = cache_keys[0]
                 stop_id = nearby_mon["fort_id"]
                 form = display["form_value"]
                 costume = display["costume_value"]
@@ -239,13 +256,29 @@ class DbPogoProtoSubmit:
                         mon.last_modified = now
                         session.add(mon)
                         await nested_transaction.commit()
-                        await self._cache.set(cache_key, 1, ex=self._args.default_nearby_timeleft * 60)
+                        self._record_webhook_event(session, "pokemon", encounter_id)
+                        cache_keys_to_set[cache_key] = self._args.default_nearby_timeleft * 60
                 except sqlalchemy.exc.IntegrityError as e:
                     logger.debug("Failed committing nearby mon {} ({}). Safe to ignore.", encounter_id, str(e))
                     # await nested_transaction.rollback()
                     continue
+        await self._dedup_cache.set_many(cache_keys_to_set)
         return cell_encounters, stop_encounters
 
+    @staticmethod
+    def __get_nearby_mon_cache_keys(nearby_mon: Dict) -> Tuple[str, str, str]:
+        """
+        Returns: The cache keys of the nearby mon, the encounter and the wild mon
+        """
+        encounter_id = nearby_mon["encounter_id"]
+        if encounter_id < 0:
+            encounter_id = encounter_id + 2 ** 64
+        mon_id = nearby_mon["id"]
+        weather_boosted = nearby_mon["display"]["weather_boosted_value"]
+        return ("monnear{}-{}".format(encounter_id, mon_id),
+                "moniv{}-{}-{}".format(encounter_id, weather_boosted, mon_id),
+                "mon{}-{}".format(encounter_id, mon_id))
+
     async def mon_iv(self, session: AsyncSession, timestamp: float,
                      encounter_proto: dict) -> Optional[Tuple[int, bool]]:
         """
@@ -264,7 +297,7 @@ class DbPogoProtoSubmit:
         if encounter_id < 0:
             encounter_id = encounter_id + 2 ** 64
         cache_key = "moniv{}-{}-{}".format(encounter_id, weather_boosted, mon_id)
-        if await self._cache.exists(cache_key):
+        if await self._dedup_cache.is_cached("mon_iv", cache_key):
             return None
 
         logger.debug3("Updating IV sent for encounter at {}", timestamp)
@@ -330,9 +363,9 @@ class DbPogoProtoSubmit:
         session.add(mon)
         await self.maybe_save_ditto(session, pokemon_display, encounter_id, mon_id, pokemon_data)
         await session.commit()
+        self._record_webhook_event(session, "pokemon", encounter_id)
         cache_time = int(despawn_time_unix - int(DatetimeWrapper.now().timestamp()))
-        if cache_time > 0:
-            await self._cache.set(cache_key, 1, ex=cache_time)
+        await self._dedup_cache.set(cache_key, cache_time)
         time_done = time.time() - time_start_submit
         logger.debug("Done updating mon IV in DB in {} seconds", time_done)
 
@@ -370,7 +403,7 @@ class DbPogoProtoSubmit:
             encounter_id = encounter_id + 2 ** 64
 
         cache_key = "moniv{}-{}-{}".format(encounter_id, weather_boosted, mon_id)
-        if await self._cache.exists(cache_key):
+        if await self._dedup_cache.is_cached("mon_lure_iv", cache_key):
             return None
 
         # ditto detector
@@ -420,7 +453,8 @@ class DbPogoProtoSubmit:
             session.add(mon)
             await self.maybe_save_ditto(session, display, encounter_id, mon_id, pokemon_data)
             await nested_transaction.commit()
-            await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_MON_LURE_IV)
+            self._record_webhook_event(session, "pokemon", encounter_id)
+            await self._dedup_cache.set(cache_key, REDIS_CACHETIME_MON_LURE_IV)
             time_done = time.time() - time_start_submit
             logger.debug("Done updating mon lure IV in DB in {} seconds", time_done)
         return encounter_id, now
@@ -435,6 +469,7 @@ class DbPogoProtoSubmit:
         if cells is None:
             return encounter_ids
 
+        lure_mons: List[Tuple[int, Dict]] = []
         for cell in cells:
             for fort in cell["forts"]:
                 lure_mon = fort.get("active_pokemon", {})
@@ -445,50 +480,59 @@ class DbPogoProtoSubmit:
                     if encounter_id < 0:
                         encounter_id = encounter_id + 2 ** 64
                     encounter_ids.append(encounter_id)
-                    cache_key = "monlurenoiv{}".format(encounter_id)
-                    if await self._cache.exists(cache_key):
-                        continue
+                    lure_mons.append((encounter_id, fort))
+        cached: Set[str] = await self._dedup_cache.get_cached(
+            "mon_lure_noiv", ["monlurenoiv{}".format(encounter_id) for encounter_id, _ in lure_mons])
+        cache_keys_to_set: Dict[str, int] = {}
+        for encounter_id, fort in lure_mons:
+            lure_mon = fort["active_pokemon"]
+            mon_id = lure_mon["id"]
+            cache_key = "monlurenoiv{}".format(encounter_id)
+            if cache_key in cached:
+                continue
 
-                    lat = fort["latitude"]
-                    lon = fort["longitude"]
-                    stopid = fort["id"]
-                    disappear_time = DatetimeWrapper.fromtimestamp(
-                        lure_mon["expiration_timestamp"] / 1000)
+            lat = fort["latitude"]
+            lon = fort["longitude"]
+            stopid = fort["id"]
+            disappear_time = DatetimeWrapper.fromtimestamp(
+                lure_mon["expiration_timestamp"] / 1000)
 
-                    now = DatetimeWrapper.fromtimestamp(timestamp)
+            now = DatetimeWrapper.fromtimestamp(timestamp)
 
-                    display = lure_mon["display"]
-                    form = display["form_value"]
-                    costume = display["costume_value"]
-                    gender = display["gender_value"]
-                    weather_boosted = display["weather_boosted_value"]
+            display = lure_mon["display"]
+            form = display["form_value"]
+            costume = display["costume_value"]
+            gender = display["gender_value"]
+            weather_boosted = display["weather_boosted_value"]
 
-                    async with session.begin_nested() as nested_transaction:
-                        mon: Optional[Pokemon] = await PokemonHelper.get(session, encounter_id)
-                        if not mon:
-                            mon: Pokemon = Pokemon()
-                            mon.encounter_id = encounter_id
-                            mon.spawnpoint_id = 0
-                            mon.seen_type = MonSeenTypes.lure_wild.name
-                            mon.pokemon_id = mon_id
-                            mon.gender = gender
-                            mon.weather_boosted_condition = weather_boosted
-                            mon.costume = costume
-                            mon.form = form
-                        mon.latitude = lat
-                        mon.longitude = lon
-                        mon.disappear_time = disappear_time
-                        mon.fort_id = stopid
-                        mon.last_modified = now
-                        try:
-                            logger.debug("Submitting lured non-IV mon {}", encounter_id)
-                            session.add(mon)
-                            await nested_transaction.commit()
-                            await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_MON_LURE_IV)
-                        except sqlalchemy.exc.IntegrityError as e:
-                            logger.debug("Failed committing lured non-IV mon {} ({}). Safe to ignore.", encounter_id,
-                                         str(e))
-                            await nested_transaction.rollback()
+            async with session.begin_nested() as nested_transaction:
+                mon: Optional[Pokemon] = await PokemonHelper.get(session, encounter_id)
+                if not mon:
+                    mon: Pokemon = Pokemon()
+                    mon.encounter_id = encounter_id
+                    mon.spawnpoint_id = 0
+                    mon.seen_type = MonSeenTypes.lure_wild.name
+                    mon.pokemon_id = mon_id
+                    mon.gender = gender
+                    mon.weather_boosted_condition = weather_boosted
+                    mon.costume = costume
+                    mon.form = form
+                mon.latitude = lat
+                mon.longitude = lon
+                mon.disappear_time = disappear_time
+                mon.fort_id = stopid
+                mon.last_modified = now
+                try:
+                    logger.debug("Submitting lured non-IV mon {}", encounter_id)
+                    session.add(mon)
+                    await nested_transaction.commit()
+                    self._record_webhook_event(session, "pokemon", encounter_id)
+                    cache_keys_to_set[cache_key] = REDIS_CACHETIME_MON_LURE_IV
+                except sqlalchemy.exc.IntegrityError as e:
+                    logger.debug("Failed committing lured non-IV mon {} ({}). Safe to ignore.", encounter_id,
+                                 str(e))
+                    await nested_transaction.rollback()
+        await self._dedup_cache.set_many(cache_keys_to_set)
         return encounter_ids
 
     async def update_seen_type_stats(self, session: AsyncSession, **kwargs):
@@ -542,71 +586,53 @@ class DbPogoProtoSubmit:
         cells = map_proto.get("cells", None)
         if cells is None:
             return False
-        spawn_ids: List[int] = []
-        for cell in cells:
-            for wild_mon in cell["wild_pokemon"]:
-                spawn_ids.append(int(str(wild_mon['spawnpoint_id']), 16))
-
-        spawndef: Dict[int, TrsSpawn] = await self._get_spawndef(session, spawn_ids)
+        wild_mons: List[Dict] = [wild_mon for cell in cells for wild_mon in cell["wild_pokemon"]]
+        if not wild_mons:
+            return
+        # Only the existence is of interest, the spawndef is updated by the upsert
+        known_spawn_ids: Set[int] = set((await TrsSpawnHelper.get_calc_endminsec(
+            session, {int(str(wild_mon["spawnpoint_id"]), 16) for wild_mon in wild_mons})).keys())
         current_event: Optional[TrsEvent] = await TrsEventHelper.get_current_event(session, True)
-        spawns_do_add: List[TrsSpawn] = []
+        event_id: int = current_event.id if current_event else 1
+        minpos = self._get_current_spawndef_pos()
+        new_spawndef: int = self._set_spawn_see_minutesgroup(self.default_spawndef, minpos)
         received_time: datetime = DatetimeWrapper.fromtimestamp(received_timestamp)
-        for cell in cells:
-            for wild_mon in cell["wild_pokemon"]:
-                spawnid = int(str(wild_mon["spawnpoint_id"]), 16)
-                lat, lng, _ = S2Helper.get_position_from_cell(
-                    int(str(wild_mon["spawnpoint_id"]) + "00000", 16))
-                despawntime = wild_mon["time_till_hidden"]
-
-                minpos = self._get_current_spawndef_pos()
-                # TODO: retrieve the spawndefs by a single executemany and pass that...
-                spawn = spawndef.get(spawnid, None)
-                if spawn:
-                    newspawndef = self._set_spawn_see_minutesgroup(spawn.spawndef, minpos)
-                else:
-                    newspawndef = self._set_spawn_see_minutesgroup(self.default_spawndef, minpos)
-
-                # TODO: This may break another known timer...
-                if 0 <= int(despawntime) <= 90000:
-                    fulldate = received_time + timedelta(milliseconds=despawntime)
-                    earliest_unseen = int(despawntime)
-                    calcendtime = fulldate.strftime("%M:%S")
-
-                    # TODO: First try to fetch a TrsSpawn, then handle the above...
-                    # TODO: We can just use the above dict of spawns....
-                    if spawn:
-                        # Update...
-                        # TODO: Is it that simple?
-                        spawn.earliest_unseen = min(spawn.earliest_unseen, earliest_unseen)
-                        if current_event.id == spawn.eventid or current_event.id != 1 and spawn.eventid != 1:
-                            spawn.spawndef = newspawndef
-                    else:
-                        spawn: TrsSpawn = TrsSpawn()
-                        spawn.spawnpoint = spawnid
-                        spawn.latitude = lat
-                        spawn.longitude = lng
-                        spawn.earliest_unseen = earliest_unseen
-                        spawn.spawndef = newspawndef
-                        spawn.eventid = current_event.id if current_event else 1
-                        spawn.first_detection = DatetimeWrapper.fromtimestamp(received_timestamp)
-                    spawn.last_scanned = DatetimeWrapper.fromtimestamp(received_timestamp)
-                    spawn.calc_endminsec = calcendtime
-                else:
-                    # TODO: Reduce "complexity..."
-                    if spawn:
-                        if current_event.id == spawn.eventid or current_event.id != 1 and spawn.eventid != 1:
-                            spawn.spawndef = newspawndef
-                    else:
-                        spawn: TrsSpawn = TrsSpawn()
-                        spawn.spawnpoint = spawnid
-                        spawn.latitude = lat
-                        spawn.longitude = lng
-                        spawn.earliest_unseen = 99999999
-                        spawn.spawndef = newspawndef
-                        spawn.eventid = current_event.id if current_event else 1
-                    spawn.last_non_scanned = DatetimeWrapper.now()
-                spawns_do_add.append(spawn)
-        session.add_all(spawns_do_add)
+        now: datetime = DatetimeWrapper.now()
+        positions: Dict[int, Tuple[float, float]] = {}
+        spawns: List[Dict] = []
+        for wild_mon in wild_mons:
+            spawnid = int(str(wild_mon["spawnpoint_id"]), 16)
+            if spawnid in known_spawn_ids:
+                # The position is not updated for known spawnpoints, no need to calculate it
+                lat, lng = 0, 0
+            elif spawnid in positions:
+                lat, lng = positions[spawnid]
+            else:
+                lat, lng, _ = S2Helper.get_position_from_cell(int(str(wild_mon["spawnpoint_id"]) + "00000", 16))
+                positions[spawnid] = (lat, lng)
+            despawntime = wild_mon["time_till_hidden"]
+            spawn: Dict = {
+                "spawnpoint": spawnid,
+                "latitude": lat,
+                "longitude": lng,
+                "spawndef": new_spawndef,
+                "eventid": event_id,
+                "first_detection": received_time,
+                "last_scanned": None,
+                "last_non_scanned": None,
+                "calc_endminsec": None
+            }
+            # TODO: This may break another known timer...
+            if 0 <= int(despawntime) <= 90000:
+                fulldate = received_time + timedelta(milliseconds=despawntime)
+                spawn["earliest_unseen"] = int(despawntime)
+                spawn["last_scanned"] = received_time
+                spawn["calc_endminsec"] = fulldate.strftime("%M:%S")
+            else:
+                spawn["earliest_unseen"] = 99999999
+                spawn["last_non_scanned"] = now
+            spawns.append(spawn)
+        await TrsSpawnHelper.upsert_many(session, spawns, event_id, minpos)
 
     async def stops(self, session: AsyncSession, map_proto: dict):
         """
@@ -617,15 +643,21 @@ class DbPogoProtoSubmit:
         if cells is None:
             return False
 
-        for cell in cells:
-            cell_id = cell["id"]
-            cell_cache_key: str = f"stops_{cell_id}"
-            if await self._cache.exists(cell_cache_key):
+        cells_cached: Set[str] = await self._dedup_cache.get_cached("stops_cell",
+                                                                    [f"stops_{cell['id']}" for cell in cells])
+        cells_to_process: List[Dict] = [cell for cell in cells if f"stops_{cell['id']}" not in cells_cached]
+        stops: Dict[str, Dict] = {self.__get_pokestop_cache_key(fort): fort
+                                  for cell in cells_to_process for fort in cell["forts"] if fort["type"] == 1}
+        stops_cached: Set[str] = await self._dedup_cache.get_cached("stop", stops.keys())
+        cache_keys_to_set: Dict[str, int] = {}
+        for cache_key, fort in stops.items():
+            if cache_key in stops_cached:
                 continue
-            for fort in cell["forts"]:
-                if fort["type"] == 1:
-                    await self._handle_pokestop_data(session, fort)
-            await self._cache.set(cell_cache_key, 1, ex=REDIS_CACHETIME_CELLS)
+            if await self._handle_pokestop_data(session, fort):
+                cache_keys_to_set[cache_key] = REDIS_CACHETIME_POKESTOP_DATA
+        for cell in cells_to_process:
+            cache_keys_to_set[f"stops_{cell['id']}"] = REDIS_CACHETIME_CELLS
+        await self._dedup_cache.set_many(cache_keys_to_set)
         return True
 
     async def stop_details(self, session: AsyncSession, stop_proto: dict):
@@ -646,13 +678,14 @@ class DbPogoProtoSubmit:
             if not last_modified:
                 last_modified = int(math.ceil(DatetimeWrapper.now().timestamp() / 1000)) * 1000
             cache_key = "stopdetail{}{}".format(stop.pokestop_id, last_modified)
-            if await self._cache.exists(cache_key):
+            if await self._dedup_cache.is_cached("stop_details", cache_key):
                 return True
             async with session.begin_nested() as nested_transaction:
                 try:
                     session.add(stop)
                     await nested_transaction.commit()
-                    await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_STOP_DETAILS)
+                    self._record_webhook_event(session, "pokestop", stop.pokestop_id)
+                    await self._dedup_cache.set(cache_key, REDIS_CACHETIME_STOP_DETAILS)
                 except sqlalchemy.exc.IntegrityError as e:
                     logger.warning("Failed committing stop details of {} ({})", stop.pokestop_id, str(e))
                     await nested_transaction.rollback()
@@ -741,6 +774,7 @@ class DbPogoProtoSubmit:
             try:
                 session.add(quest)
                 await nested_transaction.commit()
+                self._record_webhook_event(session, "quest", fort_id)
             except sqlalchemy.exc.IntegrityError as e:
                 logger.warning("Failed committing quest of stop {}, ({})", fort_id, str(e))
                 await nested_transaction.rollback()
@@ -755,72 +789,80 @@ class DbPogoProtoSubmit:
         if cells is None:
             return False
         time_receiver: datetime = DatetimeWrapper.fromtimestamp(received_timestamp)
-        for cell in cells:
-            cell_id = cell["id"]
-            cell_cache_key: str = f"gyms_{cell_id}"
-            if await self._cache.exists(cell_cache_key):
-                continue
+        cells_cached: Set[str] = await self._dedup_cache.get_cached("gyms_cell",
+                                                                    [f"gyms_{cell['id']}" for cell in cells])
+        cells_to_process: List[Dict] = [cell for cell in cells if f"gyms_{cell['id']}" not in cells_cached]
+        gyms: List[Tuple[str, int, Dict]] = []
+        for cell in cells_to_process:
             for gym in cell["forts"]:
                 if gym["type"] == 0:
-                    gymid = gym["id"]
-                    last_modified_ts = gym["last_modified_timestamp_ms"] / 1000
-                    last_modified = DatetimeWrapper.fromtimestamp(
-                        last_modified_ts)
-                    latitude = gym["latitude"]
-                    longitude = gym["longitude"]
-                    s2_cell_id = S2Helper.lat_lng_to_cell_id(latitude, longitude)
+                    s2_cell_id = S2Helper.lat_lng_to_cell_id(gym["latitude"], gym["longitude"])
                     weather: Optional[Weather] = await WeatherHelper.get(session, str(s2_cell_id))
                     gameplay_weather: int = weather.gameplay_weather if weather is not None else 0
-                    cache_key = "gym{}{}{}".format(gymid, last_modified_ts, gameplay_weather)
-                    if await self._cache.exists(cache_key):
-                        continue
-                    guard_pokemon_id = gym["gym_details"]["guard_pokemon"]
-                    team_id = gym["gym_details"]["owned_by_team"]
-                    slots_available = gym["gym_details"]["slots_available"]
-                    is_ex_raid_eligible = gym["gym_details"]["is_ex_raid_eligible"]
-                    is_ar_scan_eligible = gym["is_ar_scan_eligible"]
-                    is_in_battle = gym['gym_details']['is_in_battle']
-                    is_enabled = gym.get('enabled', 1)
-
-                    gym_obj: Optional[Gym] = await GymHelper.get(session, gymid)
-                    if not gym_obj:
-                        gym_obj: Gym = Gym()
-                        gym_obj.gym_id = gymid
-                    gym_obj.team_id = team_id
-                    gym_obj.guard_pokemon_id = guard_pokemon_id
-                    gym_obj.slots_available = slots_available
-                    gym_obj.enabled = is_enabled
-                    gym_obj.latitude = latitude
-                    gym_obj.longitude = longitude
-                    gym_obj.total_cp = gym.get("gym_display", {}).get("total_gym_cp", 0)
-                    gym_obj.is_in_battle = is_in_battle
-                    gym_obj.last_modified = last_modified
-                    gym_obj.last_scanned = time_receiver
-                    gym_obj.is_ex_raid_eligible = is_ex_raid_eligible
-                    gym_obj.is_ar_scan_eligible = is_ar_scan_eligible
-                    gym_obj.weather_boosted_condition = gameplay_weather
-
-                    gym_detail: Optional[GymDetail] = await GymDetailHelper.get(session, gymid)
-                    if not gym_detail:
-                        gym_detail: GymDetail = GymDetail()
-                        gym_detail.gym_id = gymid
-                        gym_detail.name = "unknown"
-                        gym_detail.url = ""
-                    gym_url = gym.get("image_url", "")
-                    if gym_url and gym_url.strip():
-                        gym_detail.url = gym_url.strip()
-                    gym_detail.last_scanned = time_receiver
-                    async with session.begin_nested() as nested_transaction:
-                        try:
-                            session.add(gym_obj)
-                            session.add(gym_detail)
-                            await nested_transaction.commit()
-                            await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_GYMS)
-                        except sqlalchemy.exc.IntegrityError as e:
-                            logger.warning("Failed committing gym data of {} ({})", gymid, str(e))
-                            await nested_transaction.rollback()
-            # done processing cell
-            await self._cache.set(cell_cache_key, 1, ex=REDIS_CACHETIME_CELLS)
+                    cache_key = "gym{}{}{}".format(gym["id"], gym["last_modified_timestamp_ms"] / 1000,
+                                                   gameplay_weather)
+                    gyms.append((cache_key, gameplay_weather, gym))
+        gyms_cached: Set[str] = await self._dedup_cache.get_cached("gym", [cache_key for cache_key, _, _ in gyms])
+        cache_keys_to_set: Dict[str, int] = {}
+        for cache_key, gameplay_weather, gym in gyms:
+            if cache_key in gyms_cached:
+                continue
+            gymid = gym["id"]
+            last_modified_ts = gym["last_modified_timestamp_ms"] / 1000
+            last_modified = DatetimeWrapper.fromtimestamp(
+                last_modified_ts)
+            latitude = gym["latitude"]
+            longitude = gym["longitude"]
+            guard_pokemon_id = gym["gym_details"]["guard_pokemon"]
+            team_id = gym["gym_details"]["owned_by_team"]
+            slots_available = gym["gym_details"]["slots_available"]
+            is_ex_raid_eligible = gym["gym_details"]["is_ex_raid_eligible"]
+            is_ar_scan_eligible = gym["is_ar_scan_eligible"]
+            is_in_battle = gym['gym_details']['is_in_battle']
+            is_enabled = gym.get('enabled', 1)
+
+            gym_obj: Optional[Gym] = await GymHelper.get(session, gymid)
+            if not gym_obj:
+                gym_obj: Gym = Gym()
+                gym_obj.gym_id = gymid
+            gym_obj.team_id = team_id
+            gym_obj.guard_pokemon_id = guard_pokemon_id
+            gym_obj.slots_available = slots_available
+            gym_obj.enabled = is_enabled
+            gym_obj.latitude = latitude
+            gym_obj.longitude = longitude
+            gym_obj.total_cp = gym.get("gym_display", {}).get("total_gym_cp", 0)
+            gym_obj.is_in_battle = is_in_battle
+            gym_obj.last_modified = last_modified
+            gym_obj.last_scanned = time_receiver
+            gym_obj.is_ex_raid_eligible = is_ex_raid_eligible
+            gym_obj.is_ar_scan_eligible = is_ar_scan_eligible
+            gym_obj.weather_boosted_condition = gameplay_weather
+
+            gym_detail: Optional[GymDetail] = await GymDetailHelper.get(session, gymid)
+            if not gym_detail:
+                gym_detail: GymDetail = GymDetail()
+                gym_detail.gym_id = gymid
+                gym_detail.name = "unknown"
+                gym_detail.url = ""
+            gym_url = gym.get("image_url", "")
+            if gym_url and gym_url.strip():
+                gym_detail.url = gym_url.strip()
+            gym_detail.last_scanned = time_receiver
+            async with session.begin_nested() as nested_transaction:
+                try:
+                    session.add(gym_obj)
+                    session.add(gym_detail)
+                    await nested_transaction.commit()
+                    self._record_webhook_event(session, "gym", gymid)
+                    cache_keys_to_set[cache_key] = REDIS_CACHETIME_GYMS
+                except sqlalchemy.exc.IntegrityError as e:
+                    logger.warning("Failed committing gym data of {} ({})", gymid, str(e))
+                    await nested_transaction.rollback()
+        # done processing cells
+        for cell in cells_to_process:
+            cache_keys_to_set[f"gyms_{cell['id']}"] = REDIS_CACHETIME_CELLS
+        await self._dedup_cache.set_many(cache_keys_to_set)
         return True
 
     async def gym(self, session: AsyncSession, map_proto: dict):
@@ -859,6 +901,7 @@ class DbPogoProtoSubmit:
                 try:
                     session.add(gym_detail)
                     await nested_transaction.commit()
+                    self._record_webhook_event(session, "gym", gym_id)
                 except sqlalchemy.exc.IntegrityError as e:
                     logger.warning("Failed committing gym info {} ({})", gym_id, str(e))
                     await nested_transaction.rollback()
@@ -876,6 +919,10 @@ class DbPogoProtoSubmit:
             return False
         raids_seen: int = 0
         received_at: datetime = DatetimeWrapper.fromtimestamp(timestamp)
+        cached: Set[str] = await self._dedup_cache.get_cached(
+            "raid", [self.__get_raid_cache_key(gym) for cell in cells for gym in cell["forts"]
+                     if gym["type"] == 0 and gym["gym_details"]["has_raid"]])
+        cache_keys_to_set: Dict[str, int] = {}
         for cell in cells:
             for gym in cell["forts"]:
                 if gym["type"] == 0 and gym["gym_details"]["has_raid"]:
@@ -918,8 +965,8 @@ class DbPogoProtoSubmit:
                     logger.debug3("Adding/Updating gym {} with level {} ending at {}", gymid, level,
                                   raidend_date.strftime("%Y-%m-%d %H:%M:%S"))
 
-                    cache_key = "raid{}{}{}".format(gymid, pokemon_id, raid_end_sec)
-                    if await self._cache.exists(cache_key):
+                    cache_key = self.__get_raid_cache_key(gym)
+                    if cache_key in cached:
                         continue
 
                     raid: Optional[Raid] = await RaidHelper.get(session, gymid)
@@ -946,13 +993,21 @@ class DbPogoProtoSubmit:
                         try:
                             session.add(raid)
                             await nested_transaction.commit()
-                            await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_RAIDS)
+                            self._record_webhook_event(session, "raid", gymid)
+                            cache_keys_to_set[cache_key] = REDIS_CACHETIME_RAIDS
                         except sqlalchemy.exc.IntegrityError as e:
                             logger.warning("Failed committing raid for gym {} ({})", gymid, str(e))
                             await nested_transaction.rollback()
+        await self._dedup_cache.set_many(cache_keys_to_set)
         logger.debug3("DbPogoProtoSubmit::raids: Done submitting raids with data received")
         return raids_seen
 
+    @staticmethod
+    def __get_raid_cache_key(gym: Dict) -> str:
+        raid_info = gym["gym_details"]["raid_info"]
+        pokemon_id = raid_info["raid_pokemon"]["id"] if raid_info["has_pokemon"] else None
+        return "raid{}{}{}".format(gym["id"], pokemon_id, int(raid_info["raid_end"] / 1000))
+
     async def routes(self, session: AsyncSession, routes_proto: Dict,
                      timestamp_received: int) -> None:
         logger.debug3("DbPogoProtoSubmit::routes called with data received")
@@ -968,20 +1023,28 @@ class DbPogoProtoSubmit:
             logger.warning("No cells to process in routes proto")
             return
 
+        cached: Set[str] = await self._dedup_cache.get_cached(
+            "route", ["route{}".format(route.get("id")) for cell in cells for route in cell.get("route", [])])
+        cache_keys_to_set: Dict[str, int] = {}
         for cell in cells:
             s2_cell_id: int = cell.get("s2_cell_id")
             routes: List[Dict] = cell.get("route", [])
             if not routes:
                 continue
             for route in routes:
-                await self._handle_route_cell(session, s2_cell_id, route, timestamp_received)
+                cache_key = "route{}".format(route.get("id"))
+                if cache_key in cached:
+                    continue
+                if await self._handle_route_cell(session, s2_cell_id, route, timestamp_received):
+                    cache_keys_to_set[cache_key] = REDIS_CACHETIME_ROUTE
+        await self._dedup_cache.set_many(cache_keys_to_set)
 
     async def _handle_route_cell(self, session: AsyncSession, s2_cell_id: int, route_data: Dict,
-                                 timestamp_received: int) -> None:
+                                 timestamp_received: int) -> bool:
+        """
+        Returns: True if the route has been submitted successfully
+        """
         route_id: str = route_data.get("id")
-        cache_key = "route{}".format(route_id)
-        if await self._cache.exists(cache_key):
-            return
         date_received: datetime = DatetimeWrapper.fromtimestamp(timestamp_received)
         async with session.begin_nested() as nested_transaction:
             try:
@@ -1038,11 +1101,12 @@ class DbPogoProtoSubmit:
                 route.last_updated = date_received
 
                 session.add(route)
-                await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_ROUTE)
                 await nested_transaction.commit()
+                return True
             except sqlalchemy.exc.IntegrityError as e:
                 logger.warning("Failed committing route {} of cell {} ({})", route_id, s2_cell_id, str(e))
                 await nested_transaction.rollback()
+        return False
 
     async def weather(self, session: AsyncSession, map_proto, received_timestamp) -> bool:
         """
@@ -1053,29 +1117,60 @@ class DbPogoProtoSubmit:
         if cells is None:
             return False
 
+        client_weathers: Dict[str, Dict] = {}
         for client_weather in map_proto["client_weather"]:
-            time_of_day = map_proto.get("time_of_day_value", 0)
-            await self._handle_weather_data(session, client_weather, time_of_day, received_timestamp)
+            cache_key: Optional[str] = self.__get_weather_cache_key(client_weather)
+            if cache_key:
+                client_weathers[cache_key] = client_weather
+        cached: Set[str] = await self._dedup_cache.get_cached("weather", client_weathers.keys())
+        cache_keys_to_set: Dict[str, int] = {}
+        time_of_day = map_proto.get("time_of_day_value", 0)
+        for cache_key, client_weather in client_weathers.items():
+            if cache_key in cached:
+                continue
+            if await self._handle_weather_data(session, client_weather, time_of_day, received_timestamp):
+                cache_keys_to_set[cache_key] = REDIS_CACHETIME_WEATHER
+        await self._dedup_cache.set_many(cache_keys_to_set)
         return True
 
+    @staticmethod
+    def __get_weather_cache_key(client_weather_data: Dict) -> Optional[str]:
+        """
+        Returns: The cache key of the weather or None if no weather is being displayed
+        """
+        display_weather_data = client_weather_data.get("display_weather", None)
+        if display_weather_data is None:
+            return None
+        return "weather{}{}{}{}{}{}{}".format(client_weather_data["cell_id"],
+                                              display_weather_data.get("rain_level", 0),
+                                              display_weather_data.get("wind_level", 0),
+                                              display_weather_data.get("snow_level", 0),
+                                              display_weather_data.get("fog_level", 0),
+                                              display_weather_data.get("wind_direction", 0),
+                                              client_weather_data["gameplay_weather"]["gameplay_condition"])
+
     async def cells(self, session: AsyncSession, map_proto: dict):
         protocells = map_proto.get("cells", [])
-
+        cells: Dict[str, Dict] = {}
         for cell in protocells:
             cell_id = cell["id"]
-
             if cell_id < 0:
                 cell_id = cell_id + 2 ** 64
-            cell_cache_key = "s2cell{}".format(cell_id)
-            if await self._cache.exists(cell_cache_key):
-                continue
-            await self._cache.set(cell_cache_key, 1, ex=REDIS_CACHETIME_CELLS)
-            logger.debug3("Updating s2cell {}", cell_id)
+            cells["s2cell{}".format(cell_id)] = cell
+        cached: Set[str] = await self._dedup_cache.get_cached("s2cell", cells.keys())
+        cells_to_process: Dict[str, Dict] = {cell_cache_key: cell for cell_cache_key, cell in cells.items()
+                                             if cell_cache_key not in cached}
+        await self._dedup_cache.set_many({cell_cache_key: REDIS_CACHETIME_CELLS
+                                          for cell_cache_key in cells_to_process.keys()})
+        failed_cells: Dict[str, int] = {}
+        for cell_cache_key, cell in cells_to_process.items():
+            logger.debug3("Updating s2cell {}", cell["id"])
             try:
                 await TrsS2CellHelper.insert_update_cell(session, cell)
             except sqlalchemy.exc.IntegrityError as e:
-                logger.debug("Failed committing cell {} ({})", cell_id, str(e))
-                await self._cache.set(cell_cache_key, 1, ex=1)
+                logger.debug("Failed committing cell {} ({})", cell["id"], str(e))
+                failed_cells[cell_cache_key] = 1
+        await self._dedup_cache.set_many(failed_cells)
 
     async def _handle_single_incident(self, session: AsyncSession,
                                       stop_id: str,
@@ -1131,21 +1226,24 @@ class DbPogoProtoSubmit:
             for incident in incident_displays:
                 await self._handle_single_incident(session, stop_id, incident)
 
-    async def _handle_pokestop_data(self, session: AsyncSession,
-                                    stop_data: Dict) -> Optional[Pokestop]:
-        if stop_data["type"] != 1:
-            logger.info("{} is not a pokestop", stop_data)
-            return
-
+    @staticmethod
+    def __get_pokestop_cache_key(stop_data: Dict) -> str:
         # We can detect changes of the incidents by simply appending all incident IDs sent in the proto I guess...
-        stop_id: str = stop_data["id"]
         last_modified_timestamp: int = stop_data.get("last_modified_timestamp_ms")
         if not last_modified_timestamp:
             last_modified_timestamp = int(math.ceil(DatetimeWrapper.now().timestamp() / 1000)) * 1000
-        cache_key = "stop{}{}".format(stop_id, last_modified_timestamp)
-        if await self._cache.exists(cache_key):
-            return
+        return "stop{}{}".format(stop_data["id"], last_modified_timestamp)
+
+    async def _handle_pokestop_data(self, session: AsyncSession,
+                                    stop_data: Dict) -> bool:
+        """
+        Returns: True if the stop has been submitted successfully
+        """
+        if stop_data["type"] != 1:
+            logger.info("{} is not a pokestop", stop_data)
+            return False
 
+        submitted: bool = False
         now = DatetimeWrapper.fromtimestamp(time.time())
         last_modified: datetime = DatetimeWrapper.fromtimestamp(
             stop_data["last_modified_timestamp_ms"] / 1000
@@ -1184,11 +1282,13 @@ class DbPogoProtoSubmit:
             try:
                 session.add(pokestop)
                 await nested_transaction.commit()
-                await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_POKESTOP_DATA)
+                self._record_webhook_event(session, "pokestop", stop_id)
+                submitted = True
             except sqlalchemy.exc.IntegrityError as e:
                 logger.warning("Failed committing stop {} ({})", stop_id, str(e))
                 await session.rollback()
         await self._handle_pokestop_incident_data(session, stop_id, stop_data)
+        return submitted
 
     async def _extract_args_single_stop_details(self, session: AsyncSession, stop_data) -> Optional[Pokestop]:
         if stop_data.get("type", 999) != 1:
@@ -1215,23 +1315,18 @@ class DbPogoProtoSubmit:
         return pokestop
 
     async def _handle_weather_data(self, session: AsyncSession, client_weather_data, time_of_day,
-                                   received_timestamp) -> None:
+                                   received_timestamp) -> bool:
+        """
+        Returns: True if the weather has been submitted successfully
+        """
         cell_id = client_weather_data["cell_id"]
         real_lat, real_lng = S2Helper.middle_of_cell(cell_id)
 
         display_weather_data = client_weather_data.get("display_weather", None)
         if display_weather_data is None:
-            return
+            return False
         else:
             gameplay_weather = client_weather_data["gameplay_weather"]["gameplay_condition"]
-        cache_key = "weather{}{}{}{}{}{}{}".format(cell_id, display_weather_data.get("rain_level", 0),
-                                                   display_weather_data.get("wind_level", 0),
-                                                   display_weather_data.get("snow_level", 0),
-                                                   display_weather_data.get("fog_level", 0),
-                                                   display_weather_data.get("wind_direction", 0),
-                                                   gameplay_weather)
-        if await self._cache.exists(cache_key):
-            return
         date_received = DatetimeWrapper.fromtimestamp(received_timestamp)
         async with session.begin_nested() as nested_transaction:
             try:
@@ -1255,25 +1350,16 @@ class DbPogoProtoSubmit:
                 weather.last_updated = date_received
 
                 if not weather:
-                    return
+                    return False
 
                 session.add(weather)
-                await self._cache.set(cache_key, 1, ex=REDIS_CACHETIME_WEATHER)
                 await nested_transaction.commit()
+                self._record_webhook_event(session, "weather", str(cell_id))
+                return True
             except sqlalchemy.exc.IntegrityError as e:
                 logger.warning("Failed committing weather of cell {} ({})", cell_id, str(e))
                 await nested_transaction.rollback()
-
-    async def _get_spawndef(self, session: AsyncSession, spawn_ids: List[int]) -> Dict[int, TrsSpawn]:
-        if not spawn_ids:
-            return {}
-        logger.debug3("DbPogoProtoSubmit::_get_spawndef called")
-
-        spawnret = {}
-        res: List[TrsSpawn] = await TrsSpawnHelper.get_all(session, spawn_ids)
-        for spawn in res:
-            spawnret[int(spawn.spawnpoint)] = spawn
-        return spawnret
+        return False
 
     def _get_current_spawndef_pos(self):
         minute_value = int(DatetimeWrapper.now().strftime("%M"))
@@ -1,5 +1,5 @@
 import json
-from typing import Tuple, List, Dict, Optional, Set, Any
+from typing import Tuple, List, Dict, Optional, Set, Any, Collection
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -24,9 +24,17 @@ class DbWebhookReader:
         # TODO: Consider geofences?
         raids_changed: List[Tuple[Raid, GymDetail, Gym]] = await RaidHelper.get_raids_changed_since(session,
                                                                                                     _timestamp=_timestamp)
+        return DbWebhookReader.__transform_raids(raids_changed)
 
+    @staticmethod
+    async def get_raids_of_gyms(session: AsyncSession, gym_ids: Collection[str]):
+        logger.debug2("DbWebhookReader::get_raids_of_gyms called")
+        return DbWebhookReader.__transform_raids(await RaidHelper.get_raids_of_gyms(session, gym_ids))
+
+    @staticmethod
+    def __transform_raids(raids: List[Tuple[Raid, GymDetail, Gym]]):
         ret = []
-        for (raid, gym_detail, gym) in raids_changed:
+        for (raid, gym_detail, gym) in raids:
             ret.append({
                 "gym_id": raid.gym_id,
                 "level": raid.level,
@@ -57,9 +65,17 @@ class DbWebhookReader:
     async def get_weather_changed_since(session: AsyncSession, _timestamp: int):
         logger.debug2("DbWebhookReader::get_weather_changed_since called")
         weather_changed: List[Weather] = await WeatherHelper.get_changed_since(session, _timestamp=_timestamp)
+        return DbWebhookReader.__transform_weather(weather_changed)
+
+    @staticmethod
+    async def get_weather_of_cells(session: AsyncSession, s2_cell_ids: Collection[str]):
+        logger.debug2("DbWebhookReader::get_weather_of_cells called")
+        return DbWebhookReader.__transform_weather(await WeatherHelper.get_of_cells(session, s2_cell_ids))
 
+    @staticmethod
+    def __transform_weather(weather_entries: List[Weather]):
         ret = []
-        for weather in weather_changed:
+        for weather in weather_entries:
             ret.append({
                 "s2_cell_id": weather.s2_cell_id,
                 "latitude": weather.latitude,
@@ -86,13 +102,29 @@ class DbWebhookReader:
             session, timestamp=_timestamp)
         return quests_with_changes
 
+    @staticmethod
+    async def get_quests_of_stops(session: AsyncSession, pokestop_ids: Collection[str]) \
+            -> Dict[int, Tuple[Pokestop, Dict[int, TrsQuest]]]:
+        logger.debug2("DbWebhookReader::get_quests_of_stops called")
+        if not pokestop_ids:
+            return {}
+        return await PokestopHelper.get_with_quests(session, pokestop_ids=pokestop_ids)
+
     @staticmethod
     async def get_gyms_changed_since(session: AsyncSession, _timestamp: int):
         logger.debug2("DbWebhookReader::get_gyms_changed_since called")
         gyms_changed: List[Tuple[Gym, GymDetail]] = await GymHelper.get_changed_since(session, _timestamp)
+        return DbWebhookReader.__transform_gyms(gyms_changed)
+
+    @staticmethod
+    async def get_gyms(session: AsyncSession, gym_ids: Collection[str]):
+        logger.debug2("DbWebhookReader::get_gyms called")
+        return DbWebhookReader.__transform_gyms(await GymHelper.get_with_details(session, gym_ids))
 
+    @staticmethod
+    def __transform_gyms(gyms: List[Tuple[Gym, GymDetail]]):
         ret = []
-        for (gym, gym_detail) in gyms_changed:
+        for (gym, gym_detail) in gyms:
             ret.append({
                 "gym_id": gym.gym_id,
                 "team_id": gym.team_id,
@@ -118,8 +150,18 @@ class DbWebhookReader:
         logger.debug2("DbWebhookReader::get_stops_changed_since called")
         stops_with_changes: Dict[Pokestop, List[PokestopIncident]] = await PokestopHelper\
             .get_changed_since_or_incidents(session, _timestamp)
+        return DbWebhookReader.__transform_stops(stops_with_changes)
+
+    @staticmethod
+    async def get_stops(session: AsyncSession, pokestop_ids: Collection[str]) -> List[Dict[str, Any]]:
+        logger.debug2("DbWebhookReader::get_stops called")
+        return DbWebhookReader.__transform_stops(await PokestopHelper.get_with_lure_or_incidents(session,
+                                                                                                 pokestop_ids))
+
+    @staticmethod
+    def __transform_stops(stops: Dict[Pokestop, List[PokestopIncident]]) -> List[Dict[str, Any]]:
         ret: List[Dict[str, Any]] = []
-        for stop, incidents in stops_with_changes.items():
+        for stop, incidents in stops.items():
             stop_entry: Dict[str, Any] = {
                 'pokestop_id': stop.pokestop_id,
                 'latitude': stop.latitude,
@@ -156,8 +198,19 @@ class DbWebhookReader:
             session,
             _timestamp,
             mon_types)
+        return DbWebhookReader.__transform_mons(mons_with_changes)
+
+    @staticmethod
+    async def get_mons(session: AsyncSession, encounter_ids: Collection[int],
+                       mon_types: Optional[Set[MonSeenTypes]] = None):
+        logger.debug2("DbWebhookReader::get_mons called")
+        return DbWebhookReader.__transform_mons(await PokemonHelper.get_by_encounter_ids(session, encounter_ids,
+                                                                                         mon_types))
+
+    @staticmethod
+    def __transform_mons(mons: List[Tuple[Pokemon, TrsSpawn, Optional[Pokestop], Optional[PokemonDisplay]]]):
         ret = []
-        for (mon, spawn, stop, mon_display) in mons_with_changes:
+        for (mon, spawn, stop, mon_display) in mons:
             if mon.latitude == 0 and mon.seen_type == MonSeenTypes.lure_encounter.value:
                 continue
             ret.append({
@@ -0,0 +1,115 @@
+import time
+from collections import defaultdict
+from typing import Collection, Dict, List, Optional, Set
+
+from cachetools import TLRUCache
+from redis.asyncio import Redis
+
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.database)
+
+
+class DedupCache:
+    """
+    Cache of the entities already submitted to the DB in order to not write the same data over and over again.
+    All keys of a proto are to be checked with a single call of get_cached (one MGET) and written back with a single
+    call of set_many (one pipeline) rather than checking and setting each key on its own.
+    An optional in-process tier holds keys until their expiration to avoid asking Redis for hot keys at all.
+    The keys stored in Redis hold the unix timestamp of their expiration, keys written by others (with a value of 1) are
+    considered cached as well but are not placed in the in-process tier.
+    """
+    STATS_LOG_INTERVAL = 300
+
+    def __init__(self, cache: Redis, local_cache_size: int = 0):
+        self._cache: Redis = cache
+        self._local_cache: Optional[TLRUCache] = None
+        if local_cache_size > 0:
+            self._local_cache = TLRUCache(maxsize=local_cache_size, ttu=lambda _key, expiration, _now: expiration,
+                                          timer=time.time)
+        # entity -> [local hits, redis hits, misses]
+        self._stats: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+        self._last_stats_logged: float = time.time()
+
+    async def get_cached(self, entity: str, keys: Collection[str]) -> Set[str]:
+        """
+        Args:
+            entity: Name of the type of entity the keys belong to, used for the hit/miss counters only
+            keys: The keys to check
+
+        Returns: The subset of the keys passed which are cached already
+        """
+        if not keys:
+            return set()
+        cached: Set[str] = set()
+        to_check: List[str] = []
+        for key in keys:
+            if self._local_cache is not None and key in self._local_cache:
+                cached.add(key)
+            else:
+                to_check.append(key)
+        stats = self._stats[entity]
+        stats[0] += len(cached)
+        if to_check:
+            values = await self._cache.mget(to_check)
+            for key, value in zip(to_check, values):
+                if value is None:
+                    stats[2] += 1
+                    continue
+                stats[1] += 1
+                cached.add(key)
+                self.__set_local(key, value)
+        self.__maybe_log_stats()
+        return cached
+
+    async def is_cached(self, entity: str, key: str) -> bool:
+        return key in await self.get_cached(entity, [key])
+
+    async def set_many(self, keys_with_ttl: Dict[str, int]) -> None:
+        """
+        Marks the keys as cached for the given amount of seconds. Keys with a TTL below 1 are ignored.
+        """
+        if not keys_with_ttl:
+            return
+        now: int = int(time.time())
+        async with self._cache.pipeline(transaction=False) as pipe:
+            for key, ttl in keys_with_ttl.items():
+                if ttl <= 0:
+                    continue
+                expiration: int = now + ttl
+                pipe.set(key, expiration, ex=ttl)
+                self.__set_local(key, expiration)
+            await pipe.execute()
+
+    async def set(self, key: str, ttl: int) -> None:
+        await self.set_many({key: ttl})
+
+    def __set_local(self, key: str, expiration) -> None:
+        if self._local_cache is None:
+            return
+        try:
+            expiration = int(expiration)
+        except (TypeError, ValueError):
+            return
+        if expiration <= 1:
+            # Set by others without an expiration timestamp
+            self._local_cache.pop(key, None)
+            return
+        self._local_cache[key] = expiration
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns: Per entity count of hits in the in-process cache, hits in Redis and misses
+        """
+        return {entity: {"local_hits": local_hits, "redis_hits": redis_hits, "misses": misses}
+                for entity, (local_hits, redis_hits, misses) in self._stats.items()}
+
+    def __maybe_log_stats(self) -> None:
+        if time.time() - self._last_stats_logged < self.STATS_LOG_INTERVAL:
+            return
+        self._last_stats_logged = time.time()
+        for entity, stats in sorted(self.get_stats().items()):
+            total: int = sum(stats.values())
+            logger.debug("Dedup cache {}: {} local hits, {} redis hits, {} misses ({:.1f}% hit rate)",
+                         entity, stats["local_hits"], stats["redis_hits"], stats["misses"],
+                         100 * (stats["local_hits"] + stats["redis_hits"]) / total if total else 0)
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Collection, Dict, List, Optional, Tuple
 
 from sqlalchemy import and_, case, func
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -95,3 +95,13 @@ class GymHelper:
         # TODO: Consider last_scanned above
         result = await session.execute(stmt)
         return result.all()
+
+    @staticmethod
+    async def get_with_details(session: AsyncSession, gym_ids: Collection[str]) -> List[Tuple[Gym, GymDetail]]:
+        if not gym_ids:
+            return []
+        stmt = select(Gym, GymDetail) \
+            .join(GymDetail, GymDetail.gym_id == Gym.gym_id, isouter=False) \
+            .where(Gym.gym_id.in_(gym_ids))
+        result = await session.execute(stmt)
+        return result.all()
@@ -1,9 +1,11 @@
 import datetime
 import time
 from functools import reduce
-from typing import Dict, List, Optional, Set, Tuple
+from itertools import compress
+from typing import Collection, Dict, List, Optional, Set, Tuple
 
 from sqlalchemy import Result, and_, delete, desc, func, text
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -26,6 +28,33 @@ class PokemonHelper:
         result = await session.execute(stmt)
         return result.scalars().first()
 
+    @staticmethod
+    async def upsert_wild(session: AsyncSession, mons: List[Dict]) -> None:
+        """
+        Inserts or updates wild mons using a single multi-row statement.
+        Position and spawnpoint are only set for new entries. The seen_type of entries already encountered is kept.
+        Args:
+            session:
+            mons: List of dicts containing the column values of the mons (encounter_id, spawnpoint_id, latitude,
+             longitude, pokemon_id, gender, costume, form, disappear_time, weather_boosted_condition, last_modified)
+        """
+        if not mons:
+            return
+        insert_stmt = insert(Pokemon).values([{**mon, "seen_type": MonSeenTypes.wild.name} for mon in mons])
+        on_duplicate_key_stmt = insert_stmt.on_duplicate_key_update(
+            seen_type=func.IF(Pokemon.seen_type.in_([MonSeenTypes.encounter.name,
+                                                     MonSeenTypes.lure_encounter.name]),
+                              Pokemon.seen_type, insert_stmt.inserted.seen_type),
+            pokemon_id=insert_stmt.inserted.pokemon_id,
+            gender=insert_stmt.inserted.gender,
+            costume=insert_stmt.inserted.costume,
+            form=insert_stmt.inserted.form,
+            disappear_time=insert_stmt.inserted.disappear_time,
+            weather_boosted_condition=insert_stmt.inserted.weather_boosted_condition,
+            last_modified=insert_stmt.inserted.last_modified
+        )
+        await session.execute(on_duplicate_key_stmt)
+
     @staticmethod
     async def get_encountered(session: AsyncSession, geofence_helper: GeofenceHelper, latest: int = 0) \
             -> Tuple[int, Dict[int, int]]:
@@ -47,8 +76,10 @@ class PokemonHelper:
                                           ))
         result = await session.execute(stmt)
         encounter_id_infos: Dict[int, int] = {}
-        for pokemon in result.scalars().all():
-            if not geofence_helper.is_coord_inside_include_geofence([pokemon.latitude, pokemon.longitude]):
+        mons: List[Pokemon] = result.scalars().all()
+        inside = geofence_helper.contains([(pokemon.latitude, pokemon.longitude) for pokemon in mons])
+        for pokemon, pokemon_inside in zip(mons, inside):
+            if not pokemon_inside:
                 continue
             latest = max(latest, pokemon.last_modified.timestamp())
             # Add an hour to avoid encountering unknown disappear times again
@@ -91,19 +122,23 @@ class PokemonHelper:
                                      ).order_by(Pokemon.disappear_time)
         result = await session.execute(stmt)
 
-        next_to_encounter = []
+        candidates: List[Pokemon] = []
         for pokemon in result.scalars().all():
             if pokemon.pokemon_id not in eligible_mon_ids:
                 continue
             elif pokemon.latitude is None or pokemon.longitude is None:
                 logger.warning("lat or lng is none")
                 continue
-            elif geofence_helper and not geofence_helper.is_coord_inside_include_geofence(
-                    [pokemon.latitude, pokemon.longitude]):
+            candidates.append(pokemon)
+        if geofence_helper:
+            inside = geofence_helper.contains([(pokemon.latitude, pokemon.longitude) for pokemon in candidates])
+            for pokemon in compress(candidates, ~inside):
                 logger.debug3("Excluded encounter at {}, {} since the coordinate is not inside the given include "
                               " fences", pokemon.latitude, pokemon.longitude)
-                continue
+            candidates = list(compress(candidates, inside))
 
+        next_to_encounter = []
+        for pokemon in candidates:
             next_to_encounter.append((pokemon.pokemon_id, Location(float(pokemon.latitude), float(pokemon.longitude)),
                                       pokemon.encounter_id, pokemon.seen_type, pokemon.cell_id))
         # now filter by the order of eligible_mon_ids
@@ -297,6 +332,28 @@ class PokemonHelper:
                                 mon_types: Optional[Set[MonSeenTypes]] = None) -> List[Tuple[Pokemon, TrsSpawn,
     Optional[Pokestop],
     Optional[PokemonDisplay]]]:
+        stmt = PokemonHelper.__select_with_details(mon_types) \
+            .where(Pokemon.last_modified >= DatetimeWrapper.fromtimestamp(_timestamp))
+        result = await session.execute(stmt)
+        return result.all()
+
+    @staticmethod
+    async def get_by_encounter_ids(session: AsyncSession, encounter_ids: Collection[int],
+                                   mon_types: Optional[Set[MonSeenTypes]] = None) -> List[Tuple[Pokemon, TrsSpawn,
+    Optional[Pokestop],
+    Optional[PokemonDisplay]]]:
+        """
+        Same as get_changed_since for the mons of the encounter IDs given
+        """
+        if not encounter_ids:
+            return []
+        stmt = PokemonHelper.__select_with_details(mon_types) \
+            .where(Pokemon.encounter_id.in_(encounter_ids))
+        result = await session.execute(stmt)
+        return result.all()
+
+    @staticmethod
+    def __select_with_details(mon_types: Optional[Set[MonSeenTypes]]):
         if not mon_types:
             mon_types = {MonSeenTypes.encounter, MonSeenTypes.lure_encounter}
 
@@ -310,11 +367,7 @@ class PokemonHelper:
             stmt = select(Pokemon, TrsSpawn, None, PokemonDisplay) \
                 .join(TrsSpawn, TrsSpawn.spawnpoint == Pokemon.spawnpoint_id, isouter=True)
         stmt = stmt.join(PokemonDisplay, Pokemon.encounter_id == PokemonDisplay.encounter_id, isouter=True)
-        stmt = stmt.where(and_(Pokemon.last_modified >= DatetimeWrapper.fromtimestamp(_timestamp),
-                               Pokemon.seen_type.in_(raw_types)))
-
-        result = await session.execute(stmt)
-        return result.all()
+        return stmt.where(Pokemon.seen_type.in_(raw_types))
 
     @staticmethod
     async def delete_older_than_n_hours(session: AsyncSession, hours: int, limit: Optional[int]) -> None:
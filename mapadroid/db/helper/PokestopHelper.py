@@ -1,6 +1,6 @@
 from datetime import datetime
 from operator import or_
-from typing import Dict, List, Optional, Tuple
+from typing import Collection, Dict, List, Optional, Tuple
 
 from sqlalchemy import and_, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -84,10 +84,10 @@ class PokestopHelper:
                         Pokestop.latitude <= max_lat, Pokestop.longitude <= max_lon,
                         TrsVisited.origin == None))
         result = await session.execute(stmt)
-        unvisited: List[Pokestop] = []
-        for pokestop in result.scalars().all():
-            if geofence_helper.is_coord_inside_include_geofence([pokestop.latitude, pokestop.longitude]):
-                unvisited.append(pokestop)
+        pokestops: List[Pokestop] = result.scalars().all()
+        inside = geofence_helper.contains([(pokestop.latitude, pokestop.longitude) for pokestop in pokestops])
+        unvisited: List[Pokestop] = [pokestop for pokestop, pokestop_inside in zip(pokestops, inside)
+                                     if pokestop_inside]
         return unvisited
 
     @staticmethod
@@ -176,10 +176,9 @@ class PokestopHelper:
             if limit > 0:
                 stmt = stmt.limit(limit)
             result = await session.execute(stmt)
-            for stop, _distance in result.all():
-                if not geofence_helper.is_coord_inside_include_geofence([stop.latitude, stop.longitude]):
-                    continue
-                stops_retrieved.append(stop)
+            stops: List[Pokestop] = [stop for stop, _distance in result.all()]
+            inside = geofence_helper.contains([(stop.latitude, stop.longitude) for stop in stops])
+            stops_retrieved.extend(stop for stop, stop_inside in zip(stops, inside) if stop_inside)
 
             if len(stops_retrieved) == 0 or limit > 0 and len(stops_retrieved) <= limit:
                 logger.debug("No location found or not getting enough locations - increasing distance")
@@ -199,7 +198,8 @@ class PokestopHelper:
                               ne_corner: Optional[Location] = None, sw_corner: Optional[Location] = None,
                               old_ne_corner: Optional[Location] = None, old_sw_corner: Optional[Location] = None,
                               timestamp: Optional[int] = None,
-                              fence: Optional[Tuple[str, Optional[GeofenceHelper]]] = None) -> \
+                              fence: Optional[Tuple[str, Optional[GeofenceHelper]]] = None,
+                              pokestop_ids: Optional[Collection[str]] = None) -> \
             Dict[int, Tuple[Pokestop, Dict[int, TrsQuest]]]:
         """
         quests_from_db
@@ -211,6 +211,7 @@ class PokestopHelper:
             old_sw_corner:
             timestamp:
             fence:
+            pokestop_ids: Only consider the stops of the IDs given
 
         Returns:
 
@@ -250,6 +251,8 @@ class PokestopHelper:
                                          Pokestop.longitude <= old_ne_corner.lng))
         if timestamp:
             where_conditions.append(TrsQuest.quest_timestamp >= timestamp)
+        if pokestop_ids is not None:
+            where_conditions.append(Pokestop.pokestop_id.in_(pokestop_ids))
 
         if fence:
             fence_str, geofence_helper = fence
@@ -304,14 +307,16 @@ class PokestopHelper:
 
         stmt = stmt.where(and_(*where_conditions))
         result = await session.execute(stmt)
-        stops_without_quests: Dict[str, Pokestop] = {}
+        stops: List[Pokestop] = []
         for (stop, quest) in result.all():
             if quest and (quest.layer != quest_layer.value
                           or (without_quests and quest.quest_timestamp >= timezone_midnight.timestamp())
                           or (not without_quests and quest.quest_timestamp < timezone_midnight.timestamp())):
                 continue
-            if geofence_helper.is_coord_inside_include_geofence(Location(float(stop.latitude), float(stop.longitude))):
-                stops_without_quests[stop.pokestop_id] = stop
+            stops.append(stop)
+        inside = geofence_helper.contains([(stop.latitude, stop.longitude) for stop in stops])
+        stops_without_quests: Dict[str, Pokestop] = {stop.pokestop_id: stop
+                                                     for stop, stop_inside in zip(stops, inside) if stop_inside}
         return stops_without_quests
 
     @staticmethod
@@ -387,8 +392,38 @@ class PokestopHelper:
             )
         )
         result = await session.execute(stmt)
+        return PokestopHelper.__group_incidents(result.all())
+
+    @staticmethod
+    async def get_with_lure_or_incidents(session: AsyncSession, pokestop_ids: Collection[str]) \
+            -> Dict[Pokestop, List[PokestopIncident]]:
+        """
+        Same as get_changed_since_or_incidents for the stops of the IDs given
+        """
+        if not pokestop_ids:
+            return {}
+        now = DatetimeWrapper.now()
+        stmt = select(Pokestop, PokestopIncident) \
+            .join(PokestopIncident, Pokestop.pokestop_id == PokestopIncident.pokestop_id,
+                  isouter=True)
+        stmt = stmt.where(and_(
+            Pokestop.pokestop_id.in_(pokestop_ids),
+            or_(
+                Pokestop.lure_expiration > DatetimeWrapper.fromtimestamp(0),
+                and_(
+                    PokestopIncident.incident_expiration != None,
+                    PokestopIncident.incident_expiration > now
+                    )
+                )
+            )
+        )
+        result = await session.execute(stmt)
+        return PokestopHelper.__group_incidents(result.all())
+
+    @staticmethod
+    def __group_incidents(rows) -> Dict[Pokestop, List[PokestopIncident]]:
         stops_and_incidents: Dict[Pokestop, List[PokestopIncident]] = {}
-        for pokestop, incident in result.all():
+        for pokestop, incident in rows:
             if pokestop not in stops_and_incidents:
                 stops_and_incidents[pokestop] = []
             if not incident:
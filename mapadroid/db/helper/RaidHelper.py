@@ -1,5 +1,6 @@
 import datetime
-from typing import List, Optional, Tuple
+from itertools import compress
+from typing import Collection, List, Optional, Tuple
 
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -31,14 +32,12 @@ class RaidHelper:
         stmt = stmt.where(and_(*where_conditions))
         result = await session.execute(stmt)
         next_hatches: List[Tuple[int, Location]] = []
-        for (start, latitude, longitude) in result.all():
-            if latitude is None or longitude is None:
-                # logger.warning("lat or lng is none")
-                continue
-            elif geofence_helper and not geofence_helper.is_coord_inside_include_geofence([latitude, longitude]):
-                # logger.debug3("Excluded hatch at {}, {} since the coordinate is not inside the given include fences",
-                #              latitude, longitude)
-                continue
+        hatches = [(start, latitude, longitude) for (start, latitude, longitude) in result.all()
+                   if latitude is not None and longitude is not None]
+        if geofence_helper:
+            hatches = list(compress(hatches, geofence_helper.contains([(latitude, longitude)
+                                                                        for (_start, latitude, longitude) in hatches])))
+        for (start, latitude, longitude) in hatches:
             next_hatches.append((int(start.timestamp()), Location(float(latitude), float(longitude))))
 
         # logger.debug4("Latest Q: {}", data)
@@ -53,13 +52,25 @@ class RaidHelper:
             .join(Gym, Gym.gym_id == Raid.gym_id) \
             .where(Raid.last_scanned > DatetimeWrapper.fromtimestamp(_timestamp))
         result = await session.execute(stmt)
-        changed_data: List[Tuple[Raid, GymDetail, Gym]] = []
-        raw = result.all()
-        for (raid, gym_detail, gym) in raw:
-            if gym.latitude is None or gym.longitude is None:
-                continue
-            elif geofence_helper \
-                    and not geofence_helper.is_coord_inside_include_geofence([gym.latitude, gym.longitude]):
-                continue
-            changed_data.append((raid, gym_detail, gym))
+        changed_data: List[Tuple[Raid, GymDetail, Gym]] = [(raid, gym_detail, gym)
+                                                           for (raid, gym_detail, gym) in result.all()
+                                                           if gym.latitude is not None and gym.longitude is not None]
+        if geofence_helper:
+            changed_data = list(compress(changed_data,
+                                         geofence_helper.contains([(gym.latitude, gym.longitude)
+                                                                   for (_raid, _gym_detail, gym) in changed_data])))
         return changed_data
+
+    @staticmethod
+    async def get_raids_of_gyms(session: AsyncSession,
+                                gym_ids: Collection[str]) -> List[Tuple[Raid, GymDetail, Gym]]:
+        if not gym_ids:
+            return []
+        stmt = select(Raid, GymDetail, Gym) \
+            .select_from(Raid) \
+            .join(GymDetail, GymDetail.gym_id == Raid.gym_id) \
+            .join(Gym, Gym.gym_id == Raid.gym_id) \
+            .where(Raid.gym_id.in_(gym_ids))
+        result = await session.execute(stmt)
+        return [(raid, gym_detail, gym) for (raid, gym_detail, gym) in result.all()
+                if gym.latitude is not None and gym.longitude is not None]
@@ -1,12 +1,12 @@
 import asyncio
-import concurrent.futures
 import functools
 import time
 from datetime import datetime
 from typing import Collection, Dict, List, Optional, Tuple
 
 from _datetime import timedelta
-from sqlalchemy import and_, delete, func, not_, update
+from sqlalchemy import and_, delete, func, not_, or_, update
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -35,6 +35,57 @@ class TrsSpawnHelper:
         result = await session.execute(stmt)
         return result.scalars().all()
 
+    @staticmethod
+    async def get_calc_endminsec(session: AsyncSession, spawn_ids: Collection[int]) -> Dict[int, Optional[str]]:
+        """
+        Returns: Dict mapping the IDs of the spawnpoints known to their calculated despawn minute/second
+        """
+        if not spawn_ids:
+            return {}
+        stmt = select(TrsSpawn.spawnpoint, TrsSpawn.calc_endminsec).where(TrsSpawn.spawnpoint.in_(spawn_ids))
+        result = await session.execute(stmt)
+        return {int(spawnpoint): calc_endminsec for spawnpoint, calc_endminsec in result.all()}
+
+    @staticmethod
+    async def upsert_many(session: AsyncSession, spawns: List[Dict], event_id: int,
+                          minute_group_pos: Optional[int]) -> None:
+        """
+        Inserts or updates spawnpoints using a single multi-row statement.
+        earliest_unseen is only ever lowered, last_scanned, last_non_scanned and calc_endminsec are only updated if
+        a value is passed (not None). The minute group of the spawndef of known spawnpoints is updated in SQL if the
+        spawnpoint belongs to the event passed (or neither belong to the default event).
+        Args:
+            session:
+            spawns: List of dicts containing the column values of the spawnpoints (spawnpoint, latitude, longitude,
+             earliest_unseen, spawndef, eventid, first_detection, last_scanned, last_non_scanned, calc_endminsec).
+             Position, eventid and first_detection are only used for new entries.
+            event_id: ID of the current event
+            minute_group_pos: Position in the spawndef of the quarter of an hour the spawnpoints were seen in (4-7)
+        """
+        if not spawns:
+            return
+        insert_stmt = insert(TrsSpawn).values(spawns)
+        if minute_group_pos is not None:
+            # Same as setting the bits of the minute group in a BitArray of length 8 with index 0 being the MSB
+            unseen_bit: int = 1 << (11 - minute_group_pos)
+            seen_bit: int = 1 << (7 - minute_group_pos)
+            if event_id == 1:
+                same_event = TrsSpawn.eventid == event_id
+            else:
+                same_event = or_(TrsSpawn.eventid == event_id, TrsSpawn.eventid != 1)
+            spawndef = func.IF(same_event, TrsSpawn.spawndef.op("&")(0xFF ^ unseen_bit).op("|")(seen_bit),
+                               TrsSpawn.spawndef)
+        else:
+            spawndef = TrsSpawn.spawndef
+        on_duplicate_key_stmt = insert_stmt.on_duplicate_key_update(
+            earliest_unseen=func.LEAST(TrsSpawn.earliest_unseen, insert_stmt.inserted.earliest_unseen),
+            spawndef=spawndef,
+            last_scanned=func.COALESCE(insert_stmt.inserted.last_scanned, TrsSpawn.last_scanned),
+            last_non_scanned=func.COALESCE(insert_stmt.inserted.last_non_scanned, TrsSpawn.last_non_scanned),
+            calc_endminsec=func.COALESCE(insert_stmt.inserted.calc_endminsec, TrsSpawn.calc_endminsec)
+        )
+        await session.execute(on_duplicate_key_stmt)
+
     @staticmethod
     async def __get_of_area(session: AsyncSession, geofence_helper: GeofenceHelper,
                             additional_event: Optional[int], only_unknown_endtime: bool = False) -> List[TrsSpawn]:
@@ -56,20 +107,12 @@ class TrsSpawnHelper:
 
         stmt = select(TrsSpawn).where(where_condition)
         result = await session.execute(stmt)
-        loop = asyncio.get_running_loop()
-        with concurrent.futures.ProcessPoolExecutor() as pool:
-            list_of_spawns = await loop.run_in_executor(pool, TrsSpawnHelper._filter_in_geofence,
-                                                        geofence_helper, result.scalars().all())
-        return list_of_spawns
+        return TrsSpawnHelper._filter_in_geofence(geofence_helper, result.scalars().all())
 
     @staticmethod
-    def _filter_in_geofence(geofence_helper, result):
-        list_of_spawns: List[TrsSpawn] = []
-        for spawnpoint in result:
-            if not geofence_helper.is_coord_inside_include_geofence([spawnpoint.latitude, spawnpoint.longitude]):
-                continue
-            list_of_spawns.append(spawnpoint)
-        return list_of_spawns
+    def _filter_in_geofence(geofence_helper: GeofenceHelper, result: List[TrsSpawn]) -> List[TrsSpawn]:
+        inside = geofence_helper.contains([(spawnpoint.latitude, spawnpoint.longitude) for spawnpoint in result])
+        return [spawnpoint for spawnpoint, spawnpoint_inside in zip(result, inside) if spawnpoint_inside]
 
     @staticmethod
     async def get_known_of_area(session: AsyncSession, geofence_helper: GeofenceHelper,
@@ -155,9 +198,7 @@ class TrsSpawnHelper:
         current_time_of_day = DatetimeWrapper.now().replace(microsecond=0)
         timedelta_to_be_added = timedelta(hours=1)
 
-        for spawn in result:
-            if not geofence_helper.is_coord_inside_include_geofence([spawn.latitude, spawn.longitude]):
-                continue
+        for spawn in TrsSpawnHelper._filter_in_geofence(geofence_helper, result):
             endminsec_split = spawn.calc_endminsec.split(":")
             minutes = int(endminsec_split[0])
             seconds = int(endminsec_split[1])
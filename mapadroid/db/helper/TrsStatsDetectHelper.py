@@ -1,7 +1,7 @@
 from datetime import timedelta
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 
-from sqlalchemy import and_, delete, func
+from sqlalchemy import and_, delete, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -80,3 +80,19 @@ class TrsStatsDetectHelper:
     async def cleanup(session: AsyncSession, delete_before_timestamp_scan: int) -> None:
         stmt = delete(TrsStatsDetect).where(TrsStatsDetect.timestamp_scan < delete_before_timestamp_scan)
         await session.execute(stmt)
+
+    @staticmethod
+    async def add_bulk(session: AsyncSession, stats: Sequence[TrsStatsDetect], chunk_size: int) -> None:
+        """
+        Inserts the entries using multi-row statements
+        Args:
+            session:
+            stats:
+            chunk_size: Amount of entries per statement
+        """
+        for start in range(0, len(stats), chunk_size):
+            stmt = insert(TrsStatsDetect).values([
+                {"worker": stat.worker, "timestamp_scan": stat.timestamp_scan, "mon": stat.mon, "raid": stat.raid,
+                 "mon_iv": stat.mon_iv, "quest": stat.quest}
+                for stat in stats[start:start + chunk_size]])
+            await session.execute(stmt)
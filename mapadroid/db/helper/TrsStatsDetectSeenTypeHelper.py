@@ -1,5 +1,7 @@
-from typing import Optional
+from typing import Optional, Sequence
 
+from sqlalchemy import func
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -39,3 +41,29 @@ class TrsStatsDetectSeenTypeHelper:
             if not existing.nearby_stop or stat_entry.nearby_stop and existing.nearby_stop > stat_entry.nearby_stop:
                 existing.nearby_stop = stat_entry.nearby_stop
             session.add(existing)
+
+    @staticmethod
+    async def create_or_update_bulk(session: AsyncSession, stat_entries: Sequence[TrsStatsDetectSeenType],
+                                    chunk_size: int) -> None:
+        """
+        Same merge as create_or_update (earliest time of each type of detection known) done by the DB using
+        multi-row INSERT ... ON DUPLICATE KEY UPDATE statements
+        Args:
+            session:
+            stat_entries: Entries with unique encounter_id
+            chunk_size: Amount of entries per statement
+        """
+        for start in range(0, len(stat_entries), chunk_size):
+            insert_stmt = insert(TrsStatsDetectSeenType).values([
+                {"encounter_id": stat_entry.encounter_id, "encounter": stat_entry.encounter, "wild": stat_entry.wild,
+                 "nearby_stop": stat_entry.nearby_stop, "nearby_cell": stat_entry.nearby_cell,
+                 "lure_encounter": stat_entry.lure_encounter, "lure_wild": stat_entry.lure_wild}
+                for stat_entry in stat_entries[start:start + chunk_size]])
+            # LEAST is NULL if either is NULL, the one not being NULL is kept in that case
+            stmt = insert_stmt.on_duplicate_key_update({
+                column: func.COALESCE(func.LEAST(getattr(TrsStatsDetectSeenType, column),
+                                                 insert_stmt.inserted[column]),
+                                      getattr(TrsStatsDetectSeenType, column), insert_stmt.inserted[column])
+                for column in ("encounter", "wild", "nearby_stop", "nearby_cell", "lure_encounter", "lure_wild")
+            })
+            await session.execute(stmt)
@@ -1,8 +1,9 @@
 import datetime
 import time
-from typing import Optional
+from typing import Optional, Sequence
 
-from sqlalchemy import delete, and_, or_, select
+from sqlalchemy import delete, and_, func, or_, select
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from mapadroid.db.model import TrsStatsDetectWildMonRaw
@@ -35,6 +36,29 @@ class TrsStatsDetectWildMonRawHelper:
                 existing.is_shiny = instance.is_shiny
             session.add(existing)
 
+    @staticmethod
+    async def create_or_update_bulk(session: AsyncSession, instances: Sequence[TrsStatsDetectWildMonRaw],
+                                    chunk_size: int) -> None:
+        """
+        Same merge as create_or_update done by the DB using multi-row INSERT ... ON DUPLICATE KEY UPDATE statements
+        Args:
+            session:
+            instances: Entries with unique worker and encounter_id
+            chunk_size: Amount of entries per statement
+        """
+        for start in range(0, len(instances), chunk_size):
+            insert_stmt = insert(TrsStatsDetectWildMonRaw).values([
+                {"worker": instance.worker, "encounter_id": instance.encounter_id, "count": instance.count,
+                 "is_shiny": bool(instance.is_shiny), "first_scanned": instance.first_scanned,
+                 "last_scanned": instance.last_scanned}
+                for instance in instances[start:start + chunk_size]])
+            stmt = insert_stmt.on_duplicate_key_update(
+                first_scanned=func.LEAST(TrsStatsDetectWildMonRaw.first_scanned, insert_stmt.inserted.first_scanned),
+                last_scanned=func.GREATEST(TrsStatsDetectWildMonRaw.last_scanned, insert_stmt.inserted.last_scanned),
+                count=TrsStatsDetectWildMonRaw.count + insert_stmt.inserted.count,
+                is_shiny=or_(TrsStatsDetectWildMonRaw.is_shiny, insert_stmt.inserted.is_shiny))
+            await session.execute(stmt)
+
     @staticmethod
     async def cleanup(session: AsyncSession, delete_before_timestap_scan: datetime.datetime,
                       raw_delete_shiny_days: int = 0) -> None:
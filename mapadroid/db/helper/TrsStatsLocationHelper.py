@@ -1,7 +1,7 @@
 from datetime import timedelta
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 
-from sqlalchemy import and_, delete, func
+from sqlalchemy import and_, delete, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -94,6 +94,22 @@ class TrsStatsLocationHelper:
         stat.location_nok = location_nok
         session.add(stat)
 
+    @staticmethod
+    async def add_bulk(session: AsyncSession, stats: Sequence[TrsStatsLocation], chunk_size: int) -> None:
+        """
+        Inserts the entries using multi-row statements
+        Args:
+            session:
+            stats:
+            chunk_size: Amount of entries per statement
+        """
+        for start in range(0, len(stats), chunk_size):
+            stmt = insert(TrsStatsLocation).values([
+                {"worker": stat.worker, "timestamp_scan": stat.timestamp_scan, "location_ok": stat.location_ok,
+                 "location_nok": stat.location_nok}
+                for stat in stats[start:start + chunk_size]])
+            await session.execute(stmt)
+
     @staticmethod
     async def cleanup(session: AsyncSession, delete_before_timestap_scan: int) -> None:
         stmt = delete(TrsStatsLocation).where(TrsStatsLocation.timestamp_scan < delete_before_timestap_scan)
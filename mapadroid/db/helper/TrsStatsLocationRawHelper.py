@@ -1,7 +1,8 @@
 from datetime import timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from sqlalchemy import and_, asc, case, delete, desc, func, or_
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import aliased
@@ -241,6 +242,25 @@ class TrsStatsLocationRawHelper:
         stat.transporttype = transporttype.value
         session.add(stat)
 
+    @staticmethod
+    async def add_bulk(session: AsyncSession, stats: Sequence[TrsStatsLocationRaw], chunk_size: int) -> None:
+        """
+        Inserts the entries using multi-row statements. Entries of an event already stored (same worker, location,
+        type and period) are skipped, the existing entry is kept.
+        Args:
+            session:
+            stats:
+            chunk_size: Amount of entries per statement
+        """
+        for start in range(0, len(stats), chunk_size):
+            insert_stmt = insert(TrsStatsLocationRaw).values([
+                {"worker": stat.worker, "fix_ts": stat.fix_ts, "lat": stat.lat, "lng": stat.lng,
+                 "data_ts": stat.data_ts, "type": stat.type, "walker": stat.walker, "success": stat.success,
+                 "period": stat.period, "transporttype": stat.transporttype}
+                for stat in stats[start:start + chunk_size]])
+            stmt = insert_stmt.on_duplicate_key_update(period=TrsStatsLocationRaw.period)
+            await session.execute(stmt)
+
     @staticmethod
     async def get(session: AsyncSession, worker: str, location: Location, type_of_location: PositionType,
                   period: int) -> Optional[TrsStatsLocationRaw]:
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Collection, Optional, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -19,3 +19,11 @@ class WeatherHelper:
         stmt = select(Weather).where(Weather.last_updated > DatetimeWrapper.fromtimestamp(_timestamp))
         result = await session.execute(stmt)
         return result.scalars().all()
+
+    @staticmethod
+    async def get_of_cells(session: AsyncSession, s2_cell_ids: Collection[str]) -> List[Weather]:
+        if not s2_cell_ids:
+            return []
+        stmt = select(Weather).where(Weather.s2_cell_id.in_(s2_cell_ids))
+        result = await session.execute(stmt)
+        return result.scalars().all()
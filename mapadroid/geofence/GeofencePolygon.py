@@ -0,0 +1,128 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    from matplotlib.path import Path
+except ImportError:
+    # Optional, see GeofenceHelper
+    Path = None
+
+
+class GeofencePolygon:
+    """
+    A single polygon of a geofence compiled once for repeated point-in-polygon tests.
+    The bounding box is used to reject points cheaply, the remaining points are tested against the polygon using either
+    a matplotlib Path (if available) or the ray casting of GeofenceHelper.is_point_in_polygon_custom (vectorised).
+    For large batches of points, a grid over the bounding box marks the cells not touched by any edge as entirely inside
+    or outside, only points in cells touched by an edge are tested against the polygon itself.
+    """
+    # Cells per dimension of the grid
+    GRID_SIZE: int = 64
+    # Minimum amount of points in a batch to build (and use) the grid for
+    GRID_MIN_POINTS: int = 1024
+    __CELL_OUTSIDE: int = 0
+    __CELL_INSIDE: int = 1
+    __CELL_EDGE: int = 2
+
+    def __init__(self, polygon: List[Dict[str, float]], use_matplotlib: bool):
+        # Shape (n, 2) of lat, lon
+        self.vertices: np.ndarray = np.array([(coord['lat'], coord['lon']) for coord in polygon],
+                                             dtype=np.float64).reshape(-1, 2)
+        self._path: Optional[Path] = None
+        self._grid: Optional[np.ndarray] = None
+        if len(self.vertices) == 0:
+            # Nothing is inside a polygon without vertices
+            self.min_lat = self.min_lon = np.inf
+            self.max_lat = self.max_lon = -np.inf
+            return
+        self.min_lat, self.min_lon = self.vertices.min(axis=0)
+        self.max_lat, self.max_lon = self.vertices.max(axis=0)
+        if use_matplotlib and Path is not None:
+            self._path = Path(np.vstack((self.vertices, self.vertices[:1])))
+
+    def contains_point(self, lat: float, lon: float) -> bool:
+        if lat > self.max_lat or lat < self.min_lat or lon > self.max_lon or lon < self.min_lon:
+            return False
+        if self._path is not None:
+            return bool(self._path.contains_point((lat, lon)))
+        return bool(self.__contains_custom(np.array([lat]), np.array([lon]))[0])
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            points: Shape (n, 2) of lat, lon
+
+        Returns: Boolean mask of shape (n,) of the points inside the polygon
+        """
+        lats = points[:, 0]
+        lons = points[:, 1]
+        result: np.ndarray = np.zeros(len(points), dtype=bool)
+        to_test: np.ndarray = np.flatnonzero((lats <= self.max_lat) & (lats >= self.min_lat)
+                                             & (lons <= self.max_lon) & (lons >= self.min_lon))
+        if len(to_test) >= GeofencePolygon.GRID_MIN_POINTS and self.__build_grid():
+            cells: np.ndarray = self._grid[self.__cell_indices(lats[to_test], lons[to_test])]
+            result[to_test[cells == GeofencePolygon.__CELL_INSIDE]] = True
+            to_test = to_test[cells == GeofencePolygon.__CELL_EDGE]
+        if len(to_test) > 0:
+            result[to_test] = self.__contains_exact(points[to_test])
+        return result
+
+    def __contains_exact(self, points: np.ndarray) -> np.ndarray:
+        if self._path is not None:
+            return self._path.contains_points(points)
+        return self.__contains_custom(points[:, 0], points[:, 1])
+
+    def __contains_custom(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        # Same evaluation as GeofenceHelper.is_point_in_polygon_custom, per edge for all points at once
+        inside: np.ndarray = np.zeros(len(lats), dtype=bool)
+        amount_vertices: int = len(self.vertices)
+        lat1, lon1 = self.vertices[0]
+        for vertex in range(1, amount_vertices + 1):
+            lat2, lon2 = self.vertices[vertex % amount_vertices]
+            # Edges with lon1 == lon2 are never crossed given the bounds of the longitude
+            crossing: np.ndarray = (min(lon1, lon2) < lons) & (lons <= max(lon1, lon2)) & (lats <= max(lat1, lat2))
+            if lat1 != lat2 and lon1 != lon2:
+                lat_intersection = (lons - lon1) * (lat2 - lat1) / (lon2 - lon1) + lat1
+                crossing &= lats <= lat_intersection
+            inside ^= crossing
+            lat1, lon1 = lat2, lon2
+        return inside
+
+    def __cell_indices(self, lats: np.ndarray, lons: np.ndarray):
+        size: int = GeofencePolygon.GRID_SIZE
+        rows = np.clip(((lats - self.min_lat) / (self.max_lat - self.min_lat) * size).astype(np.int64), 0, size - 1)
+        columns = np.clip(((lons - self.min_lon) / (self.max_lon - self.min_lon) * size).astype(np.int64),
+                          0, size - 1)
+        return rows, columns
+
+    def __build_grid(self) -> bool:
+        """
+        Returns: Whether the grid can be used
+        """
+        if self._grid is not None:
+            return True
+        if self.max_lat <= self.min_lat or self.max_lon <= self.min_lon:
+            return False
+        size: int = GeofencePolygon.GRID_SIZE
+        grid: np.ndarray = np.full((size, size), GeofencePolygon.__CELL_OUTSIDE, dtype=np.int8)
+        # Any cell overlapping the bounding box of an edge may contain points of the edge. Neighbouring cells are marked
+        # as well to account for rounding of the cell indices of points close to the borders of cells.
+        next_vertices: np.ndarray = np.roll(self.vertices, -1, axis=0)
+        rows_min, columns_min = self.__cell_indices(np.minimum(self.vertices[:, 0], next_vertices[:, 0]),
+                                                    np.minimum(self.vertices[:, 1], next_vertices[:, 1]))
+        rows_max, columns_max = self.__cell_indices(np.maximum(self.vertices[:, 0], next_vertices[:, 0]),
+                                                    np.maximum(self.vertices[:, 1], next_vertices[:, 1]))
+        for row_min, row_max, column_min, column_max in zip(rows_min, rows_max, columns_min, columns_max):
+            grid[max(row_min - 1, 0):row_max + 2, max(column_min - 1, 0):column_max + 2] = \
+                GeofencePolygon.__CELL_EDGE
+        # Cells not touched by any edge are either entirely inside or outside, thus testing the center suffices
+        untouched_rows, untouched_columns = np.nonzero(grid != GeofencePolygon.__CELL_EDGE)
+        if len(untouched_rows) > 0:
+            centers: np.ndarray = np.column_stack((
+                self.min_lat + (untouched_rows + 0.5) * (self.max_lat - self.min_lat) / size,
+                self.min_lon + (untouched_columns + 0.5) * (self.max_lon - self.min_lon) / size))
+            centers_inside: np.ndarray = self.__contains_exact(centers)
+            grid[untouched_rows[centers_inside], untouched_columns[centers_inside]] = GeofencePolygon.__CELL_INSIDE
+        self._grid = grid
+        return True
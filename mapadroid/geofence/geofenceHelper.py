@@ -1,7 +1,10 @@
 import sys
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from mapadroid.db.model import SettingsGeofence
+from mapadroid.geofence.GeofencePolygon import GeofencePolygon
 from mapadroid.utils.logging import get_logger, LoggerEnums
 
 logger = get_logger(LoggerEnums.system)
@@ -31,6 +34,11 @@ class GeofenceHelper:
                 exclude_geofence, excluded=True, fence_fallback=fence_name)
             logger.debug2("Loaded {} geofenced and {} excluded areas.", len(self.geofenced_areas),
                           len(self.excluded_areas))
+        # Compiled once as the areas are tested against for every coordinate
+        self._geofenced_polygons: List[GeofencePolygon] = [GeofencePolygon(area['polygon'], self.use_matplotlib)
+                                                           for area in self.geofenced_areas]
+        self._excluded_polygons: List[GeofencePolygon] = [GeofencePolygon(area['polygon'], self.use_matplotlib)
+                                                          for area in self.excluded_areas]
 
     def get_polygon_from_fence(self) -> Tuple[float, float, float, float]:
         max_lat, min_lat, max_lon, min_lon = -90, 90, -180, 180
@@ -50,35 +58,46 @@ class GeofenceHelper:
             return False
 
         # Coordinate is geofenced if in one geofenced area.
-        if self.geofenced_areas:
-            for va in self.geofenced_areas:
-                if self._in_area(coordinate, va):
-                    return True
+        if self._geofenced_polygons:
+            return any(polygon.contains_point(coordinate[0], coordinate[1])
+                       for polygon in self._geofenced_polygons)
+        return True
+
+    def contains(self, coordinates: Sequence) -> np.ndarray:
+        """
+        Batch variant of is_coord_inside_include_geofence
+        Args:
+            coordinates: Coordinates (anything indexable by [0] for the latitude and [1] for the longitude)
+
+        Returns: Boolean mask of the coordinates inside the geofence and not in any excluded area
+        """
+        if len(coordinates) == 0:
+            return np.zeros(0, dtype=bool)
+        if isinstance(coordinates, np.ndarray):
+            points: np.ndarray = coordinates[:, :2].astype(np.float64)
         else:
-            return True
-        return False
+            points = np.array([(coord[0], coord[1]) for coord in coordinates], dtype=np.float64)
+        if self._geofenced_polygons:
+            result: np.ndarray = np.zeros(len(points), dtype=bool)
+            for polygon in self._geofenced_polygons:
+                result |= polygon.contains(points)
+        else:
+            result = np.ones(len(points), dtype=bool)
+        for polygon in self._excluded_polygons:
+            if not result.any():
+                break
+            remaining: np.ndarray = np.flatnonzero(result)
+            result[remaining[polygon.contains(points[remaining])]] = False
+        return result
 
-    # TODO: Async/Threaded?
     def get_geofenced_coordinates(self, coordinates):
         # Import: We are working with n-tuples in some functions be carefull
         # and do not break compatibility
         logger.debug('Using matplotlib: {}.', self.use_matplotlib)
         logger.debug2('Found {} coordinates to geofence.', len(coordinates))
 
-        geofenced_coordinates = []
-        for coord in coordinates:
-            # Coordinate is not valid if in one excluded area.
-            if self._is_excluded(coord):
-                continue
-
-            # Coordinate is geofenced if in one geofenced area.
-            if self.geofenced_areas:
-                for va in self.geofenced_areas:
-                    if self._in_area(coord, va):
-                        geofenced_coordinates.append(coord)
-                        break
-            else:
-                geofenced_coordinates.append(coord)
+        inside: np.ndarray = self.contains(coordinates)
+        geofenced_coordinates = [coord for coord, coord_inside in zip(coordinates, inside) if coord_inside]
 
         logger.debug2("Geofenced to {} coordinates", len(geofenced_coordinates))
         return geofenced_coordinates
@@ -127,20 +146,12 @@ class GeofenceHelper:
         return geofences
 
     def _is_excluded(self, coordinate):
-        for ea in self.excluded_areas:
-            if self._in_area(coordinate, ea):
+        for polygon in self._excluded_polygons:
+            if polygon.contains_point(coordinate[0], coordinate[1]):
                 return True
 
         return False
 
-    def _in_area(self, coordinate, area):
-        point = {'lat': coordinate[0], 'lon': coordinate[1]}
-        polygon = area['polygon']
-        if self.use_matplotlib:
-            return self.is_point_in_polygon_matplotlib(point, polygon)
-        else:
-            return self.is_point_in_polygon_custom(point, polygon)
-
     @staticmethod
     def is_point_in_polygon_matplotlib(point, polygon):
         point_tuple = (point['lat'], point['lon'])
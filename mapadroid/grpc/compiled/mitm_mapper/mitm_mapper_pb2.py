@@ -20,10 +20,11 @@ from mapadroid.grpc.compiled.shared import \
     Location_pb2 as shared_dot_Location__pb2
 from mapadroid.grpc.compiled.shared import Worker_pb2 as shared_dot_Worker__pb2
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1dmitm_mapper/mitm_mapper.proto\x12\x15mapadroid.mitm_mapper\x1a\x15shared/Location.proto\x1a\x10shared/Ack.proto\x1a\x13shared/Worker.proto\x1a\x1cgoogle/protobuf/struct.proto\"\x8d\x01\n\x14SetQuestsHeldRequest\x12(\n\x06worker\x18\x01 \x01(\x0b\x32\x18.mapadroid.shared.Worker\x12;\n\x0bquests_held\x18\x02 \x01(\x0b\x32!.mapadroid.mitm_mapper.QuestsHeldH\x00\x88\x01\x01\x42\x0e\n\x0c_quests_held\"d\n\x15GetQuestsHeldResponse\x12;\n\x0bquests_held\x18\x01 \x01(\x0b\x32!.mapadroid.mitm_mapper.QuestsHeldH\x00\x88\x01\x01\x42\x0e\n\x0c_quests_held\"\x1f\n\nQuestsHeld\x12\x11\n\tquest_ids\x18\x01 \x03(\x05\"]\n\x18SetPokestopVisitsRequest\x12(\n\x06worker\x18\x01 \x01(\x0b\x32\x18.mapadroid.shared.Worker\x12\x17\n\x0fpokestop_visits\x18\x02 \x01(\x05\"J\n\x0fSetLevelRequest\x12(\n\x06worker\x18\x01 \x01(\x0b\x32\x18.mapadroid.shared.Worker\x12\r\n\x05level\x18\x02 \x01(\x05\"[\n\x19LastKnownLocationResponse\x12\x31\n\x08location\x18\x01 \x01(\x0b\x32\x1a.mapadroid.shared.LocationH\x00\x88\x01\x01\x42\x0b\n\t_location\"u\n\x0fInjectedRequest\x12(\n\x06worker\x18\x01 \x01(\x0b\x32\x18.mapadroid.shared.Worker\x12\x38\n\x08injected\x18\x02 \x01(\x0b\x32&.mapadroid.mitm_mapper.InjectionStatus\"&\n\x0fInjectionStatus\x12\x13\n\x0bis_injected\x18\x01 \x01(\x08\"\x1e\n\rLevelResponse\x12\r\n\x05level\x18\x01 \x01(\x05\"/\n\x16PokestopVisitsResponse\x12\x15\n\rstops_visited\x18\x01 \x01(\x04\"\x93\x01\n LatestMitmDataEntryUpdateRequest\x12(\n\x06worker\x18\x01 \x01(\x0b\x32\x18.mapadroid.shared.Worker\x12\x0b\n\x03key\x18\x02 \x01(\t\x12\x38\n\x04\x64\x61ta\x18\x03 \x01(\x0b\x32*.mapadroid.mitm_mapper.LatestMitmDataEntry\"g\n\x1bLatestMitmDataEntryResponse\x12>\n\x05\x65ntry\x18\x01 \x01(\x0b\x32*.mapadroid.mitm_mapper.LatestMitmDataEntryH\x00\x88\x01\x01\x42\x08\n\x06_entry\"\x8b\x01\n\x1aLatestMitmDataEntryRequest\x12(\n\x06worker\x18\x01 \x01(\x0b\x32\x18.mapadroid.shared.Worker\x12\x0b\n\x03key\x18\x02 \x01(\t\x12\x1f\n\x12timestamp_earliest\x18\x03 \x01(\x04H\x00\x88\x01\x01\x42\x15\n\x13_timestamp_earliest\"\xc4\x02\n\x13LatestMitmDataEntry\x12\x31\n\x08location\x18\x01 \x01(\x0b\x32\x1a.mapadroid.shared.LocationH\x01\x88\x01\x01\x12\x1f\n\x12timestamp_received\x18\x02 \x01(\x04H\x02\x88\x01\x01\x12(\n\x1btimestamp_of_data_retrieval\x18\x03 \x01(\x04H\x03\x88\x01\x01\x12\x32\n\x0fsome_dictionary\x18\x04 \x01(\x0b\x32\x17.google.protobuf.StructH\x00\x12/\n\tsome_list\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.ListValueH\x00\x42\x06\n\x04\x64\x61taB\x0b\n\t_locationB\x15\n\x13_timestamp_receivedB\x1e\n\x1c_timestamp_of_data_retrieval\"\x1e\n\tLastMoved\x12\x11\n\ttimestamp\x18\x01 \x01(\x04\x32\xc2\x08\n\nMitmMapper\x12R\n\x14GetLastPossiblyMoved\x12\x18.mapadroid.shared.Worker\x1a .mapadroid.mitm_mapper.LastMoved\x12^\n\x0cUpdateLatest\x12\x37.mapadroid.mitm_mapper.LatestMitmDataEntryUpdateRequest\x1a\x15.mapadroid.shared.Ack\x12v\n\rRequestLatest\x12\x31.mapadroid.mitm_mapper.LatestMitmDataEntryRequest\x1a\x32.mapadroid.mitm_mapper.LatestMitmDataEntryResponse\x12I\n\x08SetLevel\x12&.mapadroid.mitm_mapper.SetLevelRequest\x1a\x15.mapadroid.shared.Ack\x12[\n\x11SetPokestopVisits\x12/.mapadroid.mitm_mapper.SetPokestopVisitsRequest\x1a\x15.mapadroid.shared.Ack\x12\\\n\x11GetPokestopVisits\x12\x18.mapadroid.shared.Worker\x1a-.mapadroid.mitm_mapper.PokestopVisitsResponse\x12J\n\x08GetLevel\x12\x18.mapadroid.shared.Worker\x1a$.mapadroid.mitm_mapper.LevelResponse\x12V\n\x12GetInjectionStatus\x12\x18.mapadroid.shared.Worker\x1a&.mapadroid.mitm_mapper.InjectionStatus\x12L\n\x0bSetInjected\x12&.mapadroid.mitm_mapper.InjectedRequest\x1a\x15.mapadroid.shared.Ack\x12\x62\n\x14GetLastKnownLocation\x12\x18.mapadroid.shared.Worker\x1a\x30.mapadroid.mitm_mapper.LastKnownLocationResponse\x12S\n\rSetQuestsHeld\x12+.mapadroid.mitm_mapper.SetQuestsHeldRequest\x1a\x15.mapadroid.shared.Ack\x12W\n\rGetQuestsHeld\x12\x18.mapadroid.shared.Worker\x1a,.mapadroid.mitm_mapper.GetQuestsHeldResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1dmitm_mapper/mitm_mapper.proto\x12\x15mapadroid.mitm_mapper\x1a\x15shared/Location.proto\x1a\x10shared/Ack.proto\x1a\x13shared/Worker.proto\x1a\x1cgoogle/protobuf/struct.proto\")\n\x15TransportCapabilities\x12\x10\n\x08raw_json\x18\x01 \x01(\x08\"\x8d\x01\n\x14SetQuestsHeldRequest\x12(\n\x06worker\x18\x01 \x01(\x0b\x32\x18.mapadroid.shared.Worker\x12;\n\x0bquests_held\x18\x02 \x01(\x0b\x32!.mapadroid.mitm_mapper.QuestsHeldH\x00\x88\x01\x01\x42\x0e\n\x0c_quests_held\"d\n\x15GetQuestsHeldResponse\x12;\n\x0bquests_held\x18\x01 \x01(\x0b\x32!.mapadroid.mitm_mapper.QuestsHeldH\x00\x88\x01\x01\x42\x0e\n\x0c_quests_held\"\x1f\n\nQuestsHeld\x12\x11\n\tquest_ids\x18\x01 \x03(\x05\"]\n\x18SetPokestopVisitsRequest\x12(\n\x06worker\x18\x01 \x01(\x0b\x32\x18.mapadroid.shared.Worker\x12\x17\n\x0fpokestop_visits\x18\x02 \x01(\x05\"J\n\x0fSetLevelRequest\x12(\n\x06worker\x18\x01 \x01(\x0b\x32\x18.mapadroid.shared.Worker\x12\r\n\x05level\x18\x02 \x01(\x05\"[\n\x19LastKnownLocationResponse\x12\x31\n\x08location\x18\x01 \x01(\x0b\x32\x1a.mapadroid.shared.LocationH\x00\x88\x01\x01\x42\x0b\n\t_location\"u\n\x0fInjectedRequest\x12(\n\x06worker\x18\x01 \x01(\x0b\x32\x18.mapadroid.shared.Worker\x12\x38\n\x08injected\x18\x02 \x01(\x0b\x32&.mapadroid.mitm_mapper.InjectionStatus\"&\n\x0fInjectionStatus\x12\x13\n\x0bis_injected\x18\x01 \x01(\x08\"\x1e\n\rLevelResponse\x12\r\n\x05level\x18\x01 \x01(\x05\"/\n\x16PokestopVisitsResponse\x12\x15\n\rstops_visited\x18\x01 \x01(\x04\"\x93\x01\n LatestMitmDataEntryUpdateRequest\x12(\n\x06worker\x18\x01 \x01(\x0b\x32\x18.mapadroid.shared.Worker\x12\x0b\n\x03key\x18\x02 \x01(\t\x12\x38\n\x04\x64\x61ta\x18\x03 \x01(\x0b\x32*.mapadroid.mitm_mapper.LatestMitmDataEntry\"g\n\x1bLatestMitmDataEntryResponse\x12>\n\x05\x65ntry\x18\x01 \x01(\x0b\x32*.mapadroid.mitm_mapper.LatestMitmDataEntryH\x00\x88\x01\x01\x42\x08\n\x06_entry\"\xa5\x01\n\x1aLatestMitmDataEntryRequest\x12(\n\x06worker\x18\x01 \x01(\x0b\x32\x18.mapadroid.shared.Worker\x12\x0b\n\x03key\x18\x02 \x01(\t\x12\x1f\n\x12timestamp_earliest\x18\x03 \x01(\x04H\x00\x88\x01\x01\x12\x18\n\x10\x61\x63\x63\x65pts_raw_json\x18\x04 \x01(\x08\x42\x15\n\x13_timestamp_earliest\"\xd8\x02\n\x13LatestMitmDataEntry\x12\x31\n\x08location\x18\x01 \x01(\x0b\x32\x1a.mapadroid.shared.LocationH\x01\x88\x01\x01\x12\x1f\n\x12timestamp_received\x18\x02 \x01(\x04H\x02\x88\x01\x01\x12(\n\x1btimestamp_of_data_retrieval\x18\x03 \x01(\x04H\x03\x88\x01\x01\x12\x32\n\x0fsome_dictionary\x18\x04 \x01(\x0b\x32\x17.google.protobuf.StructH\x00\x12/\n\tsome_list\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.ListValueH\x00\x12\x12\n\x08raw_json\x18\x06 \x01(\x0cH\x00\x42\x06\n\x04\x64\x61taB\x0b\n\t_locationB\x15\n\x13_timestamp_receivedB\x1e\n\x1c_timestamp_of_data_retrieval\"i\n\x1cLatestMitmDataDigestResponse\x12?\n\x05\x65ntry\x18\x01 \x01(\x0b\x32+.mapadroid.mitm_mapper.LatestMitmDataDigestH\x00\x88\x01\x01\x42\x08\n\x06_entry\"\x9a\x02\n\x14LatestMitmDataDigest\x12\x31\n\x08location\x18\x01 \x01(\x0b\x32\x1a.mapadroid.shared.LocationH\x00\x88\x01\x01\x12\x1f\n\x12timestamp_received\x18\x02 \x01(\x04H\x01\x88\x01\x01\x12(\n\x1btimestamp_of_data_retrieval\x18\x03 \x01(\x04H\x02\x88\x01\x01\x12\x35\n\x06\x64igest\x18\x04 \x01(\x0b\x32 .mapadroid.mitm_mapper.GmoDigestH\x03\x88\x01\x01\x42\x0b\n\t_locationB\x15\n\x13_timestamp_receivedB\x1e\n\x1c_timestamp_of_data_retrievalB\t\n\x07_digest\"\xf4\x01\n\tGmoDigest\x12\x10\n\x08\x63\x65ll_ids\x18\x01 \x03(\x04\x12\x13\n\x0b\x66ort_counts\x18\x02 \x03(\r\x12\x17\n\x0fwild_mon_counts\x18\x03 \x03(\r\x12\x19\n\x11nearby_mon_counts\x18\x04 \x03(\r\x12\x10\n\x08\x66ort_ids\x18\x05 \x03(\t\x12\x12\n\nfort_types\x18\x06 \x03(\x05\x12\x15\n\rencounter_ids\x18\x07 \x03(\x04\x12\x0f\n\x07mon_ids\x18\x08 \x03(\r\x12\x17\n\x0fweather_boosted\x18\t \x03(\x05\x12\x11\n\tlatitudes\x18\n \x03(\x01\x12\x12\n\nlongitudes\x18\x0b \x03(\x01\"\x1e\n\tLastMoved\x12\x11\n\ttimestamp\x18\x01 \x01(\x04\"H\n\nDataUpdate\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x11\n\ttimestamp\x18\x02 \x01(\x04\x12\x1a\n\x08sequence\x18\x03 \x01(\x04R\x08sequence2\x8a\x0b\n\nMitmMapper\x12R\n\x14GetLastPossiblyMoved\x12\x18.mapadroid.shared.Worker\x1a .mapadroid.mitm_mapper.LastMoved\x12^\n\x0cUpdateLatest\x12\x37.mapadroid.mitm_mapper.LatestMitmDataEntryUpdateRequest\x1a\x15.mapadroid.shared.Ack\x12v\n\rRequestLatest\x12\x31.mapadroid.mitm_mapper.LatestMitmDataEntryRequest\x1a\x32.mapadroid.mitm_mapper.LatestMitmDataEntryResponse\x12}\n\x13RequestLatestDigest\x12\x31.mapadroid.mitm_mapper.LatestMitmDataEntryRequest\x1a\x33.mapadroid.mitm_mapper.LatestMitmDataDigestResponse\x12I\n\x08SetLevel\x12&.mapadroid.mitm_mapper.SetLevelRequest\x1a\x15.mapadroid.shared.Ack\x12[\n\x11SetPokestopVisits\x12/.mapadroid.mitm_mapper.SetPokestopVisitsRequest\x1a\x15.mapadroid.shared.Ack\x12\\\n\x11GetPokestopVisits\x12\x18.mapadroid.shared.Worker\x1a-.mapadroid.mitm_mapper.PokestopVisitsResponse\x12J\n\x08GetLevel\x12\x18.mapadroid.shared.Worker\x1a$.mapadroid.mitm_mapper.LevelResponse\x12V\n\x12GetInjectionStatus\x12\x18.mapadroid.shared.Worker\x1a&.mapadroid.mitm_mapper.InjectionStatus\x12L\n\x0bSetInjected\x12&.mapadroid.mitm_mapper.InjectedRequest\x1a\x15.mapadroid.shared.Ack\x12\x62\n\x14GetLastKnownLocation\x12\x18.mapadroid.shared.Worker\x1a\x30.mapadroid.mitm_mapper.LastKnownLocationResponse\x12S\n\rSetQuestsHeld\x12+.mapadroid.mitm_mapper.SetQuestsHeldRequest\x1a\x15.mapadroid.shared.Ack\x12W\n\rGetQuestsHeld\x12\x18.mapadroid.shared.Worker\x1a,.mapadroid.mitm_mapper.GetQuestsHeldResponse\x12U\n\x14SubscribeDataUpdates\x12\x18.mapadroid.shared.Worker\x1a!.mapadroid.mitm_mapper.DataUpdate0\x01\x12p\n\x12NegotiateTransport\x12,.mapadroid.mitm_mapper.TransportCapabilities\x1a,.mapadroid.mitm_mapper.TransportCapabilitiesb\x06proto3')
 
 
 
+_TRANSPORTCAPABILITIES = DESCRIPTOR.message_types_by_name['TransportCapabilities']
 _SETQUESTSHELDREQUEST = DESCRIPTOR.message_types_by_name['SetQuestsHeldRequest']
 _GETQUESTSHELDRESPONSE = DESCRIPTOR.message_types_by_name['GetQuestsHeldResponse']
 _QUESTSHELD = DESCRIPTOR.message_types_by_name['QuestsHeld']
@@ -38,7 +39,18 @@ _LATESTMITMDATAENTRYUPDATEREQUEST = DESCRIPTOR.message_types_by_name['LatestMitm
 _LATESTMITMDATAENTRYRESPONSE = DESCRIPTOR.message_types_by_name['LatestMitmDataEntryResponse']
 _LATESTMITMDATAENTRYREQUEST = DESCRIPTOR.message_types_by_name['LatestMitmDataEntryRequest']
 _LATESTMITMDATAENTRY = DESCRIPTOR.message_types_by_name['LatestMitmDataEntry']
+_LATESTMITMDATADIGESTRESPONSE = DESCRIPTOR.message_types_by_name['LatestMitmDataDigestResponse']
+_LATESTMITMDATADIGEST = DESCRIPTOR.message_types_by_name['LatestMitmDataDigest']
+_GMODIGEST = DESCRIPTOR.message_types_by_name['GmoDigest']
 _LASTMOVED = DESCRIPTOR.message_types_by_name['LastMoved']
+_DATAUPDATE = DESCRIPTOR.message_types_by_name['DataUpdate']
+TransportCapabilities = _reflection.GeneratedProtocolMessageType('TransportCapabilities', (_message.Message,), {
+  'DESCRIPTOR' : _TRANSPORTCAPABILITIES,
+  '__module__' : 'mitm_mapper.mitm_mapper_pb2'
+  # @@protoc_insertion_point(class_scope:mapadroid.mitm_mapper.TransportCapabilities)
+  })
+_sym_db.RegisterMessage(TransportCapabilities)
+
 SetQuestsHeldRequest = _reflection.GeneratedProtocolMessageType('SetQuestsHeldRequest', (_message.Message,), {
   'DESCRIPTOR' : _SETQUESTSHELDREQUEST,
   '__module__' : 'mitm_mapper.mitm_mapper_pb2'
@@ -137,6 +149,27 @@ LatestMitmDataEntry = _reflection.GeneratedProtocolMessageType('LatestMitmDataEn
   })
 _sym_db.RegisterMessage(LatestMitmDataEntry)
 
+LatestMitmDataDigestResponse = _reflection.GeneratedProtocolMessageType('LatestMitmDataDigestResponse', (_message.Message,), {
+  'DESCRIPTOR' : _LATESTMITMDATADIGESTRESPONSE,
+  '__module__' : 'mitm_mapper.mitm_mapper_pb2'
+  # @@protoc_insertion_point(class_scope:mapadroid.mitm_mapper.LatestMitmDataDigestResponse)
+  })
+_sym_db.RegisterMessage(LatestMitmDataDigestResponse)
+
+LatestMitmDataDigest = _reflection.GeneratedProtocolMessageType('LatestMitmDataDigest', (_message.Message,), {
+  'DESCRIPTOR' : _LATESTMITMDATADIGEST,
+  '__module__' : 'mitm_mapper.mitm_mapper_pb2'
+  # @@protoc_insertion_point(class_scope:mapadroid.mitm_mapper.LatestMitmDataDigest)
+  })
+_sym_db.RegisterMessage(LatestMitmDataDigest)
+
+GmoDigest = _reflection.GeneratedProtocolMessageType('GmoDigest', (_message.Message,), {
+  'DESCRIPTOR' : _GMODIGEST,
+  '__module__' : 'mitm_mapper.mitm_mapper_pb2'
+  # @@protoc_insertion_point(class_scope:mapadroid.mitm_mapper.GmoDigest)
+  })
+_sym_db.RegisterMessage(GmoDigest)
+
 LastMoved = _reflection.GeneratedProtocolMessageType('LastMoved', (_message.Message,), {
   'DESCRIPTOR' : _LASTMOVED,
   '__module__' : 'mitm_mapper.mitm_mapper_pb2'
@@ -144,40 +177,57 @@ LastMoved = _reflection.GeneratedProtocolMessageType('LastMoved', (_message.Mess
   })
 _sym_db.RegisterMessage(LastMoved)
 
+DataUpdate = _reflection.GeneratedProtocolMessageType('DataUpdate', (_message.Message,), {
+  'DESCRIPTOR' : _DATAUPDATE,
+  '__module__' : 'mitm_mapper.mitm_mapper_pb2'
+  # @@protoc_insertion_point(class_scope:mapadroid.mitm_mapper.DataUpdate)
+  })
+_sym_db.RegisterMessage(DataUpdate)
+
 _MITMMAPPER = DESCRIPTOR.services_by_name['MitmMapper']
 if _descriptor._USE_C_DESCRIPTORS == False:
 
   DESCRIPTOR._options = None
-  _SETQUESTSHELDREQUEST._serialized_start=149
-  _SETQUESTSHELDREQUEST._serialized_end=290
-  _GETQUESTSHELDRESPONSE._serialized_start=292
-  _GETQUESTSHELDRESPONSE._serialized_end=392
-  _QUESTSHELD._serialized_start=394
-  _QUESTSHELD._serialized_end=425
-  _SETPOKESTOPVISITSREQUEST._serialized_start=427
-  _SETPOKESTOPVISITSREQUEST._serialized_end=520
-  _SETLEVELREQUEST._serialized_start=522
-  _SETLEVELREQUEST._serialized_end=596
-  _LASTKNOWNLOCATIONRESPONSE._serialized_start=598
-  _LASTKNOWNLOCATIONRESPONSE._serialized_end=689
-  _INJECTEDREQUEST._serialized_start=691
-  _INJECTEDREQUEST._serialized_end=808
-  _INJECTIONSTATUS._serialized_start=810
-  _INJECTIONSTATUS._serialized_end=848
-  _LEVELRESPONSE._serialized_start=850
-  _LEVELRESPONSE._serialized_end=880
-  _POKESTOPVISITSRESPONSE._serialized_start=882
-  _POKESTOPVISITSRESPONSE._serialized_end=929
-  _LATESTMITMDATAENTRYUPDATEREQUEST._serialized_start=932
-  _LATESTMITMDATAENTRYUPDATEREQUEST._serialized_end=1079
-  _LATESTMITMDATAENTRYRESPONSE._serialized_start=1081
-  _LATESTMITMDATAENTRYRESPONSE._serialized_end=1184
-  _LATESTMITMDATAENTRYREQUEST._serialized_start=1187
-  _LATESTMITMDATAENTRYREQUEST._serialized_end=1326
-  _LATESTMITMDATAENTRY._serialized_start=1329
-  _LATESTMITMDATAENTRY._serialized_end=1653
-  _LASTMOVED._serialized_start=1655
-  _LASTMOVED._serialized_end=1685
-  _MITMMAPPER._serialized_start=1688
-  _MITMMAPPER._serialized_end=2778
+  _TRANSPORTCAPABILITIES._serialized_start=148
+  _TRANSPORTCAPABILITIES._serialized_end=189
+  _SETQUESTSHELDREQUEST._serialized_start=192
+  _SETQUESTSHELDREQUEST._serialized_end=333
+  _GETQUESTSHELDRESPONSE._serialized_start=335
+  _GETQUESTSHELDRESPONSE._serialized_end=435
+  _QUESTSHELD._serialized_start=437
+  _QUESTSHELD._serialized_end=468
+  _SETPOKESTOPVISITSREQUEST._serialized_start=470
+  _SETPOKESTOPVISITSREQUEST._serialized_end=563
+  _SETLEVELREQUEST._serialized_start=565
+  _SETLEVELREQUEST._serialized_end=639
+  _LASTKNOWNLOCATIONRESPONSE._serialized_start=641
+  _LASTKNOWNLOCATIONRESPONSE._serialized_end=732
+  _INJECTEDREQUEST._serialized_start=734
+  _INJECTEDREQUEST._serialized_end=851
+  _INJECTIONSTATUS._serialized_start=853
+  _INJECTIONSTATUS._serialized_end=891
+  _LEVELRESPONSE._serialized_start=893
+  _LEVELRESPONSE._serialized_end=923
+  _POKESTOPVISITSRESPONSE._serialized_start=925
+  _POKESTOPVISITSRESPONSE._serialized_end=972
+  _LATESTMITMDATAENTRYUPDATEREQUEST._serialized_start=975
+  _LATESTMITMDATAENTRYUPDATEREQUEST._serialized_end=1122
+  _LATESTMITMDATAENTRYRESPONSE._serialized_start=1124
+  _LATESTMITMDATAENTRYRESPONSE._serialized_end=1227
+  _LATESTMITMDATAENTRYREQUEST._serialized_start=1230
+  _LATESTMITMDATAENTRYREQUEST._serialized_end=1395
+  _LATESTMITMDATAENTRY._serialized_start=1398
+  _LATESTMITMDATAENTRY._serialized_end=1742
+  _LATESTMITMDATADIGESTRESPONSE._serialized_start=1744
+  _LATESTMITMDATADIGESTRESPONSE._serialized_end=1849
+  _LATESTMITMDATADIGEST._serialized_start=1852
+  _LATESTMITMDATADIGEST._serialized_end=2134
+  _GMODIGEST._serialized_start=2137
+  _GMODIGEST._serialized_end=2381
+  _LASTMOVED._serialized_start=2383
+  _LASTMOVED._serialized_end=2413
+  _DATAUPDATE._serialized_start=2415
+  _DATAUPDATE._serialized_end=2487
+  _MITMMAPPER._serialized_start=2490
+  _MITMMAPPER._serialized_end=3908
 # @@protoc_insertion_point(module_scope)
@@ -31,6 +31,11 @@ class MitmMapperStub(object):
                 request_serializer=mitm__mapper_dot_mitm__mapper__pb2.LatestMitmDataEntryRequest.SerializeToString,
                 response_deserializer=mitm__mapper_dot_mitm__mapper__pb2.LatestMitmDataEntryResponse.FromString,
                 )
+        self.RequestLatestDigest = channel.unary_unary(
+                '/mapadroid.mitm_mapper.MitmMapper/RequestLatestDigest',
+                request_serializer=mitm__mapper_dot_mitm__mapper__pb2.LatestMitmDataEntryRequest.SerializeToString,
+                response_deserializer=mitm__mapper_dot_mitm__mapper__pb2.LatestMitmDataDigestResponse.FromString,
+                )
         self.SetLevel = channel.unary_unary(
                 '/mapadroid.mitm_mapper.MitmMapper/SetLevel',
                 request_serializer=mitm__mapper_dot_mitm__mapper__pb2.SetLevelRequest.SerializeToString,
@@ -76,6 +81,16 @@ class MitmMapperStub(object):
                 request_serializer=shared_dot_Worker__pb2.Worker.SerializeToString,
                 response_deserializer=mitm__mapper_dot_mitm__mapper__pb2.GetQuestsHeldResponse.FromString,
                 )
+        self.SubscribeDataUpdates = channel.unary_stream(
+                '/mapadroid.mitm_mapper.MitmMapper/SubscribeDataUpdates',
+                request_serializer=shared_dot_Worker__pb2.Worker.SerializeToString,
+                response_deserializer=mitm__mapper_dot_mitm__mapper__pb2.DataUpdate.FromString,
+                )
+        self.NegotiateTransport = channel.unary_unary(
+                '/mapadroid.mitm_mapper.MitmMapper/NegotiateTransport',
+                request_serializer=mitm__mapper_dot_mitm__mapper__pb2.TransportCapabilities.SerializeToString,
+                response_deserializer=mitm__mapper_dot_mitm__mapper__pb2.TransportCapabilities.FromString,
+                )
 
 
 class MitmMapperServicer(object):
@@ -99,6 +114,12 @@ class MitmMapperServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def RequestLatestDigest(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def SetLevel(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -153,6 +174,21 @@ class MitmMapperServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SubscribeDataUpdates(self, request, context):
+        """Streams the timestamps of the current data of the worker followed by every update of data of the worker
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def NegotiateTransport(self, request, context):
+        """Returns the capabilities of the transport supported by both, the client (as passed) and the server.
+        Servers not implementing it only support Struct/ListValue transport of data.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_MitmMapperServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -171,6 +207,11 @@ def add_MitmMapperServicer_to_server(servicer, server):
                     request_deserializer=mitm__mapper_dot_mitm__mapper__pb2.LatestMitmDataEntryRequest.FromString,
                     response_serializer=mitm__mapper_dot_mitm__mapper__pb2.LatestMitmDataEntryResponse.SerializeToString,
             ),
+            'RequestLatestDigest': grpc.unary_unary_rpc_method_handler(
+                    servicer.RequestLatestDigest,
+                    request_deserializer=mitm__mapper_dot_mitm__mapper__pb2.LatestMitmDataEntryRequest.FromString,
+                    response_serializer=mitm__mapper_dot_mitm__mapper__pb2.LatestMitmDataDigestResponse.SerializeToString,
+            ),
             'SetLevel': grpc.unary_unary_rpc_method_handler(
                     servicer.SetLevel,
                     request_deserializer=mitm__mapper_dot_mitm__mapper__pb2.SetLevelRequest.FromString,
@@ -216,6 +257,16 @@ def add_MitmMapperServicer_to_server(servicer, server):
                     request_deserializer=shared_dot_Worker__pb2.Worker.FromString,
                     response_serializer=mitm__mapper_dot_mitm__mapper__pb2.GetQuestsHeldResponse.SerializeToString,
             ),
+            'SubscribeDataUpdates': grpc.unary_stream_rpc_method_handler(
+                    servicer.SubscribeDataUpdates,
+                    request_deserializer=shared_dot_Worker__pb2.Worker.FromString,
+                    response_serializer=mitm__mapper_dot_mitm__mapper__pb2.DataUpdate.SerializeToString,
+            ),
+            'NegotiateTransport': grpc.unary_unary_rpc_method_handler(
+                    servicer.NegotiateTransport,
+                    request_deserializer=mitm__mapper_dot_mitm__mapper__pb2.TransportCapabilities.FromString,
+                    response_serializer=mitm__mapper_dot_mitm__mapper__pb2.TransportCapabilities.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'mapadroid.mitm_mapper.MitmMapper', rpc_method_handlers)
@@ -277,6 +328,23 @@ class MitmMapper(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def RequestLatestDigest(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mapadroid.mitm_mapper.MitmMapper/RequestLatestDigest',
+            mitm__mapper_dot_mitm__mapper__pb2.LatestMitmDataEntryRequest.SerializeToString,
+            mitm__mapper_dot_mitm__mapper__pb2.LatestMitmDataDigestResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def SetLevel(request,
             target,
@@ -429,3 +497,37 @@ class MitmMapper(object):
             mitm__mapper_dot_mitm__mapper__pb2.GetQuestsHeldResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SubscribeDataUpdates(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/mapadroid.mitm_mapper.MitmMapper/SubscribeDataUpdates',
+            shared_dot_Worker__pb2.Worker.SerializeToString,
+            mitm__mapper_dot_mitm__mapper__pb2.DataUpdate.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def NegotiateTransport(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/mapadroid.mitm_mapper.MitmMapper/NegotiateTransport',
+            mitm__mapper_dot_mitm__mapper__pb2.TransportCapabilities.SerializeToString,
+            mitm__mapper_dot_mitm__mapper__pb2.TransportCapabilities.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -20,6 +20,11 @@ class StatsHandlerStub(object):
                 request_serializer=stats__handler_dot_stats__handler__pb2.Stats.SerializeToString,
                 response_deserializer=shared_dot_Ack__pb2.Ack.FromString,
                 )
+        self.StatsCollectStream = channel.stream_unary(
+                '/mapadroid.stats_handler.StatsHandler/StatsCollectStream',
+                request_serializer=stats__handler_dot_stats__handler__pb2.StatsBatch.SerializeToString,
+                response_deserializer=shared_dot_Ack__pb2.Ack.FromString,
+                )
 
 
 class StatsHandlerServicer(object):
@@ -31,6 +36,13 @@ class StatsHandlerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StatsCollectStream(self, request_iterator, context):
+        """Stats collected by a client over a period of time, split into multiple batches to limit the size of messages
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_StatsHandlerServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -39,6 +51,11 @@ def add_StatsHandlerServicer_to_server(servicer, server):
                     request_deserializer=stats__handler_dot_stats__handler__pb2.Stats.FromString,
                     response_serializer=shared_dot_Ack__pb2.Ack.SerializeToString,
             ),
+            'StatsCollectStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.StatsCollectStream,
+                    request_deserializer=stats__handler_dot_stats__handler__pb2.StatsBatch.FromString,
+                    response_serializer=shared_dot_Ack__pb2.Ack.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'mapadroid.stats_handler.StatsHandler', rpc_method_handlers)
@@ -65,3 +82,20 @@ class StatsHandler(object):
             shared_dot_Ack__pb2.Ack.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StatsCollectStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/mapadroid.stats_handler.StatsHandler/StatsCollectStream',
+            stats__handler_dot_stats__handler__pb2.StatsBatch.SerializeToString,
+            shared_dot_Ack__pb2.Ack.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.utils)
+
+
+class LoginTracker:
+    """
+    Keeps the IP a device has started pogo with by origin until the first proto of the device has been received (i.e.,
+    pogo logged in) or the login has been handled otherwise. The logins are registered with the IP in redis (as used by
+    MappingManager.ip_handle_login_request) in batches rather than one round trip per proto received.
+    The state is only ever touched from the event loop. Flushes are serialised by a lock as they await the pipeline
+    after detaching the pending logins, i.e., once a flush returned, logins registered before have been written.
+    """
+    KEY_EXPIRATION: int = 60 * 60 * 24
+
+    def __init__(self, redis_cache: Redis, ip_timeout: int, flush_interval: float):
+        self._redis_cache: Redis = redis_cache
+        self._ip_timeout: int = ip_timeout
+        self._flush_interval: float = flush_interval
+        # origin -> (IP, time.monotonic() the IP is no longer to be used for the login at)
+        self._ips: Dict[str, Tuple[str, float]] = {}
+        # IP -> {"origin:timestamp": timestamp} of the logins not yet written to redis
+        self._pending: Dict[str, Dict[str, int]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock: asyncio.Lock = asyncio.Lock()
+
+    def start(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self.__flush_regularly())
+
+    async def stop(self) -> None:
+        if self._flush_task is not None:
+            # Not cancelling a flush in flight
+            async with self._flush_lock:
+                self._flush_task.cancel()
+                self._flush_task = None
+        await self.flush()
+
+    def set_ip(self, origin: str, ip: str) -> None:
+        self._ips[origin] = (ip, time.monotonic() + self._ip_timeout)
+
+    def remove(self, origin: str) -> None:
+        self._ips.pop(origin, None)
+
+    def increment(self, origin: str) -> bool:
+        """
+        Registers a login of the origin with the IP set for it, if any. The IP is removed in turn.
+        Returns: True if a login has been registered
+        """
+        ip_entry: Optional[Tuple[str, float]] = self._ips.pop(origin, None)
+        if ip_entry is None:
+            return False
+        ip, valid_until = ip_entry
+        if valid_until < time.monotonic():
+            logger.debug("Increment not needed as the IP stored for {} timed out", origin)
+            return False
+        logger.warning("Incrementing login tracking of {}", origin)
+        now: int = int(time.time())
+        self._pending.setdefault(ip, {})[f"{origin}:{now}"] = now
+        return True
+
+    async def flush(self, ip: Optional[str] = None) -> None:
+        """
+        Writes the logins not yet written to redis
+        Args:
+            ip: Only write the logins registered with the IP given
+        """
+        async with self._flush_lock:
+            await self.__flush(ip)
+
+    async def __flush(self, ip: Optional[str]) -> None:
+        if ip is not None:
+            pending: Dict[str, Dict[str, int]] = {ip: self._pending.pop(ip)} if ip in self._pending else {}
+        else:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            async with self._redis_cache.pipeline() as pipe:
+                for ip_of_logins, logins in pending.items():
+                    await pipe.zadd(ip_of_logins, logins)
+                    await pipe.expire(ip_of_logins, LoginTracker.KEY_EXPIRATION)
+                await pipe.execute()
+        except asyncio.CancelledError:
+            self.__restore(pending)
+            raise
+        except Exception as e:
+            logger.warning("Failed writing login tracking of {} IPs, retrying with the next flush: {}",
+                           len(pending), e)
+            self.__restore(pending)
+            return
+        logger.debug("Wrote {} logins of {} IPs to login tracking", sum(len(logins) for logins in pending.values()),
+                     len(pending))
+
+    def __restore(self, pending: Dict[str, Dict[str, int]]) -> None:
+        for ip_of_logins, logins in pending.items():
+            self._pending.setdefault(ip_of_logins, {}).update(logins)
+
+    async def __flush_regularly(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
@@ -1,6 +1,5 @@
 import asyncio
 import copy
-import time
 from asyncio import Task
 from datetime import datetime
 from threading import Event
@@ -33,6 +32,7 @@ from mapadroid.db.model import (SettingsArea, SettingsAuth, SettingsDevice,
 from mapadroid.geofence.geofenceHelper import GeofenceHelper
 from mapadroid.mapping_manager.AbstractMappingManager import \
     AbstractMappingManager
+from mapadroid.mapping_manager.LoginTracker import LoginTracker
 from mapadroid.mapping_manager.MappingManagerDevicemappingKey import \
     MappingManagerDevicemappingKey
 from mapadroid.route.prioq.strategy.AbstractRoutePriorityQueueStrategy import \
@@ -105,8 +105,8 @@ class AreaEntry:
 
 
 class MappingManager(AbstractMappingManager):
-    LOGIN_TRACKING_KEY_ORIGIN_IP_MAPPED: str = "login_tracking_ip_{}"
     LOGIN_TRACKING_TIMEOUT_ORIGIN_IP_MAPPED: int = 300
+    LOGIN_TRACKING_FLUSH_INTERVAL: float = 5.0
 
     def __init__(self, db_wrapper: DbWrapper, account_handler: AbstractAccountHandler, configmode: bool = False):
         self.__jobstatus: Dict = {}
@@ -128,6 +128,7 @@ class MappingManager(AbstractMappingManager):
         self.__mappings_mutex: Optional[asyncio.Lock] = None
         self.__ptc_mutex: Optional[asyncio.Lock] = None
         self._redis_cache: Optional[Redis] = None
+        self._login_tracker: Optional[LoginTracker] = None
 
     async def setup(self):
         self.__mappings_mutex: asyncio.Lock = asyncio.Lock()
@@ -152,9 +153,14 @@ class MappingManager(AbstractMappingManager):
             await self._redis_cache.ping()
         else:
             self._redis_cache = await self.__db_wrapper.get_cache()
+        self._login_tracker = LoginTracker(self._redis_cache, MappingManager.LOGIN_TRACKING_TIMEOUT_ORIGIN_IP_MAPPED,
+                                           MappingManager.LOGIN_TRACKING_FLUSH_INTERVAL)
+        self._login_tracker.start()
 
-    def shutdown(self):
+    async def shutdown(self):
         logger.info("MappingManager exiting")
+        if self._login_tracker:
+            await self._login_tracker.stop()
 
     async def get_auths(self) -> Optional[Dict[str, SettingsAuth]]:
         return self._auths
@@ -364,37 +370,21 @@ class MappingManager(AbstractMappingManager):
     async def increment_login_tracking_by_origin(self, origin: str) -> bool:
         """
         Increments the login tracking counter for the IP stored mapped to the origin if there is one.
+        The login is written to redis with the next flush of the login tracker.
         """
-        if not self.__ptc_mutex:
+        if not self._login_tracker:
             return True
-        async with self.__ptc_mutex:
-            now = int(time.time())
-            ip_retrieved: Optional[str] = await self._redis_cache.get(
-                MappingManager.LOGIN_TRACKING_KEY_ORIGIN_IP_MAPPED.format(origin))
-            if not ip_retrieved:
-                logger.debug("Increment not needed as the IP was not stored for {}", origin)
-                return False
-            await self._redis_cache.delete(MappingManager.LOGIN_TRACKING_KEY_ORIGIN_IP_MAPPED.format(origin))
-        logger.warning("Incrementing login tracking of {}", origin)
-        async with self._redis_cache.pipeline() as pipe:
-            pipe.multi()
-            await pipe.zadd(ip_retrieved, {f"{origin}:{now}": now})
-            await pipe.expire(ip_retrieved, 60 * 60 * 24)
-            await pipe.execute()
-        return True
+        return self._login_tracker.increment(origin)
 
     async def login_tracking_set_ip(self, origin: str, ip: str) -> None:
-        if not self.__ptc_mutex:
+        if not self._login_tracker:
             return
-        await self._redis_cache.set(name=MappingManager.LOGIN_TRACKING_KEY_ORIGIN_IP_MAPPED.format(origin),
-                                    value=ip,
-                                    ex=MappingManager.LOGIN_TRACKING_TIMEOUT_ORIGIN_IP_MAPPED)
+        self._login_tracker.set_ip(origin, ip)
 
     async def login_tracking_remove_value(self, origin: str) -> None:
-        if not self.__ptc_mutex:
+        if not self._login_tracker:
             return
-        async with self.__ptc_mutex:
-            await self._redis_cache.delete(MappingManager.LOGIN_TRACKING_KEY_ORIGIN_IP_MAPPED.format(origin))
+        self._login_tracker.remove(origin)
 
     async def ip_handle_login_request(self, ip, origin, limit_seconds=None, limit_count=None,
                                       increment_count: bool = True) -> bool:
@@ -407,6 +397,8 @@ class MappingManager(AbstractMappingManager):
         now = int(datetime.timestamp(datetime.now()))
         async with self.__ptc_mutex:
             logger.warning(f"Handle PTC login request on {ip}")
+            # Logins of the IP not yet written are to be counted as well
+            await self._login_tracker.flush(ip)
             async with self._redis_cache.pipeline() as pipe:
                 while True:
                     try:
@@ -11,3 +11,9 @@ class AbstractMitmDataProcessingManager(ABC):
 
     def get_queue(self) -> asyncio.Queue:
         return self._mitm_data_queue
+
+    def get_queue_size(self) -> int:
+        """
+        Returns: The amount of items that are waiting to be processed
+        """
+        return self._mitm_data_queue.qsize()
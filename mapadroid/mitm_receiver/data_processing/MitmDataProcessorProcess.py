@@ -0,0 +1,133 @@
+import asyncio
+import os
+import time
+from multiprocessing import Process
+from multiprocessing.queues import Queue
+from multiprocessing.sharedctypes import Synchronized
+from typing import Optional, Tuple
+
+from loguru import logger
+from orjson import orjson
+
+from mapadroid.account_handler import setup_account_handler
+from mapadroid.account_handler.AbstractAccountHandler import \
+    AbstractAccountHandler
+from mapadroid.data_handler.grpc.MitmMapperClientConnector import \
+    MitmMapperClientConnector
+from mapadroid.data_handler.grpc.StatsHandlerClientConnector import \
+    StatsHandlerClientConnector
+from mapadroid.data_handler.mitm_data.AbstractMitmMapper import \
+    AbstractMitmMapper
+from mapadroid.data_handler.mitm_data.MitmMapperType import MitmMapperType
+from mapadroid.data_handler.mitm_data.RedisMitmMapper import RedisMitmMapper
+from mapadroid.data_handler.stats.AbstractStatsHandler import \
+    AbstractStatsHandler
+from mapadroid.db.DbFactory import DbFactory
+from mapadroid.mitm_receiver.data_processing.SerializedMitmDataProcessor import \
+    SerializedMitmDataProcessor
+from mapadroid.utils.EnvironmentUtil import setup_loggers
+from mapadroid.utils.logging import init_logging
+from mapadroid.utils.madGlobals import MadGlobals
+from mapadroid.utils.questGen import QuestGen
+from mapadroid.utils.RestHelper import RestHelper
+
+
+class MitmDataProcessorProcess(Process):
+    """
+    A single shard of the ProcessMitmDataProcessingManager. Runs its own asyncio loop with its own DB/Redis pool,
+     MitmMapper and StatsHandler clients and works off the items placed in the shard's IPC queue in order.
+    Items on the IPC queue are tuples of (enqueue time, received timestamp, origin, orjson serialized proto). None
+     signals the shard to drain the items queued up to that point and stop.
+    """
+    def __init__(self, shard: int, ipc_queue: Queue, application_args,
+                 processed: Synchronized, latency_total_ms: Synchronized, latency_last_ms: Synchronized,
+                 processing_total_ms: Synchronized):
+        super().__init__(name="MitmDataProcessorProcess-%s" % str(shard), daemon=True)
+        self._shard: int = shard
+        self._ipc_queue: Queue = ipc_queue
+        self._application_args = application_args
+        # Metrics shared with the parent process
+        self._processed: Synchronized = processed
+        self._latency_total_ms: Synchronized = latency_total_ms
+        self._latency_last_ms: Synchronized = latency_last_ms
+        self._processing_total_ms: Synchronized = processing_total_ms
+
+    def run(self):
+        # The process is spawned, the arguments need to be loaded once again
+        MadGlobals.application_args = self._application_args
+        os.environ['LANGUAGE'] = MadGlobals.application_args.language
+        init_logging(MadGlobals.application_args, print_info=False)
+        setup_loggers()
+        try:
+            asyncio.run(self._run_shard())
+        except KeyboardInterrupt:
+            logger.info("Received keyboard interrupt, stopping MITM data processor shard {}", self._shard)
+
+    async def _run_shard(self):
+        with logger.contextualize(identifier="shard-%s" % str(self._shard), name="mitm-processor"):
+            db_wrapper, db_exec = await DbFactory.get_wrapper(MadGlobals.application_args,
+                                                              MadGlobals.application_args.db_poolsize)
+            mitm_mapper_connector: Optional[MitmMapperClientConnector] = None
+            if MadGlobals.application_args.mitmmapper_type == MitmMapperType.grpc:
+                mitm_mapper_connector = MitmMapperClientConnector()
+                await mitm_mapper_connector.start()
+                mitm_mapper: AbstractMitmMapper = await mitm_mapper_connector.get_client()
+            else:
+                mitm_mapper: AbstractMitmMapper = RedisMitmMapper(db_wrapper)
+                await mitm_mapper.start()
+            stats_handler_connector = StatsHandlerClientConnector()
+            await stats_handler_connector.start()
+            stats_handler: AbstractStatsHandler = await stats_handler_connector.get_client()
+            await stats_handler.start()
+            quest_gen: QuestGen = QuestGen()
+            await quest_gen.setup()
+            account_handler: AbstractAccountHandler = await setup_account_handler(db_wrapper)
+
+            data_queue: asyncio.Queue = asyncio.Queue()
+            data_processor: SerializedMitmDataProcessor = SerializedMitmDataProcessor(
+                data_queue,
+                stats_handler,
+                mitm_mapper,
+                db_wrapper,
+                quest_gen,
+                account_handler=account_handler,
+                name="DataProc-%s" % str(self._shard),
+                on_item_processed=self._on_item_processed)
+            loop = asyncio.get_running_loop()
+            processor_task = loop.create_task(data_processor.run())
+            logger.info("Started MITM data processor shard {} (pid {})", self._shard, os.getpid())
+            try:
+                await self._read_ipc_queue(data_queue)
+                await processor_task
+            finally:
+                logger.info("MITM data processor shard {} drained, shutting down", self._shard)
+                if mitm_mapper_connector:
+                    await mitm_mapper.shutdown()
+                    await mitm_mapper_connector.close()
+                await stats_handler.shutdown()
+                await stats_handler_connector.close()
+                await RestHelper.close()
+                await db_exec.shutdown()
+
+    async def _read_ipc_queue(self, data_queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await loop.run_in_executor(None, self._ipc_queue.get)
+            if item is None:
+                await data_queue.put(None)
+                return
+            enqueued_at, received_timestamp, origin, raw_data = item
+            data = orjson.loads(raw_data)
+            del raw_data
+            await data_queue.put((received_timestamp, data, origin, enqueued_at))
+
+    def _on_item_processed(self, item: Tuple, processing_time_ms: int) -> None:
+        enqueued_at: float = item[3]
+        latency_ms: int = int((time.time() - enqueued_at) * 1000)
+        with self._processed.get_lock():
+            self._processed.value += 1
+        with self._latency_total_ms.get_lock():
+            self._latency_total_ms.value += latency_ms
+        with self._processing_total_ms.get_lock():
+            self._processing_total_ms.value += processing_time_ms
+        self._latency_last_ms.value = latency_ms
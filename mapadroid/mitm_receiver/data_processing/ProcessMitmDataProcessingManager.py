@@ -1,48 +1,146 @@
 import asyncio
 import multiprocessing
+import time
+import zlib
 from asyncio import Task
-from typing import List, Optional
+from multiprocessing.queues import Queue
+from typing import Dict, List, Optional, Union
+
+from loguru import logger
+from orjson import orjson
 
-from mapadroid.data_handler.mitm_data import AbstractMitmMapper
-from mapadroid.data_handler.stats import AbstractStatsHandler
-from mapadroid.db import DbWrapper
 from mapadroid.mitm_receiver.data_processing.AbstractMitmDataProcessingManager import \
     AbstractMitmDataProcessingManager
-from mapadroid.mitm_receiver.data_processing.InProcessMitmDataProcessorManager import \
-    InProcessMitmDataProcessorManager
+from mapadroid.mitm_receiver.data_processing.MitmDataProcessorProcess import \
+    MitmDataProcessorProcess
 from mapadroid.utils.madGlobals import MadGlobals
-from mapadroid.utils.questGen import QuestGen
 
 
 class ProcessMitmDataProcessingManager(AbstractMitmDataProcessingManager):
     """
     In order to utilize as many cores as possible properly, a mitm data processing asyncio loop needs to be started for
      each core available.
-     This class handles the creation of processes accordingly.
+     This class handles the creation of processes accordingly. Data placed in the queue of the manager is sharded by
+     origin to the processes in order for the protos of a single device to be processed in order.
     """
-    _data_queue: multiprocessing.Queue
-    _db_wrapper: Optional[DbWrapper]
-    _worker_threads: List[Task]
-    _mitm_mapper: AbstractMitmMapper
-    _stats_handler: AbstractStatsHandler
-    _quest_gen: QuestGen
-    _all_queues_of_processors: List[asyncio.Queue]
-
-    def __init__(self):
+    _shard_queues: List[Queue]
+    _processes: List[MitmDataProcessorProcess]
+    _feeder_task: Optional[Task]
+    _stats_task: Optional[Task]
+
+    def __init__(self, amount_of_processes: int):
         super().__init__()
-        self._all_queues_of_processors = []
+        self._amount_of_processes: int = max(1, amount_of_processes)
+        # Spawn rather than fork as the parent is running an asyncio loop along with its connections
+        self._mp_context = multiprocessing.get_context("spawn")
+        self._shard_queues = []
+        self._processes = []
+        self._feeder_task = None
+        self._stats_task = None
+        self._processed: List = []
+        self._latency_total_ms: List = []
+        self._latency_last_ms: List = []
+        self._processing_total_ms: List = []
 
     async def launch_processors(self):
-        for i in range(MadGlobals.application_args.mitmreceiver_data_workers):
-            # As this loop starts processes, shared asyncio queues are not possible and need to be created and filled
-            #  by this manager.
+        for shard in range(self._amount_of_processes):
+            shard_queue: Queue = self._mp_context.Queue()
+            processed = self._mp_context.Value("Q", 0)
+            latency_total_ms = self._mp_context.Value("Q", 0)
+            latency_last_ms = self._mp_context.Value("Q", 0)
+            processing_total_ms = self._mp_context.Value("Q", 0)
+            data_processor: MitmDataProcessorProcess = MitmDataProcessorProcess(
+                shard, shard_queue, MadGlobals.application_args,
+                processed, latency_total_ms, latency_last_ms, processing_total_ms)
+            data_processor.start()
+            self._shard_queues.append(shard_queue)
+            self._processes.append(data_processor)
+            self._processed.append(processed)
+            self._latency_total_ms.append(latency_total_ms)
+            self._latency_last_ms.append(latency_last_ms)
+            self._processing_total_ms.append(processing_total_ms)
+        logger.info("Started {} MITM data processor processes", self._amount_of_processes)
+        loop = asyncio.get_running_loop()
+        self._feeder_task = loop.create_task(self._feed_shards())
+        self._stats_task = loop.create_task(self._log_shard_stats())
 
-            data_processor: InProcessMitmDataProcessorManager = InProcessMitmDataProcessorManager(
-                queue_of_task,
-                self._mitm_mapper,
-                self._db_wrapper,
-                self._quest_gen,
-                name="SerialiedMitmDataProcessor-%s" % str(i))
+    def _get_shard(self, origin: str) -> int:
+        # crc32 rather than hash() to have a deterministic distribution across restarts
+        return zlib.crc32(origin.encode("utf8")) % self._amount_of_processes
 
-            data_processor.start()
-            self._worker_threads.append(data_processor)
+    async def _feed_shards(self) -> None:
+        while True:
+            item = await self._mitm_data_queue.get()
+            try:
+                if item is None:
+                    logger.info("Received signal to stop feeding MITM data processor processes")
+                    break
+                received_timestamp, data, origin = item
+                raw_data: bytes = orjson.dumps(data)
+                self._shard_queues[self._get_shard(origin)].put((time.time(), received_timestamp, origin, raw_data))
+                del item
+            except Exception as e:
+                logger.warning("Failed placing data in shard: {}", e)
+            finally:
+                self._mitm_data_queue.task_done()
+        for shard_queue in self._shard_queues:
+            shard_queue.put(None)
+
+    def get_queue_size(self) -> int:
+        return self._mitm_data_queue.qsize() + sum(self.__get_shard_queue_size(shard_queue)
+                                                   for shard_queue in self._shard_queues)
+
+    @staticmethod
+    def __get_shard_queue_size(shard_queue: Queue) -> int:
+        try:
+            return shard_queue.qsize()
+        except NotImplementedError:
+            # qsize is not available on all platforms (e.g., macOS)
+            return 0
+
+    def get_shard_stats(self) -> List[Dict[str, Union[int, float, bool]]]:
+        """
+        Returns: List of stats of each shard, i.e. the current depth of the queue, the amount of protos processed
+         and the average time (ms) taken from placing protos in the shard queue until they are processed as well as
+         the average processing time (ms).
+        """
+        stats: List[Dict[str, Union[int, float, bool]]] = []
+        for shard, data_processor in enumerate(self._processes):
+            processed: int = self._processed[shard].value
+            stats.append({
+                "shard": shard,
+                "alive": data_processor.is_alive(),
+                "queue_depth": self.__get_shard_queue_size(self._shard_queues[shard]),
+                "processed": processed,
+                "latency_avg_ms": self._latency_total_ms[shard].value / processed if processed else 0,
+                "latency_last_ms": self._latency_last_ms[shard].value,
+                "processing_avg_ms": self._processing_total_ms[shard].value / processed if processed else 0
+            })
+        return stats
+
+    async def _log_shard_stats(self) -> None:
+        while True:
+            await asyncio.sleep(60)
+            for shard_stats in self.get_shard_stats():
+                logger.info("MITM data processor shard {shard}: alive={alive}, queue_depth={queue_depth}, "
+                            "processed={processed}, latency_avg={latency_avg_ms:.1f}ms, "
+                            "latency_last={latency_last_ms}ms, processing_avg={processing_avg_ms:.1f}ms",
+                            **shard_stats)
+
+    async def shutdown(self):
+        logger.info("Draining {} MITM data processor processes", len(self._processes))
+        if self._feeder_task and not self._feeder_task.done():
+            # Anything placed in the queue before the stop signal is still being handed to the shards
+            await self._mitm_data_queue.put(None)
+            await self._feeder_task
+        if self._stats_task:
+            self._stats_task.cancel()
+        loop = asyncio.get_running_loop()
+        for data_processor in self._processes:
+            await loop.run_in_executor(None, data_processor.join, 60)
+            if data_processor.is_alive():
+                logger.warning("MITM data processor {} did not drain in time, terminating", data_processor.name)
+                data_processor.terminate()
+        for shard_queue in self._shard_queues:
+            shard_queue.close()
+        logger.info("Stopped MITM data processor processes")
@@ -1,7 +1,7 @@
 import asyncio
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 import sqlalchemy
 from loguru import logger
@@ -23,13 +23,14 @@ from mapadroid.utils.gamemechanicutil import determine_current_quest_layer
 from mapadroid.utils.madGlobals import (MadGlobals, MitmReceiverRetry,
                                         MonSeenTypes, QuestLayer)
 from mapadroid.utils.questGen import QuestGen
+from mapadroid.webhook.WebhookEventStream import WebhookEventStream
 
 
 class SerializedMitmDataProcessor:
     def __init__(self, data_queue: asyncio.Queue, stats_handler: AbstractStatsHandler,
                  mitm_mapper: AbstractMitmMapper, db_wrapper: DbWrapper, quest_gen: QuestGen,
                  account_handler: AbstractAccountHandler,
-                 name=None):
+                 name=None, on_item_processed: Optional[Callable[[Tuple, int], None]] = None):
         self.__queue: asyncio.Queue = data_queue
         self.__db_wrapper: DbWrapper = db_wrapper
         self.__db_submit: DbPogoProtoSubmit = db_wrapper.proto_submit
@@ -38,9 +39,18 @@ class SerializedMitmDataProcessor:
         self.__quest_gen: QuestGen = quest_gen
         self.__name = name
         self.__account_handler: AbstractAccountHandler = account_handler
+        # Called with the queue item and the time taken to process it in ms once an item has been processed
+        self.__on_item_processed: Optional[Callable[[Tuple, int], None]] = on_item_processed
+        self.__webhook_event_stream: Optional[WebhookEventStream] = None
+
+    async def __publish_webhook_events(self, session) -> None:
+        if self.__webhook_event_stream:
+            await self.__webhook_event_stream.publish_recorded(session)
 
     async def run(self):
         logger.info("Starting serialized MITM data processor")
+        if MadGlobals.application_args.webhook_event_stream:
+            self.__webhook_event_stream = WebhookEventStream(await self.__db_wrapper.get_cache())
         # TODO: use event to stop... Remove try/catch...
         with logger.contextualize(identifier=self.__name, name="mitm-processor"):
             while True:
@@ -54,6 +64,8 @@ class SerializedMitmDataProcessor:
                         with logger.contextualize(identifier=item[2], name="mitm-processor"):
                             await self.process_data(received_timestamp=item[0], data=item[1],
                                                     origin=item[2])
+                        if self.__on_item_processed:
+                            self.__on_item_processed(item, self.get_time_ms() - start_time)
                         del item
                     except (sqlalchemy.exc.IntegrityError, MitmReceiverRetry, sqlalchemy.exc.InternalError) as e:
                         logger.info("Failed submitting data to DB, rescheduling. {}", e)
@@ -112,6 +124,7 @@ class SerializedMitmDataProcessor:
                             if new_quest:
                                 await self.__stats_handler.stats_collect_quest(origin, processed_timestamp)
                             await session.commit()
+                            await self.__publish_webhook_events(session)
                     except Exception as e:
                         logger.warning("Failed submitting quests to DB: {}", e)
 
@@ -123,6 +136,7 @@ class SerializedMitmDataProcessor:
                     try:
                         await self.__db_submit.stop_details(session, data["payload"])
                         await session.commit()
+                        await self.__publish_webhook_events(session)
                     except Exception as e:
                         logger.warning("Failed fort details to DB: {}", e)
 
@@ -144,6 +158,7 @@ class SerializedMitmDataProcessor:
                     try:
                         await self.__db_submit.gym(session, data["payload"])
                         await session.commit()
+                        await self.__publish_webhook_events(session)
                     except Exception as e:
                         logger.warning("Failed submitting gym info to DB: {}", e)
 
@@ -164,6 +179,7 @@ class SerializedMitmDataProcessor:
                 if MadGlobals.application_args.game_stats:
                     await self.__db_submit.update_seen_type_stats(session, lure_encounter=[lure_encounter])
                 await session.commit()
+                await self.__publish_webhook_events(session)
             end_time = self.get_time_ms() - start_time
             logger.debug("Done processing lure encounter in {}ms", end_time)
 
@@ -176,6 +192,7 @@ class SerializedMitmDataProcessor:
                 encounter: Optional[Tuple[int, bool]] = await self.__db_submit.mon_iv(session,
                                                                                       received_timestamp,
                                                                                       data["payload"])
+                await self.__publish_webhook_events(session)
             if MadGlobals.application_args.game_stats and encounter:
                 encounter_id, is_shiny = encounter
                 loop = asyncio.get_running_loop()
@@ -269,6 +286,7 @@ class SerializedMitmDataProcessor:
             try:
                 lure_wild = await self.__db_submit.mon_lure_noiv(session, received_timestamp, data["payload"])
                 await session.commit()
+                await self.__publish_webhook_events(session)
             except Exception as e:
                 logger.warning("Failed submitting lure no iv: {}", e)
         lure_processing_time = self.get_time_ms() - lurenoiv_start
@@ -283,6 +301,7 @@ class SerializedMitmDataProcessor:
                 cell_encounters, stop_encounters = await self.__db_submit.mons_nearby(session, received_timestamp,
                                                                                       data["payload"])
                 await session.commit()
+                await self.__publish_webhook_events(session)
             except Exception as e:
                 logger.warning("Failed submitting nearby mons: {}", e)
         nearby_mons_time = self.get_time_ms() - nearby_mons_time_start
@@ -297,6 +316,7 @@ class SerializedMitmDataProcessor:
                                                                    received_timestamp,
                                                                    data["payload"])
                 await session.commit()
+                await self.__publish_webhook_events(session)
             except Exception as e:
                 logger.warning("Failed submitting wild mons: {}", e)
         mons_time = self.get_time_ms() - mons_time_start
@@ -341,6 +361,7 @@ class SerializedMitmDataProcessor:
             try:
                 amount_raids = await self.__db_submit.raids(session, data["payload"], timestamp)
                 await session.commit()
+                await self.__publish_webhook_events(session)
             except Exception as e:
                 logger.warning("Failed submitting raids: {}", e)
         raids_time = self.get_time_ms() - raids_time_start
@@ -365,6 +386,7 @@ class SerializedMitmDataProcessor:
             try:
                 await self.__db_submit.gyms(session, data["payload"], received_timestamp)
                 await session.commit()
+                await self.__publish_webhook_events(session)
             except Exception as e:
                 logger.warning("Failed submitting gyms: {}", e)
         gyms_time = self.get_time_ms() - gyms_time_start
@@ -376,6 +398,7 @@ class SerializedMitmDataProcessor:
             try:
                 await self.__db_submit.stops(session, data["payload"])
                 await session.commit()
+                await self.__publish_webhook_events(session)
             except Exception as e:
                 logger.warning("Failed submitting stops: {}", e)
                 logger.exception(e)
@@ -388,6 +411,7 @@ class SerializedMitmDataProcessor:
             try:
                 await self.__db_submit.weather(session, data["payload"], received_timestamp)
                 await session.commit()
+                await self.__publish_webhook_events(session)
             except Exception as e:
                 logger.warning("Failed submitting weather: {}", e)
         weather_time = self.get_time_ms() - weather_time_start
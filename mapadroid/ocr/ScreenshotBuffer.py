@@ -0,0 +1,153 @@
+import asyncio
+import time
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from aiofile import async_open
+from loguru import logger
+
+from mapadroid.utils.madGlobals import ScreenshotType
+
+
+class ScreenshotPipelineStats:
+    """
+    Decodes of screenshots and durations of the OCR stages run on the decoded screenshots
+    """
+    def __init__(self):
+        self.screenshots: int = 0
+        self.decodes: int = 0
+        self.decode_failures: int = 0
+        self.decode_duration_total: float = 0.0
+        self.files_written: int = 0
+        # stage -> [calls, duration total, duration max]
+        self.stages: Dict[str, list] = {}
+
+    def add_decode(self, duration: float, failed: bool) -> None:
+        self.decodes += 1
+        if failed:
+            self.decode_failures += 1
+        self.decode_duration_total += duration
+
+    def add_stage(self, stage: str, duration: float) -> None:
+        stage_stats: Optional[list] = self.stages.get(stage)
+        if stage_stats is None:
+            stage_stats = [0, 0.0, 0.0]
+            self.stages[stage] = stage_stats
+        stage_stats[0] += 1
+        stage_stats[1] += duration
+        stage_stats[2] = max(stage_stats[2], duration)
+
+    def __str__(self):
+        stages: str = ", ".join(f"{stage} {calls}x avg {total / calls:.3f}s / max {maximum:.3f}s"
+                                for stage, (calls, total, maximum) in self.stages.items())
+        return (f"{self.screenshots} screenshots, {self.decodes} decodes ({self.decode_failures} failed, "
+                f"{self.decode_duration_total:.3f}s), {self.files_written} written to disk, stages: {stages or '-'}")
+
+
+class SharedScreenshot:
+    """
+    Reference to a decoded screenshot in shared memory, passed to OCR stages run in other processes instead of the
+    image itself
+    """
+    def __init__(self, name: str, shape: Tuple[int, ...], dtype: str):
+        self.name: str = name
+        self.shape: Tuple[int, ...] = shape
+        self.dtype: str = dtype
+
+    def run(self, func: Callable, *args) -> Any:
+        """
+        Runs the function with the image (BGR) as first argument. The image is a view of the shared memory and must
+        neither be modified nor be referenced by the result.
+        Raises: FileNotFoundError if the screenshot has been closed already
+        """
+        shared_memory: SharedMemory = SharedMemory(name=self.name)
+        try:
+            image: np.ndarray = np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=shared_memory.buf)
+            try:
+                return func(image, *args)
+            finally:
+                del image
+        finally:
+            try:
+                shared_memory.close()
+            except BufferError:
+                # The image is still referenced by the traceback of an exception, the mapping is released along with it
+                pass
+
+
+class ScreenshotBuffer:
+    """
+    Screenshot of a device kept in memory as received (encoded). The image is decoded once upon first use and copied
+    to shared memory once if OCR stages are run in other processes. The screenshot is only written to disk if asked
+    to (e.g. for the preview in madmin). Closing the buffer releases the shared memory.
+    """
+    _stats: ScreenshotPipelineStats = ScreenshotPipelineStats()
+
+    def __init__(self, encoded: bytes, screenshot_type: ScreenshotType = ScreenshotType.JPEG):
+        self.encoded: bytes = encoded
+        self.screenshot_type: ScreenshotType = screenshot_type
+        self.taken_at: float = time.time()
+        self._image: Optional[np.ndarray] = None
+        self._decoded: bool = False
+        self._decode_lock: asyncio.Lock = asyncio.Lock()
+        self._shared_memory: Optional[SharedMemory] = None
+        self._shared: Optional[SharedScreenshot] = None
+        ScreenshotBuffer._stats.screenshots += 1
+
+    @staticmethod
+    def get_stats() -> ScreenshotPipelineStats:
+        return ScreenshotBuffer._stats
+
+    async def get_image(self) -> Optional[np.ndarray]:
+        """
+        Returns: The decoded image (BGR) or None if the screenshot is corrupted. The image is shared by the callers
+        and must not be modified.
+        """
+        async with self._decode_lock:
+            if not self._decoded:
+                loop = asyncio.get_running_loop()
+                self._image = await loop.run_in_executor(None, self.__decode)
+                self._decoded = True
+        return self._image
+
+    async def share(self) -> Optional[SharedScreenshot]:
+        """
+        Returns: Reference to the decoded image in shared memory or None if the screenshot is corrupted
+        """
+        image: Optional[np.ndarray] = await self.get_image()
+        if image is None:
+            return None
+        if self._shared is None:
+            self._shared_memory = SharedMemory(create=True, size=image.nbytes)
+            np.ndarray(image.shape, dtype=image.dtype, buffer=self._shared_memory.buf)[:] = image
+            self._shared = SharedScreenshot(self._shared_memory.name, image.shape, image.dtype.str)
+        return self._shared
+
+    async def write_to(self, path: str) -> bool:
+        try:
+            async with async_open(path, "wb") as fh:
+                await fh.write(self.encoded)
+        except OSError as e:
+            logger.error("Could not save screenshot to {}: {}", path, e)
+            return False
+        ScreenshotBuffer._stats.files_written += 1
+        return True
+
+    def close(self) -> None:
+        if self._shared_memory is not None:
+            self._shared_memory.close()
+            self._shared_memory.unlink()
+            self._shared_memory = None
+            self._shared = None
+
+    def __decode(self) -> Optional[np.ndarray]:
+        start: float = time.perf_counter()
+        image: Optional[np.ndarray] = None
+        try:
+            image = cv2.imdecode(np.frombuffer(self.encoded, dtype=np.uint8), cv2.IMREAD_COLOR)
+        except cv2.error as e:
+            logger.warning("Failed decoding screenshot: {}", e)
+        ScreenshotBuffer._stats.add_decode(time.perf_counter() - start, image is None)
+        return image
@@ -16,9 +16,11 @@ from mapadroid.mapping_manager import MappingManager
 from mapadroid.mapping_manager.MappingManagerDevicemappingKey import \
     MappingManagerDevicemappingKey
 from mapadroid.ocr.screen_type import ScreenType
+from mapadroid.ocr.ScreenshotBuffer import ScreenshotBuffer
 from mapadroid.utils.collections import Location, ScreenCoordinates
 from mapadroid.utils.madGlobals import MadGlobals, ScreenshotType
 from mapadroid.websocket.AbstractCommunicator import AbstractCommunicator
+from mapadroid.websocket.CommandBatch import CommandBatch
 from mapadroid.worker.WorkerState import WorkerState
 
 
@@ -352,7 +354,7 @@ class WordToScreenMatching(object):
         return screentype
 
     async def __check_pogo_screen_ban_or_loading(self, screentype, y_offset: int = 0) -> ScreenType:
-        backgroundcolor = await self._worker_state.pogo_windows.most_frequent_colour(await self.get_screenshot_path(),
+        backgroundcolor = await self._worker_state.pogo_windows.most_frequent_colour(self._worker_state.last_screenshot,
                                                                                      self._worker_state.origin,
                                                                                      y_offset=y_offset)
         if backgroundcolor is not None and (
@@ -460,14 +462,16 @@ class WordToScreenMatching(object):
         # username
         await self._communicator.click(int(self._width / 2), int(username_y))
         await asyncio.sleep(.5)
-        await self._communicator.enter_text(self._worker_state.active_account.username)
-        await self._communicator.click(100, 100)
+        await self._communicator.run_batch(CommandBatch()
+                                           .enter_text(self._worker_state.active_account.username)
+                                           .click(100, 100))
         await asyncio.sleep(2)
         # password
         await self._communicator.click(int(self._width / 2), int(password_y))
         await asyncio.sleep(.5)
-        await self._communicator.enter_text(self._worker_state.active_account.password)
-        await self._communicator.click(100, 100)
+        await self._communicator.run_batch(CommandBatch()
+                                           .enter_text(self._worker_state.active_account.password)
+                                           .click(100, 100))
         await asyncio.sleep(2)
         # button for actual login
         if MadGlobals.application_args.enable_login_tracking and self._worker_state.active_account.login_type == LoginType.ptc.name:
@@ -505,22 +509,24 @@ class WordToScreenMatching(object):
             return ScreenType.ERROR
         logger.info("Click accept button")
         if self._width == 720 and self._height == 1280:
-            await self._communicator.touch_and_hold(int(360), int(1080), int(360), int(500))
-            await self._communicator.click(480, 1080)
+            await self._communicator.run_batch(CommandBatch()
+                                               .touch_and_hold(int(360), int(1080), int(360), int(500))
+                                               .click(480, 1080))
         if self._width == 1080 and self._height == 1920:
-            await self._communicator.touch_and_hold(int(360), int(1800), int(360), int(400))
-            await self._communicator.click(830, 1638)
+            await self._communicator.run_batch(CommandBatch()
+                                               .touch_and_hold(int(360), int(1800), int(360), int(400))
+                                               .click(830, 1638))
         if self._width == 1440 and self._height == 2560:
-            await self._communicator.touch_and_hold(int(360), int(2100), int(360), int(400))
-            await self._communicator.click(976, 2180)
+            await self._communicator.run_batch(CommandBatch()
+                                               .touch_and_hold(int(360), int(2100), int(360), int(400))
+                                               .click(976, 2180))
         await asyncio.sleep(10)
         return ScreenType.UNDEFINED
 
     async def __handle_returning_player_or_wrong_credentials(self) -> None:
         self._nextscreen = ScreenType.UNDEFINED
-        screenshot_path = await self.get_screenshot_path()
         coordinates: Optional[ScreenCoordinates] = await self._worker_state.pogo_windows.look_for_button(
-            screenshot_path,
+            self._worker_state.last_screenshot,
             2.20, 3.01,
             upper=True)
         if coordinates:
@@ -532,8 +538,10 @@ class WordToScreenMatching(object):
         self._nextscreen = ScreenType.RETURNING
         click_x = int((self._width / 2) + (self._width / 4))
         click_y = int((self._height / 1.69) + self._screenshot_y_offset)
-        await self._communicator.click(click_x, click_y)
-        await self._communicator.touch_and_hold(click_x, click_y, click_x, int(click_y - (self._height / 2)), 200)
+        await self._communicator.run_batch(CommandBatch()
+                                           .click(click_x, click_y)
+                                           .touch_and_hold(click_x, click_y, click_x,
+                                                           int(click_y - (self._height / 2)), 200))
         await asyncio.sleep(1)
         await self._communicator.touch_and_hold(click_x, click_y, click_x, int(click_y - (self._height / 2)), 200)
         await asyncio.sleep(1)
@@ -546,9 +554,8 @@ class WordToScreenMatching(object):
 
     async def __handle_welcome_screen(self) -> ScreenType:
         #self._nextscreen = ScreenType.TOS
-        screenshot_path = await self.get_screenshot_path()
         coordinates: Optional[ScreenCoordinates] = await self._worker_state.pogo_windows.look_for_button(
-            screenshot_path,
+            self._worker_state.last_screenshot,
             2.20, 3.01,
             upper=True)
         if coordinates:
@@ -559,10 +566,9 @@ class WordToScreenMatching(object):
 
     async def __handle_tos_screen(self) -> ScreenType:
         #self._nextscreen = ScreenType.PRIVACY
-        screenshot_path = await self.get_screenshot_path()
         await self._communicator.click(int(self._width / 2), int(self._height * 0.47))
         coordinates: Optional[ScreenCoordinates] = await self._worker_state.pogo_windows.look_for_button(
-            screenshot_path,
+            self._worker_state.last_screenshot,
             2.20, 3.01,
             upper=True)
         if coordinates:
@@ -573,9 +579,8 @@ class WordToScreenMatching(object):
 
     async def __handle_privacy_screen(self) -> ScreenType:
         #self._nextscreen = ScreenType.WILLOWCHAR
-        screenshot_path = await self.get_screenshot_path()
         coordinates: Optional[ScreenCoordinates] = await self._worker_state.pogo_windows.look_for_button(
-            screenshot_path,
+            self._worker_state.last_screenshot,
             2.20, 3.01,
             upper=True)
         if coordinates:
@@ -601,9 +606,8 @@ class WordToScreenMatching(object):
             logger.error("Failed getting screenshot")
             return ScreenType.ERROR
 
-        screenshot_path = await self.get_screenshot_path()
         coordinates: Optional[ScreenCoordinates] = await self._worker_state.pogo_windows.look_for_button(
-            screenshot_path,
+            self._worker_state.last_screenshot,
             2.20, 3.01,
             upper=True)
         if coordinates:
@@ -613,21 +617,22 @@ class WordToScreenMatching(object):
         return ScreenType.NOTRESPONDING
 
     async def __handle_catch_tutorial(self) -> ScreenType:
-        for _ in range(2):
-            await self._communicator.click(100, 100)
+        await self._communicator.run_batch(CommandBatch().click(100, 100).click(100, 100))
         for x in range(1,10):
+            batch: CommandBatch = CommandBatch()
             for y in range(1,10):
                 click_x = int(self._width * x/10)
                 click_y = int(self._height * y/20 + self._height / 2)
-                await self._communicator.click(click_x, click_y)
+                batch.click(click_x, click_y)
+            await self._communicator.run_batch(batch)
             await asyncio.sleep(5)
             if not await self._take_screenshot(delay_before=await self.get_devicesettings_value(
                     MappingManagerDevicemappingKey.POST_SCREENSHOT_DELAY, 1),
                                                delay_after=2):
                 logger.error("Failed getting screenshot")
                 return ScreenType.ERROR
-            screenshot_path = await self.get_screenshot_path()
-            globaldict = await self._worker_state.pogo_windows.get_screen_text(screenshot_path, self._worker_state.origin)
+            globaldict = await self._worker_state.pogo_windows.get_screen_text(self._worker_state.last_screenshot,
+                                                                           self._worker_state.origin)
             starter = ['Bulbasaur', 'Charmander', 'Squirtle', 'Bisasam', 'Glumanda', 'Schiggy', 'Bulbizarre', 'Salameche', 'Carapuce']
             if any(text in starter for text in globaldict['text']):
                 logger.debug("Found Pokémon")
@@ -645,9 +650,8 @@ class WordToScreenMatching(object):
                 logger.error("Failed getting screenshot")
                 return ScreenType.ERROR
 
-            screenshot_path = await self.get_screenshot_path()
             coordinates: Optional[ScreenCoordinates] = await self._worker_state.pogo_windows.look_for_button(
-                screenshot_path,
+                self._worker_state.last_screenshot,
                 2.20, 3.01,
                 upper=True)
             if coordinates:
@@ -672,11 +676,11 @@ class WordToScreenMatching(object):
             return ScreenType.ERROR
         username = self._worker_state.active_account.username
         logger.debug('Setting name for Account to {}', username)
-        await self._communicator.enter_text(username)
-        await self._communicator.click(100, 100)
+        await self._communicator.run_batch(CommandBatch().enter_text(username).click(100, 100))
         await asyncio.sleep(2)
-        await self._communicator.click(int(self._width / 2), int(self._height * 0.66))
-        await self._communicator.click(int(self._width / 2), int(self._height * 0.51))
+        await self._communicator.run_batch(CommandBatch()
+                                           .click(int(self._width / 2), int(self._height * 0.66))
+                                           .click(int(self._width / 2), int(self._height * 0.51)))
         await asyncio.sleep(2)
 
         if not await self._take_screenshot(delay_before=await self.get_devicesettings_value(
@@ -684,8 +688,8 @@ class WordToScreenMatching(object):
                                            delay_after=2):
             logger.error("Failed getting screenshot")
             return ScreenType.ERROR
-        screenshot_path = await self.get_screenshot_path()
-        globaldict = await self._worker_state.pogo_windows.get_screen_text(screenshot_path, self._worker_state.origin)
+        globaldict = await self._worker_state.pogo_windows.get_screen_text(self._worker_state.last_screenshot,
+                                                                           self._worker_state.origin)
         errortext = ['available.','verfugbar.','disponible.']
         if any(text in errortext for text in globaldict['text']):
             logger.warning('Account name is not available. Marking account as permabanned!')
@@ -693,8 +697,7 @@ class WordToScreenMatching(object):
                                                    BurnType.BAN)
             return ScreenType.MAINTENANCE
 
-        await self._communicator.click(100, 100)
-        await self._communicator.click(100, 100)
+        await self._communicator.run_batch(CommandBatch().click(100, 100).click(100, 100))
         await asyncio.sleep(5)
         return ScreenType.ADVENTURESYNC
 
@@ -705,8 +708,10 @@ class WordToScreenMatching(object):
         return screentype
 
     async def __handle_tutorial_end(self) -> ScreenType:
+        batch: CommandBatch = CommandBatch()
         for _ in range(4):
-            await self._communicator.click(100, 100)
+            batch.click(100, 100)
+        await self._communicator.run_batch(batch)
         await asyncio.sleep(1)
         return ScreenType.POGO
 
@@ -721,11 +726,11 @@ class WordToScreenMatching(object):
         return await self.__handle_screentype(screentype=screentype, global_dict=global_dict, diff=diff,
                                               y_offset=y_offset)
 
-    async def check_quest(self, screenpath: str) -> ScreenType:
-        if screenpath is None or len(screenpath) == 0:
-            logger.error("Invalid screen path: {}", screenpath)
+    async def check_quest(self, screenshot: Optional[ScreenshotBuffer]) -> ScreenType:
+        if screenshot is None:
+            logger.error("No screenshot to check the quest on")
             return ScreenType.ERROR
-        globaldict = await self._worker_state.pogo_windows.get_screen_text(screenpath, self._worker_state.origin)
+        globaldict = await self._worker_state.pogo_windows.get_screen_text(screenshot, self._worker_state.origin)
 
         click_text = 'FIELD,SPECIAL,FELD,SPEZIAL,SPECIALES,TERRAIN'
         if not globaldict:
@@ -902,15 +907,20 @@ class WordToScreenMatching(object):
 
         screenshot_quality: int = 80
 
-        take_screenshot = await self._communicator.get_screenshot(await self.get_screenshot_path(fileaddon=errorscreen),
-                                                                  screenshot_quality, screenshot_type)
+        screenshot: Optional[ScreenshotBuffer] = await self._communicator.get_screenshot_buffer(screenshot_quality,
+                                                                                              screenshot_type)
 
-        if not take_screenshot:
+        if screenshot is None:
             logger.error("takeScreenshot: Failed retrieving screenshot")
             logger.debug("Failed retrieving screenshot")
             return False
         else:
             logger.debug("Success retrieving screenshot")
+            if self._worker_state.last_screenshot is not None:
+                self._worker_state.last_screenshot.close()
+            self._worker_state.last_screenshot = screenshot
+            if errorscreen:
+                await screenshot.write_to(await self.get_screenshot_path(fileaddon=True))
             self._lastScreenshotTaken = time.time()
             await asyncio.sleep(delay_after)
             return True
@@ -930,12 +940,11 @@ class WordToScreenMatching(object):
             logger.error("Failed getting screenshot")
             return None
 
-        screenpath = await self.get_screenshot_path()
-
         result: Optional[Tuple[ScreenType,
         Optional[
             dict], int, int, int]] = await self._worker_state.pogo_windows \
-            .screendetection_get_type_by_screen_analysis(screenpath, self._worker_state.origin)
+            .screendetection_get_type_by_screen_analysis(self._worker_state.last_screenshot,
+                                                         self._worker_state.origin)
         if result is None:
             logger.error("Failed analyzing screen")
             return None
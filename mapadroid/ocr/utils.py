@@ -1,3 +1,4 @@
+import math
 from typing import List, Optional, Tuple
 
 import cv2
@@ -7,6 +8,7 @@ from PIL import Image
 from pytesseract import Output, pytesseract
 
 from mapadroid.ocr.screen_type import ScreenType
+from mapadroid.utils.collections import ScreenCoordinates
 
 screen_texts: dict = {1: ['Geburtdatum', 'birth.', 'naissance.', 'date'],
                       2: ['ZURUCKKEHRENDER', 'ZURÜCKKEHRENDER', 'GAME', 'FREAK', 'SPIELER'],
@@ -47,7 +49,7 @@ screen_texts: dict = {1: ['Geburtdatum', 'birth.', 'naissance.', 'date'],
                      }
 
 
-def screendetection_get_type_internal(image,
+def screendetection_get_type_internal(image: np.ndarray,
                                       identifier) -> Optional[Tuple[ScreenType, Optional[dict], int, int, int]]:
     with logger.contextualize(identifier=identifier):
         returntype: ScreenType = ScreenType.UNDEFINED
@@ -57,7 +59,7 @@ def screendetection_get_type_internal(image,
 
         texts = []
         try:
-            with Image.open(image) as frame_org:
+            with _to_pil_image(image) as frame_org:
                 width, height = frame_org.size
 
                 logger.debug("Screensize: W:{} x H:{}", width, height)
@@ -97,30 +99,19 @@ def screendetection_get_type_internal(image,
 
                 del texts
                 frame.close()
-        except (FileNotFoundError, ValueError) as e:
-            logger.error("Failed opening image {} with exception {}", image, e)
+        except ValueError as e:
+            logger.error("Failed reading image with exception {}", e)
             return None
 
         return returntype, globaldict, width, height, diff
 
 
-def check_pogo_mainscreen(filename, identifier) -> bool:
+def check_pogo_mainscreen(screenshot_read: np.ndarray, identifier) -> bool:
     with logger.contextualize(identifier=identifier):
-        logger.debug("__internal_check_pogo_mainscreen: Checking close except nearby with: file {}", filename)
-        try:
-            screenshot_read = cv2.imread(filename)
-        except Exception:
-            logger.error("Screenshot corrupted")
-            logger.debug("__internal_check_pogo_mainscreen: Screenshot corrupted...")
-            return False
-        if screenshot_read is None:
-            logger.error("__internal_check_pogo_mainscreen: Screenshot corrupted")
-            return False
-
+        logger.debug("__internal_check_pogo_mainscreen: Checking close except nearby")
         height, width, _ = screenshot_read.shape
         gray = screenshot_read[int(height) - int(round(height / 5)):int(height),
                0: int(int(width) / 4)]
-        del screenshot_read
         _, width_, _ = gray.shape
         radius_min = int((width / float(6.8) - 3) / 2)
         radius_max = int((width / float(6) + 3) / 2)
@@ -149,11 +140,11 @@ def check_pogo_mainscreen(filename, identifier) -> bool:
         return False
 
 
-def most_frequent_colour_internal(image, identifier, y_offset: int = 0) -> Optional[List[int]]:
+def most_frequent_colour_internal(image: np.ndarray, identifier, y_offset: int = 0) -> Optional[List[int]]:
     with logger.contextualize(identifier=identifier):
         logger.debug("most_frequent_colour_internal: Reading screen text")
         try:
-            with Image.open(image) as img:
+            with _to_pil_image(image) as img:
                 w, h = img.size
                 left = 0
                 top = int(h * 0.05)
@@ -169,20 +160,20 @@ def most_frequent_colour_internal(image, identifier, y_offset: int = 0) -> Optio
                         most_frequent_pixel = (count, colour)
 
                 logger.debug("Most frequent pixel on screen: {}", most_frequent_pixel[1])
-        except (FileNotFoundError, ValueError) as e:
-            logger.error("Failed opening image {} with exception {}", image, e)
+        except ValueError as e:
+            logger.error("Failed reading image with exception {}", e)
             return None
 
         return most_frequent_pixel[1]
 
 
-def get_screen_text(screenpath: str, identifier) -> Optional[dict]:
+def get_screen_text(image: np.ndarray, identifier) -> Optional[dict]:
     with logger.contextualize(identifier=identifier):
         returning_dict: Optional[dict] = {}
         logger.debug("get_screen_text: Reading screen text")
 
         try:
-            with Image.open(screenpath) as frame:
+            with _to_pil_image(image) as frame:
                 frame = frame.convert('LA')
                 try:
                     returning_dict = pytesseract.image_to_data(frame, output_type=Output.DICT, timeout=40,
@@ -190,8 +181,8 @@ def get_screen_text(screenpath: str, identifier) -> Optional[dict]:
                 except Exception as e:
                     logger.error("Tesseract Error: {}. Exception: {}", returning_dict, e)
                     returning_dict = None
-        except (FileNotFoundError, ValueError) as e:
-            logger.error("Failed opening image {} with exception {}", screenpath, e)
+        except ValueError as e:
+            logger.error("Failed reading image with exception {}", e)
             return None
 
         if isinstance(returning_dict, dict):
@@ -199,3 +190,259 @@ def get_screen_text(screenpath: str, identifier) -> Optional[dict]:
         else:
             logger.warning("Could not read text in image: {}", returning_dict)
             return None
+
+
+def look_for_button_internal(screenshot_read: np.ndarray, ratiomin, ratiomax,
+                             upper) -> Optional[ScreenCoordinates]:
+    logger.debug("lookForButton: Reading lines")
+    min_distance_to_middle = None
+    try:
+        gray = cv2.cvtColor(screenshot_read, cv2.COLOR_BGR2GRAY)
+    except cv2.error:
+        logger.error("Screenshot corrupted")
+        return None
+
+    height, width, _ = screenshot_read.shape
+    _widthold = float(width)
+    logger.debug("lookForButton: Determined screenshot scale: {} x {}", height, width)
+
+    # resize for better line quality
+    height, width = gray.shape
+    factor = width / _widthold
+
+    gaussian = cv2.GaussianBlur(gray, (3, 3), 0)
+    del gray
+    edges = cv2.Canny(gaussian, 50, 200, apertureSize=3)
+    del gaussian
+
+    # checking for all possible button lines
+    max_line_length = (width / ratiomin) + (width * 0.18)
+    logger.debug("lookForButton: MaxLineLength: {}", max_line_length)
+    min_line_length = (width / ratiomax) - (width * 0.02)
+    logger.debug("lookForButton: MinLineLength: {}", min_line_length)
+
+    kernel = np.ones((2, 2), np.uint8)
+    gradient_of_edges_found = cv2.morphologyEx(edges, cv2.MORPH_GRADIENT, kernel)
+    del edges
+
+    num_lines = 0
+    lines = cv2.HoughLinesP(gradient_of_edges_found, rho=1, theta=math.pi / 180, threshold=90,
+                            minLineLength=min_line_length, maxLineGap=5)
+    del gradient_of_edges_found
+    if lines is None:
+        return None
+
+    lines_processed = _check_lines(lines, height)
+    del lines
+    _last_y = _x1 = _x2 = click_y = 0
+    for line in lines_processed:
+        line = [line]
+        for x1, y1, x2, y2 in line:
+
+            if y1 == y2 and max_line_length >= x2 - x1 >= min_line_length \
+                    and y1 > height / 3 \
+                    and width / 2 + 50 > (x2 - x1) / 2 + x1 > width / 2 - 50:
+
+                num_lines += 1
+                min_distance_to_middle_tmp = y1 - (height / 2)
+                if upper:
+                    if min_distance_to_middle is None:
+                        min_distance_to_middle = min_distance_to_middle_tmp
+                        click_y = y1 + 50
+                        _last_y = y1
+                        _x1 = x1
+                        _x2 = x2
+                    else:
+                        if min_distance_to_middle_tmp < min_distance_to_middle:
+                            click_y = _last_y + ((y1 - _last_y) / 2)
+                            _last_y = y1
+                            _x1 = x1
+                            _x2 = x2
+
+                else:
+                    click_y = _last_y + ((y1 - _last_y) / 2)
+                    _last_y = y1
+                    _x1 = x1
+                    _x2 = x2
+                logger.debug("lookForButton: Found Buttonline Nr. {} - Line lenght: {}px Coords - X: {} {} "
+                             "Y: {} {}", num_lines, x2 - x1, x1, x2, y1, y1)
+    del lines_processed
+    if 1 < num_lines <= 6:
+        # recalculate click area for real resolution
+        click_x = int(((width - _x2) + ((_x2 - _x1) / 2)) /
+                      round(factor, 2))
+        click_y = int(click_y)
+        logger.debug('lookForButton: found Button')
+        return ScreenCoordinates(click_x, click_y)
+
+    elif num_lines > 6:
+        logger.debug('lookForButton: found too many Buttons :) - assuming X coords to close present')
+        return ScreenCoordinates(int(width - (width / 7.2)),
+                                 int(height - (height / 12.19)))
+
+    logger.debug('lookForButton: did not found any Button')
+    return None
+
+
+# checks for X button on any screen... could kill raidscreen, handle properly
+def check_close_except_nearby_button_internal(screenshot_read: np.ndarray, identifier,
+                                              close_raid=False) -> List[ScreenCoordinates]:
+    with logger.contextualize(identifier=identifier):
+        if not close_raid:
+            logger.debug("__internal_check_close_except_nearby_button: Raid is not to be closed...")
+            if _check_raid_line(screenshot_read) \
+                    or _check_raid_line(screenshot_read, left_side=True):
+                # raid tab present
+                logger.debug("__internal_check_close_except_nearby_button: Not checking for close button (X). "
+                             "Nearby or raid tab open but not to be closed.")
+                return []
+        logger.debug("__internal_check_close_except_nearby_button: Checking for close button (X).")
+
+        ratio_to_use: int = 10
+        coordinates_of_close_found: List[ScreenCoordinates] = []
+        while not coordinates_of_close_found and ratio_to_use < 15:
+            coordinates_of_close_found = _read_circles(screenshot_read, float(10), xcord=False, crop=True,
+                                                       canny=True)
+            if not coordinates_of_close_found:
+                ratio_to_use += 1
+            else:
+                logger.debug("Found close button (X). Ratio: {}", ratio_to_use)
+                return coordinates_of_close_found
+        return []
+
+
+def _to_pil_image(image: np.ndarray) -> Image.Image:
+    return Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+
+def _read_circles(screenshot_read: np.ndarray, ratio, xcord=False, crop=False,
+                  canny=False, secondratio=False) -> List[ScreenCoordinates]:
+    logger.debug("__read_circles: Reading circles")
+    circles_found: List[ScreenCoordinates] = []
+    height, width, _ = screenshot_read.shape
+
+    if crop:
+        screenshot_read = screenshot_read[int(height) - int(int(height / 4)):int(height),
+                          int(int(width) / 2) - int(int(width) / 8):int(int(width) / 2) + int(
+                              int(width) / 8)]
+
+    logger.debug("__read_circles: Determined screenshot scale: {} x {}", height, width)
+    gray = cv2.cvtColor(screenshot_read, cv2.COLOR_BGR2GRAY)
+    # detect circles in the image
+
+    if not secondratio:
+        radius_min = int((width / float(ratio) - 3) / 2)
+        radius_max = int((width / float(ratio) + 3) / 2)
+    else:
+        radius_min = int((width / float(ratio) - 3) / 2)
+        radius_max = int((width / float(secondratio) + 3) / 2)
+    if canny:
+        gaussian = cv2.GaussianBlur(gray, (3, 3), 0)
+        del gray
+        gray = cv2.Canny(gaussian, 100, 50, apertureSize=3)
+
+    logger.debug("__read_circles: Detect radius of circle: Min {} / Max {}", radius_min, radius_max)
+    circles = cv2.HoughCircles(gray, cv2.HOUGH_GRADIENT, 1, width / 8, param1=100, param2=15,
+                               minRadius=radius_min,
+                               maxRadius=radius_max)
+    # ensure at least some circles were found
+    if circles is not None:
+        # convert the (x, y) coordinates and radius of the circles to integers
+        circles_first_col = np.round(circles[0, :]).astype("int")
+        del circles
+        # loop over the (x, y) coordinates and radius of the circles
+        for (pos_x, pos_y, _) in circles_first_col:
+            if not xcord:
+                circles_found.append(ScreenCoordinates(width / 2, (int(height) - int(height / 4.5)) + pos_y))
+            else:
+                if (width / 2) - 100 <= pos_x <= (width / 2) + 100 and pos_y >= (height - (height / 3)):
+                    circles_found.append(ScreenCoordinates(width / 2, (int(height) - int(height / 4.5)) + pos_y))
+        del circles_first_col
+        logger.debug("__read_circles: Determined screenshot to have {} Circle.", len(circles_found))
+        return circles_found
+    else:
+        logger.debug("__read_circles: Determined screenshot to have 0 Circle")
+        return circles_found
+
+
+def _check_lines(lines, height):
+    temp_lines = []
+    sort_lines = []
+    old_y1 = 0
+    index = 0
+
+    for line in lines:
+        for x1, y1, x2, y2 in line:
+            temp_lines.append([y1, y2, x1, x2])
+
+    temp_lines = np.array(temp_lines)
+    sort_arr = (temp_lines[temp_lines[:, 0].argsort()])
+
+    button_value = height / 40
+
+    for line in sort_arr:
+        if int(old_y1 + int(button_value)) < int(line[0]):
+            if int(line[0]) == int(line[1]):
+                sort_lines.append([line[2], line[0], line[3], line[1]])
+                old_y1 = line[0]
+        index += 1
+
+    return np.asarray(sort_lines, dtype=np.int32)
+
+
+def _check_raid_line(screenshot_read: np.ndarray, left_side=False) -> Optional[ScreenCoordinates]:
+    logger.debug("__check_raid_line: Reading lines")
+    if left_side:
+        logger.debug("__check_raid_line: Check nearby open ")
+
+    if len(_read_circles(screenshot_read, float(11),
+                         xcord=False,
+                         crop=True,
+                         canny=True)) == 0:
+        logger.debug("__check_raid_line: Not active")
+        return None
+
+    height, width, _ = screenshot_read.shape
+    screenshot_partial = screenshot_read[int(height / 2) - int(height / 3):int(height / 2) + int(height / 3),
+                                         int(0):int(width)]
+    gray = cv2.cvtColor(screenshot_partial, cv2.COLOR_BGR2GRAY)
+    del screenshot_partial
+    gaussian = cv2.GaussianBlur(gray, (5, 5), 0)
+    del gray
+    logger.debug("__check_raid_line: Determined screenshot scale: {} x {}", height, width)
+    edges = cv2.Canny(gaussian, 50, 150, apertureSize=3)
+    del gaussian
+    max_line_length = width / 3.30 + width * 0.03
+    logger.debug("__check_raid_line: MaxLineLength: {}", max_line_length)
+    min_line_length = width / 6.35 - width * 0.03
+    logger.debug("__check_raid_line: MinLineLength: {}", min_line_length)
+    lines = cv2.HoughLinesP(edges, rho=1, theta=math.pi / 180, threshold=70, minLineLength=min_line_length,
+                            maxLineGap=2)
+    del edges
+    if lines is None:
+        return None
+    try:
+        for line in lines:
+            for x1, y1, x2, y2 in line:
+                if not left_side:
+                    if y1 == y2 and (x2 - x1 <= max_line_length) and (
+                            x2 - x1 >= min_line_length) and x1 > width / 2 and x2 > width / 2 and y1 < (
+                            height / 2):
+                        logger.debug("__check_raid_line: Raid-tab is active - Line length: {}px "
+                                     "Coords - x: {} {} Y: {} {}", x2 - x1, x1, x2, y1, y2)
+                        return ScreenCoordinates(0, 0)
+                else:
+                    if y1 == y2 and (x2 - x1 <= max_line_length) and (
+                            x2 - x1 >= min_line_length) and (
+                            (x1 < width / 2 and x2 < width / 2) or (
+                            x1 < width / 2 < x2)) and y1 < (
+                            height / 2):
+                        logger.debug("__check_raid_line: Nearby is active - but not Raid-Tab")
+                        raidtab_x = int(width - (x2 - x1))
+                        raidtab_y = int(
+                            (int(height / 2) - int(height / 3) + y1) * 0.9)
+                        return ScreenCoordinates(raidtab_x, raidtab_y)
+    finally:
+        del lines
+    logger.debug("__check_raid_line: Not active")
+    return None
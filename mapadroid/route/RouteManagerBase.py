@@ -17,6 +17,7 @@ from mapadroid.route.prioq.strategy.AbstractRoutePriorityQueueStrategy import (
     AbstractRoutePriorityQueueStrategy, RoutePriorityQueueEntry)
 from mapadroid.route.routecalc.RoutecalcUtil import RoutecalcUtil
 from mapadroid.route.RoutePoolEntry import RoutePoolEntry
+from mapadroid.route.WorkerPositionIndex import WorkerPositionIndex
 from mapadroid.utils.collections import Location
 from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
 from mapadroid.utils.geo import get_distance_of_two_points_in_meters
@@ -74,6 +75,7 @@ class RouteManagerBase(ABC):
         self._coords_to_be_ignored = set()
         self._overwrite_calculation: bool = False
         self._routepool: Dict[str, RoutePoolEntry] = {}
+        self._worker_positions: WorkerPositionIndex = WorkerPositionIndex()
         self._roundcount: int = 0
         self._joinqueue = joinqueue
         self._worker_start_position: Dict[str] = {}
@@ -190,6 +192,7 @@ class RouteManagerBase(ABC):
             if remove_routepool_entry and worker_name in self._routepool:
                 logger.info("Deleting old routepool of {}", worker_name)
                 self._routepool.pop(worker_name)
+                self._worker_positions.remove(worker_name)
                 await self._update_routepool()
             if len(self._workers_registered) == 0 and self._is_started.is_set():
                 logger.info("Routemanager does not have any subscribing workers anymore, calling stop", self.name)
@@ -352,6 +355,7 @@ class RouteManagerBase(ABC):
     def __set_routepool_entry_location(self, origin: str, pos: Location):
         if self._routepool.get(origin, None) is not None:
             self._routepool[origin].current_pos = pos
+            self._worker_positions.update(origin, pos)
             self._routepool[origin].last_access = time.time()
             self._routepool[origin].worker_sleeping = 0
 
@@ -392,6 +396,7 @@ class RouteManagerBase(ABC):
             self._routepool[origin] = routepool_entry
             if origin in self._worker_start_position:
                 routepool_entry.current_pos = self._worker_start_position[origin]
+            self._worker_positions.update(origin, routepool_entry.current_pos)
             if not await self._update_routepool() or origin not in self._routepool:
                 logger.info("Failed updating routepools after adding a worker to it")
                 return None
@@ -574,21 +579,18 @@ class RouteManagerBase(ABC):
                                                                prioqcoord.lat, prioqcoord.lng)
 
         logger.debug("distance to PrioQ {}: {}", prioqcoord, distance_worker)
-        temp_distance = distance_worker
-
-        for worker in self._routepool.keys():
-            if worker == origin or self._routepool[worker].prio_coord \
-                    or self._routepool[origin].last_position_type == PositionType.PRIOQ:
-                continue
-            worker_pos = self._routepool[worker].current_pos
-            prio_distance = get_distance_of_two_points_in_meters(worker_pos.lat, worker_pos.lng,
-                                                                 prioqcoord.lat, prioqcoord.lng)
-            logger.debug("distance to PrioQ {}: {}", prioqcoord, prio_distance)
-            if prio_distance < temp_distance:
-                logger.debug("Worker {} closer by {} meters", worker,
-                             int(distance_worker) - int(prio_distance))
-                temp_distance = prio_distance
+
+        if self._routepool[origin].last_position_type != PositionType.PRIOQ:
+            # Workers nearest to the event first, the first one allowed to take over the event is the closest one
+            for worker, distance in self._worker_positions.nearest(prioqcoord):
+                if distance >= distance_worker:
+                    break
+                entry: Optional[RoutePoolEntry] = self._routepool.get(worker)
+                if worker == origin or entry is None or entry.prio_coord:
+                    continue
                 closer_worker = worker
+                logger.debug("Worker {} closer by {} meters", closer_worker, int(distance_worker) - int(distance))
+                break
 
         if closer_worker is not None:
             self._routepool[closer_worker].prio_coord = prioqcoord
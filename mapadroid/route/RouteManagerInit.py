@@ -35,7 +35,7 @@ class RouteManagerInit(SubrouteReplacingMixin, RouteManagerBase):
 
     async def _get_coords_fresh(self, dynamic: bool) -> List[Location]:
         # Take the max radius times 2 as the areas would overlap otherwise
-        return S2Helper.generate_locations(self.get_max_radius() * 2, self.get_geofence_helper())
+        return await S2Helper.generate_locations(self.get_max_radius() * 2, self.get_geofence_helper())
 
     async def _quit_route(self):
         logger.info("Shutdown Route")
@@ -0,0 +1,185 @@
+import math
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+from mapadroid.route.RoutePoolEntry import RoutePoolEntry
+from mapadroid.utils.collections import Location
+from mapadroid.utils.geo import get_distances_in_meters
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.routemanager)
+
+
+class SubrouteRebalanceStats:
+    """
+    Durations of the rebalancing of subroutes, split by full rebalancing (the coords of the round changed) and
+    incremental rebalancing (only the workers changed)
+    """
+    def __init__(self):
+        self.full: int = 0
+        self.incremental: int = 0
+        self.subroutes_replaced: int = 0
+        self.duration_total: float = 0.0
+        self.duration_max: float = 0.0
+        self.duration_last: float = 0.0
+
+    def add_rebalance(self, incremental: bool, subroutes_replaced: int, duration: float) -> None:
+        if incremental:
+            self.incremental += 1
+        else:
+            self.full += 1
+        self.subroutes_replaced += subroutes_replaced
+        self.duration_total += duration
+        self.duration_max = max(self.duration_max, duration)
+        self.duration_last = duration
+
+    @property
+    def duration_avg(self) -> float:
+        rebalances: int = self.full + self.incremental
+        return self.duration_total / rebalances if rebalances else 0.0
+
+    def __str__(self):
+        return (f"{self.full} full and {self.incremental} incremental rebalances replacing "
+                f"{self.subroutes_replaced} subroutes, duration avg {self.duration_avg:.4f}s / "
+                f"max {self.duration_max:.4f}s / last {self.duration_last:.4f}s")
+
+
+class SubrouteRebalancer:
+    """
+    Splits the coords of the current round into consecutive subroutes, one per worker. The split is remembered: as
+    long as the coords of the round remain the same, a worker leaving hands its subroute to the neighbouring subroutes
+    and a worker joining takes over the second half of the longest subroute. Only those subroutes are replaced, the
+    other workers keep their subroutes and queues. The round is split evenly in the order of the workers being added
+    if the coords of the round changed or the subroutes drifted apart too far.
+    The positions of the coords in the round are indexed to resume the queue of a worker at the spot it was heading to
+    before.
+    """
+    # Subroutes are split evenly again once one is longer than this factor times the even share
+    MAX_IMBALANCE: float = 2.0
+
+    def __init__(self):
+        self._route: List[Location] = []
+        # location -> ascending positions of the location in the round
+        self._positions: Dict[Location, List[int]] = {}
+        # (origin, entry, first position, position past the last one) of the subroutes in the order of the round
+        self._split: List[Tuple[str, RoutePoolEntry, int, int]] = []
+        self.stats: SubrouteRebalanceStats = SubrouteRebalanceStats()
+
+    def rebalance(self, coords: List[Location], routepool: Dict[str, RoutePoolEntry], origins: List[str]) -> int:
+        """
+        Args:
+            coords: Coords of the current round, at least one per worker
+            routepool: Entries of the workers
+            origins: Origins of the workers in the order they were added
+
+        Returns: Number of subroutes replaced
+        """
+        start: float = time.perf_counter()
+        split: Optional[List[Tuple[str, RoutePoolEntry, int, int]]] = None
+        incremental: bool = False
+        if coords == self._route and self._split:
+            split = self.__move_segments(routepool, origins)
+            incremental = split is not None
+        else:
+            self._route = list(coords)
+            self._positions = {}
+            for position, location in enumerate(self._route):
+                self._positions.setdefault(location, []).append(position)
+        if split is None:
+            split = self.__split_evenly(routepool, origins)
+
+        previous: Dict[str, Tuple[str, RoutePoolEntry, int, int]] = {segment[0]: segment for segment in self._split}
+        replaced: int = 0
+        for origin, entry, begin, end in split:
+            previous_segment: Optional[Tuple[str, RoutePoolEntry, int, int]] = previous.get(origin)
+            if (previous_segment is None or previous_segment[1] is not entry
+                    or previous_segment[2:] != (begin, end)):
+                logger.debug("Replacing subroute of {}", origin)
+                self.__replace_subroute(entry, begin, end)
+                replaced += 1
+        self._split = split
+        self.stats.add_rebalance(incremental, replaced, time.perf_counter() - start)
+        return replaced
+
+    def __split_evenly(self, routepool: Dict[str, RoutePoolEntry],
+                       origins: List[str]) -> List[Tuple[str, RoutePoolEntry, int, int]]:
+        subroute_length, extra_length_workers = divmod(len(self._route), len(origins))
+        split: List[Tuple[str, RoutePoolEntry, int, int]] = []
+        begin: int = 0
+        for i, origin in enumerate(origins):
+            end: int = begin + subroute_length + (1 if i < extra_length_workers else 0)
+            split.append((origin, routepool[origin], begin, end))
+            begin = end
+        return split
+
+    def __move_segments(self, routepool: Dict[str, RoutePoolEntry],
+                        origins: List[str]) -> Optional[List[Tuple[str, RoutePoolEntry, int, int]]]:
+        remaining_origins: Set[str] = set(origins)
+        segments: List[List] = [list(segment) for segment in self._split]
+        # Workers gone (or having been replaced by a new entry) hand their coords to the neighbouring subroutes
+        for index in reversed(range(len(segments))):
+            origin, entry, begin, end = segments[index]
+            if origin in remaining_origins and routepool.get(origin) is entry:
+                continue
+            del segments[index]
+            if not segments:
+                return None
+            elif index == 0:
+                segments[0][2] = begin
+            elif index == len(segments):
+                segments[-1][3] = end
+            else:
+                middle: int = (begin + end) // 2
+                segments[index - 1][3] = middle
+                segments[index][2] = middle
+        # Workers joining take over the second half of the longest subroute
+        present_origins: Set[str] = {segment[0] for segment in segments}
+        for origin in origins:
+            if origin in present_origins:
+                continue
+            longest: int = max(range(len(segments)), key=lambda i: segments[i][3] - segments[i][2])
+            begin, end = segments[longest][2:]
+            if end - begin < 2:
+                return None
+            middle = (begin + end + 1) // 2
+            segments[longest][3] = middle
+            segments.insert(longest + 1, [origin, routepool[origin], middle, end])
+        even_share: int = math.ceil(len(self._route) / len(segments))
+        if max(end - begin for _origin, _entry, begin, end in segments) > self.MAX_IMBALANCE * even_share:
+            return None
+        return [(origin, entry, begin, end) for origin, entry, begin, end in segments]
+
+    def __replace_subroute(self, entry: RoutePoolEntry, begin: int, end: int) -> None:
+        entry.subroute = self._route[begin:end]
+        # Search for the closest spot within old queue and only start from there
+        resume_at: int = self.__find_resume_position(entry.queue[0] if entry.queue else None, begin, end)
+        entry.queue.clear()
+        entry.queue.extend(self._route[resume_at:end])
+
+    def __find_resume_position(self, location: Optional[Location], begin: int, end: int) -> int:
+        if location is None or begin >= end:
+            return begin
+        positions: Optional[List[int]] = self._positions.get(location)
+        if not positions:
+            # Not part of the round (e.g. a location to be redone), resume at the closest location of the subroute
+            closest: Optional[Location] = SubrouteRebalancer.find_closest_location(location,
+                                                                                   self._route[begin:end])
+            positions = self._positions[closest]
+        index: int = bisect_left(positions, begin)
+        if index < len(positions) and positions[index] < end:
+            return positions[index]
+        # The location moved to another subroute, neighbouring coords of the route being close to each other the end
+        # of this subroute nearest to the location along the route is the closest spot
+        before: Optional[int] = begin - positions[index - 1] if index > 0 else None
+        after: Optional[int] = positions[index] - (end - 1) if index < len(positions) else None
+        if after is None or before is not None and before <= after:
+            return begin
+        return end - 1
+
+    @staticmethod
+    def find_closest_location(location: Optional[Location], route: List[Location]) -> Optional[Location]:
+        if not route or not location:
+            return None
+        distances = get_distances_in_meters(location.lat, location.lng, [(loc.lat, loc.lng) for loc in route])
+        return route[int(distances.argmin())]
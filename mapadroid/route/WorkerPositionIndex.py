@@ -0,0 +1,56 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from mapadroid.utils.collections import Location
+from mapadroid.utils.geo import get_distances_in_meters
+
+
+class WorkerPositionIndex:
+    """
+    Current positions of the workers of a route for nearest worker lookups. The positions are kept in an array with a
+    row per worker which is updated in place as workers move, rows of workers removed are reused by workers added.
+    """
+    def __init__(self):
+        self._row_of_origin: Dict[str, int] = {}
+        self._origin_of_row: List[Optional[str]] = []
+        self._positions: np.ndarray = np.zeros((0, 2), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._row_of_origin)
+
+    def update(self, origin: str, location: Location) -> None:
+        row: Optional[int] = self._row_of_origin.get(origin)
+        if row is None:
+            row = self.__add(origin)
+        self._positions[row] = (location.lat, location.lng)
+
+    def remove(self, origin: str) -> None:
+        row: Optional[int] = self._row_of_origin.pop(origin, None)
+        if row is not None:
+            self._origin_of_row[row] = None
+
+    def nearest(self, location: Location) -> List[Tuple[str, float]]:
+        """
+        Returns: Origins of the workers and their distance (meters) to the location, nearest first
+        """
+        rows: np.ndarray = np.fromiter(self._row_of_origin.values(), dtype=np.int64, count=len(self._row_of_origin))
+        if len(rows) == 0:
+            return []
+        distances: np.ndarray = get_distances_in_meters(location.lat, location.lng, self._positions[rows])
+        order: np.ndarray = np.argsort(distances, kind="stable")
+        return [(self._origin_of_row[row], distance)
+                for row, distance in zip(rows[order].tolist(), distances[order].tolist())]
+
+    def __add(self, origin: str) -> int:
+        try:
+            row: int = self._origin_of_row.index(None)
+            self._origin_of_row[row] = origin
+        except ValueError:
+            row = len(self._origin_of_row)
+            self._origin_of_row.append(origin)
+            self._positions = np.concatenate((self._positions, np.zeros((max(row, 1), 2), dtype=np.float64)))
+            # Rows beyond the ones in use are reserved for the workers added next
+            self._origin_of_row.extend([None] * (len(self._positions) - len(self._origin_of_row)))
+        self._row_of_origin[origin] = row
+        return row
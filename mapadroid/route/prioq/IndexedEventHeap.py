@@ -0,0 +1,123 @@
+import heapq
+import itertools
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from mapadroid.route.prioq.strategy.AbstractRoutePriorityQueueStrategy import \
+    RoutePriorityQueueEntry
+from mapadroid.utils.collections import Location
+
+
+class IndexedEventHeap:
+    """
+    Heap of the events of a priority queue ordered by the timestamp due (events due at the same time in the order of
+    being pushed). Events are indexed by their timestamp due and location, an event already present is not pushed
+    again. Removing an event only drops it from the index, the heap skips it once it reaches the top (lazy deletion).
+    Read-only snapshots sorted by the timestamp due are cached until the heap is modified.
+    """
+    # The heap is rebuilt from the events present once it holds this many times the events present (plus the slack)
+    __COMPACTION_FACTOR: int = 2
+    __COMPACTION_SLACK: int = 64
+
+    def __init__(self, entries: Iterable[RoutePriorityQueueEntry] = ()):
+        # (timestamp due, sequence, entry), items whose sequence does not match the index are removed ones
+        self._heap: List[Tuple[int, int, RoutePriorityQueueEntry]] = []
+        self._sequence_of_event: Dict[Tuple[int, Location], int] = {}
+        self._sequence = itertools.count()
+        self._snapshot: Optional[List[RoutePriorityQueueEntry]] = None
+        self.replace(entries)
+
+    def __len__(self) -> int:
+        return len(self._sequence_of_event)
+
+    def __contains__(self, entry: RoutePriorityQueueEntry) -> bool:
+        return IndexedEventHeap.__key(entry) in self._sequence_of_event
+
+    def push(self, entry: RoutePriorityQueueEntry) -> bool:
+        """
+        Returns: False if the event has already been present
+        """
+        key: Tuple[int, Location] = IndexedEventHeap.__key(entry)
+        if key in self._sequence_of_event:
+            return False
+        sequence: int = next(self._sequence)
+        self._sequence_of_event[key] = sequence
+        heapq.heappush(self._heap, (entry.timestamp_due, sequence, entry))
+        self._snapshot = None
+        return True
+
+    def discard(self, entry: RoutePriorityQueueEntry) -> bool:
+        """
+        Returns: False if the event has not been present
+        """
+        if self._sequence_of_event.pop(IndexedEventHeap.__key(entry), None) is None:
+            return False
+        self._snapshot = None
+        if len(self._heap) > self.__COMPACTION_FACTOR * len(self._sequence_of_event) + self.__COMPACTION_SLACK:
+            self.replace(self.entries())
+        return True
+
+    def peek(self) -> Optional[RoutePriorityQueueEntry]:
+        self.__drop_removed_from_top()
+        return self._heap[0][2] if self._heap else None
+
+    def pop(self) -> RoutePriorityQueueEntry:
+        """
+        Raises: IndexError if the heap is empty
+        """
+        self.__drop_removed_from_top()
+        _timestamp_due, _sequence, entry = heapq.heappop(self._heap)
+        del self._sequence_of_event[IndexedEventHeap.__key(entry)]
+        self._snapshot = None
+        return entry
+
+    def discard_due_until(self, timestamp: int) -> int:
+        """
+        Removes the events due at or before the timestamp
+        Returns: The number of events removed
+        """
+        removed: int = 0
+        while True:
+            entry: Optional[RoutePriorityQueueEntry] = self.peek()
+            if entry is None or entry.timestamp_due > timestamp:
+                return removed
+            self.pop()
+            removed += 1
+
+    def replace(self, entries: Iterable[RoutePriorityQueueEntry]) -> None:
+        self._sequence_of_event = {}
+        self._heap = []
+        for entry in entries:
+            key: Tuple[int, Location] = IndexedEventHeap.__key(entry)
+            if key not in self._sequence_of_event:
+                sequence: int = next(self._sequence)
+                self._sequence_of_event[key] = sequence
+                self._heap.append((entry.timestamp_due, sequence, entry))
+        heapq.heapify(self._heap)
+        self._snapshot = None
+
+    def entries(self) -> List[RoutePriorityQueueEntry]:
+        """
+        Returns: The events present in no particular order
+        """
+        return [entry for _timestamp_due, sequence, entry in self._heap
+                if self._sequence_of_event.get(IndexedEventHeap.__key(entry)) == sequence]
+
+    def snapshot(self) -> List[RoutePriorityQueueEntry]:
+        """
+        Returns: The events present sorted by the timestamp due. The list is shared by the callers until the heap is
+        modified and must not be altered.
+        """
+        if self._snapshot is None:
+            self._snapshot = [item[2] for item in sorted(
+                (timestamp_due, sequence, entry) for timestamp_due, sequence, entry in self._heap
+                if self._sequence_of_event.get(IndexedEventHeap.__key(entry)) == sequence)]
+        return self._snapshot
+
+    def __drop_removed_from_top(self) -> None:
+        while self._heap and self._sequence_of_event.get(IndexedEventHeap.__key(self._heap[0][2])) \
+                != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+    @staticmethod
+    def __key(entry: RoutePriorityQueueEntry) -> Tuple[int, Location]:
+        return entry.timestamp_due, entry.location
@@ -1,14 +1,14 @@
 import asyncio
-import copy
-import heapq
 import time
 from asyncio import Task
-from typing import List, Optional
+from typing import List, Optional, Set, Tuple
 
 from loguru import logger
 
+from mapadroid.route.prioq.IndexedEventHeap import IndexedEventHeap
 from mapadroid.route.prioq.strategy.AbstractRoutePriorityQueueStrategy import AbstractRoutePriorityQueueStrategy, \
     RoutePriorityQueueEntry
+from mapadroid.utils.collections import Location
 from mapadroid.utils.madGlobals import PrioQueueNoDueEntry
 
 
@@ -16,7 +16,7 @@ class RoutePriorityQueue:
     def __init__(self, strategy: AbstractRoutePriorityQueueStrategy):
         self._strategy: AbstractRoutePriorityQueueStrategy = strategy
         self._update_lock: asyncio.Lock = asyncio.Lock()
-        self.__queue: List[RoutePriorityQueueEntry] = []
+        self.__queue: IndexedEventHeap = IndexedEventHeap()
         self._stop_updates: asyncio.Event = asyncio.Event()
         self._update_prio_queue_task: Optional[Task] = None
 
@@ -73,27 +73,30 @@ class RoutePriorityQueue:
 
     async def __pop_event_internal(self) -> RoutePriorityQueueEntry:
         async with self._update_lock:
-            if not self.__queue:
+            next_event: Optional[RoutePriorityQueueEntry] = self.__queue.peek()
+            if next_event is None:
                 raise PrioQueueNoDueEntry("No items in queue")
-            elif self.__queue[0].timestamp_due > int(time.time()):
+            elif next_event.timestamp_due > int(time.time()):
                 raise PrioQueueNoDueEntry("No item available that is due at this time")
             else:
-                coord = heapq.heappop(self.__queue)
+                coord = self.__queue.pop()
                 logger.info("Got event: {}", coord)
                 return coord
 
-    def __merge_queues(self, old_coords: List[RoutePriorityQueueEntry],
-                       new_coords: List[RoutePriorityQueueEntry]) -> List[RoutePriorityQueueEntry]:
+    def __merge_queues(self, new_coords: List[RoutePriorityQueueEntry]) -> None:
         # TODO: For each new coord search for old coord given timedelta and distance whether it can be
         #  considered to cluster
         # just remove all coords < max backlog time and all > NOW. Append all new coords...
         now = int(time.time())
-        merged_coords = [coord for coord in old_coords if
-                         now >= coord.timestamp_due
-                         and (self._strategy.get_max_backlog_duration() == 0
-                              or coord.timestamp_due > now - self._strategy.get_max_backlog_duration())]
-        merged_coords.extend(new_coords)
-        return merged_coords
+        if self._strategy.get_max_backlog_duration() != 0:
+            self.__queue.discard_due_until(now - self._strategy.get_max_backlog_duration())
+        # Events not due yet are kept if they are part of the new events rather than being removed and pushed again
+        new_events: Set[Tuple[int, Location]] = {(coord.timestamp_due, coord.location) for coord in new_coords}
+        for coord in self.__queue.entries():
+            if coord.timestamp_due > now and (coord.timestamp_due, coord.location) not in new_events:
+                self.__queue.discard(coord)
+        for coord in new_coords:
+            self.__queue.push(coord)
 
     async def __update_queue(self) -> None:
         new_coords: List[RoutePriorityQueueEntry] = await self._strategy.retrieve_new_coords()
@@ -102,28 +105,22 @@ class RoutePriorityQueue:
             None, self._strategy.postprocess_coords, new_coords)
         logger.success("Got {} new events", len(post_processed_coords))
         async with self._update_lock:
-            merged = await loop.run_in_executor(
-                None, self.__merge_filter_queue, post_processed_coords)
-            self.__queue = merged
+            self.__merge_filter_queue(post_processed_coords)
 
-    def __merge_filter_queue(self,
-                             post_processed_coords: List[RoutePriorityQueueEntry]) -> List[RoutePriorityQueueEntry]:
+    def __merge_filter_queue(self, post_processed_coords: List[RoutePriorityQueueEntry]) -> None:
         try:
             if self._strategy.is_full_replace_queue():
-                merged = post_processed_coords
+                self.__queue.replace(post_processed_coords)
             else:
-                merged = self.__merge_queues(self.__queue, post_processed_coords)
-            merged = self._strategy.filter_queue(merged)
-            heapq.heapify(merged)
-            return merged
+                self.__merge_queues(post_processed_coords)
+            present: List[RoutePriorityQueueEntry] = self.__queue.entries()
+            filtered: List[RoutePriorityQueueEntry] = self._strategy.filter_queue(present)
+            if filtered is not present:
+                self.__queue.replace(filtered)
         except Exception as e:
             logger.warning("Failed to merge/filter queue")
             logger.exception(e)
-            return post_processed_coords
+            self.__queue.replace(post_processed_coords)
 
     def get_copy_of_prioq(self) -> List[RoutePriorityQueueEntry]:
-        copied_queue = copy.deepcopy(self.__queue)
-        ordinary_list: List[RoutePriorityQueueEntry] = []
-        while copied_queue:
-            ordinary_list.append(heapq.heappop(copied_queue))
-        return ordinary_list
+        return list(self.__queue.snapshot())
@@ -1,8 +1,10 @@
-from typing import Tuple, List
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
 
 import s2sphere
 from loguru import logger
 
+from mapadroid.route.routecalc.SpatialEventIndex import SpatialEventIndex
 from mapadroid.utils.collections import Relation, Location
 from mapadroid.utils.geo import (get_distance_of_two_points_in_meters,
                                  get_middle_of_coord_list)
@@ -18,41 +20,23 @@ class ClusteringHelper:
         self.useS2 = use_s2
         self.S2level = s2_level
 
-    def _get_relations_in_range_within_time(self, queue: List[Tuple[int, Location]], max_radius):
-        relations = {}
-        for event in queue:
-            for other_event in queue:
-                if event[1].lat == other_event[1].lat and event[1].lng == other_event[1].lng and \
-                        event not in relations.keys():
-                    relations[event] = []
-                distance = get_distance_of_two_points_in_meters(event[1].lat, event[1].lng,
-                                                                other_event[1].lat, other_event[1].lng)
-                # we will always build relations from the event at hand subtracted by the event inspected
-                timedelta = event[0] - other_event[0]
-                if 0 <= distance <= max_radius * 2 and 0 <= timedelta <= self.max_timedelta_seconds:
-                    if event not in relations.keys():
-                        relations[event] = []
-                    # avoid duplicates
-                    already_present = False
-                    for relation in relations[event]:
-                        if relation[0][1].lat == other_event[1].lat and \
-                                relation[0][1].lng == other_event[1].lng:
-                            already_present = True
-                    if not already_present:
-                        relations[event].append(
-                            Relation(other_event, distance, timedelta))
+    def _get_relations_in_range_within_time(self, index: SpatialEventIndex, max_radius):
+        relations = {event: [] for event in index.events}
+        # locations of the events related to an event already to avoid duplicates
+        related_locations: Dict[Tuple[int, Location], Set[Location]] = {event: set() for event in index.events}
+        # pairs are ordered by the event at hand and the event inspected, matching the order of the events given
+        firsts, others, distances = index.pairs_within(max_radius * 2, self.max_timedelta_seconds)
+        for first, other, distance in zip(firsts.tolist(), others.tolist(), distances.tolist()):
+            event = index.events[first]
+            other_event = index.events[other]
+            # avoid duplicates
+            if other_event[1] in related_locations[event]:
+                continue
+            related_locations[event].add(other_event[1])
+            # we will always build relations from the event at hand subtracted by the event inspected
+            relations[event].append(Relation(other_event, distance, event[0] - other_event[0]))
         return relations
 
-    @staticmethod
-    def _get_most_west_amongst_relations(relations):
-        selected = list(relations.keys())[0]
-        for event in relations.keys():
-            if event[1].lng < selected[1].lng:
-                selected = event
-            elif event[1].lng == selected[1].lng and event[1].lat > selected[1].lat:
-                selected = event
-        return selected
-
     def _get_farthest_in_relation(self, to_be_inspected):
         # retrieve the relation farthest within the given timedelta, do not bother about maximizing the timedelta
         # if a coord is not within the given timedeltas, it will simply remain in the original set anyway ;)
@@ -66,15 +50,15 @@ class ClusteringHelper:
                 farthest = relation
         return farthest.other_event, distance
 
-    def _get_count_and_coords_in_circle_within_timedelta(self, middle, relations, earliest_timestamp,
-                                                         latest_timestamp, max_radius):
+    def _get_count_and_coords_in_circle_within_timedelta(self, middle, events: Iterable[Tuple[int, Location]],
+                                                         earliest_timestamp, latest_timestamp, max_radius):
         inside_circle = []
         highest_timedelta = 0
         if self.useS2:
             region = s2sphere.CellUnion(
                 S2Helper.get_s2cells_from_circle(middle.lat, middle.lng, self.max_radius, self.S2level))
 
-        for event_relations in relations:
+        for event_relations in events:
             # exclude previously clustered events...
             if len(event_relations) == 4 and event_relations[3]:
                 inside_circle.append(event_relations)
@@ -125,7 +109,7 @@ class ClusteringHelper:
                 latest = item[0]
         return latest
 
-    def _get_circle(self, event, to_be_inspected, relations, max_radius):
+    def _get_circle(self, event, to_be_inspected, relations, index: SpatialEventIndex, max_radius):
         if len(to_be_inspected) == 0:
             return event, [event]
         elif len(to_be_inspected) == 1:
@@ -158,8 +142,13 @@ class ClusteringHelper:
             middle_event = (
                 latest_timestamp, middle, latest_timestamp - earliest_timestamp, True
             )
+        if self.useS2:
+            # the S2 cells covering the circle may exceed the radius
+            candidates = list(relations.keys())
+        else:
+            candidates = index.candidates_within(middle, max_radius)
         count_inside, events_in_circle, highest_timedelta, latest_timestamp = \
-            self._get_count_and_coords_in_circle_within_timedelta(middle, relations,
+            self._get_count_and_coords_in_circle_within_timedelta(middle, candidates,
                                                                   earliest_timestamp, latest_timestamp,
                                                                   max_radius)
         middle_event = (latest_timestamp, middle_event[1],
@@ -169,41 +158,51 @@ class ClusteringHelper:
         elif count_inside > self.max_count_per_circle:
             to_be_inspected = [
                 to_keep for to_keep in to_be_inspected if not to_keep.other_event == farthest_away]
-            return self._get_circle(event, to_be_inspected, relations, distance_to_farthest)
+            return self._get_circle(event, to_be_inspected, relations, index, distance_to_farthest)
         else:
             return middle_event, events_in_circle
 
     @staticmethod
-    def _remove_coords_from_relations(relations, events_to_be_removed):
-        for source_event, relations_to_source in list(relations.items()):
-            # iterate relations, remove anything matching events_to_be_removed
-            for event in events_to_be_removed:
-                if event == source_event:
-                    relations.pop(source_event)
-                    break
-                # iterate through the entire distance relations as well...
-                for relation in relations_to_source:
-                    if relation.other_event[1] == event[1]:
-                        relations[source_event].remove(relation)
+    def _remove_coords_from_relations(relations, events_to_be_removed, index: SpatialEventIndex,
+                                      related_sources: Dict[Location, List[Tuple[int, Location]]]):
+        locations_to_be_removed: Set[Location] = {event[1] for event in events_to_be_removed}
+        for event in events_to_be_removed:
+            if relations.pop(event, None) is not None:
+                index.remove(event)
+        # remove the relations to the locations removed from the remaining events
+        sources_to_clean_up: Set[Tuple[int, Location]] = set()
+        for location in locations_to_be_removed:
+            sources_to_clean_up.update(related_sources.pop(location, []))
+        for source_event in sources_to_clean_up:
+            relations_to_source = relations.get(source_event)
+            if relations_to_source is not None:
+                relations[source_event] = [relation for relation in relations_to_source
+                                           if relation.other_event[1] not in locations_to_be_removed]
         return relations
 
-    def _sum_up_relations(self, relations) -> List[Tuple[int, Location]]:
+    def _sum_up_relations(self, relations, index: SpatialEventIndex) -> List[Tuple[int, Location]]:
         final_set: List[Tuple[int, Location]] = []
+        # location -> events holding relations to events at the location
+        related_sources: Dict[Location, List[Tuple[int, Location]]] = defaultdict(list)
+        for source_event, relations_to_source in relations.items():
+            for relation in relations_to_source:
+                related_sources[relation.other_event[1]].append(source_event)
 
         while len(relations) > 0:
-            west_next = self._get_most_west_amongst_relations(relations)
+            west_next = index.most_west()
             try:
                 middle_event, events_to_be_removed = self._get_circle(west_next, relations[west_next], relations,
-                                                                      self.max_radius)
+                                                                      index, self.max_radius)
                 final_set.append((middle_event[0], middle_event[1]))
                 relations = self._remove_coords_from_relations(
-                    relations, events_to_be_removed)
+                    relations, events_to_be_removed, index, related_sources)
             except Exception as e:
                 logger.exception(e)
         return final_set
 
     def get_clustered(self, queue: List[Tuple[int, Location]]) -> List[Tuple[int, Location]]:
+        index: SpatialEventIndex = SpatialEventIndex(queue, self.max_radius * 2)
         relations = self._get_relations_in_range_within_time(
-            queue, max_radius=self.max_radius)
-        summed_up = self._sum_up_relations(relations)
+            index, max_radius=self.max_radius)
+        summed_up = self._sum_up_relations(relations, index)
         return summed_up
@@ -1,5 +1,3 @@
-import asyncio
-import concurrent.futures
 from timeit import default_timer as timer
 from typing import List, Optional, Tuple
 
@@ -13,9 +11,13 @@ from mapadroid.route.routecalc.ClusteringHelper import ClusteringHelper
 from mapadroid.utils.collections import Location
 from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
 from mapadroid.utils.madGlobals import RoutecalculationTypes
+from mapadroid.utils.ProcessPool import ProcessPool
 
 
 class RoutecalcUtil:
+    # Coords of up to this amount are clustered inline rather than in the process pool
+    CLUSTERING_INLINE_THRESHOLD: int = 200
+
     @staticmethod
     async def calculate_route(db_wrapper: DbWrapper, routecalc_id: int, coords: List[Location], max_radius,
                               max_coords_within_radius,
@@ -55,11 +57,10 @@ class RoutecalcUtil:
 
         if len(coords) > 0 and max_radius and max_radius >= 1 and max_coords_within_radius:
             logger.info("Calculating route for {}", route_name)
-            loop = asyncio.get_running_loop()
-            with concurrent.futures.ProcessPoolExecutor() as pool:
-                calculated_route = await loop.run_in_executor(
-                    pool, RoutecalcUtil.get_less_coords, coords, max_radius, max_coords_within_radius, use_s2,
-                    s2_level)
+            calculated_route = await ProcessPool.run(RoutecalcUtil.get_less_coords, coords, max_radius,
+                                                     max_coords_within_radius, use_s2, s2_level,
+                                                     work_size=len(coords),
+                                                     inline_threshold=RoutecalcUtil.CLUSTERING_INLINE_THRESHOLD)
 
             logger.debug("Coords summed up to {} coords", len(calculated_route))
         logger.debug("Got {} coordinates", len(calculated_route))
@@ -0,0 +1,140 @@
+import heapq
+import itertools
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from mapadroid.utils.collections import Location
+from mapadroid.utils.geo import EARTH_RADIUS_METERS, get_pairwise_distances_in_meters
+
+
+class SpatialEventIndex:
+    """
+    Uniform grid of the events (timestamp, Location) to be clustered, allowing radius queries without inspecting
+    every event. The grid is laid over the cartesian coordinates of the events on a sphere of the earth's radius
+    as the distance along the surface grows monotonic with the length of the chord. Events retain the order of their
+    first occurrence, duplicates are dropped. Events can be removed from the index, they will not be returned anymore.
+    """
+    # Relative and absolute (in meters) safety margin accounting for rounding errors of radius queries
+    __RELATIVE_MARGIN: float = 1e-9
+    __ABSOLUTE_MARGIN: float = 1e-3
+
+    def __init__(self, events: List[Tuple[int, Location]], cell_size: float):
+        """
+        Args:
+            events: Events to be indexed
+            cell_size: Distance in meters along the surface covered by a cell, ideally the radius queried the most
+        """
+        self.events: List[Tuple[int, Location]] = list(dict.fromkeys(events))
+        self._index_of_event: Dict[Tuple[int, Location], int] = {event: index
+                                                                 for index, event in enumerate(self.events)}
+        self._coordinates: np.ndarray = np.array([(event[1].lat, event[1].lng) for event in self.events],
+                                                 dtype=np.float64).reshape(-1, 2)
+        self._timestamps: np.ndarray = np.array([event[0] for event in self.events], dtype=np.float64)
+        self._alive: np.ndarray = np.ones(len(self.events), dtype=bool)
+        # Queries of the radius of cell_size only need to inspect the neighbouring cells
+        self._cell_size: float = max(self.__chord_length_with_margin(cell_size), 1.0)
+        self._points: np.ndarray = SpatialEventIndex.__to_cartesian(self._coordinates)
+        cell_keys: np.ndarray = np.floor(self._points / self._cell_size).astype(np.int64)
+        self._cells: Dict[Tuple[int, int, int], np.ndarray] = {}
+        if len(self.events) > 0:
+            # Group the indices of events by cell, indices within a cell remain in ascending order
+            order = np.lexsort((cell_keys[:, 2], cell_keys[:, 1], cell_keys[:, 0]))
+            sorted_keys = cell_keys[order]
+            boundaries = np.flatnonzero(np.any(np.diff(sorted_keys, axis=0) != 0, axis=1)) + 1
+            for indices in np.split(order, boundaries):
+                self._cells[tuple(int(value) for value in cell_keys[indices[0]])] = np.sort(indices)
+        # Sorted by longitude ascending, latitude descending and order of occurrence (see most_west)
+        self._west_heap: List[Tuple[float, float, int]] = [(event[1].lng, -event[1].lat, index)
+                                                            for index, event in enumerate(self.events)]
+        heapq.heapify(self._west_heap)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._alive))
+
+    def remove(self, event: Tuple[int, Location]) -> None:
+        index = self._index_of_event.get(event)
+        if index is not None:
+            self._alive[index] = False
+
+    def most_west(self) -> Tuple[int, Location]:
+        """
+        Returns: The remaining event with the lowest longitude, the highest latitude amongst those and the first
+        occurring amongst those
+        """
+        while not self._alive[self._west_heap[0][2]]:
+            heapq.heappop(self._west_heap)
+        return self.events[self._west_heap[0][2]]
+
+    def candidates_within(self, location: Location, radius: float) -> List[Tuple[int, Location]]:
+        """
+        Returns: The remaining events in order of occurrence which are possibly within the radius (meters) of the
+        location. Every remaining event within the radius is contained, events slightly further away may be.
+        """
+        point = SpatialEventIndex.__to_cartesian(np.array([[location.lat, location.lng]]))[0]
+        reach = self.__chord_length_with_margin(radius)
+        lower = np.floor((point - reach) / self._cell_size).astype(np.int64)
+        upper = np.floor((point + reach) / self._cell_size).astype(np.int64)
+        if np.prod(upper - lower + 1) <= len(self._cells):
+            keys = itertools.product(*(range(low, high + 1) for low, high in zip(lower, upper)))
+            cells = [self._cells[key] for key in keys if key in self._cells]
+        else:
+            cells = [indices for key, indices in self._cells.items()
+                     if np.all(lower <= key) and np.all(key <= upper)]
+        if not cells:
+            return []
+        indices = np.concatenate(cells)
+        indices = indices[self._alive[indices]]
+        inside = np.linalg.norm(self._points[indices] - point, axis=1) <= reach
+        return [self.events[index] for index in np.sort(indices[inside])]
+
+    def pairs_within(self, max_distance: float, max_timedelta: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Finds all pairs of events (including each event paired with itself) within max_distance meters of each other
+        with the timestamp of the first one being at most max_timedelta seconds past the timestamp of the other one.
+        Returns: Indices of the first events, indices of the other events and the distances of the pairs, sorted by
+        the index of the first event and the index of the other event
+        """
+        reach = self.__chord_length_with_margin(max_distance)
+        cells_reached = int(math.ceil(reach / self._cell_size))
+        offsets = list(itertools.product(range(-cells_reached, cells_reached + 1), repeat=3))
+        firsts: List[np.ndarray] = []
+        others: List[np.ndarray] = []
+        for key, rows in self._cells.items():
+            columns = np.concatenate([self._cells[neighbour] for neighbour in
+                                      ((key[0] + x, key[1] + y, key[2] + z) for x, y, z in offsets)
+                                      if neighbour in self._cells])
+            # Prune by the time window before calculating distances
+            timedeltas = self._timestamps[rows, np.newaxis] - self._timestamps[columns]
+            row_positions, column_positions = np.nonzero((0 <= timedeltas) & (timedeltas <= max_timedelta))
+            firsts.append(rows[row_positions])
+            others.append(columns[column_positions])
+        if not firsts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.float64)
+        first = np.concatenate(firsts)
+        other = np.concatenate(others)
+        distances = get_pairwise_distances_in_meters(self._coordinates[first], self._coordinates[other])
+        in_range = distances <= max_distance
+        first, other, distances = first[in_range], other[in_range], distances[in_range]
+        order = np.lexsort((other, first))
+        return first[order], other[order], distances[order]
+
+    def __chord_length_with_margin(self, distance: float) -> float:
+        return (SpatialEventIndex.__chord_length(distance) * (1 + SpatialEventIndex.__RELATIVE_MARGIN)
+                + SpatialEventIndex.__ABSOLUTE_MARGIN)
+
+    @staticmethod
+    def __chord_length(distance: float) -> float:
+        # Length of the chord of an arc of the given length along the surface
+        return 2 * EARTH_RADIUS_METERS * math.sin(min(max(distance, 0.0), math.pi * EARTH_RADIUS_METERS)
+                                                  / (2 * EARTH_RADIUS_METERS))
+
+    @staticmethod
+    def __to_cartesian(coordinates: np.ndarray) -> np.ndarray:
+        radians = np.radians(coordinates)
+        cos_lat = np.cos(radians[:, 0])
+        return EARTH_RADIUS_METERS * np.column_stack((cos_lat * np.cos(radians[:, 1]),
+                                                      cos_lat * np.sin(radians[:, 1]),
+                                                      np.sin(radians[:, 0])))
@@ -1,18 +1,20 @@
-import asyncio
 import math
 import platform
-from concurrent.futures import ProcessPoolExecutor
 from typing import List
 
 import numpy as np
 
 from mapadroid.route.routecalc.calculate_route_quick import route_calc_impl
 from mapadroid.utils.collections import Location
-from mapadroid.utils.logging import LoggerEnums, get_logger, init_logging
-from mapadroid.utils.madGlobals import MadGlobals, RoutecalculationTypes
+from mapadroid.utils.logging import LoggerEnums, get_logger
+from mapadroid.utils.madGlobals import RoutecalculationTypes
+from mapadroid.utils.ProcessPool import ProcessPool
 
 logger = get_logger(LoggerEnums.routecalc)
 
+# Routes of up to this amount of coords are calculated inline rather than in the process pool
+INLINE_THRESHOLD: int = 100
+
 
 def is_or_tools_available() -> bool:
     or_tools_available: bool = False
@@ -73,8 +75,6 @@ def format_solution(manager, routing, solution):
 
 
 def _run_in_process_executor(method, less_coordinates, route_name):
-    # Utility method to init logging in process executor...
-    init_logging(MadGlobals.application_args, print_info=False)
     try:
         return method(less_coordinates, route_name)
     except Exception as e:
@@ -125,15 +125,13 @@ async def route_calc_all(coords: List[Location], route_name, algorithm: Routecal
     for i in range(len(coords)):
         coords_for_calc[i][0] = coords[i].lat
         coords_for_calc[i][1] = coords[i].lng
-    loop = asyncio.get_running_loop()
-    with ProcessPoolExecutor() as executor:
-        if is_or_tools_available() and algorithm.OR_TOOLS:
-            logger.debug("Using OR-Tools for routecalc")
-            sol_best = await loop.run_in_executor(
-                executor, _run_in_process_executor, route_calc_ortools, coords_for_calc, route_name)
-        else:
-            logger.debug("Using MAD quick routecalc")
-            sol_best = await loop.run_in_executor(
-                executor, _run_in_process_executor, route_calc_impl, coords_for_calc, route_name)
+    if is_or_tools_available() and algorithm.OR_TOOLS:
+        logger.debug("Using OR-Tools for routecalc")
+        method = route_calc_ortools
+    else:
+        logger.debug("Using MAD quick routecalc")
+        method = route_calc_impl
+    sol_best = await ProcessPool.run(_run_in_process_executor, method, coords_for_calc, route_name,
+                                     work_size=len(coords), inline_threshold=INLINE_THRESHOLD)
     logger.debug("Solution has {} coordinates", len(sol_best))
     return sol_best
@@ -1,206 +1,363 @@
+import itertools
+import math
+import time
+from collections import deque
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy.spatial import Delaunay, QhullError
+
+from mapadroid.utils.geo import EARTH_RADIUS_METERS
 from mapadroid.utils.logging import LoggerEnums, get_logger
 
 logger = get_logger(LoggerEnums.routecalc)
 
+# Amount of nearest neighbours considered for the matching and the improvement of the tour
+NEIGHBOURS: int = 10
+# Seconds spent improving the tour with 2-opt and Or-opt moves at most
+IMPROVEMENT_TIME_BUDGET: float = 10.0
 
-def route_calc_impl(coords, route_name):
-    with logger.contextualize(origin=route_name):
-        less_coords_array = []
-        for i in range(len(coords)):
-            less_coords_array.append([coords[i][0].item(), coords[i][1].item()])
 
-        length, path = tsp(less_coords_array)
-        logger.info("Found {} long solution: ", length)
+def route_calc_impl(coords, route_name, improvement_time_budget: float = IMPROVEMENT_TIME_BUDGET):
+    with logger.contextualize(origin=route_name):
+        points = project_to_plane(coords)
+        length, path = tsp(points, improvement_time_budget)
+        logger.info("Found {:.0f}m long solution", length)
 
     return path
 
 
-def tsp(data):
-    logger.info("building the graph for a route of {}", len(data))
-    # build a graph
-    graph_data = build_graph(data)
+def project_to_plane(coords) -> np.ndarray:
+    """
+    Equirectangular projection of (lat, lng) pairs to meters around their mean latitude,
+    accurate for the extent of routes
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    radians = np.radians(coords)
+    cos_lat = math.cos(float(np.mean(radians[:, 0]))) if len(coords) > 0 else 1.0
+    return np.column_stack((radians[:, 1] * cos_lat, radians[:, 0])) * EARTH_RADIUS_METERS
+
+
+def tsp(points: np.ndarray, improvement_time_budget: float = IMPROVEMENT_TIME_BUDGET) -> Tuple[float, List[int]]:
+    """
+    Christofides-like heuristic: MST, greedy matching of the odd vertexes, eulerian tour with shortcuts and
+    2-opt/Or-opt improvements of the resulting tour within the time budget
+    Returns: length of the round trip and the indices of the points in order starting at 0
+    """
+    amount: int = len(points)
+    if amount <= 3:
+        return tour_length(points, list(range(amount))), list(range(amount))
 
-    # build a minimum spanning tree
-    logger.info("Building a min span tree..")
-    min_span_tree = minimum_spanning_tree(graph_data)
+    logger.info("Building a min span tree for a route of {}", amount)
+    mst_edges = minimum_spanning_tree(points)
+    neighbours = nearest_neighbours(points, NEIGHBOURS)
 
-    # find odd vertexes
     logger.info("Finding odd vertexes...")
-    odd_vertexes = find_odd_vertexes(min_span_tree)
+    odd_vertexes = find_odd_vertexes(mst_edges, amount)
 
-    # add minimum weight matching edges to MST
     logger.info("Adding minimum weight matching edges to MST...")
-    minimum_weight_matching(min_span_tree, graph_data, odd_vertexes)
+    matching_edges = minimum_weight_matching(points, odd_vertexes)
 
-    # find an eulerian tour
     logger.info("Finding and Eulerian tour...")
-    eulerian_tour = find_eulerian_tour(min_span_tree)
-
-    current = eulerian_tour[0]
-    path = [current]
-    visited = [False] * len(eulerian_tour)
-    visited[current] = True
-
-    length = 0
+    eulerian_tour = find_eulerian_tour(np.concatenate((mst_edges, matching_edges)), amount)
 
     logger.info("Visiting each node in our eulerian tour and making a route")
-    for node in eulerian_tour[1:]:
+    visited = np.zeros(amount, dtype=bool)
+    tour: List[int] = []
+    for node in eulerian_tour:
         if not visited[node]:
-            path.append(node)
             visited[node] = True
+            tour.append(node)
 
-            length += graph_data[current][node]
-            current = node
+    if improvement_time_budget > 0:
+        logger.info("Improving the route...")
+        tour = improve_tour(points, tour, neighbours, time.perf_counter() + improvement_time_budget)
 
+    start = tour.index(0)
+    path = tour[start:] + tour[:start]
     logger.info("Done making a route!")
-    return length, path
-
-
-def get_length(x1, y1, x2, y2):
-    return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** (1 / 2)
-
-
-def build_graph(data):
-    graph = {}
-    for this in range(len(data)):
-        for another_point in range(len(data)):
-            if this != another_point:
-                if this not in graph:
-                    graph[this] = {}
-
-                graph[this][another_point] = get_length(data[this][0], data[this][1], data[another_point][0],
-                                                        data[another_point][1])
-
-    return graph
-
-
-class UnionFind:
-    def __init__(self):
-        self.weights = {}
-        self.parents = {}
-
-    def __getitem__(self, obj):
-        if obj not in self.parents:
-            self.parents[obj] = obj
-            self.weights[obj] = 1
-            return obj
-
-        # find path of objects leading to the root
-        path = [obj]
-        root = self.parents[obj]
-        while root != path[-1]:
-            path.append(root)
-            root = self.parents[root]
-
-        # compress the path and return
-        for ancestor in path:
-            self.parents[ancestor] = root
-        return root
-
-    def __iter__(self):
-        return iter(self.parents)
-
-    def union(self, *objects):
-        roots = [self[x] for x in objects]
-        heaviest = max([(self.weights[r], r) for r in roots])[1]
-        for root in roots:
-            if root != heaviest:
-                self.weights[heaviest] += self.weights[root]
-                self.parents[root] = heaviest
-
-
-def minimum_spanning_tree(graph):
-    tree = []
-    subtrees = UnionFind()
-    for W, u, v in sorted((graph[u][v], u, v) for u in graph for v in graph[u]):  # noqa: VNE001 N806
-        if subtrees[u] != subtrees[v]:
-            tree.append((u, v, W))
-            subtrees.union(u, v)
-
-    return tree
-
-
-def find_odd_vertexes(min_span_tree):
-    tmp_g = {}
-    vertexes = []
-    for edge in min_span_tree:
-        if edge[0] not in tmp_g:
-            tmp_g[edge[0]] = 0
-
-        if edge[1] not in tmp_g:
-            tmp_g[edge[1]] = 0
-
-        tmp_g[edge[0]] += 1
-        tmp_g[edge[1]] += 1
-
-    for vertex in tmp_g:
-        if tmp_g[vertex] % 2 == 1:
-            vertexes.append(vertex)
-
-    return vertexes
-
-
-def minimum_weight_matching(min_span_tree, graph, odd_vert):
-    import random
-    random.shuffle(odd_vert)
-
-    while odd_vert:
-        vertex = odd_vert.pop()
-        length = float("inf")
-        index = 1
-        closest = 0
-        for index in odd_vert:
-            if vertex != index and graph[vertex][index] < length:
-                length = graph[vertex][index]
-                closest = index
-
-        min_span_tree.append((vertex, closest, length))
-        odd_vert.remove(closest)
-
-
-def find_eulerian_tour(matched_min_span_tree):
-    # find neigbours
-    neighbours = {}
-    for edge in matched_min_span_tree:
-        if edge[0] not in neighbours:
-            neighbours[edge[0]] = []
-
-        if edge[1] not in neighbours:
-            neighbours[edge[1]] = []
-
-        neighbours[edge[0]].append(edge[1])
-        neighbours[edge[1]].append(edge[0])
-
-    # finds the hamiltonian circuit
-    start_vertex = matched_min_span_tree[0][0]
-    ep = [neighbours[start_vertex][0]]
-
-    while len(matched_min_span_tree) > 0:
-        stop_ind = None
-        for ind, v in enumerate(ep):  # noqa: VNE001
-            if len(neighbours[v]) > 0:
-                stop_ind = ind
+    return tour_length(points, path), path
+
+
+def tour_length(points: np.ndarray, tour: List[int]) -> float:
+    if len(tour) < 2:
+        return 0.0
+    ordered = points[tour]
+    return float(np.sum(np.hypot(*(ordered - np.roll(ordered, -1, axis=0)).T)))
+
+
+def minimum_spanning_tree(points: np.ndarray) -> np.ndarray:
+    """
+    Kruskal's algorithm on the edges of the Delaunay triangulation of the points which contains the euclidean
+    minimum spanning tree. Prim's algorithm on the complete graph is used if the points cannot be triangulated.
+    Returns: Array of shape (n - 1, 2) of the edges of the tree
+    """
+    amount: int = len(points)
+    try:
+        # Joggling the input keeps duplicate and collinear points part of the triangulation, centering the points
+        # keeps the joggle small
+        simplices = Delaunay(points - points.mean(axis=0), qhull_options="QJ").simplices
+    except (QhullError, ValueError) as e:
+        logger.debug("Falling back to Prim's algorithm as the points cannot be triangulated: {}", e)
+        return _prim_minimum_spanning_tree(points)
+    candidates = np.sort(np.concatenate((simplices[:, [0, 1]], simplices[:, [1, 2]], simplices[:, [0, 2]])),
+                         axis=1).astype(np.int64)
+    # edges are shared by adjacent triangles, deduplicated by the key of the pair of vertexes
+    keys = np.unique(candidates[:, 0] * amount + candidates[:, 1])
+    candidates = np.column_stack((keys // amount, keys % amount))
+    lengths = np.hypot(*(points[candidates[:, 0]] - points[candidates[:, 1]]).T)
+    parents: List[int] = list(range(amount))
+
+    def find(vertex: int) -> int:
+        while parents[vertex] != vertex:
+            parents[vertex] = parents[parents[vertex]]
+            vertex = parents[vertex]
+        return vertex
+
+    edges: List[Tuple[int, int]] = []
+    for first, other in candidates[np.argsort(lengths, kind="stable")].tolist():
+        first_root, other_root = find(first), find(other)
+        if first_root != other_root:
+            parents[first_root] = other_root
+            edges.append((first, other))
+            if len(edges) == amount - 1:
                 break
-
-        while len(neighbours[v]) > 0:
-            w = neighbours[v][0]  # noqa: VNE001
-
-            remove_edge_from_matched_mst(matched_min_span_tree, v, w)
-
-            del neighbours[v][(neighbours[v].index(w))]
-            del neighbours[w][(neighbours[w].index(v))]
-
-            stop_ind += 1
-            ep.insert(stop_ind, w)
-
-            v = w  # noqa: VNE001
-
-    return ep
-
-
-def remove_edge_from_matched_mst(matched_mst, v1, v2):
-    for i, item in enumerate(matched_mst):
-        if (item[0] == v2 and item[1] == v1) or (item[0] == v1 and item[1] == v2):
-            del matched_mst[i]
-
-    return matched_mst
+    if len(edges) < amount - 1:
+        logger.debug("Falling back to Prim's algorithm as the triangulation is not connected")
+        return _prim_minimum_spanning_tree(points)
+    return np.array(edges, dtype=np.int64)
+
+
+def _prim_minimum_spanning_tree(points: np.ndarray) -> np.ndarray:
+    """
+    Prim's algorithm on the complete graph keeping one row of distances, O(n^2)
+    """
+    amount: int = len(points)
+    in_tree = np.zeros(amount, dtype=bool)
+    distances = np.full(amount, np.inf)
+    closest = np.zeros(amount, dtype=np.int64)
+    edges = np.empty((max(amount - 1, 0), 2), dtype=np.int64)
+    vertex: int = 0
+    for edge in range(amount - 1):
+        in_tree[vertex] = True
+        vertex_distances = np.hypot(points[:, 0] - points[vertex, 0], points[:, 1] - points[vertex, 1])
+        closer = vertex_distances < distances
+        distances[closer] = vertex_distances[closer]
+        closest[closer] = vertex
+        distances[in_tree] = np.inf
+        vertex = int(np.argmin(distances))
+        edges[edge] = (closest[vertex], vertex)
+    return edges
+
+
+def find_odd_vertexes(edges: np.ndarray, amount: int) -> np.ndarray:
+    degrees = np.bincount(edges.ravel(), minlength=amount)
+    return np.flatnonzero(degrees % 2 == 1)
+
+
+def nearest_neighbours(points: np.ndarray, amount_of_neighbours: int) -> np.ndarray:
+    """
+    Nearest neighbours found by inspecting the grid cells around each cell of points until the k nearest
+    are guaranteed to be amongst the points inspected
+    Returns: Array of shape (n, k) of the indices of the k nearest other points of each point, closest first
+    """
+    amount: int = len(points)
+    amount_of_neighbours = min(amount_of_neighbours, amount - 1)
+    neighbours = np.empty((amount, amount_of_neighbours), dtype=np.int64)
+    extent = np.ptp(points, axis=0)
+    # cells hold about as many points as neighbours searched on average
+    cell_size: float = max(math.sqrt(max(float(extent[0] * extent[1]), float(np.max(extent)) ** 2 / amount, 1.0)
+                                     * amount_of_neighbours / amount), 1e-6)
+    cell_keys = np.floor((points - points.min(axis=0)) / cell_size).astype(np.int64)
+    order = np.lexsort((cell_keys[:, 1], cell_keys[:, 0]))
+    boundaries = np.flatnonzero(np.any(np.diff(cell_keys[order], axis=0) != 0, axis=1)) + 1
+    cells: Dict[Tuple[int, int], np.ndarray] = {}
+    for indices in np.split(order, boundaries):
+        cells[(int(cell_keys[indices[0], 0]), int(cell_keys[indices[0], 1]))] = indices
+    for (cell_x, cell_y), rows in cells.items():
+        ring = 1
+        while True:
+            if (2 * ring + 1) ** 2 < len(cells):
+                columns = [cells[key] for key in itertools.product(range(cell_x - ring, cell_x + ring + 1),
+                                                                     range(cell_y - ring, cell_y + ring + 1))
+                           if key in cells]
+            else:
+                columns = list(cells.values())
+            candidates = np.concatenate(columns)
+            if len(candidates) > amount_of_neighbours:
+                distances = np.hypot(points[rows, 0, np.newaxis] - points[candidates, 0],
+                                     points[rows, 1, np.newaxis] - points[candidates, 1])
+                distances[candidates[np.newaxis, :] == rows[:, np.newaxis]] = np.inf
+                closest = np.argpartition(distances, amount_of_neighbours - 1, axis=1)[:, :amount_of_neighbours]
+                closest_distances = np.take_along_axis(distances, closest, axis=1)
+                # points outside the cells inspected are further away than ring cells
+                if len(candidates) == amount or np.all(closest_distances.max(axis=1) <= ring * cell_size):
+                    order = np.argsort(closest_distances, axis=1)
+                    neighbours[rows] = candidates[np.take_along_axis(closest, order, axis=1)]
+                    break
+            ring += 1
+    return neighbours
+
+
+def minimum_weight_matching(points: np.ndarray, odd_vertexes: np.ndarray) -> np.ndarray:
+    """
+    Greedy matching of the odd vertexes: candidate edges to the nearest odd vertexes are taken shortest first,
+    vertexes left over are matched to the nearest unmatched one
+    Returns: Array of shape (len(odd_vertexes) / 2, 2) of the edges matched
+    """
+    if len(odd_vertexes) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    odd_points = points[odd_vertexes]
+    odd_neighbours = nearest_neighbours(odd_points, NEIGHBOURS)
+    firsts = np.repeat(np.arange(len(odd_vertexes)), odd_neighbours.shape[1])
+    others = odd_neighbours.ravel()
+    lengths = np.hypot(*(odd_points[firsts] - odd_points[others]).T)
+    matched = np.zeros(len(odd_vertexes), dtype=bool)
+    edges: List[Tuple[int, int]] = []
+    for candidate in np.argsort(lengths, kind="stable"):
+        first, other = firsts[candidate], others[candidate]
+        if not matched[first] and not matched[other]:
+            matched[first] = matched[other] = True
+            edges.append((first, other))
+    unmatched = np.flatnonzero(~matched)
+    while len(unmatched) > 0:
+        first, unmatched = unmatched[0], unmatched[1:]
+        distances = np.hypot(*(odd_points[unmatched] - odd_points[first]).T)
+        closest = int(np.argmin(distances))
+        edges.append((first, unmatched[closest]))
+        unmatched = np.delete(unmatched, closest)
+    return odd_vertexes[np.array(edges, dtype=np.int64)]
+
+
+def find_eulerian_tour(edges: np.ndarray, amount: int) -> List[int]:
+    """
+    Hierholzer's algorithm on the multigraph given (every vertex having an even degree)
+    Returns: Vertexes in order of the eulerian circuit starting at the first vertex of the first edge
+    """
+    # adjacency of the vertexes in CSR layout, every edge being listed for both of its vertexes
+    ends = np.concatenate((edges[:, 0], edges[:, 1]))
+    others = np.concatenate((edges[:, 1], edges[:, 0]))
+    edge_ids = np.concatenate((np.arange(len(edges)), np.arange(len(edges))))
+    order = np.argsort(ends, kind="stable")
+    adjacent: List[int] = others[order].tolist()
+    adjacent_edge: List[int] = edge_ids[order].tolist()
+    offsets: List[int] = np.concatenate(([0], np.cumsum(np.bincount(ends, minlength=amount)))).tolist()
+    next_unused: List[int] = offsets[:-1]
+    used: List[bool] = [False] * len(edges)
+
+    stack: List[int] = [int(edges[0, 0])]
+    tour: List[int] = []
+    while stack:
+        vertex = stack[-1]
+        position = next_unused[vertex]
+        while position < offsets[vertex + 1] and used[adjacent_edge[position]]:
+            position += 1
+        next_unused[vertex] = position
+        if position == offsets[vertex + 1]:
+            tour.append(stack.pop())
+        else:
+            used[adjacent_edge[position]] = True
+            stack.append(adjacent[position])
+    tour.reverse()
+    return tour
+
+
+def improve_tour(points: np.ndarray, tour: List[int], neighbours: np.ndarray, deadline: float) -> List[int]:
+    """
+    Improves the round trip by 2-opt and Or-opt moves of segments of up to 3 vertexes to one of the nearest
+    neighbours until no move improves the tour or the deadline (time.perf_counter()) passed
+    """
+    amount: int = len(tour)
+    xs: List[float] = points[:, 0].tolist()
+    ys: List[float] = points[:, 1].tolist()
+    neighbour_lists: List[List[int]] = neighbours.tolist()
+    tour_array = np.array(tour, dtype=np.int64)
+    positions = np.empty(amount, dtype=np.int64)
+    positions[tour_array] = np.arange(amount)
+
+    def dist(first: int, other: int) -> float:
+        return math.hypot(xs[first] - xs[other], ys[first] - ys[other])
+
+    def reverse(start: int, end: int) -> None:
+        # reverse the path of positions start to end (inclusive, cyclic) by reversing the shorter side
+        inner = (end - start) % amount + 1
+        if inner * 2 > amount:
+            start, end, inner = (end + 1) % amount, (start - 1) % amount, amount - inner
+        indices = (start + np.arange(inner)) % amount
+        tour_array[indices] = tour_array[indices[::-1]]
+        positions[tour_array[indices]] = indices
+
+    def two_opt(vertex: int) -> bool:
+        position = int(positions[vertex])
+        for succ_direction in (True, False):
+            other_side = int(tour_array[(position + (1 if succ_direction else -1)) % amount])
+            removed = dist(vertex, other_side)
+            for candidate in neighbour_lists[vertex]:
+                added = dist(vertex, candidate)
+                if added >= removed:
+                    break
+                candidate_position = int(positions[candidate])
+                candidate_other = int(tour_array[(candidate_position + (1 if succ_direction else -1)) % amount])
+                if candidate_other == vertex or candidate == other_side:
+                    continue
+                delta = added + dist(other_side, candidate_other) - removed - dist(candidate, candidate_other)
+                if delta < -1e-7:
+                    if succ_direction:
+                        reverse((position + 1) % amount, candidate_position)
+                    else:
+                        reverse(candidate_position, (position - 1) % amount)
+                    activate((vertex, other_side, candidate, candidate_other))
+                    return True
+        return False
+
+    def or_opt(vertex: int) -> bool:
+        nonlocal tour_array
+        position = int(positions[vertex])
+        for segment_length in (1, 2, 3):
+            if segment_length + 2 > amount:
+                break
+            segment = [int(tour_array[(position + offset) % amount]) for offset in range(segment_length)]
+            before = int(tour_array[(position - 1) % amount])
+            after = int(tour_array[(position + segment_length) % amount])
+            removal_gain = dist(before, segment[0]) + dist(segment[-1], after) - dist(before, after)
+            if removal_gain <= 1e-7:
+                continue
+            for end in (segment[0], segment[-1]):
+                for candidate in neighbour_lists[end]:
+                    if dist(end, candidate) >= removal_gain:
+                        break
+                    if candidate in segment:
+                        continue
+                    candidate_next = int(tour_array[(positions[candidate] + 1) % amount])
+                    if candidate_next in segment:
+                        continue
+                    insertion = dist(candidate, candidate_next)
+                    forwards = dist(candidate, segment[0]) + dist(segment[-1], candidate_next) - insertion
+                    backwards = dist(candidate, segment[-1]) + dist(segment[0], candidate_next) - insertion
+                    if min(forwards, backwards) < removal_gain - 1e-7:
+                        moved = segment if forwards <= backwards else segment[::-1]
+                        remaining = np.roll(tour_array, -((position + segment_length) % amount))[:-segment_length]
+                        insert_at = int(np.flatnonzero(remaining == candidate)[0]) + 1
+                        tour_array = np.concatenate((remaining[:insert_at], moved, remaining[insert_at:]))
+                        positions[tour_array] = np.arange(amount)
+                        activate(segment + [before, after, candidate, candidate_next])
+                        return True
+        return False
+
+    def activate(vertexes) -> None:
+        # vertexes next to changed edges are inspected again
+        for changed in vertexes:
+            if not queued[changed]:
+                queued[changed] = True
+                active.append(changed)
+
+    active = deque(tour)
+    queued: List[bool] = [True] * amount
+    while active and time.perf_counter() < deadline:
+        vertex = active.popleft()
+        queued[vertex] = False
+        if two_opt(vertex) or or_opt(vertex):
+            activate((vertex,))
+    if active:
+        logger.info("Stopped improving the route after the time budget of the improvement passed")
+    return tour_array.tolist()
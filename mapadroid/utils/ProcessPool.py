@@ -0,0 +1,219 @@
+import asyncio
+import functools
+import heapq
+import importlib
+import itertools
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mapadroid.utils.logging import LoggerEnums, get_logger, init_logging
+from mapadroid.utils.madGlobals import MadGlobals
+
+logger = get_logger(LoggerEnums.system)
+
+
+class ProcessPoolTaskStats:
+    """
+    Durations of the tasks of a single function run by the ProcessPool
+    """
+    def __init__(self):
+        self.tasks: int = 0
+        self.inline: int = 0
+        self.failures: int = 0
+        self.wait_total: float = 0.0
+        self.duration_total: float = 0.0
+        self.duration_max: float = 0.0
+
+    def add_task(self, waited: float, duration: float, inline: bool, failed: bool) -> None:
+        self.tasks += 1
+        if inline:
+            self.inline += 1
+        if failed:
+            self.failures += 1
+        self.wait_total += waited
+        self.duration_total += duration
+        self.duration_max = max(self.duration_max, duration)
+
+    @property
+    def duration_avg(self) -> float:
+        return self.duration_total / self.tasks if self.tasks else 0.0
+
+    def __str__(self):
+        return (f"{self.tasks} tasks ({self.inline} inline), {self.failures} failed, "
+                f"waited {self.wait_total:.3f}s, duration avg {self.duration_avg:.3f}s / max {self.duration_max:.3f}s")
+
+
+class ProcessPool:
+    """
+    Application-wide pool of processes for CPU-bound tasks. The processes are started once (spawned, not forked off
+    the running MAD process) with the modules commonly needed preloaded. Tasks are queued by priority if all processes
+    are busy, tasks cancelled before they started are dropped. Tasks indicating a small amount of work are run inline
+    in the calling process as that is cheaper than transferring the data to another process.
+    The pool is bound to the loop it was started in - one event loop per process is assumed.
+    Once shut down, tasks are run inline until the pool is started again.
+    """
+    PRIORITY_HIGH: int = 0
+    PRIORITY_NORMAL: int = 10
+    PRIORITY_LOW: int = 20
+    # Modules imported by every process upon start
+    PRELOADED_MODULES: Tuple[str, ...] = ("numpy",
+                                          "mapadroid.geofence.geofenceHelper",
+                                          "mapadroid.route.routecalc.calculate_route_quick",
+                                          "mapadroid.route.routecalc.ClusteringHelper")
+    _executor: Optional[ProcessPoolExecutor] = None
+    _max_workers: int = 0
+    _closed: bool = False
+    _running: int = 0
+    # (priority, sequence, future of the caller, function, args, time queued)
+    _pending: List[Tuple[int, int, asyncio.Future, Callable, Tuple, float]] = []
+    _sequence = itertools.count()
+    _stats: Dict[str, ProcessPoolTaskStats] = {}
+
+    @staticmethod
+    async def start(max_workers: Optional[int] = None) -> None:
+        if ProcessPool._executor is not None:
+            return
+        if max_workers is None:
+            max_workers = getattr(MadGlobals.application_args, "process_pool_size", 2)
+        ProcessPool._max_workers = max(max_workers, 1)
+        ProcessPool._closed = False
+        executor: ProcessPoolExecutor = ProcessPool.__create_executor()
+        # Spawn the processes now rather than delaying the first tasks
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, ProcessPool._noop)
+                               for _ in range(ProcessPool._max_workers)))
+        logger.info("Started process pool of {} processes", ProcessPool._max_workers)
+
+    @staticmethod
+    async def shutdown() -> None:
+        executor: Optional[ProcessPoolExecutor] = ProcessPool._executor
+        ProcessPool._executor = None
+        # Neither recreate the executor upon further tasks nor start it implicitly again
+        ProcessPool._closed = True
+        ProcessPool._max_workers = 0
+        for pending in ProcessPool._pending:
+            pending[2].cancel()
+        ProcessPool._pending = []
+        if executor is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, executor.shutdown)
+        for name, stats in ProcessPool._stats.items():
+            logger.info("Process pool stats of {}: {}", name, stats)
+
+    @staticmethod
+    async def run(func: Callable, *args, priority: int = PRIORITY_NORMAL, work_size: Optional[int] = None,
+                  inline_threshold: int = 0) -> Any:
+        """
+        Runs the function with the args given in a process of the pool. Function and args have to be picklable,
+        i.e., the function has to be defined at module level or be a static method without name mangling.
+        Args:
+            func: Function to run
+            *args: Arguments passed to the function
+            priority: Tasks with lower values are started first if tasks are queued
+            work_size: Amount of work (e.g. number of coords) the task represents
+            inline_threshold: The task is run inline in the calling process if work_size is at most this value
+
+        Returns: The result of the function, exceptions raised by the function are re-raised
+        """
+        name: str = getattr(func, "__qualname__", repr(func))
+        if ProcessPool._closed or work_size is not None and work_size <= inline_threshold:
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args)
+                failed = False
+                return result
+            finally:
+                ProcessPool.__get_stats(name).add_task(0.0, time.perf_counter() - start, True, failed)
+        if ProcessPool._max_workers == 0:
+            await ProcessPool.start()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        heapq.heappush(ProcessPool._pending, (priority, next(ProcessPool._sequence), future, func, args,
+                                              time.perf_counter()))
+        ProcessPool.__dispatch()
+        # Cancelling the caller cancels the future, the task is dropped if it has not been started yet
+        return await future
+
+    @staticmethod
+    def queue_length() -> int:
+        return len(ProcessPool._pending)
+
+    @staticmethod
+    def running() -> int:
+        return ProcessPool._running
+
+    @staticmethod
+    def get_stats() -> Dict[str, ProcessPoolTaskStats]:
+        return ProcessPool._stats
+
+    @staticmethod
+    def __get_stats(name: str) -> ProcessPoolTaskStats:
+        stats: Optional[ProcessPoolTaskStats] = ProcessPool._stats.get(name)
+        if stats is None:
+            stats = ProcessPoolTaskStats()
+            ProcessPool._stats[name] = stats
+        return stats
+
+    @staticmethod
+    def __create_executor() -> ProcessPoolExecutor:
+        ProcessPool._executor = ProcessPoolExecutor(ProcessPool._max_workers,
+                                                    mp_context=multiprocessing.get_context("spawn"),
+                                                    initializer=ProcessPool._initialize_process,
+                                                    initargs=(MadGlobals.application_args,
+                                                              ProcessPool.PRELOADED_MODULES))
+        return ProcessPool._executor
+
+    @staticmethod
+    def __dispatch() -> None:
+        if ProcessPool._closed:
+            return
+        loop = asyncio.get_running_loop()
+        while ProcessPool._pending and ProcessPool._running < ProcessPool._max_workers:
+            _priority, _sequence, future, func, args, queued_at = heapq.heappop(ProcessPool._pending)
+            if future.cancelled():
+                continue
+            executor: ProcessPoolExecutor = ProcessPool._executor or ProcessPool.__create_executor()
+            try:
+                task = loop.run_in_executor(executor, func, *args)
+            except (BrokenProcessPool, RuntimeError) as e:
+                future.set_exception(e)
+                continue
+            ProcessPool._running += 1
+            task.add_done_callback(functools.partial(ProcessPool.__on_done, future,
+                                                     getattr(func, "__qualname__", repr(func)),
+                                                     queued_at, time.perf_counter()))
+
+    @staticmethod
+    def __on_done(future: asyncio.Future, name: str, queued_at: float, started_at: float,
+                  task: asyncio.Future) -> None:
+        ProcessPool._running -= 1
+        exception: Optional[BaseException] = None if task.cancelled() else task.exception()
+        ProcessPool.__get_stats(name).add_task(started_at - queued_at, time.perf_counter() - started_at, False,
+                                               task.cancelled() or exception is not None)
+        if not future.done():
+            if task.cancelled():
+                future.cancel()
+            elif exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(task.result())
+        if isinstance(exception, BrokenProcessPool) and ProcessPool._executor is not None:
+            logger.warning("Process pool broke ({}), recreating it", exception)
+            ProcessPool._executor.shutdown(wait=False)
+            ProcessPool._executor = None
+        ProcessPool.__dispatch()
+
+    @staticmethod
+    def _noop() -> None:
+        pass
+
+    @staticmethod
+    def _initialize_process(application_args, preloaded_modules: Tuple[str, ...]) -> None:
+        MadGlobals.application_args = application_args
+        if application_args is not None:
+            init_logging(application_args, print_info=False)
+        for module in preloaded_modules:
+            importlib.import_module(module)
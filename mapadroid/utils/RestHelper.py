@@ -1,10 +1,12 @@
 import asyncio
 import json
-from typing import Optional, Mapping, Dict, Union
+import time
+from typing import Dict, Mapping, Optional, Union
 
 import aiohttp
-from aiohttp import ClientConnectionError, ClientError
+from aiohttp import ClientConnectionError, ClientConnectorError, ClientError
 from aiohttp.typedefs import LooseHeaders
+from yarl import URL
 
 from mapadroid.utils.json_encoder import MADEncoder
 from mapadroid.utils.logging import get_logger, LoggerEnums
@@ -24,59 +26,165 @@ class RestApiResult:
             return f"{self.status_code}: {self.result_body[:25]}[..]"
 
 
+class RestRequestStats:
+    """
+    Counters of the requests sent to a single origin
+    """
+    def __init__(self):
+        self.requests: int = 0
+        self.failures: int = 0
+        self.retries: int = 0
+        self.latency_total: float = 0.0
+        self.latency_max: float = 0.0
+
+    def add_request(self, latency: float, failed: bool) -> None:
+        self.requests += 1
+        if failed:
+            self.failures += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    @property
+    def latency_avg(self) -> float:
+        return self.latency_total / self.requests if self.requests else 0.0
+
+    def __str__(self):
+        return (f"{self.requests} requests, {self.failures} failed, {self.retries} retries, "
+                f"latency avg {self.latency_avg:.3f}s / max {self.latency_max:.3f}s")
+
+
 class RestHelper:
+    # Sessions are kept alive per origin (scheme, host and port) to reuse connections across requests.
+    # They are bound to the loop they were created in - one event loop per process is assumed.
+    CONNECTIONS_PER_HOST: int = 10
+    KEEPALIVE_TIMEOUT: float = 30.0
+    # Status codes worth retrying, anything else is considered final
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+    # Methods which may be retried after the request may have reached the server already
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+    _sessions: Dict[str, aiohttp.ClientSession] = {}
+    _stats: Dict[str, RestRequestStats] = {}
+
+    @staticmethod
+    def __get_origin(url: str) -> str:
+        return str(URL(url).origin())
+
+    @staticmethod
+    def __get_session(origin: str) -> aiohttp.ClientSession:
+        session: Optional[aiohttp.ClientSession] = RestHelper._sessions.get(origin)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=RestHelper.CONNECTIONS_PER_HOST,
+                                             keepalive_timeout=RestHelper.KEEPALIVE_TIMEOUT)
+            session = aiohttp.ClientSession(connector=connector,
+                                            json_serialize=lambda data: json.dumps(data, cls=MADEncoder))
+            RestHelper._sessions[origin] = session
+        return session
+
+    @staticmethod
+    def __get_stats_of_origin(origin: str) -> RestRequestStats:
+        stats: Optional[RestRequestStats] = RestHelper._stats.get(origin)
+        if stats is None:
+            stats = RestRequestStats()
+            RestHelper._stats[origin] = stats
+        return stats
+
+    @staticmethod
+    def get_stats() -> Dict[str, RestRequestStats]:
+        """
+        Returns: The counters of requests per origin since the start
+        """
+        return dict(RestHelper._stats)
+
+    @staticmethod
+    async def close() -> None:
+        sessions = list(RestHelper._sessions.values())
+        RestHelper._sessions.clear()
+        for session in sessions:
+            await session.close()
+
+    @staticmethod
+    async def __send_with_retries(method: str, url: str, result: RestApiResult, retries: int,
+                                  retry_backoff: float, **kwargs) -> Optional[bytes]:
+        """
+        Sends the request, retrying on connection errors and status codes in RETRY_STATUS_CODES with an exponential
+        backoff. Timeouts and connections lost while the request was in flight are only retried for methods in
+        IDEMPOTENT_METHODS as the server may have processed the request already, e.g., a webhook payload would be
+        delivered twice. The same applies to 5xx status codes returned after processing a request.
+        Returns: The raw body of the last response or None if no response has been received
+        """
+        origin: str = RestHelper.__get_origin(url)
+        stats: RestRequestStats = RestHelper.__get_stats_of_origin(origin)
+        attempt: int = 0
+        while True:
+            raw_body: Optional[bytes] = None
+            failed: bool = True
+            retryable: bool = True
+            start: float = time.perf_counter()
+            try:
+                async with RestHelper.__get_session(origin).request(method, url, allow_redirects=True,
+                                                                    **kwargs) as resp:
+                    result.status_code = resp.status
+                    raw_body = await resp.read()
+                failed = result.status_code >= 400
+                retryable = result.status_code in RestHelper.RETRY_STATUS_CODES
+            except ClientConnectorError as e:
+                # The connection could not be established, the request has not been sent
+                logger.warning("Connecting to {} failed: {}", url, str(e))
+            except (ClientConnectionError, asyncio.TimeoutError) as e:
+                logger.warning("Request to {} failed or timed out: {}", url, str(e))
+                retryable = method in RestHelper.IDEMPOTENT_METHODS
+            except ClientError as e:
+                logger.warning("Request to {} failed: {}", url, e)
+                retryable = method in RestHelper.IDEMPOTENT_METHODS
+            stats.add_request(time.perf_counter() - start, failed)
+            if attempt >= retries or not retryable:
+                return raw_body
+            attempt += 1
+            stats.retries += 1
+            await asyncio.sleep(retry_backoff * 2 ** (attempt - 1))
+
     @staticmethod
     async def send_get(url: str, headers=None,
                        params: Optional[Mapping[str, str]] = None,
                        timeout: int = 10,
-                       get_raw_body: Optional[bool] = False) -> RestApiResult:
+                       get_raw_body: Optional[bool] = False,
+                       retries: int = 0, retry_backoff: float = 1.0) -> RestApiResult:
         if headers is None:
             headers = {}
         result: RestApiResult = RestApiResult()
-        timeout = aiohttp.ClientTimeout(total=timeout)
+        raw_body: Optional[bytes] = await RestHelper.__send_with_retries(
+            "GET", url, result, retries, retry_backoff, headers=headers, params=params,
+            timeout=aiohttp.ClientTimeout(total=timeout))
+        if raw_body is None:
+            return result
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url, headers=headers, params=params, allow_redirects=True) as resp:
-                    result.status_code = resp.status
-                    try:
-                        if get_raw_body:
-                            result.result_body = await resp.read()
-                        else:
-                            result.result_body = json.loads(await resp.text())
-                        logger.success("Successfully got data from our request to {}: {}", url, result)
-                    except Exception as e:
-                        logger.warning("Failed converting response of request to '{}' with raw result '{}' to json: {}",
-                                       url, result, e)
-        except (ClientConnectionError, asyncio.TimeoutError) as e:
-            logger.warning("Connecting to {} failed: {}", url, str(e))
-        except ClientError as e:
-            logger.warning("Request to {} failed: {}", url, e)
+            if get_raw_body:
+                result.result_body = raw_body
+            else:
+                result.result_body = json.loads(raw_body)
+            logger.success("Successfully got data from our request to {}: {}", url, result)
+        except Exception as e:
+            logger.warning("Failed converting response of request to '{}' with raw result '{}' to json: {}",
+                           url, result, e)
         return result
 
     @staticmethod
     async def send_post(url: str, data: dict,
                         headers: Optional[LooseHeaders], params: Optional[Mapping[str, str]],
-                        timeout: int = 10) -> RestApiResult:
+                        timeout: int = 10,
+                        retries: int = 0, retry_backoff: float = 1.0) -> RestApiResult:
         result: RestApiResult = RestApiResult()
-        timeout = aiohttp.ClientTimeout(total=timeout)
-        try:
-            mad_json_dumps = lambda data_to_dump: json.dumps(data_to_dump, cls=MADEncoder)
-            async with aiohttp.ClientSession(timeout=timeout, json_serialize=mad_json_dumps) as session:
-                async with session.post(url, json=data, headers=headers, params=params, allow_redirects=True) as resp:
-                    result.status_code = resp.status
-                    raw_text = await resp.text()
-                    if raw_text:
-                        try:
-                            result.result_body = json.loads(raw_text)
-                            logger.success("Successfully got data from our request to {}: {}", url, result)
-                        except Exception as e:
-                            logger.debug(
-                                "Failed converting response of request to '{}' with raw result '{}' to json: {}",
-                                url, result.result_body, e)
-        except ClientConnectionError as e:
-            logger.warning("Connecting to {} failed: ", url, e)
-        except ClientError as e:
-            logger.warning("Request to {} failed: ", url, e)
+        raw_body: Optional[bytes] = await RestHelper.__send_with_retries(
+            "POST", url, result, retries, retry_backoff, json=data, headers=headers, params=params,
+            timeout=aiohttp.ClientTimeout(total=timeout))
+        if raw_body:
+            try:
+                result.result_body = json.loads(raw_body)
+                logger.success("Successfully got data from our request to {}: {}", url, result)
+            except Exception as e:
+                logger.debug(
+                    "Failed converting response of request to '{}' with raw result '{}' to json: {}",
+                    url, result.result_body, e)
         return result
 
     @staticmethod
@@ -86,13 +194,6 @@ class RestHelper:
         if headers is None:
             headers = {}
         result: RestApiResult = RestApiResult()
-        timeout = aiohttp.ClientTimeout(total=timeout)
-        try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.head(url, headers=headers, params=params, allow_redirects=True) as resp:
-                    result.status_code = resp.status
-        except (ClientConnectionError, asyncio.TimeoutError) as e:
-            logger.warning("Connecting to {} failed: {}", url, str(e))
-        except ClientError as e:
-            logger.warning("Request to {} failed: {}", url, e)
+        await RestHelper.__send_with_retries("HEAD", url, result, 0, 0, headers=headers, params=params,
+                                             timeout=aiohttp.ClientTimeout(total=timeout))
         return result
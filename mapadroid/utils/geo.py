@@ -1,7 +1,14 @@
 import math
 
+import numpy as np
+
 from mapadroid.utils.collections import Location
 
+# approximate radius of earth in meters
+EARTH_RADIUS_METERS: float = 6373000.0
+# Rows of a distance matrix computed at once to limit the size of intermediate arrays
+DISTANCE_MATRIX_CHUNK_SIZE: int = 1024
+
 
 def get_lat_lng_offsets_by_distance(distance):
     earth = 6373.0
@@ -31,6 +38,91 @@ def get_distance_of_two_points_in_meters(start_lat, start_lon, dest_lat, dest_lo
     return distance * 1000
 
 
+def to_coordinate_array(coordinates) -> np.ndarray:
+    """
+    Args:
+        coordinates: Iterable of (lat, lng) pairs such as Location or an array of shape (n, 2) in degrees
+    Returns: Array of shape (n, 2) in degrees
+    """
+    array = np.asarray(coordinates, dtype=np.float64)
+    if array.size == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    return array.reshape(-1, 2)
+
+
+def _haversine(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    # Arguments in radians, same formula as get_distance_of_two_points_in_meters
+    angle = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    # Rounding may push angle slightly above 1 for antipodal points
+    np.clip(angle, 0.0, 1.0, out=angle)
+    return EARTH_RADIUS_METERS * 2 * np.arctan2(np.sqrt(angle), np.sqrt(1 - angle))
+
+
+def get_distances_in_meters(lat: float, lng: float, coordinates) -> np.ndarray:
+    """
+    Vectorised version of get_distance_of_two_points_in_meters for one point and many
+    Args:
+        lat: Latitude of the point to measure the distances from
+        lng: Longitude of the point to measure the distances from
+        coordinates: (lat, lng) pairs, see to_coordinate_array
+    Returns: Array of the distances of the point to the coordinates in meters
+    """
+    radians = np.radians(to_coordinate_array(coordinates))
+    return _haversine(math.radians(lat), math.radians(lng), radians[:, 0], radians[:, 1])
+
+
+def get_pairwise_distances_in_meters(coordinates, other_coordinates) -> np.ndarray:
+    """
+    Vectorised version of get_distance_of_two_points_in_meters for pairs of points
+    Args:
+        coordinates: (lat, lng) pairs, see to_coordinate_array
+        other_coordinates: (lat, lng) pairs of the same length as coordinates
+    Returns: Array of the distances of coordinates[i] to other_coordinates[i] in meters
+    """
+    radians = np.radians(to_coordinate_array(coordinates))
+    other_radians = np.radians(to_coordinate_array(other_coordinates))
+    return _haversine(radians[:, 0], radians[:, 1], other_radians[:, 0], other_radians[:, 1])
+
+
+def get_distance_matrix_in_meters(coordinates, other_coordinates=None,
+                                  chunk_size: int = DISTANCE_MATRIX_CHUNK_SIZE) -> np.ndarray:
+    """
+    Vectorised version of get_distance_of_two_points_in_meters for many points and many.
+    The matrix is computed in chunks of rows to limit the memory used by intermediate arrays.
+    Args:
+        coordinates: (lat, lng) pairs of the rows, see to_coordinate_array
+        other_coordinates: (lat, lng) pairs of the columns, defaults to coordinates
+        chunk_size: Amount of rows computed at once, values below 1 are treated as 1
+    Returns: Array of shape (len(coordinates), len(other_coordinates)) with the distances in meters
+    """
+    radians = np.radians(to_coordinate_array(coordinates))
+    if other_coordinates is None:
+        other_radians = radians
+    else:
+        other_radians = np.radians(to_coordinate_array(other_coordinates))
+    matrix = np.empty((len(radians), len(other_radians)), dtype=np.float64)
+    other_lats = other_radians[np.newaxis, :, 0]
+    other_lngs = other_radians[np.newaxis, :, 1]
+    chunk_size = max(chunk_size, 1)
+    for start in range(0, len(radians), chunk_size):
+        chunk = radians[start:start + chunk_size]
+        matrix[start:start + len(chunk)] = _haversine(chunk[:, 0, np.newaxis], chunk[:, 1, np.newaxis],
+                                                      other_lats, other_lngs)
+    return matrix
+
+
+def get_indices_in_radius(lat: float, lng: float, coordinates, radius: float) -> np.ndarray:
+    """
+    Args:
+        lat: Latitude of the center
+        lng: Longitude of the center
+        coordinates: (lat, lng) pairs, see to_coordinate_array
+        radius: Radius in meters (inclusive)
+    Returns: Indices of the coordinates within the radius around the center in ascending order
+    """
+    return np.flatnonzero(get_distances_in_meters(lat, lng, coordinates) <= radius)
+
+
 def get_middle_of_coord_list(list_of_coords) -> Location:
     if len(list_of_coords) == 1:
         return list_of_coords[0]
@@ -1,8 +1,9 @@
+import asyncio
 import math
-import multiprocessing
-from typing import List
+from typing import List, Optional, Tuple
 
 import gpxdata
+import numpy as np
 import s2sphere
 
 from mapadroid.geofence.geofenceHelper import GeofenceHelper
@@ -10,11 +11,16 @@ from mapadroid.utils.collections import Location
 from mapadroid.utils.geo import (get_distance_of_two_points_in_meters,
                                  get_middle_of_coord_list)
 from mapadroid.utils.logging import LoggerEnums, get_logger
+from mapadroid.utils.ProcessPool import ProcessPool
 
 logger = get_logger(LoggerEnums.utils)
 
 
 class S2Helper:
+    # Init areas of up to this many locations are generated inline, larger ones in chunks in the process pool
+    GENERATION_INLINE_THRESHOLD: int = 2000000
+    GENERATION_CHUNK_SIZE: int = 1000000
+
     @staticmethod
     def lat_lng_to_cell_id(lat, lng, level=10):
         # Getting the cell id of a location
@@ -50,25 +56,70 @@ class S2Helper:
         return s2sphere.math.degrees(cell.lat().radians), s2sphere.math.degrees(cell.lng().radians), 0
 
     @staticmethod
-    def _generate_star_locs(center, distance, ring):
-        results = []
-        for i in range(0, 6):
-            # Star_locs will contain the locations of the 6 vertices of
-            # the current ring (90,150,210,270,330 and 30 degrees from
-            # origin) to form a star
-            star_loc = S2Helper.get_new_coords(center, distance * ring,
-                                               90 + 60 * i)
-            for index in range(0, ring):
-                # Then from each point on the star, create locations
-                # towards the next point of star along the edge of the
-                # current ring
-                loc = S2Helper.get_new_coords(star_loc, distance * index, 210 + 60 * i)
-                results.append(loc)
-        return results
+    def _generate_ring_coordinates(center_lat: float, center_lng: float, distance: float, first_ring: int,
+                                   last_ring: int, geofence_helper: Optional[GeofenceHelper]) -> np.ndarray:
+        """
+        Generates the locations of the hexagonal rings first_ring (inclusive) to last_ring (exclusive) around the
+        center in the order of the rings, starting at the vertex east of the center and going clockwise along the
+        edges of a ring. Edges of rings not reaching the bounding box of the geofence are skipped.
+        Returns: Array of the lat/lng of the locations inside the geofence
+        """
+        rings: np.ndarray = np.arange(first_ring, last_ring)
+        sides: np.ndarray = np.arange(6)
+        # The 6 vertices of each ring (90, 150, 210, 270, 330 and 30 degrees from the center) form a star
+        vertex_lats, vertex_lngs = S2Helper.get_new_coords_array(center_lat, center_lng,
+                                                                 distance * rings[:, np.newaxis],
+                                                                 90 + 60 * sides[np.newaxis, :])
+        # Every edge starts at a vertex heading towards the next vertex and holds as many locations as its ring number
+        edge_rings: np.ndarray = np.repeat(rings, 6)
+        edge_sides: np.ndarray = np.tile(sides, len(rings))
+        start_lats: np.ndarray = vertex_lats.ravel()
+        start_lngs: np.ndarray = vertex_lngs.ravel()
+        bounding_box: Optional[Tuple[float, float, float, float]] = None
+        if geofence_helper is not None and geofence_helper.geofenced_areas:
+            bounding_box = geofence_helper.get_polygon_from_fence()
+            reaching = S2Helper.__edges_reaching_box(start_lats, start_lngs,
+                                                     np.roll(vertex_lats, -1, axis=1).ravel(),
+                                                     np.roll(vertex_lngs, -1, axis=1).ravel(),
+                                                     distance * (edge_rings + 1), bounding_box)
+            edge_rings, edge_sides = edge_rings[reaching], edge_sides[reaching]
+            start_lats, start_lngs = start_lats[reaching], start_lngs[reaching]
+
+        edge_of_location: np.ndarray = np.repeat(np.arange(len(edge_rings)), edge_rings)
+        first_of_edge: np.ndarray = np.cumsum(edge_rings) - edge_rings
+        steps: np.ndarray = np.arange(len(edge_of_location)) - first_of_edge[edge_of_location]
+        lats, lngs = S2Helper.get_new_coords_array(start_lats[edge_of_location], start_lngs[edge_of_location],
+                                                   distance * steps, 210 + 60 * edge_sides[edge_of_location])
+        coordinates: np.ndarray = np.column_stack((lats, lngs))
+        if bounding_box is not None:
+            south, west, north, east = bounding_box
+            coordinates = coordinates[(south <= lats) & (lats <= north) & (west <= lngs) & (lngs <= east)]
+        if geofence_helper is not None and geofence_helper.is_enabled():
+            coordinates = coordinates[geofence_helper.contains(coordinates)]
+        return coordinates
+
+    @staticmethod
+    def __edges_reaching_box(start_lats: np.ndarray, start_lngs: np.ndarray, end_lats: np.ndarray,
+                             end_lngs: np.ndarray, lengths: np.ndarray,
+                             bounding_box: Tuple[float, float, float, float]) -> np.ndarray:
+        south, west, north, east = bounding_box
+        # The edges are arcs of great circles rather than straight lines in degrees, the generous margin covers the
+        # deviation as well as rounding
+        margin_lat: np.ndarray = np.degrees((0.25 * lengths) / gpxdata.Util.r_earth)
+        edge_south: np.ndarray = np.minimum(start_lats, end_lats) - margin_lat
+        edge_north: np.ndarray = np.maximum(start_lats, end_lats) + margin_lat
+        highest_lat: np.ndarray = np.minimum(np.maximum(np.abs(edge_south), np.abs(edge_north)), 89.0)
+        margin_lng: np.ndarray = margin_lat / np.cos(np.radians(highest_lat))
+        edge_west: np.ndarray = np.minimum(start_lngs, end_lngs) - margin_lng
+        edge_east: np.ndarray = np.maximum(start_lngs, end_lngs) + margin_lng
+        # Edges crossing the antimeridian are always kept
+        wrapping: np.ndarray = np.abs(start_lngs - end_lngs) > 180
+        return ((edge_north >= south) & (edge_south <= north)
+                & (wrapping | ((edge_east >= west) & (edge_west <= east))))
 
     # the following stuff is drafts for further consideration
     @staticmethod
-    def generate_locations(distance: float, geofence_helper: GeofenceHelper):
+    async def generate_locations(distance: float, geofence_helper: GeofenceHelper) -> List[Location]:
         south, east, north, west = geofence_helper.get_polygon_from_fence()
 
         corners = [
@@ -92,25 +143,39 @@ class S2Helper:
         step_limit = math.ceil(farthest_dist / distance)
 
         # This will loop thorugh all the rings in the hex from the centre
-        # moving outwards
+        # moving outwards. Ring n holds 6 * n locations.
         logger.info("Calculating positions for init scan")
-        num_cores = multiprocessing.cpu_count()
-        with multiprocessing.get_context("spawn").Pool(processes=num_cores) as pool:
-            temp = [pool.apply(S2Helper._generate_star_locs, args=(
-                center, distance, i)) for i in range(1, step_limit)]
-
-        results = [item for sublist in temp for item in sublist]
-        results.append(Location(center.lat, center.lng))
+        location_count: int = 3 * step_limit * (step_limit - 1)
+        if location_count <= S2Helper.GENERATION_INLINE_THRESHOLD:
+            ring_chunks: List[Tuple[int, int]] = [(1, max(step_limit, 1))]
+        else:
+            ring_chunks = S2Helper.__split_rings(step_limit, S2Helper.GENERATION_CHUNK_SIZE)
+        chunks: List[np.ndarray] = await asyncio.gather(*(
+            ProcessPool.run(S2Helper._generate_ring_coordinates, center.lat, center.lng, distance, first_ring,
+                            last_ring, geofence_helper, work_size=location_count,
+                            inline_threshold=S2Helper.GENERATION_INLINE_THRESHOLD)
+            for first_ring, last_ring in ring_chunks))
 
         logger.info("Filtering positions for init scan")
-        # Geofence results.
+        center_coordinates: np.ndarray = np.array([[center.lat, center.lng]])
         if geofence_helper is not None and geofence_helper.is_enabled():
-            results = geofence_helper.get_geofenced_coordinates(results)
-            if not results:
-                logger.error('No cells regarded as valid for desired scan area. Check your provided geofences. '
-                             'Aborting.')
+            center_coordinates = center_coordinates[geofence_helper.contains(center_coordinates)]
+        results: List[Location] = [Location(lat, lng) for lat, lng in
+                                   np.concatenate(chunks + [center_coordinates]).tolist()]
+        if geofence_helper is not None and geofence_helper.is_enabled() and not results:
+            logger.error('No cells regarded as valid for desired scan area. Check your provided geofences. '
+                         'Aborting.')
         return results
 
+    @staticmethod
+    def __split_rings(step_limit: int, chunk_size: int) -> List[Tuple[int, int]]:
+        # Splits the rings 1 to step_limit (exclusive) into consecutive ranges of about chunk_size locations
+        rings: np.ndarray = np.arange(1, step_limit)
+        chunk_of_ring: np.ndarray = np.cumsum(6 * rings) // chunk_size
+        boundaries: List[int] = (rings[np.flatnonzero(np.diff(chunk_of_ring)) + 1]).tolist()
+        starts: List[int] = [1] + boundaries
+        return list(zip(starts, boundaries + [step_limit]))
+
     @staticmethod
     def get_most_north(location_list):
         if location_list is None or len(location_list) == 0:
@@ -185,6 +250,24 @@ class S2Helper:
 
         return Location(destination.lat, destination.lon)
 
+    @staticmethod
+    def get_new_coords_array(lats, lngs, distances, bearings) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batch variant of get_new_coords, the arguments are broadcast against each other.
+        Returns: Arrays of the resulting latitudes and longitudes
+        """
+        lat_rad: np.ndarray = np.radians(lats)
+        distance_rad: np.ndarray = np.asarray(distances, dtype=np.float64) / gpxdata.Util.r_earth
+        bearing_rad: np.ndarray = np.radians(bearings)
+        sin_lat1, cos_lat1 = np.sin(lat_rad), np.cos(lat_rad)
+        sin_distance, cos_distance = np.sin(distance_rad), np.cos(distance_rad)
+        sin_lat: np.ndarray = sin_lat1 * cos_distance + cos_lat1 * sin_distance * np.cos(bearing_rad)
+        lng_diff: np.ndarray = np.arctan2(np.sin(bearing_rad) * sin_distance * cos_lat1,
+                                          cos_distance - sin_lat1 * sin_lat)
+        new_lats: np.ndarray = np.degrees(np.arcsin(np.clip(sin_lat, -1.0, 1.0)))
+        new_lngs: np.ndarray = (np.asarray(lngs, dtype=np.float64) + np.degrees(lng_diff)) % 360
+        return new_lats, np.where(new_lngs > 180, new_lngs - 360, new_lngs)
+
     @staticmethod
     # Returns a set of S2 cells within circle around position
     def get_s2cells_from_circle(lat, lng, radius, level=15):
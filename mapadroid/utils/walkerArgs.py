@@ -88,6 +88,10 @@ def parse_args():
                         help='Port to listen on for proto data (MITM data). Default: 8000')
     parser.add_argument('-mrdw', '--mitmreceiver_data_workers', type=int, default=2,
                         help='Amount of workers to work off the data that queues up. Default: 2')
+    parser.add_argument('-mrdp', '--mitmreceiver_data_processes', type=int, default=0,
+                        help='Amount of processes to work off the data that queues up (standalone MITMReceiver with '
+                             'gRPC or Redis MitmMapper only). Data of a device is always processed by the same '
+                             'process. Default: 0 (process data within the MITMReceiver process)')
     parser.add_argument('-miptt', '--mitm_ignore_proc_time_thresh', type=int, default=0,
                         help='Ignore MITM data having a timestamp too far in the past.'
                              'Specify in seconds. Default: 0 (off)')
@@ -132,6 +136,10 @@ def parse_args():
     parser.add_argument('-mitmcomp', '--mitmmapper_compression', type=bool,
                         action=argparse.BooleanOptionalAction,
                         help='Enable compression of data of the MitmMapper gRPC communication. Default: False')
+    parser.add_argument('-mitmrawjson', '--mitmmapper_raw_json', type=bool, default=True,
+                        action=argparse.BooleanOptionalAction,
+                        help='Transport data of the MitmMapper gRPC communication as JSON rather than protobuf Struct '
+                             'if supported by both ends. Default: True')
 
     # StatsHandler gRPC
     parser.add_argument('-statship', '--statshandler_ip', required=False, default="127.0.0.1", type=str,
@@ -145,6 +153,9 @@ def parse_args():
     parser.add_argument('-statshcomp', '--statshandler_compression', type=bool,
                         action=argparse.BooleanOptionalAction,
                         help='Enable compression of data of the StatsHandler gRPC communication. Default: False')
+    parser.add_argument('-statshfi', '--statshandler_flush_interval', required=False, default=5.0, type=float,
+                        help='Interval in seconds to submit the stats collected to the StatsHandler gRPC API in '
+                             'batches. Default: 5')
 
     # Walk Settings
     parser.add_argument('--enable_worker_specific_extra_start_stop_handling', default=False,
@@ -224,8 +235,12 @@ def parse_args():
     parser.add_argument('--no_quest_titles', default=False, action='store_true',
                         help='Do not download quest title resources')
     parser.add_argument('-wfdsd', '--wait_for_data_sleep_duration', default='1.0', type=float,
-                        help=('Time in seconds (floating point) to sleep inbetween checks of data in workers. '
-                              'Default: 1.0'))
+                        help=('Maximum time in seconds (floating point) inbetween checks of data in workers. '
+                              'Workers are woken up as soon as new data arrives, this merely applies if no new data '
+                              'is signaled. Default: 1.0'))
+    parser.add_argument('-pps', '--process_pool_size', default=2, type=int,
+                        help=('Amount of processes shared for CPU-bound tasks such as route calculations. '
+                              'Tasks are queued by priority if all processes are busy. Default: 2'))
 
     # MADmin
     parser.add_argument('-dm', '--disable_madmin', action='store_true', default=False,
@@ -276,6 +291,8 @@ def parse_args():
                         help='Generate mon seen stats (only with --game_stats)')
     parser.add_argument('-gsst', '--game_stats_save_time', default=300, type=int,
                         help='Number of seconds until worker information is saved to database')
+    parser.add_argument('-gssbs', '--game_stats_submit_batch_size', default=1000, type=int,
+                        help='Number of stats entries written to the database per statement. Default: 1000')
     parser.add_argument('-rds', '--raw_delete_shiny', default=0, type=int,
                         help='Delete shiny mon in raw stats older then x days (0 =  Disable (Default))')
 
@@ -307,6 +324,23 @@ def parse_args():
                         help='Split up the payload into chunks and send multiple requests. Default: 0 (unlimited)')
     parser.add_argument('-whwi', '--webhook_worker_interval', default=10, type=int,
                         help='Send webhook every X seconds (Default: 10 [seconds])')
+    parser.add_argument('-whmc', '--webhook_max_concurrency', default=4, type=int,
+                        help='Maximum amount of requests in flight per webhook receiver. Receivers and payload chunks '
+                             'are delivered concurrently (Default: 4)')
+    parser.add_argument('-whr', '--webhook_retries', default=2, type=int,
+                        help='Amount of retries of a webhook request failing to connect or returning a 429 or 5xx '
+                             'status code. Receivers returning a 5xx status code after processing a payload receive '
+                             'it again. Timed out requests are not retried (Default: 2)')
+    parser.add_argument('-whrb', '--webhook_retry_backoff', default=1.0, type=float,
+                        help='Seconds to wait before the first retry of a webhook request, doubled with every further '
+                             'retry (Default: 1.0)')
+    parser.add_argument('-whds', '--webhook_dedup_size', default=200000, type=int,
+                        help='Amount of entities to remember the last payload sent of in order to only send new or '
+                             'changed entities to webhooks (Default: 200000)')
+    parser.add_argument('-whes', '--webhook_event_stream', action='store_true', default=False,
+                        help='Publish the entities changed by MITM data processing to a Redis stream and have the '
+                             'webhook worker send these rather than polling the DB for changes. Needs to be set for '
+                             'the MITM receiver as well when run on its own.')
 
     # Dynamic Rarity
     parser.add_argument('-rh', '--rarity_hours', type=int, default=72,
@@ -405,6 +439,10 @@ def parse_args():
                         help='Redis password')
     parser.add_argument('-cdb', '--cache_database', default=0,
                         help='Redis database. Use different numbers (0-15) if you are running multiple instances')
+    parser.add_argument('-cldds', '--cache_local_dedup_size', default=10000, type=int,
+                        help='Amount of submitted entities to additionally keep in memory of each process in order to '
+                             'skip asking redis whether they have been submitted already. 0 to disable. '
+                             '(Default: 10000)')
 
     parser.add_argument('-eemd', '--enable_early_maintenance_detection', action='store_true', default=False,
                         help='Enable early maintenance screen detection - could be inaccurate, but will save on login time')
@@ -0,0 +1,108 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from cachetools import LRUCache
+from orjson import orjson
+from redis.asyncio import Redis
+
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.webhook)
+
+
+class WebhookChangeFeed:
+    """
+    Keeps track of the payloads sent to the webhook receivers in order to only send new or changed entities.
+    The DB is queried for a window of changes overlapping the previous passes, thus most entities are read multiple
+    times. The last payload delivered per entity is remembered by a hash in a bounded map, payloads equal to the last
+    one delivered are dropped.
+    The start of the window of the last pass is persisted as watermark for the next start to continue where the last
+    run stopped without missing rows committed late.
+    """
+    WATERMARK_KEY = "webhook_watermark"
+    # Older watermarks are not used in order to not send large amounts of outdated data upon start
+    WATERMARK_MAX_AGE = 900
+    # Fields changing without the entity having changed in a way relevant to receivers
+    VOLATILE_FIELDS = frozenset({"updated", "last_modified", "time_changed"})
+    # Fields identifying the entity of a payload per type of payload
+    IDENTIFYING_FIELDS: Dict[str, Tuple[str, ...]] = {
+        "pokemon": ("encounter_id",),
+        "raid": ("gym_id",),
+        "gym": ("gym_id",),
+        "pokestop": ("pokestop_id",),
+        "quest": ("pokestop_id", "with_ar"),
+        "weather": ("s2_cell_id",)
+    }
+
+    def __init__(self, cache: Redis, max_entries: int):
+        self._cache: Redis = cache
+        # (type, *identifying values) -> hash of the last payload sent
+        self._sent: LRUCache = LRUCache(maxsize=max_entries)
+
+    async def load_watermark(self) -> Optional[int]:
+        """
+        Returns: The timestamp to continue fetching changes from or None if no recent watermark is known
+        """
+        watermark_raw: Optional[bytes] = await self._cache.get(WebhookChangeFeed.WATERMARK_KEY)
+        if not watermark_raw:
+            return None
+        watermark: int = int(watermark_raw)
+        if watermark < time.time() - WebhookChangeFeed.WATERMARK_MAX_AGE:
+            logger.info("Ignoring webhook watermark {} as it is too old", watermark)
+            return None
+        return watermark
+
+    async def store_watermark(self, timestamp: int) -> None:
+        await self._cache.set(WebhookChangeFeed.WATERMARK_KEY, int(timestamp))
+
+    def filter_changed(self, payloads: List[Dict]) -> List[Dict]:
+        """
+        Drops the payloads equal to the last payload sent of the same entity. The payloads returned are only
+        remembered once passed to mark_sent, i.e., payloads failing to be delivered are not dropped the next time.
+        Args:
+            payloads: The payloads (dicts with "type" and "message") prepared
+
+        Returns: The payloads of new or changed entities in the order given
+        """
+        changed: List[Dict] = []
+        # Entities contained more than once in the payloads given
+        pending: Dict[Tuple, int] = {}
+        for payload in payloads:
+            identity: Optional[Tuple[Tuple, int]] = WebhookChangeFeed.__get_identity(payload)
+            if not identity:
+                changed.append(payload)
+                continue
+            entity_key, payload_hash = identity
+            if self._sent.get(entity_key) == payload_hash or pending.get(entity_key) == payload_hash:
+                continue
+            pending[entity_key] = payload_hash
+            changed.append(payload)
+        if len(changed) < len(payloads):
+            logger.debug("Dropped {} of {} webhook payloads as they have been sent before",
+                         len(payloads) - len(changed), len(payloads))
+        return changed
+
+    def mark_sent(self, payloads: List[Dict]) -> None:
+        """
+        Remembers the payloads given as the last ones delivered of their entities
+        """
+        for payload in payloads:
+            identity: Optional[Tuple[Tuple, int]] = WebhookChangeFeed.__get_identity(payload)
+            if identity:
+                self._sent[identity[0]] = identity[1]
+
+    @staticmethod
+    def __get_identity(payload: Dict) -> Optional[Tuple[Tuple, int]]:
+        """
+        Returns: The key of the entity of the payload and the hash of the payload or None if the type of payload does
+        not identify entities
+        """
+        message: Dict = payload["message"]
+        identifying_fields: Optional[Tuple[str, ...]] = WebhookChangeFeed.IDENTIFYING_FIELDS.get(payload["type"])
+        if not identifying_fields:
+            return None
+        entity_key = (payload["type"], *(message.get(field) for field in identifying_fields))
+        payload_hash: int = hash(orjson.dumps({key: value for key, value in message.items()
+                                               if key not in WebhookChangeFeed.VOLATILE_FIELDS},
+                                              default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS))
+        return entity_key, payload_hash
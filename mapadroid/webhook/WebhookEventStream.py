@@ -0,0 +1,103 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, Set, Tuple
+
+import ujson
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mapadroid.utils.logging import LoggerEnums, get_logger
+
+logger = get_logger(LoggerEnums.webhook)
+
+
+class WebhookEventStream:
+    """
+    Redis stream of the IDs of entities changed upon ingestion of data, consumed by the webhook worker instead of
+    polling the DB for changes.
+    IDs are recorded on the session writing the entities and only published once the session has been committed.
+    Otherwise, the webhook worker may read the entities before the changes are visible.
+    Each message of the stream maps the types of entities ("pokemon", "raid", "gym", "pokestop", "quest", "weather")
+    to JSON lists of IDs.
+    """
+    STREAM_KEY = "webhook_events"
+    # ID of the last message of the stream consumed by the webhook worker
+    POSITION_KEY = "webhook_events_position"
+    # Approximate amount of messages kept in the stream
+    MAX_LENGTH = 100000
+    SESSION_INFO_KEY = "webhook_events"
+
+    def __init__(self, cache: Redis):
+        self._cache: Redis = cache
+
+    @staticmethod
+    def record(session: AsyncSession, entity_type: str, entity_ids: Iterable[Hashable]) -> None:
+        recorded: Dict[str, Set] = session.info.setdefault(WebhookEventStream.SESSION_INFO_KEY, defaultdict(set))
+        recorded[entity_type].update(entity_ids)
+
+    async def publish_recorded(self, session: AsyncSession) -> None:
+        """
+        Publishes the IDs recorded on the session. To be called once the session has been committed.
+        """
+        recorded: Dict[str, Set] = session.info.pop(WebhookEventStream.SESSION_INFO_KEY, None)
+        if not recorded:
+            return
+        try:
+            await self._cache.xadd(WebhookEventStream.STREAM_KEY,
+                                   {entity_type: ujson.dumps(list(entity_ids))
+                                    for entity_type, entity_ids in recorded.items()},
+                                   maxlen=WebhookEventStream.MAX_LENGTH, approximate=True)
+        except Exception as e:
+            logger.warning("Failed publishing changes for webhooks: {}", e)
+
+    async def load_position(self) -> str:
+        """
+        Returns: The ID of the last message consumed. If none has been persisted, the ID of the last message published
+        so far is persisted and returned in order to only consume messages published from now on.
+        "$" is never returned as messages published between two reads would be skipped when reading from "$" again.
+        """
+        position = await self._cache.get(WebhookEventStream.POSITION_KEY)
+        if position:
+            return position.decode() if isinstance(position, bytes) else str(position)
+        try:
+            stream_info: Dict = await self._cache.xinfo_stream(WebhookEventStream.STREAM_KEY)
+            position = stream_info["last-generated-id"]
+            position = position.decode() if isinstance(position, bytes) else str(position)
+        except ResponseError:
+            # The stream does not exist yet, i.e., all messages are to be consumed once published
+            position = "0-0"
+        await self.store_position(position)
+        return position
+
+    async def store_position(self, position: str) -> None:
+        await self._cache.set(WebhookEventStream.POSITION_KEY, position)
+
+    async def read_batch(self, position: str, timeout: float, batch_window: float,
+                         count: int = 1000) -> Tuple[str, Dict[str, Set]]:
+        """
+        Waits up to timeout seconds for messages after the position given (an ID as returned by load_position).
+        Once a message arrives, further messages arriving within batch_window seconds are merged into the same batch.
+        Returns: The ID of the last message read (or the position passed if none has been read) and the IDs of
+        entities changed per type
+        """
+        changes: Dict[str, Set] = defaultdict(set)
+        position = self.__merge(await self._cache.xread({WebhookEventStream.STREAM_KEY: position}, count=count,
+                                                        block=int(timeout * 1000)),
+                                position, changes)
+        if changes and batch_window > 0:
+            await asyncio.sleep(batch_window)
+            position = self.__merge(await self._cache.xread({WebhookEventStream.STREAM_KEY: position}, count=count),
+                                    position, changes)
+        return position, changes
+
+    @staticmethod
+    def __merge(response, position: str, changes: Dict[str, Set]) -> str:
+        for _stream, messages in response or []:
+            for message_id, fields in messages:
+                position = message_id.decode() if isinstance(message_id, bytes) else message_id
+                for entity_type, entity_ids in fields.items():
+                    if isinstance(entity_type, bytes):
+                        entity_type = entity_type.decode()
+                    changes[entity_type].update(ujson.loads(entity_ids))
+        return position
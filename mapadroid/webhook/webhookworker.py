@@ -2,7 +2,10 @@ import asyncio
 import json
 import time
 from asyncio import Task
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from yarl import URL
 
 from mapadroid.db.DbWebhookReader import DbWebhookReader
 from mapadroid.db.DbWrapper import DbWrapper
@@ -14,14 +17,20 @@ from mapadroid.utils.json_encoder import mad_json_dumps
 from mapadroid.utils.logging import LoggerEnums, get_logger
 from mapadroid.utils.madGlobals import MonSeenTypes, terminate_mad
 from mapadroid.utils.questGen import QuestGen
-from mapadroid.utils.RestHelper import RestApiResult, RestHelper
+from mapadroid.utils.RestHelper import (RestApiResult, RestHelper,
+                                        RestRequestStats)
 from mapadroid.utils.s2Helper import S2Helper
+from mapadroid.webhook.WebhookChangeFeed import WebhookChangeFeed
+from mapadroid.webhook.WebhookEventStream import WebhookEventStream
 
 logger = get_logger(LoggerEnums.webhook)
 
 
 class WebhookWorker:
     __excluded_areas = {}
+    __stats_log_interval_sec = 300
+    # Changes published to the event stream within this window are sent together
+    __event_batch_window_sec = 0.5
 
     def __init__(self, args, db_wrapper: DbWrapper, mapping_manager: MappingManager, rarity, quest_gen: QuestGen):
         self.__quest_gen: QuestGen = quest_gen
@@ -56,20 +65,28 @@ class WebhookWorker:
 
         return [payload[x: x + size] for x in range(0, len(payload), size)]
 
-    def __is_in_excluded_area(self, coordinate):
+    def __get_excluded_mask(self, coordinates: List[Tuple[float, float]]) -> np.ndarray:
+        """
+        Returns: Boolean mask of the coordinates within any of the excluded areas
+        """
+        excluded: np.ndarray = np.zeros(len(coordinates), dtype=bool)
+        if not coordinates:
+            return excluded
         for gfh in self.__excluded_areas:
-            if gfh.is_coord_inside_include_geofence(coordinate):
-                return True
+            excluded |= gfh.contains(coordinates)
+        return excluded
 
-        return False
-
-    async def __send_webhook(self, payloads):
+    async def __send_webhook(self, payloads: List[Dict]) -> List[Dict]:
+        """
+        Returns: The payloads delivered to all receivers subscribed to them
+        """
         if len(payloads) == 0:
             logger.debug2("Payload empty. Skip sending to webhook.")
-            return
+            return []
 
-        current_wh_num = 1
-        for webhook in self.__webhook_receivers:
+        deliveries = []
+        chunks: List[List[Dict]] = []
+        for current_wh_num, webhook in enumerate(self.__webhook_receivers, start=1):
             payload_to_send = []
             sub_types = webhook.get('types')
 
@@ -91,43 +108,59 @@ class WebhookWorker:
                 payload_to_send, self.__args.webhook_max_payload_size
             )
 
-            current_pl_num = 1
-            for payload_chunk in payload_list:
-                logger.debug4("Python data for payload: {}", payload_chunk)
-                logger.debug4("Payload: {}", await mad_json_dumps(payload_chunk))
+            for current_pl_num, payload_chunk in enumerate(payload_list, start=1):
+                if len(self.__webhook_receivers) > 1:
+                    whcount_text = " [wh {}/{}]".format(current_wh_num, len(self.__webhook_receivers))
+                else:
+                    whcount_text = ""
 
-                try:
-                    response: RestApiResult = await RestHelper.send_post(webhook.get('url'),
-                                                                         data=payload_chunk,
-                                                                         headers={"Content-Type": "application/json"},
-                                                                         params=None,
-                                                                         timeout=5)
-                    if response.status_code != 200:
-                        logger.warning("Webhook destination {} returned status code other than 200 OK: {}",
-                                       webhook.get('url'), response.status_code)
-                    else:
-                        if len(self.__webhook_receivers) > 1:
-                            whcount_text = " [wh {}/{}]".format(current_wh_num, len(self.__webhook_receivers))
-                        else:
-                            whcount_text = ""
-
-                        if len(payload_list) > 1:
-                            whchunk_text = " [pl {}/{}]".format(current_pl_num, len(payload_list))
-                        else:
-                            whchunk_text = ""
-
-                        logger.success("Successfully sent payload to webhook{}{}. Stats: {}", whchunk_text,
-                                       whcount_text, await mad_json_dumps(self.__payload_type_count(payload_chunk)))
-                except Exception as e:
-                    logger.warning("Exception occured while sending webhook: {}", e)
+                if len(payload_list) > 1:
+                    whchunk_text = " [pl {}/{}]".format(current_pl_num, len(payload_list))
+                else:
+                    whchunk_text = ""
+                deliveries.append(self.__send_payload_chunk(webhook, payload_chunk, whcount_text + whchunk_text))
+                chunks.append(payload_chunk)
+
+        # Receivers and chunks are delivered concurrently, the amount of requests in flight per receiver is limited
+        results: List[bool] = await asyncio.gather(*deliveries)
+        failed: Set[int] = {id(payload) for payload_chunk, delivered in zip(chunks, results) if not delivered
+                            for payload in payload_chunk}
+        return [payload for payload in payloads if id(payload) not in failed]
+
+    async def __send_payload_chunk(self, webhook: Dict, payload_chunk: List[Dict], position_text: str) -> bool:
+        logger.debug4("Python data for payload: {}", payload_chunk)
+        async with webhook["semaphore"]:
+            try:
+                response: RestApiResult = await RestHelper.send_post(webhook.get('url'),
+                                                                     data=payload_chunk,
+                                                                     headers={"Content-Type": "application/json"},
+                                                                     params=None,
+                                                                     timeout=5,
+                                                                     retries=self.__args.webhook_retries,
+                                                                     retry_backoff=self.__args.webhook_retry_backoff)
+                if response.status_code != 200:
+                    logger.warning("Webhook destination {} returned status code other than 200 OK: {}",
+                                   webhook.get('url'), response.status_code)
+                    return False
+                logger.success("Successfully sent payload to webhook{}. Stats: {}", position_text,
+                               await mad_json_dumps(self.__payload_type_count(payload_chunk)))
+                return True
+            except Exception as e:
+                logger.warning("Exception occured while sending webhook: {}", e)
+                return False
 
-                current_pl_num += 1
-            current_wh_num += 1
+    def __log_delivery_stats(self):
+        stats: Dict[str, RestRequestStats] = RestHelper.get_stats()
+        for origin in {webhook["origin"] for webhook in self.__webhook_receivers}:
+            if origin in stats:
+                logger.info("Webhook delivery to {}: {}", origin, stats[origin])
 
     async def __prepare_quest_data(self, quest_data: Dict[int, Tuple[Pokestop, Dict[int, TrsQuest]]]):
         ret = []
-        for stop, quests in quest_data.values():
-            if self.__is_in_excluded_area([stop.latitude, stop.longitude]):
+        excluded = self.__get_excluded_mask([(stop.latitude, stop.longitude)
+                                             for stop, _quests in quest_data.values()])
+        for (stop, quests), stop_excluded in zip(quest_data.values(), excluded):
+            if stop_excluded:
                 continue
             for layer, quest in quests.items():
                 try:
@@ -365,8 +398,9 @@ class WebhookWorker:
     def __prepare_raid_data(self, raid_data):
         ret = []
 
-        for raid in raid_data:
-            if self.__is_in_excluded_area([raid["latitude"], raid["longitude"]]):
+        excluded = self.__get_excluded_mask([(raid["latitude"], raid["longitude"]) for raid in raid_data])
+        for raid, raid_excluded in zip(raid_data, excluded):
+            if raid_excluded:
                 continue
 
             # skip ex raid mon if disabled
@@ -432,8 +466,9 @@ class WebhookWorker:
     def __prepare_mon_data(self, mon_data: List[Dict]):
         ret = []
 
-        for mon in mon_data:
-            if self.__is_in_excluded_area([mon["latitude"], mon["longitude"]]):
+        excluded = self.__get_excluded_mask([(mon["latitude"], mon["longitude"]) for mon in mon_data])
+        for mon, mon_excluded in zip(mon_data, excluded):
+            if mon_excluded:
                 logger.debug3("Webhook ignoring (excluded area) mon ID {} with encounter ID {}. Stats: {}/{}/{}",
                               mon["pokemon_id"],
                               mon["encounter_id"],
@@ -548,8 +583,9 @@ class WebhookWorker:
     def __prepare_gyms_data(self, gym_data):
         ret = []
 
-        for gym in gym_data:
-            if self.__is_in_excluded_area([gym["latitude"], gym["longitude"]]):
+        excluded = self.__get_excluded_mask([(gym["latitude"], gym["longitude"]) for gym in gym_data])
+        for gym, gym_excluded in zip(gym_data, excluded):
+            if gym_excluded:
                 continue
 
             gym_payload = {
@@ -580,8 +616,10 @@ class WebhookWorker:
     def __prepare_stops_data(self, pokestop_data: List[Dict[str, Any]]):
         ret = []
 
-        for pokestop in pokestop_data:
-            if self.__is_in_excluded_area([pokestop["latitude"], pokestop["longitude"]]):
+        excluded = self.__get_excluded_mask([(pokestop["latitude"], pokestop["longitude"])
+                                             for pokestop in pokestop_data])
+        for pokestop, pokestop_excluded in zip(pokestop_data, excluded):
+            if pokestop_excluded:
                 continue
 
             pokestop_payload = {
@@ -648,9 +686,12 @@ class WebhookWorker:
                 for valid_type in self.__valid_types:
                     self.__webhook_types.add(valid_type)
 
+            url = url.replace(" ", "")
             self.__webhook_receivers.append({
-                "url": url.replace(" ", ""),
-                "types": sub_types
+                "url": url,
+                "origin": str(URL(url).origin()),
+                "types": sub_types,
+                "semaphore": asyncio.Semaphore(self.__args.webhook_max_concurrency)
             })
 
     async def __build_excluded_areas(self):
@@ -734,30 +775,107 @@ class WebhookWorker:
 
         return full_payload
 
+    async def __create_payload_of_changes(self, changes: Dict[str, Set]):
+        """
+        Same as __create_payload for the entities published to the event stream. Errors are raised for the changes
+        to be read again rather than skipped.
+        """
+        full_payload = []
+        async with self.__db_wrapper as session, session:
+            if 'raid' in self.__webhook_types and changes.get("raid"):
+                full_payload += self.__prepare_raid_data(
+                    await DbWebhookReader.get_raids_of_gyms(session, changes["raid"]))
+            if 'quest' in self.__webhook_types and changes.get("quest"):
+                full_payload += await self.__prepare_quest_data(
+                    await DbWebhookReader.get_quests_of_stops(session, changes["quest"]))
+            if 'weather' in self.__webhook_types and changes.get("weather"):
+                full_payload += self.__prepare_weather_data(
+                    await DbWebhookReader.get_weather_of_cells(session, changes["weather"]))
+            if 'gym' in self.__webhook_types and changes.get("gym"):
+                full_payload += self.__prepare_gyms_data(
+                    await DbWebhookReader.get_gyms(session, changes["gym"]))
+            if 'pokestop' in self.__webhook_types and changes.get("pokestop"):
+                full_payload += self.__prepare_stops_data(
+                    await DbWebhookReader.get_stops(session, changes["pokestop"]))
+            if self.__pokemon_types and changes.get("pokemon"):
+                full_payload += self.__prepare_mon_data(
+                    await DbWebhookReader.get_mons(session, changes["pokemon"], self.__pokemon_types))
+        return full_payload
+
     async def start(self) -> Task:
         loop = asyncio.get_running_loop()
         return loop.create_task(self.__run_worker())
 
     async def __run_worker(self):
-        logger.info("Starting webhook worker thread, sending payload every {} seconds", self.__worker_interval_sec)
-
         self.__build_webhook_receivers()
         await self.__build_excluded_areas()
 
+        change_feed: WebhookChangeFeed = WebhookChangeFeed(await self.__db_wrapper.get_cache(),
+                                                           self.__args.webhook_dedup_size)
+        if self.__args.webhook_event_stream:
+            await self.__consume_event_stream(change_feed)
+        else:
+            await self.__poll_changes(change_feed)
+        logger.info("Stopping webhook worker thread")
+
+    async def __consume_event_stream(self, change_feed: WebhookChangeFeed):
+        logger.info("Starting webhook worker thread, sending changes published upon ingestion")
+        event_stream: WebhookEventStream = WebhookEventStream(await self.__db_wrapper.get_cache())
+        position: str = await event_stream.load_position()
+        last_stats_logged = time.time()
+
+        while not terminate_mad.is_set():
+            try:
+                read_position, changes = await event_stream.read_batch(position, timeout=self.__worker_interval_sec,
+                                                                       batch_window=self.__event_batch_window_sec)
+                if changes:
+                    full_payload = change_feed.filter_changed(await self.__create_payload_of_changes(changes))
+                    delivered = await self.__send_webhook(full_payload)
+                    change_feed.mark_sent(delivered)
+                    if len(delivered) < len(full_payload):
+                        # The changes are read again, the payloads delivered are dropped by the change feed then
+                        logger.warning("Failed delivering {} of {} webhook payloads, retrying",
+                                       len(full_payload) - len(delivered), len(full_payload))
+                        await asyncio.sleep(self.__worker_interval_sec)
+                        continue
+                    await event_stream.store_position(read_position)
+                position = read_position
+            except Exception as e:
+                logger.warning("Failed sending changes via webhook: {}", e)
+                await asyncio.sleep(self.__worker_interval_sec)
+            if time.time() - last_stats_logged >= self.__stats_log_interval_sec:
+                self.__log_delivery_stats()
+                last_stats_logged = time.time()
+
+    async def __poll_changes(self, change_feed: WebhookChangeFeed):
+        logger.info("Starting webhook worker thread, sending payload every {} seconds", self.__worker_interval_sec)
         if self.__args.webhook_start_time != 0:
             self.__last_check = int(self.__args.webhook_start_time)
+        else:
+            watermark: Optional[int] = await change_feed.load_watermark()
+            if watermark:
+                logger.info("Continuing to send changes since {}", watermark)
+                self.__last_check = watermark
+
+        last_stats_logged = time.time()
 
         while not terminate_mad.is_set():
+            pass_started = int(time.time())
             # Always check modifications of intervals N - 6 to NOW given processing of queues may take some time...
-            preparing_timestamp = int(time.time()) - 6 * self.__worker_interval_sec
+            # Entities fetched again are dropped by the change feed unless they changed.
+            preparing_timestamp = pass_started - 6 * self.__worker_interval_sec
 
             # fetch data and create payload
-            full_payload = await self.__create_payload()
+            full_payload = change_feed.filter_changed(await self.__create_payload())
 
-            # send our payload
-            await self.__send_webhook(full_payload)
+            # send our payload, payloads failing to be delivered are sent again in the next pass
+            change_feed.mark_sent(await self.__send_webhook(full_payload))
 
             self.__last_check = preparing_timestamp
+            # Rows committed after their timestamp may not have been read yet, hence the next start re-reads the
+            # overlap as well. It is sent again once as the change feed does not know the payloads sent before.
+            await change_feed.store_watermark(preparing_timestamp)
+            if time.time() - last_stats_logged >= self.__stats_log_interval_sec:
+                self.__log_delivery_stats()
+                last_stats_logged = time.time()
             await asyncio.sleep(self.__worker_interval_sec)
-
-        logger.info("Stopping webhook worker thread")
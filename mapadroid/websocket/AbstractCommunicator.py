@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 
+from mapadroid.ocr.ScreenshotBuffer import ScreenshotBuffer
 from mapadroid.utils.collections import Location
 from mapadroid.utils.CustomTypes import MessageTyping
 from mapadroid.utils.madGlobals import ScreenshotType
+from mapadroid.websocket.CommandBatch import CommandBatch
 
 
 class AbstractCommunicator(ABC):
@@ -19,6 +21,23 @@ class AbstractCommunicator(ABC):
     async def is_alive(self) -> bool:
         pass
 
+    @abstractmethod
+    async def run_batch(self, batch: CommandBatch, timeout: float = None) -> List[Optional[MessageTyping]]:
+        """
+        Sends the commands of the batch without waiting for a response in between
+        :param batch: commands to be sent
+        :param timeout: per command
+        :return: the responses in the order of the commands, None for commands not answered in time
+        """
+        pass
+
+    @abstractmethod
+    async def run_batch_and_ok(self, batch: CommandBatch, timeout: float = None) -> bool:
+        """
+        :return: boolean indicating whether every command of the batch succeeded
+        """
+        pass
+
     @abstractmethod
     async def install_apk(self, timeout: float, filepath: str = None, data=None) -> bool:
         pass
@@ -115,6 +134,17 @@ class AbstractCommunicator(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_screenshot_buffer(self, quality: int = 70, screenshot_type: ScreenshotType = ScreenshotType.JPEG
+                                    ) -> Optional[ScreenshotBuffer]:
+        """
+
+        :param quality: of the screenshot (compression)
+        :param screenshot_type: whether it's jpeg or png
+        :return: the screenshot kept in memory or None if it could not be retrieved
+        """
+        pass
+
     @abstractmethod
     async def back_button(self) -> bool:
         pass
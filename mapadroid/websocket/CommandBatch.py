@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from mapadroid.utils.CustomTypes import MessageTyping
+
+
+class CommandBatch:
+    """
+    Commands to be sent to a device in one go (see AbstractCommunicator.run_batch). The commands are sent in the order
+    added without waiting for the response to one command before sending the next one, the device handles them in the
+    order received. Only commands not depending on the outcome of the previous ones are to be batched, e.g. a couple of
+    taps without any delay in between.
+    The static methods build the commands as sent by the communicator.
+    """
+    def __init__(self):
+        self.commands: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def click(self, click_x: int, click_y: int) -> CommandBatch:
+        self.commands.append(CommandBatch.click_command(click_x, click_y))
+        return self
+
+    def swipe(self, x1: int, y1: int, x2: int, y2: int) -> CommandBatch:
+        self.commands.append(CommandBatch.swipe_command(x1, y1, x2, y2))
+        return self
+
+    def touch_and_hold(self, x1: int, y1: int, x2: int, y2: int, duration: int = 3000) -> CommandBatch:
+        self.commands.append(CommandBatch.touch_and_hold_command(x1, y1, x2, y2, duration))
+        return self
+
+    def enter_text(self, text: str) -> CommandBatch:
+        self.commands.append(CommandBatch.enter_text_command(text))
+        return self
+
+    def back_button(self) -> CommandBatch:
+        self.commands.append(CommandBatch.back_button_command())
+        return self
+
+    def start_app(self, package_name: str) -> CommandBatch:
+        self.commands.append(CommandBatch.start_app_command(package_name))
+        return self
+
+    def stop_app(self, package_name: str) -> CommandBatch:
+        self.commands.append(CommandBatch.stop_app_command(package_name))
+        return self
+
+    def reset_app_data(self, package_name: str) -> CommandBatch:
+        self.commands.append(CommandBatch.reset_app_data_command(package_name))
+        return self
+
+    def turn_screen_on(self) -> CommandBatch:
+        self.commands.append(CommandBatch.turn_screen_on_command())
+        return self
+
+    def get_screensize(self) -> CommandBatch:
+        self.commands.append(CommandBatch.screensize_command())
+        return self
+
+    def get_y_offset(self) -> CommandBatch:
+        self.commands.append(CommandBatch.y_offset_command())
+        return self
+
+    @staticmethod
+    def is_ok(response: Optional[MessageTyping]) -> bool:
+        return response is not None and "OK" == response.strip()
+
+    @staticmethod
+    def click_command(click_x: int, click_y: int) -> str:
+        return "screen click {} {}\r\n".format(str(int(round(click_x))), str(int(round(click_y))))
+
+    @staticmethod
+    def swipe_command(x1: int, y1: int, x2: int, y2: int) -> str:
+        return "touch swipe {} {} {} {}\r\n".format(str(int(round(x1))), str(int(round(y1))),
+                                                   str(int(round(x2))), str(int(round(y2))))
+
+    @staticmethod
+    def touch_and_hold_command(x1: int, y1: int, x2: int, y2: int, duration: int = 3000) -> str:
+        return "touch swipe {} {} {} {} {}".format(str(int(round(x1))), str(int(round(y1))),
+                                                   str(int(round(x2))), str(int(round(y2))),
+                                                   str(int(duration)))
+
+    @staticmethod
+    def enter_text_command(text: str) -> str:
+        return "touch text " + str(text)
+
+    @staticmethod
+    def back_button_command() -> str:
+        return "screen back\r\n"
+
+    @staticmethod
+    def start_app_command(package_name: str) -> str:
+        return "more start {}\r\n".format(package_name)
+
+    @staticmethod
+    def stop_app_command(package_name: str) -> str:
+        return "more stop {}\r\n".format(package_name)
+
+    @staticmethod
+    def reset_app_data_command(package_name: str) -> str:
+        return "more reset {}\r\n".format(package_name)
+
+    @staticmethod
+    def turn_screen_on_command() -> str:
+        return "more screen on\r\n"
+
+    @staticmethod
+    def screensize_command() -> str:
+        return "screen size"
+
+    @staticmethod
+    def y_offset_command() -> str:
+        return "screen offset"
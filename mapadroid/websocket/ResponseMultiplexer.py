@@ -0,0 +1,144 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from mapadroid.utils.CustomTypes import MessageTyping
+
+
+class CommandRoundTripStats:
+    """
+    Histograms of the round trip durations (command sent until response received) of the commands sent to a device,
+    by command
+    """
+    # Upper bounds (seconds) of the buckets, the last bucket holds the round trips taking longer
+    BUCKET_BOUNDS: Tuple[float, ...] = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self):
+        self.histograms: Dict[str, List[int]] = {}
+        self.duration_total: Dict[str, float] = {}
+        self.timeouts: Dict[str, int] = {}
+
+    def add_round_trip(self, command: str, duration: float) -> None:
+        histogram: Optional[List[int]] = self.histograms.get(command)
+        if histogram is None:
+            histogram = [0] * (len(self.BUCKET_BOUNDS) + 1)
+            self.histograms[command] = histogram
+        histogram[bisect_left(self.BUCKET_BOUNDS, duration)] += 1
+        self.duration_total[command] = self.duration_total.get(command, 0.0) + duration
+
+    def add_timeout(self, command: str) -> None:
+        self.timeouts[command] = self.timeouts.get(command, 0) + 1
+
+    def round_trips(self, command: str) -> int:
+        return sum(self.histograms.get(command, ()))
+
+    def __str__(self):
+        lines: List[str] = []
+        for command in sorted(set(self.histograms) | set(self.timeouts)):
+            round_trips: int = self.round_trips(command)
+            average: float = self.duration_total.get(command, 0.0) / round_trips if round_trips else 0.0
+            buckets: str = " ".join(f"<={bound}s:{count}" for bound, count
+                                    in zip(self.BUCKET_BOUNDS, self.histograms.get(command, ())) if count)
+            longer: int = self.histograms[command][-1] if command in self.histograms else 0
+            if longer:
+                buckets += f" >{self.BUCKET_BOUNDS[-1]}s:{longer}"
+            lines.append(f"{command}: {round_trips} round trips, avg {average:.3f}s, "
+                         f"{self.timeouts.get(command, 0)} timeouts [{buckets.strip()}]")
+        return "; ".join(lines)
+
+
+class ResponseMultiplexer:
+    """
+    Hands the responses received on the connection of a device to the commands waiting for them, matched by the
+    message ID the command has been sent with. Waiting for a response times out or may be cancelled, responses to
+    commands no longer waiting are dropped. Once the connection is closed all commands waiting fail at once rather
+    than waiting for their timeout. The multiplexer (and its stats) is kept for the reconnects of the device.
+    """
+    MAX_MESSAGE_ID: int = 100000
+
+    def __init__(self):
+        # message ID -> (future of the response, command, time sent)
+        self._pending: Dict[int, Tuple[asyncio.Future, str, float]] = {}
+        self._last_message_id: int = 0
+        self.stats: CommandRoundTripStats = CommandRoundTripStats()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def register(self, command: str) -> int:
+        """
+        Registers a command about to be sent
+        Args:
+            command: Name of the command the round trip is accounted for in the stats
+
+        Returns: The message ID to send the command with
+        """
+        message_id: int = self._last_message_id
+        while True:
+            message_id = message_id % (self.MAX_MESSAGE_ID - 1) + 1
+            if message_id not in self._pending:
+                break
+        self._last_message_id = message_id
+        self._pending[message_id] = (asyncio.get_running_loop().create_future(), command, time.perf_counter())
+        return message_id
+
+    async def wait(self, message_id: int, timeout: float) -> MessageTyping:
+        """
+        Waits for the response to the command sent with the message ID. The command is unregistered once done.
+        Raises: asyncio.TimeoutError if no response has been received in time, the exception passed to close if the
+        connection has been closed meanwhile
+        """
+        pending: Optional[Tuple[asyncio.Future, str, float]] = self._pending.get(message_id)
+        if pending is None:
+            raise KeyError(message_id)
+        future, command, _sent_at = pending
+        try:
+            # Shielded to tell a timeout apart from the response arriving at the same time
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                return future.result()
+            self.stats.add_timeout(command)
+            raise
+        finally:
+            self.discard(message_id)
+
+    def discard(self, message_id: int) -> None:
+        pending: Optional[Tuple[asyncio.Future, str, float]] = self._pending.pop(message_id, None)
+        if pending is not None and not pending[0].done():
+            pending[0].cancel()
+
+    def resolve(self, message_id: int, message: MessageTyping) -> bool:
+        """
+        Returns: False if no command is waiting for the response
+        """
+        pending: Optional[Tuple[asyncio.Future, str, float]] = self._pending.get(message_id)
+        if pending is None or pending[0].done():
+            logger.debug("Dropping response to message ID {} as nothing is waiting for it", message_id)
+            return False
+        future, command, sent_at = pending
+        self.stats.add_round_trip(command, time.perf_counter() - sent_at)
+        future.set_result(message)
+        return True
+
+    def close(self, exception: Exception) -> None:
+        """
+        Fails the commands waiting with the exception given, e.g. once the connection has been closed
+        """
+        for future, _command, _sent_at in self._pending.values():
+            if not future.done():
+                future.set_exception(exception)
+                # Retrieved by the waiting command, if any
+                future.exception()
+
+    @staticmethod
+    def get_command_name(message: MessageTyping, byte_command: Optional[int] = None) -> str:
+        """
+        Returns: The first two words of text commands (e.g. 'screen capture'), the byte command of binary ones
+        """
+        if isinstance(message, str):
+            return " ".join(message.split(maxsplit=2)[:2])
+        return "bytes {}".format(byte_command)
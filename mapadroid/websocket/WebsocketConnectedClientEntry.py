@@ -1,7 +1,6 @@
 import asyncio
-import math
 import time
-from typing import Dict, Optional
+from typing import List, Optional
 
 import websockets
 from loguru import logger
@@ -10,17 +9,11 @@ from mapadroid.utils.CustomTypes import MessageTyping
 from mapadroid.utils.madGlobals import (
     WebsocketWorkerConnectionClosedException, WebsocketWorkerRemovedException,
     WebsocketWorkerTimeoutException)
+from mapadroid.websocket.ResponseMultiplexer import ResponseMultiplexer
 from mapadroid.worker.AbstractWorker import AbstractWorker
 from mapadroid.worker.WorkerState import WorkerState
 
 
-class ReceivedMessageEntry:
-    def __init__(self):
-        # TODO: consider timestamp of when the message was waited for to cleanup?
-        self.message: Optional[MessageTyping] = None
-        self.message_received_event: asyncio.Event = asyncio.Event()
-
-
 class WebsocketConnectedClientEntry:
     def __init__(self, origin: str, worker_instance: Optional[AbstractWorker],
                  websocket_client_connection: Optional[websockets.WebSocketClientProtocol],
@@ -30,34 +23,18 @@ class WebsocketConnectedClientEntry:
         self.worker_state: WorkerState = worker_state
         self.websocket_client_connection: Optional[websockets.WebSocketClientProtocol] = websocket_client_connection
         self.fail_counter: int = 0
-        self.received_messages: Dict[int, ReceivedMessageEntry] = {}
-        self.received_mutex: asyncio.Lock = asyncio.Lock()
-        self.message_id_counter: int = 0
-        self.message_id_mutex: asyncio.Lock = asyncio.Lock()
+        self.responses: ResponseMultiplexer = ResponseMultiplexer()
         # store a timestamp in order to cleanup (soft-states)
         self.last_message_received_at: float = 0
 
-    async def set_message_response(self, message_id: int, message: MessageTyping) -> None:
-        async with self.received_mutex:
-            message_entry = self.received_messages.get(message_id, None)
-            if message_entry is not None:
-                message_entry.message = message
-                message_entry.message_received_event.set()
-                self.last_message_received_at = time.time()
+    def set_message_response(self, message_id: int, message: MessageTyping) -> None:
+        if self.responses.resolve(message_id, message):
+            self.last_message_received_at = time.time()
 
     async def send_and_wait(self, message: MessageTyping, timeout: float, worker_instance: AbstractWorker,
                             byte_command: Optional[int] = None) -> Optional[MessageTyping]:
-        if not self.worker_instance or self.worker_instance != worker_instance and worker_instance != 'madmin':
-            # TODO: consider changing this...
-            raise WebsocketWorkerRemovedException("Invalid worker instance, removed worker")
-        elif not self.websocket_client_connection.open:
-            raise WebsocketWorkerConnectionClosedException("Connection closed, stopping")
-
-        # install new ReceivedMessageEntry
-        message_id: int = await self.__get_new_message_id()
-        new_entry = ReceivedMessageEntry()
-        async with self.received_mutex:
-            self.received_messages[message_id] = new_entry
+        self.__check_connection(worker_instance)
+        message_id: int = self.responses.register(ResponseMultiplexer.get_command_name(message, byte_command))
         try:
             if isinstance(message, bytes):
                 logger.debug("sending binary: {}", message[:10])
@@ -70,32 +47,79 @@ class WebsocketConnectedClientEntry:
             logger.debug2("Timeout towards: {}", timeout)
             response = None
             try:
-                event_triggered = await asyncio.wait_for(new_entry.message_received_event.wait(), timeout=timeout)
-                if event_triggered:
-                    logger.debug("Received answer in time, popping response")
-                    self.fail_counter = 0
-                    if isinstance(new_entry.message, str):
-                        logger.debug("Response: {}", new_entry.message.strip())
-                    else:
-                        logger.debug("Received binary data , starting with {}", new_entry.message[:10])
-                    response = new_entry.message
+                response = await self.responses.wait(message_id, timeout)
+                logger.debug("Received answer in time, popping response")
+                self.fail_counter = 0
+                if isinstance(response, str):
+                    logger.debug("Response: {}", response.strip())
+                else:
+                    logger.debug("Received binary data , starting with {}", response[:10])
             except asyncio.TimeoutError:
-                logger.warning("Timeout, increasing timeout-counter")
-                self.fail_counter += 1
-                if self.fail_counter > 5:
-                    logger.error("5 consecutive timeouts or origin is no longer connected, cleanup")
-                    try:
-                        await self.websocket_client_connection.close()
-                    except Exception as e:
-                        logger.info("Failed closing connection forcefully after 5 timeouts: {}", e)
-                    raise WebsocketWorkerTimeoutException("Multiple consecutive timeouts detected")
+                await self.__on_timeout()
 
             logger.debug("Done sending command")
             return response
         finally:
-            logger.debug2("Cleaning up received message.")
-            async with self.received_mutex:
-                del self.received_messages[message_id]
+            self.responses.discard(message_id)
+
+    async def send_batch_and_wait(self, messages: List[str], timeout: float,
+                                  worker_instance: AbstractWorker) -> List[Optional[MessageTyping]]:
+        """
+        Sends the commands one after another without waiting for the responses in between, the device handles them in
+        the order received.
+        Args:
+            messages: Commands to send
+            timeout: Per command, the responses are waited for as long as handling all commands one by one may take
+            worker_instance: Worker sending the commands
+
+        Returns: The responses in the order of the commands, None for commands not answered in time
+        """
+        self.__check_connection(worker_instance)
+        message_ids: List[int] = [self.responses.register(ResponseMultiplexer.get_command_name(message))
+                                  for message in messages]
+        try:
+            for message_id, message in zip(message_ids, messages):
+                logger.debug("sending command: {}", message.strip())
+                await self.__send_message(message_id, message)
+            results = await asyncio.gather(*(self.responses.wait(message_id, timeout * len(messages))
+                                             for message_id in message_ids), return_exceptions=True)
+            responses: List[Optional[MessageTyping]] = []
+            timed_out: bool = False
+            for result in results:
+                if isinstance(result, asyncio.TimeoutError):
+                    timed_out = True
+                    responses.append(None)
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    responses.append(result)
+            if timed_out:
+                await self.__on_timeout()
+            else:
+                self.fail_counter = 0
+            logger.debug("Done sending {} commands", len(messages))
+            return responses
+        finally:
+            for message_id in message_ids:
+                self.responses.discard(message_id)
+
+    def __check_connection(self, worker_instance: AbstractWorker) -> None:
+        if not self.worker_instance or self.worker_instance != worker_instance and worker_instance != 'madmin':
+            # TODO: consider changing this...
+            raise WebsocketWorkerRemovedException("Invalid worker instance, removed worker")
+        elif not self.websocket_client_connection.open:
+            raise WebsocketWorkerConnectionClosedException("Connection closed, stopping")
+
+    async def __on_timeout(self) -> None:
+        logger.warning("Timeout, increasing timeout-counter")
+        self.fail_counter += 1
+        if self.fail_counter > 5:
+            logger.error("5 consecutive timeouts or origin is no longer connected, cleanup")
+            try:
+                await self.websocket_client_connection.close()
+            except Exception as e:
+                logger.info("Failed closing connection forcefully after 5 timeouts: {}", e)
+            raise WebsocketWorkerTimeoutException("Multiple consecutive timeouts detected")
 
     async def __send_message(self, message_id: int, message: MessageTyping,
                              byte_command: Optional[int] = None) -> None:
@@ -112,12 +136,3 @@ class WebsocketConnectedClientEntry:
             logger.error("Tried to send invalid message (bytes without byte command or no byte/str passed)")
             return
         await self.websocket_client_connection.send(to_be_sent)
-
-    async def __get_new_message_id(self) -> int:
-        async with self.message_id_mutex:
-            self.message_id_counter += 1
-            self.message_id_counter = int(math.fmod(self.message_id_counter, 100000))
-            if self.message_id_counter == 100000:
-                self.message_id_counter = 1
-            new_message_id = self.message_id_counter
-        return new_message_id
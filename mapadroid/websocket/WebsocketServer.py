@@ -24,7 +24,8 @@ from mapadroid.ocr.pogoWindows import PogoWindows
 from mapadroid.utils.authHelper import check_auth, get_auths_for_levl
 from mapadroid.utils.CustomTypes import MessageTyping
 from mapadroid.utils.logging import InterceptHandler, LoggerEnums, get_logger
-from mapadroid.utils.madGlobals import WebsocketAbortRegistrationException
+from mapadroid.utils.madGlobals import (
+    WebsocketAbortRegistrationException, WebsocketWorkerConnectionClosedException)
 from mapadroid.utils.pogoevent import PogoEvent
 from mapadroid.websocket.AbstractCommunicator import AbstractCommunicator
 from mapadroid.websocket.communicator import Communicator
@@ -330,19 +331,16 @@ class WebsocketServer(object):
             return
         connection: websockets.WebSocketClientProtocol = client_entry.websocket_client_connection
         logger.info("Consumer handler starting")
-        while connection.open:
-            message = None
-            try:
-                message = await connection.recv()
-                # message = await asyncio.wait_for(connection.recv(), timeout=4.0)
-            except asyncio.TimeoutError:
-                await asyncio.sleep(0.02)
-            except websockets.ConnectionClosed as cc:
-                logger.warning("Connection was closed, stopping receiver. Exception: {}", repr(cc))
-                return
-
-            if message is not None:
-                await self.__on_message(client_entry, message)
+        try:
+            async for message in connection:
+                self.__on_message(client_entry, message)
+        except websockets.ConnectionClosed as cc:
+            logger.warning("Connection was closed, stopping receiver. Exception: {}", repr(cc))
+            return
+        finally:
+            # Commands still waiting for a response fail right away rather than running into their timeout
+            client_entry.responses.close(WebsocketWorkerConnectionClosedException("Connection closed"))
+            logger.info("Command round trips of {}: {}", client_entry.origin, client_entry.responses.stats)
         logger.warning("Connection closed in __client_message_receiver")
 
     async def _stop_worker(self, origin: str) -> None:
@@ -351,7 +349,7 @@ class WebsocketServer(object):
             await entry.worker_instance.stop_worker()
 
     @staticmethod
-    async def __on_message(client_entry: WebsocketConnectedClientEntry, message: MessageTyping) -> None:
+    def __on_message(client_entry: WebsocketConnectedClientEntry, message: MessageTyping) -> None:
         response: Optional[MessageTyping] = None
         try:
             if isinstance(message, str):
@@ -366,7 +364,7 @@ class WebsocketServer(object):
         except ValueError as e:
             logger.warning("Failed reading message ID of message received for {} ({})", client_entry.origin, repr(e))
             return
-        await client_entry.set_message_response(message_id, response)
+        client_entry.set_message_response(message_id, response)
 
     @staticmethod
     async def __close_websocket_client_connection(origin_of_worker: str,
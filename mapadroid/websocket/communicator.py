@@ -1,11 +1,12 @@
 import asyncio
 import re
 from ipaddress import IPv4Address, ip_address
-from typing import Optional
+from typing import List, Optional
 
 import websockets
 from aiofile import async_open
 
+from mapadroid.ocr.ScreenshotBuffer import ScreenshotBuffer
 from mapadroid.utils.collections import Location
 from mapadroid.utils.CustomTypes import MessageTyping
 from mapadroid.utils.geo import get_distance_of_two_points_in_meters
@@ -14,6 +15,7 @@ from mapadroid.utils.madGlobals import (
     MadGlobals, ScreenshotType, WebsocketWorkerConnectionClosedException,
     WebsocketWorkerTimeoutException)
 from mapadroid.websocket.AbstractCommunicator import AbstractCommunicator
+from mapadroid.websocket.CommandBatch import CommandBatch
 from mapadroid.websocket.WebsocketConnectedClientEntry import \
     WebsocketConnectedClientEntry
 from mapadroid.worker.AbstractWorker import AbstractWorker
@@ -66,6 +68,17 @@ class Communicator(AbstractCommunicator):
                                                                      byte_command=byte_command)
             return result is not None and "OK" == result.strip()
 
+    async def run_batch(self, batch: CommandBatch, timeout: float = None) -> List[Optional[MessageTyping]]:
+        if not batch.commands:
+            return []
+        async with self.__send_mutex:
+            timeout = self.__command_timeout if timeout is None else timeout
+            return await self.websocket_client_entry.send_batch_and_wait(batch.commands, timeout,
+                                                                         self.worker_instance_ref)
+
+    async def run_batch_and_ok(self, batch: CommandBatch, timeout: float = None) -> bool:
+        return all(CommandBatch.is_ok(response) for response in await self.run_batch(batch, timeout))
+
     async def install_apk(self, timeout: float, filepath: str = None, data=None) -> bool:
         if not data:
             async with async_open(filepath, "rb") as file:  # opening for [r]eading as [b]inary
@@ -79,10 +92,10 @@ class Communicator(AbstractCommunicator):
         return await self.__run_and_ok_bytes(message=data, timeout=timeout, byte_command=2)
 
     async def start_app(self, package_name: str) -> bool:
-        return await self.__run_and_ok("more start {}\r\n".format(package_name), self.__command_timeout)
+        return await self.__run_and_ok(CommandBatch.start_app_command(package_name), self.__command_timeout)
 
     async def stop_app(self, package_name: str) -> bool:
-        if not await self.__run_and_ok("more stop {}\r\n".format(package_name), self.__command_timeout):
+        if not await self.__run_and_ok(CommandBatch.stop_app_command(package_name), self.__command_timeout):
             logger.error("Failed stopping {}, please check if SU has been granted", package_name)
             return False
         else:
@@ -100,7 +113,7 @@ class Communicator(AbstractCommunicator):
         return await self.__run_and_ok("more restart {}\r\n".format(package_name), self.__command_timeout)
 
     async def reset_app_data(self, package_name: str) -> bool:
-        return await self.__run_and_ok("more reset {}\r\n".format(package_name), self.__command_timeout)
+        return await self.__run_and_ok(CommandBatch.reset_app_data_command(package_name), self.__command_timeout)
 
     async def clear_app_cache(self, package_name: str) -> bool:
         return await self.__run_and_ok("more cache {}\r\n".format(package_name), self.__command_timeout)
@@ -112,38 +125,43 @@ class Communicator(AbstractCommunicator):
         await self.passthrough("su -c magiskhide --enable")
 
     async def turn_screen_on(self) -> bool:
-        return await self.__run_and_ok("more screen on\r\n", self.__command_timeout)
+        return await self.__run_and_ok(CommandBatch.turn_screen_on_command(), self.__command_timeout)
 
     async def click(self, click_x: int, click_y: int) -> bool:
         logger.debug('Click {} / {}', click_x, click_y)
-        return await self.__run_and_ok(
-            "screen click {} {}\r\n".format(str(int(round(click_x))), str(int(round(click_y)))),
-            self.__command_timeout)
+        return await self.__run_and_ok(CommandBatch.click_command(click_x, click_y), self.__command_timeout)
 
     async def swipe(self, x1: int, y1: int, x2: int, y2: int) -> Optional[MessageTyping]:
-        return await self.__run_get_gesponse(
-            "touch swipe {} {} {} {}\r\n".format(str(int(round(x1))), str(int(round(y1))),
-                                                 str(int(round(x2))), str(int(round(y2)))))
+        return await self.__run_get_gesponse(CommandBatch.swipe_command(x1, y1, x2, y2))
 
     async def touch_and_hold(self, x1: int, y1: int, x2: int, y2: int, duration: int = 3000) -> bool:
-        return await self.__run_and_ok("touch swipe {} {} {} {} {}".format(str(int(round(x1))), str(int(round(y1))),
-                                                                           str(int(round(x2))), str(int(round(y2))),
-                                                                           str(int(duration))), self.__command_timeout)
+        return await self.__run_and_ok(CommandBatch.touch_and_hold_command(x1, y1, x2, y2, duration),
+                                       self.__command_timeout)
 
     async def get_screensize(self) -> Optional[MessageTyping]:
-        return await self.__run_get_gesponse("screen size")
+        return await self.__run_get_gesponse(CommandBatch.screensize_command())
 
     async def get_y_offset(self) -> Optional[MessageTyping]:
-        return await self.__run_get_gesponse("screen offset")
+        return await self.__run_get_gesponse(CommandBatch.y_offset_command())
 
     async def uiautomator(self) -> Optional[MessageTyping]:
         return await self.__run_get_gesponse("more uiautomator")
 
     async def get_screenshot(self, path: str, quality: int = 70,
                              screenshot_type: ScreenshotType = ScreenshotType.JPEG) -> bool:
+        screenshot: Optional[ScreenshotBuffer] = await self.get_screenshot_buffer(quality, screenshot_type)
+        if screenshot is None:
+            return False
+        logger.debug("Storing screenshot...")
+        stored: bool = await screenshot.write_to(path)
+        logger.debug2("Done storing, returning")
+        return stored
+
+    async def get_screenshot_buffer(self, quality: int = 70, screenshot_type: ScreenshotType = ScreenshotType.JPEG
+                                    ) -> Optional[ScreenshotBuffer]:
         if quality < 10 or quality > 100:
             logger.error("Invalid quality value passed for screenshots")
-            return False
+            return None
 
         screenshot_type_str: str = "jpeg"
         if screenshot_type == ScreenshotType.PNG:
@@ -151,32 +169,24 @@ class Communicator(AbstractCommunicator):
 
         encoded = await self.__run_get_gesponse("screen capture {} {}\r\n".format(screenshot_type_str, quality))
         if encoded is None:
-            return False
+            return None
         elif isinstance(encoded, str):
             logger.debug2("Screenshot response not binary")
             if "KO: " in encoded:
                 logger.error("get_screenshot: Could not retrieve screenshot. Make sure your RGC is updated.")
-                return False
             elif "OK:" not in encoded:
                 logger.error("get_screenshot: response not OK")
-                return False
-            return False
-        else:
-            logger.debug("Storing screenshot...")
-            async with async_open(path, "wb") as fh:
-                await fh.write(encoded)
-            del encoded
-            logger.debug2("Done storing, returning")
-            return True
+            return None
+        return ScreenshotBuffer(encoded, screenshot_type)
 
     async def back_button(self) -> bool:
-        return await self.__run_and_ok("screen back\r\n", self.__command_timeout)
+        return await self.__run_and_ok(CommandBatch.back_button_command(), self.__command_timeout)
 
     async def home_button(self) -> bool:
         return await self.__run_and_ok("touch keyevent 3", self.__command_timeout)
 
     async def enter_text(self, text: str) -> bool:
-        return await self.__run_and_ok("touch text " + str(text), self.__command_timeout)
+        return await self.__run_and_ok(CommandBatch.enter_text_command(text), self.__command_timeout)
 
     async def is_screen_on(self) -> bool:
         state = await self.__run_get_gesponse("more state screen\r\n")
@@ -184,6 +184,9 @@ class Worker(AbstractWorker):
                         self._scan_task.cancel()
                         await self._scan_strategy.worker_specific_setup_stop()
                     self._scan_task = None
+                if self._worker_state.last_screenshot is not None:
+                    self._worker_state.last_screenshot.close()
+                    self._worker_state.last_screenshot = None
 
     async def _run_scan(self):
         with logger.contextualize(identifier=self._worker_state.origin, name="worker"):
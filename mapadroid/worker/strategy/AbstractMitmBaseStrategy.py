@@ -1,13 +1,7 @@
 import asyncio
-import sys
 
 from mapadroid.db.helper.PokemonHelper import PokemonHelper
 
-if sys.version_info.major == 3 and sys.version_info.minor >= 10:
-    from collections.abc import Collection
-else:
-    from collections import Collection
-
 import math
 import time
 from abc import ABC, abstractmethod
@@ -168,6 +162,8 @@ class AbstractMitmBaseStrategy(AbstractWorkerStrategy, ABC):
         # Any data after timestamp + timeout should be valid!
         logger.debug("Waiting for data ({}) after {} with timeout of {}s.",
                      proto_to_wait_for, DatetimeWrapper.fromtimestamp(timestamp), timeout)
+        # Timestamp of the latest data of the key checked already, only newer data is worth checking again
+        timestamp_checked: int = timestamp
         while not self._worker_state.stop_worker_event.is_set() \
                 and (int(timestamp + timeout) >= int(time.time()) or timeout == 0):
             # Not checking the timestamp against the proto awaited in here since custom handling may be adequate.
@@ -184,7 +180,15 @@ class AbstractMitmBaseStrategy(AbstractWorkerStrategy, ABC):
             elif latest:
                 last_time_received = latest.timestamp_of_data_retrieval
                 break
-            await asyncio.sleep(MadGlobals.application_args.wait_for_data_sleep_duration)
+            if latest and latest.timestamp_of_data_retrieval:
+                timestamp_checked = max(timestamp_checked, int(latest.timestamp_of_data_retrieval))
+            # Woken up as soon as new data arrives, the check is repeated at least every couple of seconds
+            # nonetheless to catch updates of the location or the worker having to be stopped
+            timestamp_updated: Optional[int] = await self._mitm_mapper.wait_for_data_update(
+                self._worker_state.origin, key, timestamp_checked,
+                MadGlobals.application_args.wait_for_data_sleep_duration)
+            if timestamp_updated:
+                timestamp_checked = max(timestamp_checked, timestamp_updated)
 
         if proto_to_wait_for in [ProtoIdentifier.GMO, ProtoIdentifier.ENCOUNTER]:
             if type_of_data_returned != ReceivedType.UNDEFINED:
@@ -223,13 +227,19 @@ class AbstractMitmBaseStrategy(AbstractWorkerStrategy, ABC):
             check_data = await self._is_location_within_allowed_range(latest_location)
         latest: Optional[LatestMitmDataEntry] = None
         if check_data:
-            latest = await self._mitm_mapper.request_latest(
-                self._worker_state.origin,
-                key, timestamp)
+            latest = await self._request_latest(key, proto_to_wait_for, timestamp)
             type_of_data_returned, data = await self._check_for_data_content(
                 latest, proto_to_wait_for, timestamp)
         return data, latest, type_of_data_returned
 
+    async def _request_latest(self, key: str, proto_to_wait_for: ProtoIdentifier,
+                              timestamp: int) -> Optional[LatestMitmDataEntry]:
+        """
+        Fetches the latest data to be passed to _check_for_data_content. Strategies merely relying on the digest of
+        the data may override this to not request the full payload.
+        """
+        return await self._mitm_mapper.request_latest(self._worker_state.origin, key, timestamp)
+
     async def raise_stop_worker_if_applicable(self):
         """
         Checks if the worker is supposed to be stopped or the routemanagers/mappings have changed
@@ -451,25 +461,6 @@ class AbstractMitmBaseStrategy(AbstractWorkerStrategy, ABC):
                 await asyncio.sleep(1)
         return True
 
-    @staticmethod
-    def _gmo_cells_contain_multiple_of_key(gmo: dict, keys_in_cell: Union[str, Collection[str]]) -> bool:
-        if not gmo or not keys_in_cell or "cells" not in gmo:
-            return False
-        keys: List[str] = []
-        if isinstance(keys_in_cell, str):
-            keys.append(keys_in_cell)
-        else:
-            keys.extend(keys_in_cell)
-        cells = gmo.get("cells", [])
-        if not cells or not isinstance(cells, list):
-            return False
-        for cell in cells:
-            for key in keys:
-                value_of_key = cell.get(key, None)
-                if value_of_key and isinstance(value_of_key, list) and len(value_of_key) > 0:
-                    return True
-        return False
-
     async def _additional_health_check(self) -> None:
         # Ensure PogoDroid was started...
         if not await self.get_devicesettings_value(MappingManagerDevicemappingKey.EXTENDED_PERMISSION_TOGGLING, False):
@@ -17,6 +17,7 @@ from mapadroid.mapping_manager.MappingManagerDevicemappingKey import \
 from mapadroid.ocr.pogoWindows import PogoWindows
 from mapadroid.ocr.screen_type import ScreenType
 from mapadroid.ocr.screenPath import LoginType, WordToScreenMatching
+from mapadroid.ocr.ScreenshotBuffer import ScreenshotBuffer
 from mapadroid.utils.collections import Location, ScreenCoordinates
 from mapadroid.utils.CustomTypes import MessageTyping
 from mapadroid.utils.geo import (get_distance_of_two_points_in_meters,
@@ -27,6 +28,7 @@ from mapadroid.utils.madGlobals import (InternalStopWorkerException,
                                         ScreenshotType, TransportType,
                                         WebsocketWorkerRemovedException)
 from mapadroid.websocket.AbstractCommunicator import AbstractCommunicator
+from mapadroid.websocket.CommandBatch import CommandBatch
 from mapadroid.worker.WorkerState import WorkerState
 from mapadroid.worker.WorkerType import WorkerType
 
@@ -204,9 +206,10 @@ class AbstractWorkerStrategy(ABC):
             return True
 
         if not await self._communicator.is_screen_on():
-            await self._communicator.start_app("de.grennith.rgc.remotegpscontroller")
             logger.info("Turning screen on")
-            await self._communicator.turn_screen_on()
+            await self._communicator.run_batch(CommandBatch()
+                                               .start_app("de.grennith.rgc.remotegpscontroller")
+                                               .turn_screen_on())
             await asyncio.sleep(
                 await self.get_devicesettings_value(MappingManagerDevicemappingKey.POST_TURN_SCREEN_ON_DELAY, 7))
 
@@ -223,8 +226,9 @@ class AbstractWorkerStrategy(ABC):
                 # sleeping close to or longer than 5 minutes may cause a problem with a 5-minute timeout
                 # in the RGC websocket connection? Only sleep 60s and then do some nonsense ...
                 logger.warning("start_pogo: No permission for PTC login. Kill pogo data and wait for 4 minutes...")
-                await self._communicator.reset_app_data("com.nianticlabs.pokemongo")
-                await self._communicator.stop_app("com.nianticlabs.pokemongo")
+                await self._communicator.run_batch(CommandBatch()
+                                                   .reset_app_data("com.nianticlabs.pokemongo")
+                                                   .stop_app("com.nianticlabs.pokemongo"))
                 c = 0
                 await self._communicator.passthrough("true")
                 while c < 4:
@@ -293,9 +297,10 @@ class AbstractWorkerStrategy(ABC):
 
     async def turn_screen_on_and_start_pogo(self):
         if not await self._communicator.is_screen_on():
-            await self._communicator.start_app("de.grennith.rgc.remotegpscontroller")
             logger.info("Turning screen on")
-            await self._communicator.turn_screen_on()
+            await self._communicator.run_batch(CommandBatch()
+                                               .start_app("de.grennith.rgc.remotegpscontroller")
+                                               .turn_screen_on())
             await asyncio.sleep(
                 await self.get_devicesettings_value(MappingManagerDevicemappingKey.POST_TURN_SCREEN_ON_DELAY, 2))
         # check if pogo is running and start it if necessary
@@ -527,13 +532,9 @@ class AbstractWorkerStrategy(ABC):
                 return False
         attempts = 0
 
-        screenshot_path = await self.get_screenshot_path()
-        if os.path.isdir(screenshot_path):
-            logger.error("_check_pogo_main_screen: screenshot.png/.jpg is not a file/corrupted")
-            return False
-
         logger.debug("_check_pogo_main_screen: checking mainscreen")
-        while not await self._pogo_windows_handler.check_pogo_mainscreen(screenshot_path, self._worker_state.origin):
+        while not await self._pogo_windows_handler.check_pogo_mainscreen(self._worker_state.last_screenshot,
+                                                                         self._worker_state.origin):
             logger.info("_check_pogo_main_screen: not on Mainscreen...")
             if attempts == max_attempts:
                 # could not reach raidtab in given max_attempts
@@ -542,20 +543,21 @@ class AbstractWorkerStrategy(ABC):
                 return False
 
             found: List[ScreenCoordinates] = await self._pogo_windows_handler.check_close_except_nearby_button(
-                await self.get_screenshot_path(), self._worker_state.origin, close_raid=True)
+                self._worker_state.last_screenshot, self._worker_state.origin, close_raid=True)
             if found:
                 logger.debug("_check_pogo_main_screen: Found (X) button (except nearby)")
                 await self._communicator.click(found[0].x, found[0].y)
                 await asyncio.sleep(2)
             else:
                 button_coords: Optional[ScreenCoordinates] = await self._pogo_windows_handler \
-                    .look_for_button(screenshot_path, 2.20, 3.01)
+                    .look_for_button(self._worker_state.last_screenshot, 2.20, 3.01)
                 if button_coords:
                     logger.debug("_check_pogo_main_screen: Found button (small)")
                     await self._communicator.click(button_coords.x, button_coords.y)
                     await asyncio.sleep(2)
                     return True
-                button_coords = await self._pogo_windows_handler.look_for_button(screenshot_path, 1.05, 2.20)
+                button_coords = await self._pogo_windows_handler.look_for_button(self._worker_state.last_screenshot,
+                                                                                 1.05, 2.20)
                 if button_coords:
                     logger.debug("_check_pogo_main_screen: Found button (big)")
                     await self._communicator.click(button_coords.x, button_coords.y)
@@ -584,8 +586,15 @@ class AbstractWorkerStrategy(ABC):
         screenshot_quality: int = await self.get_devicesettings_value(MappingManagerDevicemappingKey.SCREENSHOT_QUALITY,
                                                                       80)
 
-        take_screenshot = await self._communicator.get_screenshot(await self.get_screenshot_path(fileaddon=errorscreen),
-                                                                  screenshot_quality, screenshot_type)
+        screenshot: Optional[ScreenshotBuffer] = await self._communicator.get_screenshot_buffer(screenshot_quality,
+                                                                                              screenshot_type)
+        take_screenshot: bool = screenshot is not None
+        if screenshot is not None:
+            if self._worker_state.last_screenshot is not None:
+                self._worker_state.last_screenshot.close()
+            self._worker_state.last_screenshot = screenshot
+            if errorscreen:
+                await screenshot.write_to(await self.get_screenshot_path(fileaddon=True))
 
         if self._worker_state.last_screenshot_taken_at and time_since_last_screenshot < 0.5:
             logger.info("screenshot taken recently, returning immediately")
@@ -621,15 +630,21 @@ class AbstractWorkerStrategy(ABC):
     async def _update_screen_size(self):
         if self._worker_state.stop_worker_event.is_set():
             raise WebsocketWorkerRemovedException("Worker is to be stopped rather than update screensize")
-        screen = await self._communicator.get_screensize()
+        softbar_enabled: bool = await self.get_devicesettings_value(MappingManagerDevicemappingKey.SOFTBAR_ENABLED,
+                                                                    False)
+        batch: CommandBatch = CommandBatch().get_screensize()
+        if softbar_enabled:
+            batch.get_y_offset()
+        responses: List[Optional[MessageTyping]] = await self._communicator.run_batch(batch)
+        screen = responses[0]
         if not screen:
             raise WebsocketWorkerRemovedException("Could not retrieve screensize")
 
         screen = screen.strip().split(' ')
         x_offset = await self.get_devicesettings_value(MappingManagerDevicemappingKey.SCREENSHOT_X_OFFSET, 0)
         y_offset_settings = await self.get_devicesettings_value(MappingManagerDevicemappingKey.SCREENSHOT_Y_OFFSET, 0)
-        if await self.get_devicesettings_value(MappingManagerDevicemappingKey.SOFTBAR_ENABLED, False):
-            y_offset_raw: Optional[MessageTyping] = await self._communicator.get_y_offset()
+        if softbar_enabled:
+            y_offset_raw: Optional[MessageTyping] = responses[1]
             if not y_offset_raw:
                 raise WebsocketWorkerRemovedException("No y offset available")
             else:
@@ -2,16 +2,17 @@ import asyncio
 import math
 import time
 from abc import ABC, abstractmethod
-from typing import Optional, Set, Tuple, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 from redis import Redis
 
+from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.GmoDigest import (
+    GmoDigest, WildMonDigest)
 from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.LatestMitmDataEntry import \
     LatestMitmDataEntry
 from mapadroid.mapping_manager.MappingManagerDevicemappingKey import \
     MappingManagerDevicemappingKey
 from mapadroid.utils.collections import Location
-from mapadroid.utils.geo import get_distance_of_two_points_in_meters
 from mapadroid.utils.logging import LoggerEnums, get_logger
 from mapadroid.utils.madGlobals import (FortSearchResultTypes,
                                         InternalStopWorkerException,
@@ -31,6 +32,13 @@ class AbstractWorkerMitmStrategy(AbstractMitmBaseStrategy, ABC):
                                       timestamp: int) -> Tuple[ReceivedType, Optional[object]]:
         pass
 
+    async def _request_latest(self, key: str, proto_to_wait_for: ProtoIdentifier,
+                              timestamp: int) -> Optional[LatestMitmDataEntry]:
+        if proto_to_wait_for == ProtoIdentifier.GMO:
+            # The digest of GMOs holds everything needed to decide upon GMOs
+            return await self._mitm_mapper.request_latest_digest(self._worker_state.origin, key, timestamp)
+        return await super()._request_latest(key, proto_to_wait_for, timestamp)
+
     async def pre_work_loop(self):
         await super().pre_work_loop()
         logger.info("MITM worker starting")
@@ -98,7 +106,7 @@ class AbstractWorkerMitmStrategy(AbstractMitmBaseStrategy, ABC):
         return timestamp_to_use
 
     async def post_move_location_routine(self, timestamp) -> Optional[Tuple[ReceivedType,
-                                                                            Optional[Union[dict,
+                                                                            Optional[Union[dict, GmoDigest,
                                                                                            FortSearchResultTypes]],
                                                                             float]]:
         # TODO: pass the appropriate proto number if IV?
@@ -110,29 +118,23 @@ class AbstractWorkerMitmStrategy(AbstractMitmBaseStrategy, ABC):
             return None
         return type_received, data_gmo, time_received
 
-    async def _gmo_contains_wild_mons_closeby(self, gmo) -> bool:
-        cells = gmo.get("cells", None)
-        if not cells:
-            return False
-        for cell in cells:
-            for wild_mon in cell["wild_pokemon"]:
-                lat = wild_mon["latitude"]
-                lon = wild_mon["longitude"]
-                distance_to_mon: float = get_distance_of_two_points_in_meters(lat, lon,
-                                                                              self._worker_state.current_location.lat,
-                                                                              self._worker_state.current_location.lng)
-                # TODO: Distance probably incorrect
-                if distance_to_mon > 70:
-                    logger.debug("Distance to mon around considered to be too far away to await encounter")
-                    continue
-                else:
-                    logger.debug2("Mon at {:.5f}, {:.5f} at distance {}", lat, lon, distance_to_mon)
-                    return True
+    async def _gmo_contains_wild_mons_closeby(self, gmo_digest: GmoDigest) -> bool:
+        distances_to_mons = gmo_digest.wild_mon_distances(self._worker_state.current_location.lat,
+                                                          self._worker_state.current_location.lng)
+        for wild_mon, distance_to_mon in zip(gmo_digest.wild_mons(), distances_to_mons):
+            # TODO: Distance probably incorrect
+            if distance_to_mon > 70:
+                logger.debug("Distance to mon around considered to be too far away to await encounter")
+                continue
+            else:
+                logger.debug2("Mon at {:.5f}, {:.5f} at distance {}", wild_mon.latitude, wild_mon.longitude,
+                              distance_to_mon)
+                return True
         return False
 
-    async def _gmo_contains_mons_to_be_encountered(self, gmo, check_encounter_id: bool = False) -> bool:
-        cells = gmo.get("cells", None)
-        if not cells:
+    async def _gmo_contains_mons_to_be_encountered(self, gmo_digest: GmoDigest,
+                                                   check_encounter_id: bool = False) -> bool:
+        if not gmo_digest.encounter_ids:
             return False
         ids_to_encounter: Set[int] = set()
         if not check_encounter_id:
@@ -145,39 +147,34 @@ class AbstractWorkerMitmStrategy(AbstractMitmBaseStrategy, ABC):
             ids_iv = await self._mapping_manager.routemanager_get_encounter_ids_left(self._area_id)
             ids_to_encounter = {id_to_encounter for id_to_encounter in ids_iv}
 
-        for cell in cells:
-            for wild_mon in cell["wild_pokemon"]:
-                spawnid = int(str(wild_mon["spawnpoint_id"]), 16)
-                lat = wild_mon["latitude"]
-                lon = wild_mon["longitude"]
-                distance_to_mon: float = get_distance_of_two_points_in_meters(lat, lon,
-                                                                              self._worker_state.current_location.lat,
-                                                                              self._worker_state.current_location.lng)
-                # TODO: Distance probably incorrect
-                if distance_to_mon > 65:
-                    logger.debug("Distance to mon around considered to be too far away to await encounter")
-                    continue
-                # If the mon has been encountered before, continue as it cannot be expected to be encountered again
-                encounter_id = wild_mon["encounter_id"]
-                pokemon_data = wild_mon.get("pokemon_data")
-                mon_id = pokemon_data.get("id")
-                pokemon_display = pokemon_data.get("display", {})
-                weather_boosted = pokemon_display.get('weather_boosted_value', None)
-                if encounter_id < 0:
-                    encounter_id = encounter_id + 2 ** 64
-                cache_key = "moniv{}-{}-{}".format(encounter_id, weather_boosted, mon_id)
-                cache: Redis = await self._db_wrapper.get_cache()
-                if await cache.exists(cache_key):
-                    continue
-                if encounter_id in self._encounter_ids:
-                    # already encountered
-                    continue
-                # now check whether mon_mitm's mon IDs to scan are present and unscanned
-                # OR iv_mitm...
-                if not check_encounter_id and mon_id in ids_to_encounter:
-                    return True
-                elif check_encounter_id and encounter_id in ids_to_encounter:
-                    return True
+        # Cache key -> mon in range of the worker
+        mons_in_range: Dict[str, WildMonDigest] = {}
+        distances_to_mons = gmo_digest.wild_mon_distances(self._worker_state.current_location.lat,
+                                                          self._worker_state.current_location.lng)
+        for wild_mon, distance_to_mon in zip(gmo_digest.wild_mons(), distances_to_mons):
+            # TODO: Distance probably incorrect
+            if distance_to_mon > 65:
+                logger.debug("Distance to mon around considered to be too far away to await encounter")
+                continue
+            cache_key = "moniv{}-{}-{}".format(wild_mon.encounter_id, wild_mon.weather_boosted, wild_mon.mon_id)
+            mons_in_range[cache_key] = wild_mon
+        if not mons_in_range:
+            return False
+        cache: Redis = await self._db_wrapper.get_cache()
+        cached: List[Optional[bytes]] = await cache.mget(list(mons_in_range.keys()))
+        for (cache_key, wild_mon), cached_value in zip(mons_in_range.items(), cached):
+            # If the mon has been encountered before, continue as it cannot be expected to be encountered again
+            if cached_value is not None:
+                continue
+            if wild_mon.encounter_id in self._encounter_ids:
+                # already encountered
+                continue
+            # now check whether mon_mitm's mon IDs to scan are present and unscanned
+            # OR iv_mitm...
+            if not check_encounter_id and wild_mon.mon_id in ids_to_encounter:
+                return True
+            elif check_encounter_id and wild_mon.encounter_id in ids_to_encounter:
+                return True
         return False
 
     async def worker_specific_setup_start(self):
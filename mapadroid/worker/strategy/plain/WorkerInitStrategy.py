@@ -1,6 +1,8 @@
 from enum import Enum
 from typing import List, Optional, Tuple
 
+from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.GmoDigest import \
+    GmoDigest
 from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.LatestMitmDataEntry import \
     LatestMitmDataEntry
 from mapadroid.db.model import SettingsAreaInitMitm
@@ -43,7 +45,10 @@ class WorkerInitStrategy(AbstractWorkerMitmStrategy):
             # TODO: latter indicates too high speeds for example
             return type_of_data_found, data_found
 
-        latest_proto_data: dict = latest.data
+        if proto_to_wait_for == ProtoIdentifier.GMO:
+            latest_proto_data: Optional[GmoDigest] = latest.digest
+        else:
+            latest_proto_data: Optional[dict] = latest.data
         if latest_proto_data is None:
             return ReceivedType.UNDEFINED, data_found
         if proto_to_wait_for == ProtoIdentifier.GMO:
@@ -53,7 +58,7 @@ class WorkerInitStrategy(AbstractWorkerMitmStrategy):
             if ((init_type == InitTypes.MONS
                  and await self._gmo_contains_wild_mons_closeby(latest_proto_data))
                     or (init_type == InitTypes.FORTS
-                        and self._gmo_cells_contain_multiple_of_key(latest_proto_data, keys_to_check_fort))):
+                        and latest_proto_data.cells_contain_any_of(keys_to_check_fort))):
                 data_found = latest_proto_data
                 type_of_data_found = ReceivedType.GMO
             else:
@@ -1,5 +1,6 @@
 from typing import Optional, Tuple, List, Union
 
+from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.GmoDigest import GmoDigest
 from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.LatestMitmDataEntry import LatestMitmDataEntry
 from mapadroid.utils.DatetimeWrapper import DatetimeWrapper
 from mapadroid.utils.ProtoIdentifier import ProtoIdentifier
@@ -31,7 +32,10 @@ class WorkerMonMitmStrategy(AbstractWorkerMitmStrategy):
             # TODO: latter indicates too high speeds for example
             return type_of_data_found, data_found
 
-        latest_proto_data: dict = latest.data
+        if proto_to_wait_for == ProtoIdentifier.GMO:
+            latest_proto_data: Optional[GmoDigest] = latest.digest
+        else:
+            latest_proto_data: Optional[dict] = latest.data
         if latest_proto_data is None:
             return ReceivedType.UNDEFINED, data_found
         if proto_to_wait_for == ProtoIdentifier.GMO:
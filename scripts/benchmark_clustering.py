@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the clustering of events (used for prio queues and the reduction of coords of routes) comparing the
+ClusteringHelper to the previous implementation inspecting every pair of events.
+The results of both implementations are compared, the previous one is only run for datasets up to --legacy-max
+events as it takes minutes for 10k events.
+
+Usage (from the root of the repository):
+    PYTHONPATH=. python scripts/benchmark_clustering.py --sizes 1000 10000 100000
+"""
+import argparse
+import random
+import sys
+import time
+from typing import List, Tuple
+
+import s2sphere
+from loguru import logger
+
+from mapadroid.route.routecalc.ClusteringHelper import ClusteringHelper
+from mapadroid.utils.collections import Location, Relation
+from mapadroid.utils.geo import (get_distance_of_two_points_in_meters,
+                                 get_middle_of_coord_list)
+from mapadroid.utils.s2Helper import S2Helper
+
+
+class LegacyClusteringHelper:
+    """
+    The clustering as implemented before the spatial index, kept as reference of the expected results
+    """
+    def __init__(self, max_radius, max_count_per_circle: int, max_timedelta_seconds, use_s2: bool = False,
+                 s2_level: int = 30):
+        self.max_radius = max_radius
+        self.max_count_per_circle = max_count_per_circle
+        self.max_timedelta_seconds = max_timedelta_seconds
+        self.useS2 = use_s2
+        self.S2level = s2_level
+
+    def _get_relations_in_range_within_time(self, queue: List[Tuple[int, Location]], max_radius):
+        relations = {}
+        for event in queue:
+            for other_event in queue:
+                if event[1].lat == other_event[1].lat and event[1].lng == other_event[1].lng and \
+                        event not in relations.keys():
+                    relations[event] = []
+                distance = get_distance_of_two_points_in_meters(event[1].lat, event[1].lng,
+                                                                other_event[1].lat, other_event[1].lng)
+                # we will always build relations from the event at hand subtracted by the event inspected
+                timedelta = event[0] - other_event[0]
+                if 0 <= distance <= max_radius * 2 and 0 <= timedelta <= self.max_timedelta_seconds:
+                    if event not in relations.keys():
+                        relations[event] = []
+                    # avoid duplicates
+                    already_present = False
+                    for relation in relations[event]:
+                        if relation[0][1].lat == other_event[1].lat and \
+                                relation[0][1].lng == other_event[1].lng:
+                            already_present = True
+                    if not already_present:
+                        relations[event].append(
+                            Relation(other_event, distance, timedelta))
+        return relations
+
+    @staticmethod
+    def _get_most_west_amongst_relations(relations):
+        selected = list(relations.keys())[0]
+        for event in relations.keys():
+            if event[1].lng < selected[1].lng:
+                selected = event
+            elif event[1].lng == selected[1].lng and event[1].lat > selected[1].lat:
+                selected = event
+        return selected
+
+    def _get_farthest_in_relation(self, to_be_inspected):
+        # retrieve the relation farthest within the given timedelta, do not bother about maximizing the timedelta
+        # if a coord is not within the given timedeltas, it will simply remain in the original set anyway ;)
+        # ignore any relations of previously merged origins for now
+        distance = -1
+        farthest = None
+        for relation in to_be_inspected:
+            if (len(relation.other_event) == 4 and not relation.other_event[3] or len(relation) < 4) and \
+                    relation.timedelta <= self.max_timedelta_seconds and relation.distance > distance:
+                distance = relation.distance
+                farthest = relation
+        return farthest.other_event, distance
+
+    def _get_count_and_coords_in_circle_within_timedelta(self, middle, relations, earliest_timestamp,
+                                                         latest_timestamp, max_radius):
+        inside_circle = []
+        highest_timedelta = 0
+        if self.useS2:
+            region = s2sphere.CellUnion(
+                S2Helper.get_s2cells_from_circle(middle.lat, middle.lng, self.max_radius, self.S2level))
+
+        for event_relations in relations:
+            # exclude previously clustered events...
+            if len(event_relations) == 4 and event_relations[3]:
+                inside_circle.append(event_relations)
+                continue
+            distance = get_distance_of_two_points_in_meters(middle.lat, middle.lng,
+                                                            event_relations[1].lat,
+                                                            event_relations[1].lng)
+            event_in_range = 0 <= distance <= max_radius
+            if self.useS2:
+                event_in_range = region.contains(s2sphere.LatLng.from_degrees(event_relations[1].lat,
+                                                                              event_relations[1].lng).to_point())
+            # timedelta of event being inspected to the earliest timestamp
+            timedelta_end = latest_timestamp - event_relations[0]
+            timedelta_start = event_relations[0] - earliest_timestamp
+            if timedelta_end < 0 and event_in_range:
+                # we found an event starting past the current latest timestamp, let's update the latest_timestamp
+                latest_timestamp_temp = latest_timestamp + abs(timedelta_end)
+                if latest_timestamp_temp - earliest_timestamp <= self.max_timedelta_seconds:
+                    latest_timestamp = latest_timestamp_temp
+                    highest_timedelta = highest_timedelta + abs(timedelta_end)
+                    inside_circle.append(event_relations)
+            elif timedelta_start < 0 and event_in_range:
+                # we found an event starting before earliest_timestamp, let's check that...
+                earliest_timestamp_temp = earliest_timestamp - abs(timedelta_start)
+                if latest_timestamp - earliest_timestamp_temp <= self.max_timedelta_seconds:
+                    earliest_timestamp = earliest_timestamp_temp
+                    highest_timedelta = highest_timedelta + abs(timedelta_start)
+                    inside_circle.append(event_relations)
+            elif timedelta_end >= 0 and timedelta_start >= 0 and event_in_range:
+                # we found an event within our current timedelta and proximity, just append it to the list
+                inside_circle.append(event_relations)
+
+        return len(inside_circle), inside_circle, highest_timedelta, latest_timestamp
+
+    @staticmethod
+    def _get_earliest_timestamp_in_queue(queue):
+        earliest = queue[0][0]
+        for item in queue:
+            if earliest > item[0]:
+                earliest = item[0]
+        return earliest
+
+    @staticmethod
+    def _get_latest_timestamp_in_queue(queue):
+        latest = queue[0][0]
+        for item in queue:
+            if latest < item[0]:
+                latest = item[0]
+        return latest
+
+    def _get_circle(self, event, to_be_inspected, relations, max_radius):
+        if len(to_be_inspected) == 0:
+            return event, [event]
+        elif len(to_be_inspected) == 1:
+            # TODO: do relations hold themselves or is there a return missing here?
+            return event, [event]
+        # use the get_farthest... since we have previously moved the middle, we need to check for matching events in
+        # such cases and build new circle events in time
+        if len(event) == 4 and event[3]:
+            # this is a previously clustered event, we will simply check for other events that have not been clustered
+            # to include those in our current circle
+            # all we need to do is update timestamps to keep track as to whether we are still inside the max_timedelta
+            # constraint
+            middle_event = event
+            middle = event[1]
+            earliest_timestamp = event[0] - event[2]
+            latest_timestamp = event[0]
+            farthest_away = event
+            distance_to_farthest = max_radius
+        else:
+            farthest_away, distance_to_farthest = self._get_farthest_in_relation(
+                to_be_inspected)
+            all_events_within_range_and_time = [event, farthest_away]
+            earliest_timestamp = self._get_earliest_timestamp_in_queue(
+                all_events_within_range_and_time)
+            latest_timestamp = self._get_latest_timestamp_in_queue(
+                all_events_within_range_and_time)
+            middle = get_middle_of_coord_list(
+                [event[1], farthest_away[1]]
+            )
+            middle_event = (
+                latest_timestamp, middle, latest_timestamp - earliest_timestamp, True
+            )
+        count_inside, events_in_circle, highest_timedelta, latest_timestamp = \
+            self._get_count_and_coords_in_circle_within_timedelta(middle, relations,
+                                                                  earliest_timestamp, latest_timestamp,
+                                                                  max_radius)
+        middle_event = (latest_timestamp, middle_event[1],
+                        highest_timedelta, middle_event[3])
+        if count_inside <= self.max_count_per_circle and count_inside == len(to_be_inspected):
+            return middle_event, events_in_circle
+        elif count_inside > self.max_count_per_circle:
+            to_be_inspected = [
+                to_keep for to_keep in to_be_inspected if not to_keep.other_event == farthest_away]
+            return self._get_circle(event, to_be_inspected, relations, distance_to_farthest)
+        else:
+            return middle_event, events_in_circle
+
+    @staticmethod
+    def _remove_coords_from_relations(relations, events_to_be_removed):
+        for source_event, relations_to_source in list(relations.items()):
+            # iterate relations, remove anything matching events_to_be_removed
+            for event in events_to_be_removed:
+                if event == source_event:
+                    relations.pop(source_event)
+                    break
+                # iterate through the entire distance relations as well...
+                for relation in relations_to_source:
+                    if relation.other_event[1] == event[1]:
+                        relations[source_event].remove(relation)
+        return relations
+
+    def _sum_up_relations(self, relations) -> List[Tuple[int, Location]]:
+        final_set: List[Tuple[int, Location]] = []
+
+        while len(relations) > 0:
+            west_next = self._get_most_west_amongst_relations(relations)
+            try:
+                middle_event, events_to_be_removed = self._get_circle(west_next, relations[west_next], relations,
+                                                                      self.max_radius)
+                final_set.append((middle_event[0], middle_event[1]))
+                relations = self._remove_coords_from_relations(
+                    relations, events_to_be_removed)
+            except Exception as e:
+                logger.exception(e)
+        return final_set
+
+    def get_clustered(self, queue: List[Tuple[int, Location]]) -> List[Tuple[int, Location]]:
+        relations = self._get_relations_in_range_within_time(
+            queue, max_radius=self.max_radius)
+        summed_up = self._sum_up_relations(relations)
+        return summed_up
+
+
+def generate_events(amount: int, max_timedelta: int, seed: int) -> List[Tuple[int, Location]]:
+    """
+    Events spread over an area of roughly 5x5km per 10k events (the density of spawnpoints of a city) with
+    timestamps within an hour. Locations are rounded to ~1m to produce duplicates like spawnpoints close together.
+    """
+    rng = random.Random(seed)
+    span = 0.045 * max(amount / 10000, 0.01) ** 0.5
+    events: List[Tuple[int, Location]] = []
+    for _ in range(amount):
+        timestamp = rng.randint(0, 3600) if max_timedelta > 0 else 0
+        events.append((timestamp, Location(round(50.0 + rng.uniform(0, span), 5),
+                                           round(8.0 + rng.uniform(0, span * 1.5), 5))))
+    return events
+
+
+def run(helper, events: List[Tuple[int, Location]]) -> Tuple[float, List[Tuple[int, Location]]]:
+    start = time.perf_counter()
+    clustered = helper.get_clustered(events)
+    return time.perf_counter() - start, clustered
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark of the clustering of events")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--legacy-max", type=int, default=1000,
+                        help="Largest dataset the previous implementation is run for")
+    parser.add_argument("--radius", type=float, default=70)
+    parser.add_argument("--max-count", type=int, default=5)
+    parser.add_argument("--max-timedelta", type=int, default=300,
+                        help="Timedelta of events to be clustered, 0 to cluster coords of routes")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logger.remove()
+    mismatches = 0
+    for size in args.sizes:
+        events = generate_events(size, args.max_timedelta, args.seed)
+        duration, clustered = run(ClusteringHelper(args.radius, args.max_count, args.max_timedelta), events)
+        line = "{:>7} events -> {:>7} clustered: {:9.3f}s".format(size, len(clustered), duration)
+        if size <= args.legacy_max:
+            legacy_duration, legacy_clustered = run(
+                LegacyClusteringHelper(args.radius, args.max_count, args.max_timedelta), events)
+            equal = legacy_clustered == clustered
+            mismatches += 0 if equal else 1
+            line += ", previously {:9.3f}s ({:.1f}x), {}".format(legacy_duration, legacy_duration / duration,
+                                                                 "identical" if equal else "DIFFERENT")
+        print(line)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,748 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the ingestion of protos: requests are posted to the MITMReceiver (ReceiveProtosEndpoint), processed by
+SerializedMitmDataProcessor and written by DbPogoProtoSubmit just like protos sent by devices.
+The protos are either generated (GMOs, encounters, fort details, quests and gym infos of a synthetic area, reproducible
+by --seed) or replayed from a file holding one request body (a proto or a list of protos) per line. --record writes
+the generated request bodies to such a file without running the benchmark.
+
+Reported are protos/sec, p50/p99 latencies of the stages (HTTP request to the receiver, wait in the data queue,
+processing of the proto and each method of DbPogoProtoSubmit called) and the DB/Redis round trips per proto. --output
+writes the results as JSON, --compare prints the changes relative to the results of a previous run.
+
+The DB has to be a throwaway MySQL/MariaDB database (DbPogoProtoSubmit relies on MySQL upserts, SQLite is not an
+option), the schema is installed if missing. Redis is either the one configured (cache_*) or an in-memory stand-in
+(--fake-redis) which does not support --webhook_event_stream.
+MAD's arguments (e.g. -cf, --dbip, --dbname, --cache_host, --game_stats, --mitmreceiver_data_workers) are passed
+through. Auth of MITM requests is disabled, quest titles are not downloaded.
+
+Usage (from the root of the repository):
+    PYTHONPATH=. python scripts/benchmark_proto_ingest.py -cf configs/benchmark.ini --protos 20000 --devices 20 \
+        --output results.json [--compare previous.json]
+    PYTHONPATH=. python scripts/benchmark_proto_ingest.py --record protos.jsonl --protos 20000
+    PYTHONPATH=. python scripts/benchmark_proto_ingest.py -cf configs/benchmark.ini --replay protos.jsonl
+"""
+import argparse
+import asyncio
+import functools
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+import s2sphere
+from aiohttp import ClientSession
+from orjson import orjson
+from redis.asyncio import Redis
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+import mapadroid
+from mapadroid.utils.ProtoIdentifier import ProtoIdentifier
+
+PROTO_NAMES: Dict[str, int] = {
+    "gmo": ProtoIdentifier.GMO.value,
+    "encounter": ProtoIdentifier.ENCOUNTER.value,
+    "fort_details": ProtoIdentifier.FORT_DETAILS.value,
+    "quest": ProtoIdentifier.FORT_SEARCH.value,
+    "gym_info": ProtoIdentifier.GYM_INFO.value,
+}
+DEFAULT_MIX: str = "gmo=60,encounter=25,fort_details=5,quest=5,gym_info=5"
+
+
+def proto_name(proto_type: int) -> str:
+    try:
+        return ProtoIdentifier(proto_type).name.lower()
+    except ValueError:
+        return str(proto_type)
+
+
+class LatencyRecorder:
+    """
+    Durations by stage, reported as percentiles (nearest rank)
+    """
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def add(self, stage: str, duration: float) -> None:
+        self.samples.setdefault(stage, []).append(duration)
+
+    def clear(self) -> None:
+        self.samples.clear()
+
+    @staticmethod
+    def percentile(ordered: List[float], percent: float) -> float:
+        return ordered[max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        summary: Dict[str, Dict[str, float]] = {}
+        for stage, samples in sorted(self.samples.items()):
+            ordered: List[float] = sorted(samples)
+            summary[stage] = {
+                "count": len(ordered),
+                "mean_ms": round(1000 * sum(ordered) / len(ordered), 3),
+                "p50_ms": round(1000 * self.percentile(ordered, 50), 3),
+                "p99_ms": round(1000 * self.percentile(ordered, 99), 3),
+                "max_ms": round(1000 * ordered[-1], 3),
+            }
+        return summary
+
+
+class InMemoryPipeline:
+    def __init__(self, redis: "InMemoryRedis"):
+        self._redis: InMemoryRedis = redis
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self._commands.clear()
+
+    def set(self, *args, **kwargs) -> "InMemoryPipeline":
+        self._commands.append(("set", args, kwargs))
+        return self
+
+    def get(self, *args) -> "InMemoryPipeline":
+        self._commands.append(("get", args, {}))
+        return self
+
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        self._redis.round_trips += 1
+        results = [getattr(self._redis, "_" + command)(*args, **kwargs) for command, args, kwargs in self._commands]
+        self._commands.clear()
+        return results
+
+
+class InMemoryRedis:
+    """
+    Stand-in for Redis holding the keys in memory, implements the commands used by the ingestion only
+    """
+    def __init__(self):
+        # key -> (value, time.monotonic() of the expiration or None)
+        self._values: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self.round_trips: int = 0
+
+    def _get(self, name: str) -> Optional[bytes]:
+        entry: Optional[Tuple[bytes, Optional[float]]] = self._values.get(name)
+        if entry is None:
+            return None
+        value, expiration = entry
+        if expiration is not None and expiration <= time.monotonic():
+            del self._values[name]
+            return None
+        return value
+
+    def _set(self, name: str, value: Any, ex: Optional[int] = None, **kwargs) -> bool:
+        self._values[name] = (str(value).encode(), time.monotonic() + ex if ex else None)
+        return True
+
+    async def ping(self) -> bool:
+        self.round_trips += 1
+        return True
+
+    async def get(self, name: str) -> Optional[bytes]:
+        self.round_trips += 1
+        return self._get(name)
+
+    async def mget(self, keys, *args) -> List[Optional[bytes]]:
+        self.round_trips += 1
+        return [self._get(key) for key in keys]
+
+    async def set(self, name: str, value: Any, ex: Optional[int] = None, **kwargs) -> bool:
+        self.round_trips += 1
+        return self._set(name, value, ex)
+
+    async def exists(self, *names: str) -> int:
+        self.round_trips += 1
+        return sum(1 for name in names if self._get(name) is not None)
+
+    async def delete(self, *names: str) -> int:
+        self.round_trips += 1
+        return sum(1 for name in names if self._values.pop(name, None) is not None)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> InMemoryPipeline:
+        return InMemoryPipeline(self)
+
+    async def close(self) -> None:
+        pass
+
+
+class RoundTripCountingRedis(Redis):
+    """
+    Redis client counting the commands and pipelines executed
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.round_trips: int = 0
+
+    async def execute_command(self, *args, **options):
+        self.round_trips += 1
+        return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None):
+        pipeline = super().pipeline(transaction, shard_hint)
+        execute = pipeline.execute
+
+        async def execute_counted(raise_on_error: bool = True):
+            self.round_trips += 1
+            return await execute(raise_on_error)
+        pipeline.execute = execute_counted
+        return pipeline
+
+
+class DbRoundTripCounter:
+    """
+    Counts the statements, commits and rollbacks sent by any engine
+    """
+    def __init__(self):
+        self.round_trips: int = 0
+        event.listen(Engine, "before_cursor_execute", self.__count)
+        event.listen(Engine, "commit", self.__count)
+        event.listen(Engine, "rollback", self.__count)
+
+    def __count(self, *args, **kwargs) -> None:
+        self.round_trips += 1
+
+
+class SyntheticProtoGenerator:
+    """
+    Protos of a synthetic area of level 15 cells around a location holding stops, gyms (with raids) and spawnpoints.
+    A proto only depends on the seed and its index apart from timestamps, raids and gyms being relative to the current
+    time. Wild mons are kept for --mon-lifetime protos, GMOs repeatedly
+    covering the same mons, stops and gyms exercise the dedup cache like devices scanning an area do.
+    """
+    def __init__(self, seed: int, lat: float, lng: float, cells: int, cells_per_gmo: int, stops_per_cell: int,
+                 gyms_per_cell: int, spawnpoints_per_cell: int, mon_lifetime: int):
+        self._seed: int = seed
+        self._cells_per_gmo: int = min(cells_per_gmo, cells)
+        self._mon_lifetime: int = max(1, mon_lifetime)
+        rng = random.Random(seed)
+        self.cell_ids: List[int] = self.__get_cells_around(lat, lng, cells)
+        self.weather_cell_id: int = s2sphere.CellId(self.cell_ids[0]).parent(10).id()
+        self.stops: Dict[int, List[Dict]] = {}
+        self.gyms: Dict[int, List[Dict]] = {}
+        self.spawnpoints: Dict[int, List[Tuple[str, float, float]]] = {}
+        for cell_id in self.cell_ids:
+            cell_lat, cell_lng = self.__get_center(cell_id)
+            self.stops[cell_id] = [{"id": "%032x.16" % rng.getrandbits(128),
+                                    "latitude": cell_lat + rng.uniform(-0.001, 0.001),
+                                    "longitude": cell_lng + rng.uniform(-0.0015, 0.0015),
+                                    "last_modified_timestamp_ms": 1600000000000 + rng.randint(0, 10 ** 8)}
+                                   for _ in range(stops_per_cell)]
+            self.gyms[cell_id] = [{"id": "%032x.16" % rng.getrandbits(128),
+                                   "latitude": cell_lat + rng.uniform(-0.001, 0.001),
+                                   "longitude": cell_lng + rng.uniform(-0.0015, 0.0015),
+                                   "raid_level": rng.choice((0, 0, 1, 3, 5))}
+                                  for _ in range(gyms_per_cell)]
+            self.spawnpoints[cell_id] = []
+            for _ in range(spawnpoints_per_cell):
+                spawn_lat = cell_lat + rng.uniform(-0.001, 0.001)
+                spawn_lng = cell_lng + rng.uniform(-0.0015, 0.0015)
+                spawn_cell = s2sphere.CellId.from_lat_lng(s2sphere.LatLng.from_degrees(spawn_lat, spawn_lng))
+                self.spawnpoints[cell_id].append(("{:016x}".format(spawn_cell.parent(20).id())[:-5],
+                                                  spawn_lat, spawn_lng))
+
+    @staticmethod
+    def __get_cells_around(lat: float, lng: float, amount: int) -> List[int]:
+        start = s2sphere.CellId.from_lat_lng(s2sphere.LatLng.from_degrees(lat, lng)).parent(15)
+        cells: List[s2sphere.CellId] = [start]
+        seen: Set[int] = {start.id()}
+        index = 0
+        while len(cells) < amount:
+            for neighbour in cells[index].get_edge_neighbors():
+                if neighbour.id() not in seen and len(cells) < amount:
+                    seen.add(neighbour.id())
+                    cells.append(neighbour)
+            index += 1
+        return [cell.id() for cell in cells]
+
+    @staticmethod
+    def __get_center(cell_id: int) -> Tuple[float, float]:
+        lat_lng = s2sphere.CellId(cell_id).to_lat_lng()
+        return lat_lng.lat().degrees, lat_lng.lng().degrees
+
+    @staticmethod
+    def _signed(value: int) -> int:
+        # int64 as sent by devices
+        return value - 2 ** 64 if value >= 2 ** 63 else value
+
+    @staticmethod
+    def _mix(*values: int) -> int:
+        # splitmix64 of the values, stable across runs unlike hash()
+        result: int = 0
+        for value in values:
+            result = (result ^ value) + 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF
+            result = (result ^ (result >> 30)) * 0xBF58476D1CE4E5B9 & 0xFFFFFFFFFFFFFFFF
+            result = (result ^ (result >> 27)) * 0x94D049BB133111EB & 0xFFFFFFFFFFFFFFFF
+            result ^= result >> 31
+        return result
+
+    def generate(self, proto_types: List[int]) -> Iterator[Dict]:
+        for index, proto_type in enumerate(proto_types):
+            rng = random.Random(self._mix(self._seed, index))
+            window_start: int = index % len(self.cell_ids)
+            cell_ids: List[int] = [self.cell_ids[(window_start + offset) % len(self.cell_ids)]
+                                   for offset in range(self._cells_per_gmo)]
+            if proto_type == ProtoIdentifier.GMO.value:
+                payload = self._gmo(index, cell_ids, rng)
+            elif proto_type == ProtoIdentifier.ENCOUNTER.value:
+                payload = self._encounter(index, rng.choice(cell_ids), rng)
+            elif proto_type == ProtoIdentifier.FORT_DETAILS.value:
+                payload = self._fort_details(rng.choice(cell_ids), rng)
+            elif proto_type == ProtoIdentifier.FORT_SEARCH.value:
+                payload = self._quest(rng.choice(cell_ids), rng)
+            else:
+                payload = self._gym_info(rng.choice(cell_ids), rng)
+            lat, lng = self.__get_center(cell_ids[0])
+            yield {"type": proto_type, "payload": payload, "timestamp": int(time.time()), "lat": lat, "lng": lng}
+
+    def _wild_mons(self, index: int, cell_id: int, all_spawnpoints: bool = False) -> List[Dict]:
+        cycle: int = index // self._mon_lifetime
+        mons: List[Dict] = []
+        for spawn_index, (spawnpoint_id, lat, lng) in enumerate(self.spawnpoints[cell_id]):
+            mixed: int = self._mix(self._seed, cell_id, spawn_index, cycle)
+            if mixed % 3 == 0 and not all_spawnpoints:
+                # Nothing spawned
+                continue
+            mons.append({
+                "encounter_id": self._signed(mixed),
+                "spawnpoint_id": spawnpoint_id,
+                "latitude": lat,
+                "longitude": lng,
+                "time_till_hidden": mixed % 90000 if mixed % 2 else -1,
+                "pokemon_data": {"id": 1 + mixed % 649,
+                                 "display": {"gender_value": 1 + mixed % 2, "costume_value": 0,
+                                             "form_value": 0, "weather_boosted_value": mixed % 8 // 7,
+                                             "is_shiny": 0}}
+            })
+        return mons
+
+    def _gym_fort(self, gym: Dict, rng: random.Random) -> Dict:
+        raid_end: int = (int(time.time()) // 2700 + 1) * 2700 * 1000
+        return {
+            "id": gym["id"], "type": 0, "latitude": gym["latitude"], "longitude": gym["longitude"],
+            "enabled": True, "is_ar_scan_eligible": False,
+            "last_modified_timestamp_ms": int(time.time() // 600 * 600 * 1000),
+            "image_url": "", "gym_display": {"total_gym_cp": rng.randint(0, 20000)},
+            "gym_details": {
+                "guard_pokemon": rng.randint(1, 649), "owned_by_team": rng.randint(0, 3),
+                "slots_available": rng.randint(0, 6), "is_ex_raid_eligible": False, "is_in_battle": False,
+                "has_raid": gym["raid_level"] > 0,
+                "raid_info": {
+                    "has_pokemon": True, "level": gym["raid_level"], "is_exclusive": False,
+                    "raid_spawn": raid_end - 3600 * 1000, "raid_battle": raid_end - 2700 * 1000,
+                    "raid_end": raid_end,
+                    "raid_pokemon": {"id": 150, "cp": 40000, "move_1": 1, "move_2": 2,
+                                     "display": {"form_value": 0, "gender_value": 3, "costume_value": 0}}
+                }
+            }
+        }
+
+    def _gmo(self, index: int, cell_ids: List[int], rng: random.Random) -> Dict:
+        now_ms: int = int(time.time() * 1000)
+        cells: List[Dict] = []
+        for cell_id in cell_ids:
+            forts: List[Dict] = [{"id": stop["id"], "type": 1, "latitude": stop["latitude"],
+                                  "longitude": stop["longitude"], "enabled": True, "is_ar_scan_eligible": False,
+                                  "last_modified_timestamp_ms": stop["last_modified_timestamp_ms"],
+                                  "active_fort_modifier": []}
+                                 for stop in self.stops[cell_id]]
+            forts.extend(self._gym_fort(gym, rng) for gym in self.gyms[cell_id])
+            wild_mons: List[Dict] = self._wild_mons(index, cell_id)
+            cells.append({
+                "id": self._signed(cell_id), "current_timestamp": now_ms, "forts": forts,
+                "wild_pokemon": wild_mons, "catchable_pokemon": [],
+                "nearby_pokemon": [{"id": mon["pokemon_data"]["id"], "encounter_id": mon["encounter_id"],
+                                    "fort_id": "", "display": mon["pokemon_data"]["display"]}
+                                   for mon in wild_mons]
+            })
+        return {"cells": cells, "time_of_day_value": 1,
+                "client_weather": [{"cell_id": self._signed(self.weather_cell_id),
+                                    "display_weather": {"cloud_level": 0, "rain_level": index // 5000 % 2,
+                                                        "wind_level": 0, "snow_level": 0, "fog_level": 0,
+                                                        "wind_direction": 0},
+                                    "gameplay_weather": {"gameplay_condition": 1 + index // 5000 % 2}}]}
+
+    def _encounter(self, index: int, cell_id: int, rng: random.Random) -> Dict:
+        wild_mons: List[Dict] = self._wild_mons(index, cell_id) or self._wild_mons(index, cell_id, True)
+        wild_mon: Dict = rng.choice(wild_mons)
+        pokemon_data: Dict = dict(wild_mon["pokemon_data"])
+        pokemon_data.update({"individual_attack": rng.randint(0, 15), "individual_defense": rng.randint(0, 15),
+                             "individual_stamina": rng.randint(0, 15), "cp": rng.randint(10, 3000),
+                             "cp_multiplier": rng.uniform(0.1, 0.7), "weight": rng.uniform(1, 100),
+                             "height": rng.uniform(0.2, 3), "move_1": rng.randint(1, 300),
+                             "move_2": rng.randint(1, 300), "size": rng.randint(1, 5)})
+        return {"status": 1, "wild_pokemon": dict(wild_mon, pokemon_data=pokemon_data),
+                "capture_probability": {"capture_probability_list": "[0.3, 0.4, 0.5]"}}
+
+    def _fort_details(self, cell_id: int, rng: random.Random) -> Dict:
+        stop: Dict = rng.choice(self.stops[cell_id])
+        return {"id": stop["id"], "fort_id": stop["id"], "type": 1, "latitude": stop["latitude"],
+                "longitude": stop["longitude"], "name": "Stop " + stop["id"][:6],
+                "image_urls": ["http://example.com/" + stop["id"][:6]],
+                "last_modified_timestamp_ms": stop["last_modified_timestamp_ms"]}
+
+    def _quest(self, cell_id: int, rng: random.Random) -> Dict:
+        stop: Dict = rng.choice(self.stops[cell_id])
+        return {"result": 1, "fort_id": stop["id"],
+                "challenge_quest": {
+                    "quest": {"quest_type": 4, "template_id": "CHALLENGE_CATCH_EASY",
+                              "goal": {"target": rng.randint(1, 10), "condition": []},
+                              "quest_rewards": [{"type": 2, "item": {"item": 1, "amount": rng.randint(1, 5)},
+                                                 "pokemon_encounter": {}, "stardust": 0}]},
+                    "quest_display": {"title": "quest_catch_pokemon_plural"}}}
+
+    def _gym_info(self, cell_id: int, rng: random.Random) -> Dict:
+        gym: Dict = rng.choice(self.gyms[cell_id])
+        return {"result": 1, "name": "Gym " + gym["id"][:6], "description": "", "url": "",
+                "gym_status_and_defenders": {"pokemon_fort_proto": {"id": gym["id"]}}}
+
+
+def get_proto_types(mix: str, amount: int, seed: int) -> List[int]:
+    weights: Dict[int, float] = {}
+    for entry in mix.split(","):
+        name, weight = entry.split("=")
+        if name.strip() not in PROTO_NAMES:
+            raise ValueError("Unknown proto {}, known are {}".format(name, ", ".join(PROTO_NAMES)))
+        weights[PROTO_NAMES[name.strip()]] = float(weight)
+    return random.Random(seed).choices(list(weights.keys()), list(weights.values()), k=amount)
+
+
+def chunk_requests(protos: Iterator[Dict], protos_per_request: int) -> List[List[Dict]]:
+    requests: List[List[Dict]] = []
+    for proto in protos:
+        if not requests or len(requests[-1]) >= protos_per_request:
+            requests.append([])
+        requests[-1].append(proto)
+    return requests
+
+
+def read_requests(path: str) -> List[List[Dict]]:
+    requests: List[List[Dict]] = []
+    with open(path, "rb") as replay_file:
+        for line in replay_file:
+            if line.strip():
+                body = orjson.loads(line)
+                requests.append(body if isinstance(body, list) else [body])
+    return requests
+
+
+def get_version() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=mapadroid.MAD_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(bench_args: argparse.Namespace, requests: List[List[Dict]]) -> Dict:
+    # Imported once MAD's arguments have been loaded
+    from mapadroid.account_handler import setup_account_handler
+    from mapadroid.data_handler.StandaloneMitmMapperAndStatsHandler import \
+        StandaloneMitmMapperAndStatsHandler
+    from mapadroid.db.DbWrapper import DbWrapper
+    from mapadroid.db.helper.SettingsDeviceHelper import SettingsDeviceHelper
+    from mapadroid.db.model import SettingsDevice, SettingsWalker
+    from mapadroid.db.PooledQueryExecutor import PooledQueryExecutor
+    from mapadroid.mapping_manager.AbstractMappingManager import \
+        AbstractMappingManager
+    from mapadroid.mitm_receiver.data_processing.SerializedMitmDataProcessor import \
+        SerializedMitmDataProcessor
+    from mapadroid.mitm_receiver.MITMReceiver import MITMReceiver
+    from mapadroid.utils.madGlobals import MadGlobals
+    from mapadroid.utils.questGen import QuestGen
+
+    mad_args = MadGlobals.application_args
+    recorder = LatencyRecorder()
+    failures: Dict[str, int] = {"requests": 0, "processing": 0}
+    processed: List[int] = [0]
+
+    class BenchmarkQueryExecutor(PooledQueryExecutor):
+        async def setup(self):
+            if bench_args.fake_redis:
+                await self._init_pool()
+                self._redis_cache = InMemoryRedis()
+            else:
+                await super().setup()
+                self._redis_cache = RoundTripCountingRedis(connection_pool=self._redis_cache.connection_pool)
+
+    class BenchmarkMappingManager(AbstractMappingManager):
+        def __init__(self, origins: Set[str]):
+            self._origins: Set[str] = origins
+
+        async def get_all_loaded_origins(self) -> Set[str]:
+            return self._origins
+
+        async def get_safe_items(self, origin: str) -> List[int]:
+            return []
+
+        async def get_auths(self) -> Optional[Dict[str, str]]:
+            return None
+
+        async def routemanager_of_origin_is_levelmode(self, origin: str) -> bool:
+            return False
+
+        async def routemanager_get_quest_layer_to_scan_of_origin(self, origin: str) -> Optional[int]:
+            return None
+
+        async def increment_login_tracking_by_origin(self, origin: str) -> bool:
+            return False
+
+    class TimedQueue(asyncio.Queue):
+        def _init(self, maxsize):
+            super()._init(maxsize)
+            self._put_at: Deque[float] = deque()
+
+        def _put(self, item):
+            self._put_at.append(time.perf_counter())
+            super()._put(item)
+
+        def _get(self):
+            recorder.add("queue", time.perf_counter() - self._put_at.popleft())
+            return super()._get()
+
+    class TimedMitmDataProcessor(SerializedMitmDataProcessor):
+        async def process_data(self, received_timestamp: int, data, origin):
+            start: float = time.perf_counter()
+            try:
+                await super().process_data(received_timestamp, data, origin)
+                processed[0] += 1
+            except Exception:
+                failures["processing"] += 1
+                raise
+            finally:
+                recorder.add("process." + proto_name(data.get("type", 0)), time.perf_counter() - start)
+
+    def timed(stage: str, method):
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            start: float = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                recorder.add(stage, time.perf_counter() - start)
+        return wrapper
+
+    mad_args.insecure_auth = True
+    mad_args.no_quest_titles = True
+    mad_args.mitm_unix_socket = None
+    mad_args.mitmreceiver_ip = "127.0.0.1"
+    mad_args.mitmreceiver_port = bench_args.port
+    db_round_trips = DbRoundTripCounter()
+    db_exec = BenchmarkQueryExecutor(mad_args, host=mad_args.dbip, port=mad_args.dbport,
+                                     username=mad_args.dbusername, password=mad_args.dbpassword,
+                                     database=mad_args.dbname,
+                                     poolsize=max(mad_args.db_poolsize, mad_args.mitmreceiver_data_workers * 2))
+    db_wrapper = DbWrapper(db_exec=db_exec, args=mad_args)
+    await db_exec.setup()
+    await db_wrapper.setup()
+    proto_submit = db_wrapper.proto_submit
+    for name in dir(type(proto_submit)):
+        method = getattr(proto_submit, name)
+        if not name.startswith("_") and name != "setup" and asyncio.iscoroutinefunction(method):
+            setattr(proto_submit, name, timed("submit." + name, method))
+
+    origins: List[str] = ["benchmark{}".format(index) for index in range(bench_args.devices)]
+    async with db_wrapper as session, session:
+        # Fort searches are only accepted of known devices
+        walker: Optional[SettingsWalker] = None
+        for origin in origins:
+            if await SettingsDeviceHelper.get_by_origin(session, db_wrapper.get_instance_id(), origin):
+                continue
+            if walker is None:
+                walker = SettingsWalker(instance_id=db_wrapper.get_instance_id(), name="benchmark")
+                session.add(walker)
+                await session.flush()
+            session.add(SettingsDevice(instance_id=db_wrapper.get_instance_id(), name=origin,
+                                       walker_id=walker.walker_id))
+        await session.commit()
+    account_handler = await setup_account_handler(db_wrapper)
+    mitm_mapper = StandaloneMitmMapperAndStatsHandler(db_wrapper)
+    await mitm_mapper.start()
+    for origin in origins:
+        # Encounters are only processed for level 30+
+        await mitm_mapper.set_level(origin, 40)
+    quest_gen = QuestGen()
+    await quest_gen.setup()
+
+    data_queue = TimedQueue()
+    processor_tasks: List[asyncio.Task] = []
+    for index in range(mad_args.mitmreceiver_data_workers):
+        data_processor = TimedMitmDataProcessor(data_queue, mitm_mapper, mitm_mapper, db_wrapper, quest_gen,
+                                                account_handler=account_handler, name="DataProc-%s" % index)
+        processor_tasks.append(asyncio.create_task(data_processor.run()))
+    mitm_receiver = MITMReceiver(mitm_mapper, BenchmarkMappingManager(set(origins)), db_wrapper, None, data_queue,
+                                 account_handler=account_handler)
+    runner = await mitm_receiver.start()
+    url: str = "http://127.0.0.1:{}/".format(runner.addresses[0][1])
+
+    async def send(http_session: ClientSession, origin: str, bodies: List[List[Dict]]) -> None:
+        for body in bodies:
+            if not bench_args.keep_timestamps:
+                for proto in body:
+                    proto["timestamp"] = int(time.time())
+            types: Set[str] = {proto_name(proto.get("type", 0)) for proto in body}
+            start: float = time.perf_counter()
+            async with http_session.post(url, data=orjson.dumps(body), headers={"Origin": origin}) as response:
+                await response.read()
+                if response.status != 200:
+                    failures["requests"] += 1
+            recorder.add("receive." + (types.pop() if len(types) == 1 else "mixed"), time.perf_counter() - start)
+
+    async with ClientSession() as http_session:
+        # Warm up the connections, not accounted for
+        await asyncio.gather(*(send(http_session, origin, requests[:1]) for origin in origins[:1]))
+        await data_queue.join()
+        recorder.clear()
+        processed[0] = 0
+        failures["requests"] = failures["processing"] = 0
+        redis_cache = await db_wrapper.get_cache()
+        redis_round_trips_before: int = redis_cache.round_trips
+        db_round_trips_before: int = db_round_trips.round_trips
+
+        start: float = time.perf_counter()
+        await asyncio.gather(*(send(http_session, origin, requests[index::len(origins)])
+                               for index, origin in enumerate(origins)))
+        await data_queue.join()
+        duration: float = time.perf_counter() - start
+
+    db_round_trips_total: int = db_round_trips.round_trips - db_round_trips_before
+    redis_round_trips_total: int = redis_cache.round_trips - redis_round_trips_before
+    sent: int = sum(len(body) for body in requests)
+    stages: Dict[str, Dict[str, float]] = recorder.summary()
+    await mitm_receiver.shutdown()
+    await asyncio.gather(*processor_tasks, return_exceptions=True)
+    await runner.cleanup()
+    await mitm_mapper.shutdown()
+    dedup_stats = proto_submit.get_dedup_cache().get_stats()
+    await redis_cache.close()
+    await db_exec.shutdown()
+
+    per_proto = max(processed[0], 1)
+    return {
+        "benchmark": "proto_ingest",
+        "version": get_version(),
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(bench_args).items() if key not in ("output", "compare")},
+        "mad_config": {"mitmreceiver_data_workers": mad_args.mitmreceiver_data_workers,
+                       "db_poolsize": mad_args.db_poolsize, "game_stats": mad_args.game_stats,
+                       "scan_nearby_mons": mad_args.scan_nearby_mons,
+                       "cache_local_dedup_size": mad_args.cache_local_dedup_size,
+                       "webhook_event_stream": mad_args.webhook_event_stream},
+        "protos": {"sent": sent, "processed": processed[0], "dropped": max(0, sent - processed[0]),
+                   "failed_requests": failures["requests"], "failed_processing": failures["processing"]},
+        "duration_seconds": round(duration, 3),
+        "protos_per_second": round(processed[0] / duration, 2) if duration else 0,
+        "stages": stages,
+        "round_trips": {"db": {"total": db_round_trips_total,
+                               "per_proto": round(db_round_trips_total / per_proto, 3)},
+                        "redis": {"total": redis_round_trips_total,
+                                  "per_proto": round(redis_round_trips_total / per_proto, 3)}},
+        "dedup_cache": dedup_stats,
+    }
+
+
+def print_results(results: Dict, baseline: Optional[Dict]) -> None:
+    def change(current: float, previous: Optional[float]) -> str:
+        if previous is None:
+            return ""
+        if not previous:
+            return " (was 0)"
+        return " ({:+.1f}%)".format(100 * (current - previous) / previous)
+
+    base_stages: Dict[str, Dict] = baseline.get("stages", {}) if baseline else {}
+    protos = results["protos"]
+    print("{} protos sent, {} processed, {} dropped, {} failed requests, {} failed processing".format(
+        protos["sent"], protos["processed"], protos["dropped"], protos["failed_requests"],
+        protos["failed_processing"]))
+    print("{:.1f} protos/s{} in {:.2f}s".format(
+        results["protos_per_second"], change(results["protos_per_second"],
+                                             baseline.get("protos_per_second") if baseline else None),
+        results["duration_seconds"]))
+    for kind, round_trips in results["round_trips"].items():
+        previous = baseline["round_trips"][kind]["per_proto"] if baseline else None
+        print("{} round trips: {:.2f}/proto{}".format(kind, round_trips["per_proto"],
+                                                      change(round_trips["per_proto"], previous)))
+    print("{:<28} {:>8} {:>10} {:>10} {:>10}".format("stage", "count", "p50 ms", "p99 ms", "max ms"))
+    for stage, summary in results["stages"].items():
+        previous = base_stages.get(stage)
+        print("{:<28} {:>8} {:>10.2f} {:>10.2f} {:>10.2f}{}{}".format(
+            stage, summary["count"], summary["p50_ms"], summary["p99_ms"], summary["max_ms"],
+            change(summary["p50_ms"], previous["p50_ms"]) if previous else "",
+            change(summary["p99_ms"], previous["p99_ms"]) if previous else ""))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark of the ingestion of protos, other arguments are "
+                                                 "passed to MAD")
+    parser.add_argument("--protos", type=int, default=10000, help="Amount of protos to generate")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weights of the protos generated, known are "
+                                                           + ", ".join(PROTO_NAMES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--location", type=float, nargs=2, default=[50.0, 8.0], metavar=("LAT", "LNG"))
+    parser.add_argument("--cells", type=int, default=100, help="Level 15 cells of the synthetic area")
+    parser.add_argument("--cells-per-gmo", type=int, default=9)
+    parser.add_argument("--stops-per-cell", type=int, default=3)
+    parser.add_argument("--gyms-per-cell", type=int, default=1)
+    parser.add_argument("--spawnpoints-per-cell", type=int, default=8)
+    parser.add_argument("--mon-lifetime", type=int, default=200, help="Protos a wild mon is seen for")
+    parser.add_argument("--replay", help="File of request bodies to replay instead of generating protos")
+    parser.add_argument("--record", help="Write the generated request bodies to the file and exit")
+    parser.add_argument("--keep-timestamps", action="store_true",
+                        help="Do not set the timestamps of the protos to the time they are sent")
+    parser.add_argument("--devices", type=int, default=10, help="Devices sending the requests concurrently")
+    parser.add_argument("--protos-per-request", type=int, default=1)
+    parser.add_argument("--fake-redis", action="store_true", help="Use an in-memory stand-in for Redis")
+    parser.add_argument("--port", type=int, default=0, help="Port of the MITMReceiver, 0 to pick a free one")
+    parser.add_argument("--output", help="Write the results as JSON to the file")
+    parser.add_argument("--compare", help="Results of a previous run (--output) to compare to")
+    bench_args, mad_argv = parser.parse_known_args()
+
+    if bench_args.replay:
+        requests: List[List[Dict]] = read_requests(bench_args.replay)
+    else:
+        generator = SyntheticProtoGenerator(bench_args.seed, bench_args.location[0], bench_args.location[1],
+                                            bench_args.cells, bench_args.cells_per_gmo, bench_args.stops_per_cell,
+                                            bench_args.gyms_per_cell, bench_args.spawnpoints_per_cell,
+                                            bench_args.mon_lifetime)
+        requests = chunk_requests(generator.generate(get_proto_types(bench_args.mix, bench_args.protos,
+                                                                     bench_args.seed)),
+                                  bench_args.protos_per_request)
+    if bench_args.record:
+        with open(bench_args.record, "wb") as record_file:
+            for body in requests:
+                record_file.write(orjson.dumps(body) + b"\n")
+        print("Wrote {} requests to {}".format(len(requests), bench_args.record))
+        return 0
+    baseline: Optional[Dict] = None
+    if bench_args.compare:
+        with open(bench_args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    # MAD parses sys.argv on its own
+    sys.argv = [sys.argv[0]] + mad_argv
+    from mapadroid.utils.logging import init_logging
+    from mapadroid.utils.madGlobals import MadGlobals
+    MadGlobals.load_args()
+    os.environ['LANGUAGE'] = MadGlobals.application_args.language
+    init_logging(MadGlobals.application_args)
+
+    results: Dict = asyncio.run(run_benchmark(bench_args, requests))
+    print_results(results, baseline)
+    if bench_args.output:
+        with open(bench_args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    return 1 if results["protos"]["failed_requests"] or results["protos"]["dropped"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -36,8 +36,10 @@ from mapadroid.utils.EnvironmentUtil import setup_loggers, setup_runtime
 from mapadroid.utils.logging import LoggerEnums, get_logger, init_logging
 from mapadroid.utils.madGlobals import MadGlobals, terminate_mad
 from mapadroid.utils.pogoevent import PogoEvent
+from mapadroid.utils.ProcessPool import ProcessPool
 from mapadroid.utils.questGen import QuestGen
 from mapadroid.utils.rarity import Rarity
+from mapadroid.utils.RestHelper import RestHelper
 from mapadroid.utils.SystemStatsUtil import get_system_infos
 from mapadroid.webhook.webhookworker import WebhookWorker
 from mapadroid.websocket.WebsocketServer import WebsocketServer
@@ -88,6 +90,8 @@ async def start():
     #  data_manager.fix_routecalc_on_boot()
     event = PogoEvent(MadGlobals.application_args, db_wrapper)
     await event.start_event_checker()
+    # Route calculations of the mapping manager are run in the process pool
+    await ProcessPool.start()
     # Do not remove this sleep unless you have solved the race condition on boot with the logger
     await asyncio.sleep(.1)
     account_handler: AbstractAccountHandler = await setup_account_handler(db_wrapper)
@@ -222,6 +226,7 @@ async def start():
             if webhook_task:
                 logger.info("Stopping webhook task")
                 webhook_task.cancel()
+            await RestHelper.close()
             if device_updater is not None:
                 await device_updater.stop_updater()
             if t_usage:
@@ -232,10 +237,11 @@ async def start():
                 logger.info("Waiting for websocket-thread to exit")
                 # t_ws.cancel()
             if mapping_manager is not None:
-                mapping_manager.shutdown()
+                await mapping_manager.shutdown()
             # if storage_manager is not None:
             #    logger.debug('Stopping storage manager')
             #    storage_manager.shutdown()
+            await ProcessPool.shutdown()
             if db_exec is not None:
                 logger.debug("Calling db_pool_manager shutdown")
                 cache: Redis = await db_wrapper.get_cache()
@@ -34,8 +34,10 @@ from mapadroid.utils.EnvironmentUtil import setup_loggers, setup_runtime
 from mapadroid.utils.logging import LoggerEnums, get_logger, init_logging
 from mapadroid.utils.madGlobals import MadGlobals, terminate_mad
 from mapadroid.utils.pogoevent import PogoEvent
+from mapadroid.utils.ProcessPool import ProcessPool
 from mapadroid.utils.questGen import QuestGen
 from mapadroid.utils.rarity import Rarity
+from mapadroid.utils.RestHelper import RestHelper
 from mapadroid.utils.SystemStatsUtil import get_system_infos
 from mapadroid.webhook.webhookworker import WebhookWorker
 from mapadroid.websocket.WebsocketServer import WebsocketServer
@@ -87,6 +89,8 @@ async def start():
     #  data_manager.fix_routecalc_on_boot()
     event = PogoEvent(MadGlobals.application_args, db_wrapper)
     event_task: Optional[Task] = await event.start_event_checker()
+    # Route calculations of the mapping manager are run in the process pool
+    await ProcessPool.start()
     # Do not remove this sleep unless you have solved the race condition on boot with the logger
     await asyncio.sleep(.1)
     # TODO: Externalize MappingManager as a service
@@ -207,24 +211,32 @@ async def start():
             if webhook_task is not None:
                 logger.info("Waiting for webhook-thread to exit")
                 webhook_task.cancel()
+            await RestHelper.close()
             if ws_server is not None:
                 logger.info("Stopping websocket server")
                 await ws_server.stop_server()
                 logger.info("Waiting for websocket-thread to exit")
                 # t_ws.cancel()
             if mapping_manager:
-                mapping_manager.shutdown()
+                await mapping_manager.shutdown()
             # if storage_manager is not None:
             #    logger.debug('Stopping storage manager')
             #    storage_manager.shutdown()
             if event_task:
                 event_task.cancel()
+            if stats_handler is not None:
+                await stats_handler.shutdown()
+            if isinstance(mitm_mapper, MitmMapperClient):
+                await mitm_mapper.shutdown()
+            await ProcessPool.shutdown()
             if db_exec is not None:
                 logger.debug("Calling db_pool_manager shutdown")
                 cache: Redis = await db_wrapper.get_cache()
                 await cache.close()
                 await db_exec.shutdown()
                 logger.debug("Done shutting down db_pool_manager")
+            if pogo_win_manager:
+                await pogo_win_manager.shutdown()
         except Exception:
             logger.opt(exception=True).critical("An unhandled exception occurred during shutdown!")
         logger.info("Done shutting down")
@@ -24,14 +24,19 @@ from mapadroid.mapping_manager.AbstractMappingManager import \
     AbstractMappingManager
 from mapadroid.mapping_manager.MappingManagerClientConnector import \
     MappingManagerClientConnector
+from mapadroid.mitm_receiver.data_processing.AbstractMitmDataProcessingManager import \
+    AbstractMitmDataProcessingManager
 from mapadroid.mitm_receiver.data_processing.InProcessMitmDataProcessorManager import \
     InProcessMitmDataProcessorManager
+from mapadroid.mitm_receiver.data_processing.ProcessMitmDataProcessingManager import \
+    ProcessMitmDataProcessingManager
 from mapadroid.mitm_receiver.MITMReceiver import MITMReceiver
 from mapadroid.utils.EnvironmentUtil import setup_loggers, setup_runtime
 from mapadroid.utils.logging import LoggerEnums, get_logger, init_logging
 from mapadroid.utils.madGlobals import MadGlobals, terminate_mad
 from mapadroid.utils.questGen import QuestGen
 from mapadroid.utils.redisReport import report_queue_size
+from mapadroid.utils.RestHelper import RestHelper
 from mapadroid.utils.SystemStatsUtil import get_system_infos
 
 try:
@@ -86,8 +91,12 @@ async def start():
     await quest_gen.setup()
     account_handler: AbstractAccountHandler = await setup_account_handler(db_wrapper)
 
-    mitm_data_processor_manager = InProcessMitmDataProcessorManager(mitm_mapper, stats_handler, db_wrapper, quest_gen,
-                                                                    account_handler=account_handler)
+    if MadGlobals.application_args.mitmreceiver_data_processes > 0:
+        mitm_data_processor_manager: AbstractMitmDataProcessingManager = ProcessMitmDataProcessingManager(
+            MadGlobals.application_args.mitmreceiver_data_processes)
+    else:
+        mitm_data_processor_manager: AbstractMitmDataProcessingManager = InProcessMitmDataProcessorManager(
+            mitm_mapper, stats_handler, db_wrapper, quest_gen, account_handler=account_handler)
     await mitm_data_processor_manager.launch_processors()
 
     mapping_manager_connector = MappingManagerClientConnector()
@@ -110,7 +119,7 @@ async def start():
     if MadGlobals.application_args.redis_report_queue_key:
         logger.info("Starting report queue size to Redis via key: {}", MadGlobals.application_args.redis_report_queue_key)
         loop = asyncio.get_running_loop()
-        t_reporting = loop.create_task(report_queue_size(db_wrapper, mitm_data_processor_manager.get_queue()))
+        t_reporting = loop.create_task(report_queue_size(db_wrapper, mitm_data_processor_manager))
     logger.info("MAD is now running.....")
     exit_code = 0
     try:
@@ -121,6 +130,8 @@ async def start():
     finally:
         await mitm_receiver_task.shutdown()
         await mitm_receiver.shutdown()
+        if isinstance(mitm_data_processor_manager, ProcessMitmDataProcessingManager):
+            await mitm_data_processor_manager.shutdown()
         await storage_elem.shutdown()
         try:
             logger.success("Stop called")
@@ -130,8 +141,11 @@ async def start():
                 t_usage.cancel()
             if t_reporting:
                 t_reporting.cancel()
+            await RestHelper.close()
             if mitm_mapper_connector:
+                await mitm_mapper.shutdown()
                 await mitm_mapper_connector.close()
+            await stats_handler.shutdown()
             if db_exec is not None:
                 logger.debug("Calling db_pool_manager shutdown")
                 cache: Redis = await db_wrapper.get_cache()
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from mapadroid.route.routecalc.calculate_route_quick import (minimum_spanning_tree, project_to_plane,
+                                                             route_calc_impl, tour_length)
+
+
+class TestCalculateRouteQuick(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(42)
+        self.coords = np.column_stack((50 + rng.uniform(0, 0.05, 1000), 8 + rng.uniform(0, 0.08, 1000)))
+
+    def test_route_visits_every_coord_once(self):
+        for amount in (0, 1, 2, 3, 4, 5, 50, 1000):
+            path = route_calc_impl(self.coords[:amount], "test")
+            self.assertEqual(sorted(path), list(range(amount)))
+            if amount > 0:
+                self.assertEqual(path[0], 0)
+
+    def test_improvement_shortens_route(self):
+        points = project_to_plane(self.coords)
+        unimproved = tour_length(points, route_calc_impl(self.coords, "test", improvement_time_budget=0))
+        improved = tour_length(points, route_calc_impl(self.coords, "test"))
+        self.assertLessEqual(improved, unimproved)
+
+    @staticmethod
+    def prim_length(points: np.ndarray) -> float:
+        # Prim's algorithm on the complete graph as reference
+        distances = np.hypot(points[:, np.newaxis, 0] - points[:, 0], points[:, np.newaxis, 1] - points[:, 1])
+        in_tree = np.zeros(len(points), dtype=bool)
+        in_tree[0] = True
+        length = 0.0
+        for _ in range(len(points) - 1):
+            outside = distances[in_tree][:, ~in_tree]
+            length += outside.min()
+            in_tree[np.flatnonzero(~in_tree)[np.argmin(outside.min(axis=0))]] = True
+        return length
+
+    def assert_minimum_spanning_tree(self, points: np.ndarray):
+        edges = minimum_spanning_tree(points)
+        self.assertEqual(len(edges), len(points) - 1)
+        self.assertEqual(len(np.unique(edges)), len(points))
+        self.assertAlmostEqual(float(np.sum(np.hypot(*(points[edges[:, 0]] - points[edges[:, 1]]).T))),
+                               self.prim_length(points), places=6)
+
+    def test_minimum_spanning_tree_of_uniform_points(self):
+        self.assert_minimum_spanning_tree(project_to_plane(self.coords))
+
+    def test_minimum_spanning_tree_of_clusters(self):
+        rng = np.random.default_rng(42)
+        # clusters far apart are not connected by the graph of nearest neighbours
+        self.assert_minimum_spanning_tree(np.vstack((rng.normal(0, 5, (200, 2)), rng.normal(500, 3, (20, 2)),
+                                                     [[1e4, 1e4]])))
+        # the edges to a point between two close clusters are not amongst the nearest neighbours of either
+        cluster = np.column_stack((np.zeros(11), np.arange(11) * 0.1))
+        self.assert_minimum_spanning_tree(np.vstack((cluster, cluster + [10, 0], [[5, 10.9]])))
+
+    def test_minimum_spanning_tree_of_degenerate_points(self):
+        self.assert_minimum_spanning_tree(np.column_stack((np.arange(50.0), np.arange(50.0) * 2)))
+        self.assert_minimum_spanning_tree(np.array([[0.0, 0.0], [0.0, 0.0], [1.0, 1.0], [1.0, 1.0], [3.0, 0.0]]))
+
+
+if __name__ == '__main__':
+    unittest.main()
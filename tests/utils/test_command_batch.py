@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+from mapadroid.websocket.CommandBatch import CommandBatch
+from mapadroid.websocket.WebsocketConnectedClientEntry import \
+    WebsocketConnectedClientEntry
+
+
+class FakeConnection:
+    """
+    Answers the commands only once all commands of the batch have been sent, in reversed order
+    """
+    def __init__(self, commands_expected: int, unanswered: str = None):
+        self.open = True
+        self.sent = []
+        self.entry = None
+        self.commands_expected = commands_expected
+        self.unanswered = unanswered
+
+    async def send(self, message: str) -> None:
+        self.sent.append(message)
+        if len(self.sent) == self.commands_expected:
+            for sent in reversed(self.sent):
+                message_id, command = sent.split(";", 1)
+                if command != self.unanswered:
+                    asyncio.get_running_loop().call_soon(self.entry.set_message_response, int(message_id),
+                                                         "OK" if command.startswith("screen click") else "1080 1920")
+
+    async def close(self) -> None:
+        self.open = False
+
+
+class TestCommandBatch(unittest.TestCase):
+    def __send_batch(self, batch: CommandBatch, unanswered: str = None):
+        connection = FakeConnection(len(batch), unanswered)
+        entry = WebsocketConnectedClientEntry("origin", "worker", connection, None)
+        connection.entry = entry
+        responses = asyncio.run(entry.send_batch_and_wait(batch.commands, 0.05, "worker"))
+        return connection, entry, responses
+
+    def test_commands_are_pipelined(self):
+        batch = CommandBatch().click(100.4, 200.6).get_screensize().click(1, 2)
+        connection, entry, responses = self.__send_batch(batch)
+        self.assertEqual([sent.split(";", 1)[1] for sent in connection.sent],
+                         ["screen click 100 201\r\n", "screen size", "screen click 1 2\r\n"])
+        self.assertEqual(responses, ["OK", "1080 1920", "OK"])
+        self.assertEqual(len(entry.responses), 0)
+        self.assertEqual(entry.responses.stats.round_trips("screen click"), 2)
+
+    def test_commands_not_answered_time_out(self):
+        batch = CommandBatch().click(1, 2).get_screensize()
+        _connection, entry, responses = self.__send_batch(batch, unanswered="screen size")
+        self.assertEqual(responses, ["OK", None])
+        self.assertEqual(entry.fail_counter, 1)
+        self.assertTrue(CommandBatch.is_ok(responses[0]))
+        self.assertFalse(CommandBatch.is_ok(responses[1]))
+
+    def test_commands_match_single_commands(self):
+        self.assertEqual(CommandBatch.touch_and_hold_command(360, 1080.2, 360, 500, 200),
+                         "touch swipe 360 1080 360 500 200")
+        self.assertEqual(CommandBatch.swipe_command(1, 2, 3, 4), "touch swipe 1 2 3 4\r\n")
+        self.assertEqual(CommandBatch.enter_text_command("name"), "touch text name")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import asyncio
+import unittest
+
+from mapadroid.data_handler.mitm_data.DataUpdateNotifier import \
+    DataUpdateNotifier
+
+
+class TestDataUpdateNotifier(unittest.TestCase):
+    def setUp(self) -> None:
+        self.notifier = DataUpdateNotifier()
+
+    def test_newer_data_is_returned_right_away(self):
+        async def run():
+            self.notifier.notify("worker", "106", 100)
+            self.assertEqual(await self.notifier.wait_for_timestamp("worker", "106", 99, 1), 100)
+            self.assertIsNone(await self.notifier.wait_for_timestamp("worker", "106", 100, 0.01))
+            self.assertIsNone(await self.notifier.wait_for_timestamp("worker", "102", 0, 0.01))
+        asyncio.run(run())
+
+    def test_waiting_coroutine_is_woken_up(self):
+        async def run():
+            waiting = asyncio.create_task(self.notifier.wait_for_timestamp("worker", "106", 100, 5))
+            await asyncio.sleep(0)
+            # Neither other keys, other workers nor older data wake up the coroutine for good
+            self.notifier.notify("worker", "102", 200)
+            self.notifier.notify("other", "106", 200)
+            self.notifier.notify("worker", "106", 50)
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiting.done())
+            self.notifier.notify("worker", "106", 101)
+            return await asyncio.wait_for(waiting, 1)
+        self.assertEqual(asyncio.run(run()), 101)
+        self.assertEqual(self.notifier.get_timestamps("worker"), {"102": 200, "106": 101})
+
+    def test_update_within_the_same_second_wakes_up(self):
+        async def run():
+            self.notifier.notify("worker", "106", 100)
+            waiting = asyncio.create_task(self.notifier.wait_for_timestamp("worker", "106", 100, 5))
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiting.done())
+            self.notifier.notify("worker", "106", 100)
+            return await asyncio.wait_for(waiting, 1)
+        self.assertEqual(asyncio.run(run()), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import asyncio
+import unittest
+
+from mapadroid.data_handler.grpc.MitmMapperClient import MitmMapperClient
+from mapadroid.data_handler.grpc.MitmMapperServer import MitmMapperServer
+
+
+class FakeChannel:
+    """
+    Passes the calls of the client stubs on to the servicer given
+    """
+    def __init__(self, servicer):
+        self.servicer = servicer
+
+    def unary_stream(self, method, **kwargs):
+        return lambda request: getattr(self.servicer, method.rsplit("/", 1)[1])(request, None)
+
+    def unary_unary(self, method, **kwargs):
+        return None
+
+    stream_unary = stream_stream = unary_unary
+
+
+class TestDataUpdateSubscription(unittest.TestCase):
+    def test_updates_within_the_same_second_are_streamed(self):
+        async def run():
+            server = MitmMapperServer()
+            client = MitmMapperClient(FakeChannel(server))
+            server._data_update_notifier.notify("worker", "106", 100)
+            self.assertEqual(await client.wait_for_data_update("worker", "106", 99, 1), 100)
+            waiting = asyncio.create_task(client.wait_for_data_update("worker", "106", 100, 5))
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiting.done())
+            server._data_update_notifier.notify("worker", "106", 100)
+            self.assertEqual(await asyncio.wait_for(waiting, 1), 100)
+            await client.shutdown()
+        asyncio.run(run())
+
+    def test_subscriptions_are_cancelled_upon_shutdown(self):
+        async def run():
+            server = MitmMapperServer()
+            client = MitmMapperClient(FakeChannel(server))
+            self.assertIsNone(await client.wait_for_data_update("worker", "106", 0, 0.01))
+            subscriptions = list(client._data_update_subscriptions.values())
+            self.assertEqual(len(subscriptions), 1)
+            await client.shutdown()
+            self.assertTrue(all(subscription.done() for subscription in subscriptions))
+            self.assertEqual(client._data_update_subscriptions, {})
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
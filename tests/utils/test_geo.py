@@ -0,0 +1,42 @@
+import random
+import unittest
+
+import numpy as np
+
+from mapadroid.utils.geo import (get_distance_matrix_in_meters,
+                                 get_distance_of_two_points_in_meters,
+                                 get_distances_in_meters,
+                                 get_indices_in_radius)
+
+
+class TestGeo(unittest.TestCase):
+    def setUp(self) -> None:
+        random.seed(42)
+        self.coordinates = [(random.uniform(-89, 89), random.uniform(-180, 180)) for _ in range(200)]
+        self.expected = np.array([[get_distance_of_two_points_in_meters(lat, lng, other_lat, other_lng)
+                                   for other_lat, other_lng in self.coordinates]
+                                  for lat, lng in self.coordinates])
+
+    def test_distances_match_scalar_version(self):
+        lat, lng = self.coordinates[0]
+        np.testing.assert_allclose(get_distances_in_meters(lat, lng, self.coordinates), self.expected[0],
+                                   rtol=1e-9, atol=1e-6)
+
+    def test_distance_matrix_in_chunks(self):
+        for chunk_size in (0, 1, 7, 1000):
+            np.testing.assert_allclose(get_distance_matrix_in_meters(self.coordinates, chunk_size=chunk_size),
+                                       self.expected, rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(get_distance_matrix_in_meters(self.coordinates[:3], self.coordinates),
+                                   self.expected[:3], rtol=1e-9, atol=1e-6)
+        self.assertEqual(get_distance_matrix_in_meters([], self.coordinates).shape, (0, len(self.coordinates)))
+
+    def test_indices_in_radius(self):
+        lat, lng = self.coordinates[0]
+        radius = float(np.median(self.expected[0]))
+        self.assertEqual(list(get_indices_in_radius(lat, lng, self.coordinates, radius)),
+                         [index for index, distance in enumerate(self.expected[0]) if distance <= radius])
+        self.assertEqual(len(get_indices_in_radius(lat, lng, [], radius)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from mapadroid.db.model import SettingsGeofence
+from mapadroid.geofence.geofenceHelper import GeofenceHelper
+from mapadroid.geofence.GeofencePolygon import GeofencePolygon
+
+
+class TestGeofence(unittest.TestCase):
+    def setUp(self) -> None:
+        include_fence = SettingsGeofence(fence_data='["[outer]", "50.0,8.0", "50.0,8.2", "50.1,8.3", "50.2,8.1", '
+                                                    '"50.1,7.9", "[second]", "50.3,8.0", "50.3,8.1", "50.4,8.05"]')
+        exclude_fence = SettingsGeofence(fence_data='["[hole]", "50.05,8.05", "50.05,8.1", "50.1,8.1", '
+                                                    '"50.1,8.05"]')
+        self.geofence_helper: GeofenceHelper = GeofenceHelper(include_fence, exclude_fence)
+        random.seed(42)
+        self.coordinates = [(random.uniform(49.95, 50.45), random.uniform(7.85, 8.35)) for _ in range(5000)]
+        # Vertices are corner cases of the point-in-polygon tests
+        for area in self.geofence_helper.geofenced_areas + self.geofence_helper.excluded_areas:
+            self.coordinates.extend((coord['lat'], coord['lon']) for coord in area['polygon'])
+
+    def __is_inside_per_polygon(self, coordinate, use_matplotlib: bool) -> bool:
+        point = {'lat': coordinate[0], 'lon': coordinate[1]}
+        if use_matplotlib:
+            is_point_in_polygon = GeofenceHelper.is_point_in_polygon_matplotlib
+        else:
+            is_point_in_polygon = GeofenceHelper.is_point_in_polygon_custom
+        if any(is_point_in_polygon(point, area['polygon']) for area in self.geofence_helper.excluded_areas):
+            return False
+        return any(is_point_in_polygon(point, area['polygon']) for area in self.geofence_helper.geofenced_areas)
+
+    def test_contains_matches_per_polygon_tests(self):
+        for use_matplotlib in (True, False):
+            if use_matplotlib and not self.geofence_helper.use_matplotlib:
+                continue
+            self.geofence_helper._geofenced_polygons = [GeofencePolygon(area['polygon'], use_matplotlib)
+                                                        for area in self.geofence_helper.geofenced_areas]
+            self.geofence_helper._excluded_polygons = [GeofencePolygon(area['polygon'], use_matplotlib)
+                                                       for area in self.geofence_helper.excluded_areas]
+            expected = [self.__is_inside_per_polygon(coordinate, use_matplotlib) for coordinate in self.coordinates]
+            self.assertEqual(list(self.geofence_helper.contains(self.coordinates)), expected)
+            self.assertEqual([self.geofence_helper.is_coord_inside_include_geofence(coordinate)
+                              for coordinate in self.coordinates], expected)
+            self.assertEqual(self.geofence_helper.get_geofenced_coordinates(self.coordinates),
+                             [coordinate for coordinate, inside in zip(self.coordinates, expected) if inside])
+
+    def test_contains_without_fences(self):
+        geofence_helper: GeofenceHelper = GeofenceHelper(None, None)
+        self.assertEqual(list(geofence_helper.contains([(50.0, 8.0), (0.0, 0.0)])), [True, True])
+        self.assertEqual(len(geofence_helper.contains([])), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+
+from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.GmoDigest import GmoDigest, WildMonDigest
+from mapadroid.data_handler.mitm_data.holder.latest_mitm_data.LatestMitmDataEntry import LatestMitmDataEntry
+from mapadroid.utils.collections import Location
+
+GMO = {
+    "cells": [
+        {"id": -2 ** 62, "forts": [{"id": "stop", "type": 1}, {"id": "gym"}],
+         "wild_pokemon": [{"encounter_id": -1, "latitude": 50.0, "longitude": 8.0,
+                           "pokemon_data": {"id": 25, "display": {"weather_boosted_value": 1}}}],
+         "nearby_pokemon": [{"id": 1}, {"id": 2}]},
+        {"id": 1234, "forts": [], "wild_pokemon": [{"encounter_id": 2 ** 63 + 1, "latitude": 50.1, "longitude": 8.1,
+                                                    "pokemon_data": {"id": 1}}]},
+        {"id": 5678}
+    ]
+}
+# As transported via google.protobuf.Struct, numbers being doubles
+GMO_OF_DOUBLES = {
+    "cells": [
+        {"id": float(-2 ** 62), "forts": [{"id": "stop", "type": 1.0}, {"id": "gym"}],
+         "wild_pokemon": [{"encounter_id": -1.0, "latitude": 50.0, "longitude": 8.0,
+                           "pokemon_data": {"id": 25.0, "display": {"weather_boosted_value": 1.0}}}],
+         "nearby_pokemon": [{"id": 1.0}, {"id": 2.0}]},
+        {"id": 1234.0, "forts": [], "wild_pokemon": [{"encounter_id": float(2 ** 63), "latitude": 50.1,
+                                                      "longitude": 8.1, "pokemon_data": {"id": 1.0}}]},
+        {"id": 5678.0}
+    ]
+}
+
+
+class TestGmoDigest(unittest.TestCase):
+    def test_digest_of_gmo(self):
+        digest = GmoDigest.from_gmo(GMO)
+        # Signed IDs are converted to unsigned ones
+        self.assertEqual(digest.cell_ids, [2 ** 64 - 2 ** 62, 1234, 5678])
+        self.assertEqual(digest.fort_counts, [2, 0, 0])
+        self.assertEqual(digest.wild_mon_counts, [1, 1, 0])
+        self.assertEqual(digest.nearby_mon_counts, [2, 0, 0])
+        self.assertEqual(digest.fort_ids, ["stop", "gym"])
+        self.assertEqual(digest.fort_types, [1, 0])
+        self.assertEqual(list(digest.wild_mons()), [WildMonDigest(2 ** 64 - 1, 25, 1, 50.0, 8.0),
+                                                    WildMonDigest(2 ** 63 + 1, 1, None, 50.1, 8.1)])
+        self.assertTrue(digest.cells_contain_any_of("nearby_pokemon"))
+        self.assertFalse(GmoDigest.from_gmo({"cells": [{"id": 1}]}).cells_contain_any_of(["forts", "wild_pokemon"]))
+        self.assertEqual(GmoDigest.from_gmo({}), GmoDigest())
+
+    def test_digest_of_gmo_transported_as_doubles(self):
+        digest = GmoDigest.from_gmo(GMO_OF_DOUBLES)
+        self.assertEqual(digest.cell_ids, [2 ** 64 - 2 ** 62, 1234, 5678])
+        self.assertEqual(digest.fort_types, [1, 0])
+        self.assertEqual(digest.encounter_ids, [2 ** 64 - 1, 2 ** 63])
+        self.assertEqual(digest.mon_ids, [25, 1])
+        self.assertEqual(digest.weather_boosted, [1, None])
+        for value in digest.cell_ids + digest.fort_types + digest.encounter_ids + digest.mon_ids:
+            self.assertIsInstance(value, int)
+
+    def test_json_round_trip_of_digest(self):
+        digest = GmoDigest.from_gmo(GMO)
+        entry = LatestMitmDataEntry(Location(50.0, 8.0), 100, 99, None, digest)
+        loaded = asyncio.run(LatestMitmDataEntry.from_json(asyncio.run(entry.to_json())))
+        self.assertEqual(loaded.digest, digest)
+        self.assertEqual(loaded.location, Location(50.0, 8.0))
+        self.assertEqual((loaded.timestamp_received, loaded.timestamp_of_data_retrieval), (100, 99))
+        self.assertIsNone(loaded.data)
+        loaded = asyncio.run(LatestMitmDataEntry.from_json(
+            asyncio.run(LatestMitmDataEntry(None, 100, 99, {"a": 1}).to_json())))
+        self.assertIsNone(loaded.digest)
+        self.assertEqual(loaded.data, {"a": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import heapq
+import random
+import unittest
+
+from mapadroid.route.prioq.IndexedEventHeap import IndexedEventHeap
+from mapadroid.route.prioq.strategy.AbstractRoutePriorityQueueStrategy import \
+    RoutePriorityQueueEntry
+from mapadroid.utils.collections import Location
+
+
+class TestIndexedEventHeap(unittest.TestCase):
+    def setUp(self) -> None:
+        random.seed(42)
+        self.entries = [RoutePriorityQueueEntry(timestamp_due=random.randint(0, 1000),
+                                                location=Location(random.uniform(50, 51), random.uniform(8, 9)))
+                        for _ in range(500)]
+
+    def test_pops_in_order_of_plain_heap(self):
+        events = IndexedEventHeap(self.entries)
+        plain = list(self.entries)
+        heapq.heapify(plain)
+        self.assertEqual([events.pop().timestamp_due for _ in range(len(self.entries))],
+                         [heapq.heappop(plain).timestamp_due for _ in range(len(self.entries))])
+        self.assertIsNone(events.peek())
+
+    def test_discarded_events_are_skipped(self):
+        events = IndexedEventHeap(self.entries)
+        removed = self.entries[::3]
+        for entry in removed:
+            self.assertTrue(events.discard(entry))
+        self.assertFalse(events.discard(removed[0]))
+        remaining = [entry for index, entry in enumerate(self.entries) if index % 3]
+        self.assertEqual(len(events), len(remaining))
+        self.assertEqual([entry.timestamp_due for entry in events.snapshot()],
+                         sorted(entry.timestamp_due for entry in remaining))
+        snapshot = events.snapshot()
+        self.assertEqual([events.pop() for _ in range(len(remaining))], snapshot)
+        self.assertEqual(len(events), 0)
+
+    def test_duplicates_and_snapshots(self):
+        events = IndexedEventHeap()
+        self.assertTrue(events.push(self.entries[0]))
+        self.assertFalse(events.push(RoutePriorityQueueEntry(timestamp_due=self.entries[0].timestamp_due,
+                                                             location=self.entries[0].location)))
+        snapshot = events.snapshot()
+        self.assertIs(events.snapshot(), snapshot)
+        events.push(self.entries[1])
+        self.assertIsNot(events.snapshot(), snapshot)
+        self.assertEqual(len(events.snapshot()), 2)
+
+    def test_discard_due_until(self):
+        events = IndexedEventHeap(self.entries)
+        removed = events.discard_due_until(500)
+        self.assertEqual(removed, sum(1 for entry in self.entries if entry.timestamp_due <= 500))
+        self.assertTrue(all(entry.timestamp_due > 500 for entry in events.entries()))
+
+
+if __name__ == '__main__':
+    unittest.main()
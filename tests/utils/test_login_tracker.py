@@ -0,0 +1,126 @@
+import asyncio
+import unittest
+
+from mapadroid.mapping_manager.LoginTracker import LoginTracker
+
+
+class FakeRedis:
+    """
+    Records the commands executed by pipelines, fails executing them if told to
+    """
+    def __init__(self):
+        self.executed = []
+        self.fail = False
+        # Pipelines are only executed once set if given
+        self.gate = None
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def zadd(self, name, mapping):
+        self.commands.append(("zadd", name, dict(mapping)))
+
+    async def expire(self, name, time):
+        self.commands.append(("expire", name, time))
+
+    async def execute(self):
+        if self.redis.gate is not None:
+            await self.redis.gate.wait()
+        if self.redis.fail:
+            raise ConnectionError("redis gone")
+        self.redis.executed.append(self.commands)
+
+
+class TestLoginTracker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.redis = FakeRedis()
+        self.tracker = LoginTracker(self.redis, ip_timeout=300, flush_interval=60)
+
+    def test_logins_are_written_in_one_batch(self):
+        self.tracker.set_ip("dev1", "1.1.1.1")
+        self.tracker.set_ip("dev2", "1.1.1.1")
+        self.tracker.set_ip("dev3", "2.2.2.2")
+        self.assertTrue(self.tracker.increment("dev1"))
+        # The IP is only used for the first proto after the start
+        self.assertFalse(self.tracker.increment("dev1"))
+        self.assertTrue(self.tracker.increment("dev2"))
+        self.assertTrue(self.tracker.increment("dev3"))
+        self.assertEqual(self.redis.executed, [])
+        asyncio.run(self.tracker.flush())
+        self.assertEqual(len(self.redis.executed), 1)
+        commands = self.redis.executed[0]
+        self.assertEqual([command[:2] for command in commands],
+                         [("zadd", "1.1.1.1"), ("expire", "1.1.1.1"), ("zadd", "2.2.2.2"), ("expire", "2.2.2.2")])
+        self.assertEqual(sorted(login.split(":")[0] for login in commands[0][2]), ["dev1", "dev2"])
+        asyncio.run(self.tracker.flush())
+        self.assertEqual(len(self.redis.executed), 1)
+
+    def test_removed_and_timed_out_ips_are_not_counted(self):
+        self.tracker.set_ip("dev1", "1.1.1.1")
+        self.tracker.remove("dev1")
+        self.assertFalse(self.tracker.increment("dev1"))
+        tracker = LoginTracker(self.redis, ip_timeout=-1, flush_interval=60)
+        tracker.set_ip("dev1", "1.1.1.1")
+        self.assertFalse(tracker.increment("dev1"))
+
+    def test_flush_of_single_ip_and_retry_on_failure(self):
+        self.tracker.set_ip("dev1", "1.1.1.1")
+        self.tracker.set_ip("dev2", "2.2.2.2")
+        self.tracker.increment("dev1")
+        self.tracker.increment("dev2")
+        self.redis.fail = True
+        asyncio.run(self.tracker.flush("1.1.1.1"))
+        self.redis.fail = False
+        asyncio.run(self.tracker.flush("1.1.1.1"))
+        self.assertEqual([command[1] for command in self.redis.executed[0]], ["1.1.1.1", "1.1.1.1"])
+        asyncio.run(self.tracker.stop())
+        self.assertEqual([command[1] for command in self.redis.executed[1]], ["2.2.2.2", "2.2.2.2"])
+
+    def test_flush_waits_for_flush_in_flight(self):
+        async def run():
+            self.redis.gate = asyncio.Event()
+            self.tracker.set_ip("dev1", "1.1.1.1")
+            self.tracker.increment("dev1")
+            in_flight = asyncio.create_task(self.tracker.flush())
+            await asyncio.sleep(0)
+            flush_of_ip = asyncio.create_task(self.tracker.flush("1.1.1.1"))
+            await asyncio.sleep(0.01)
+            # The logins of the IP are not written yet, counting them has to wait
+            self.assertFalse(flush_of_ip.done())
+            self.redis.gate.set()
+            await flush_of_ip
+            self.assertTrue(in_flight.done())
+            self.assertEqual([command[1] for command in self.redis.executed[0]], ["1.1.1.1", "1.1.1.1"])
+        asyncio.run(run())
+
+    def test_stop_does_not_drop_flush_in_flight(self):
+        async def run():
+            tracker = LoginTracker(self.redis, ip_timeout=300, flush_interval=0.001)
+            self.redis.gate = asyncio.Event()
+            tracker.start()
+            tracker.set_ip("dev1", "1.1.1.1")
+            tracker.increment("dev1")
+            await asyncio.sleep(0.01)
+            stopping = asyncio.create_task(tracker.stop())
+            await asyncio.sleep(0.01)
+            self.redis.gate.set()
+            await stopping
+            self.assertEqual(len(self.redis.executed), 1)
+            self.assertEqual([command[1] for command in self.redis.executed[0]], ["1.1.1.1", "1.1.1.1"])
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
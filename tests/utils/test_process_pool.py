@@ -0,0 +1,57 @@
+import asyncio
+import operator
+import os
+import time
+import unittest
+
+from mapadroid.utils.ProcessPool import ProcessPool
+
+
+class TestProcessPool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await ProcessPool.start(max_workers=1)
+
+    async def asyncTearDown(self) -> None:
+        await ProcessPool.shutdown()
+
+    async def test_run_in_other_process(self):
+        self.assertNotEqual(await ProcessPool.run(os.getpid), os.getpid())
+        self.assertEqual(await ProcessPool.run(operator.add, 1, 2), 3)
+        with self.assertRaises(ZeroDivisionError):
+            await ProcessPool.run(operator.truediv, 1, 0)
+
+    async def test_run_inline(self):
+        self.assertEqual(await ProcessPool.run(os.getpid, work_size=10, inline_threshold=10), os.getpid())
+        self.assertGreaterEqual(ProcessPool.get_stats()[os.getpid.__qualname__].inline, 1)
+
+    async def test_priority_and_cancellation(self):
+        finished = []
+
+        async def run(name: str, priority: int):
+            await ProcessPool.run(time.sleep, 0.05, priority=priority)
+            finished.append(name)
+
+        blocking = asyncio.create_task(run("blocking", ProcessPool.PRIORITY_NORMAL))
+        await asyncio.sleep(0)
+        low = asyncio.create_task(run("low", ProcessPool.PRIORITY_LOW))
+        cancelled = asyncio.create_task(run("cancelled", ProcessPool.PRIORITY_HIGH))
+        high = asyncio.create_task(run("high", ProcessPool.PRIORITY_HIGH))
+        await asyncio.sleep(0)
+        self.assertEqual(ProcessPool.queue_length(), 3)
+        cancelled.cancel()
+        await asyncio.gather(blocking, low, high, cancelled, return_exceptions=True)
+        self.assertEqual(finished, ["blocking", "high", "low"])
+        self.assertEqual(ProcessPool.queue_length(), 0)
+        self.assertEqual(ProcessPool.running(), 0)
+
+    async def test_run_inline_once_shut_down(self):
+        await ProcessPool.shutdown()
+        self.assertEqual(await ProcessPool.run(os.getpid), os.getpid())
+        self.assertIsNone(ProcessPool._executor)
+        # Starting the pool again runs tasks in other processes again
+        await ProcessPool.start(max_workers=1)
+        self.assertNotEqual(await ProcessPool.run(os.getpid), os.getpid())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+from mapadroid.utils.madGlobals import WebsocketWorkerConnectionClosedException
+from mapadroid.websocket.ResponseMultiplexer import ResponseMultiplexer
+
+
+class TestResponseMultiplexer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.responses = ResponseMultiplexer()
+
+    def test_responses_are_matched_by_message_id(self):
+        async def run():
+            first = self.responses.register("screen capture")
+            second = self.responses.register("touch click")
+            asyncio.get_running_loop().call_soon(self.responses.resolve, second, "OK")
+            asyncio.get_running_loop().call_soon(self.responses.resolve, first, b"image")
+            self.assertEqual(await self.responses.wait(second, 1), "OK")
+            self.assertEqual(await self.responses.wait(first, 1), b"image")
+            self.assertEqual(len(self.responses), 0)
+            # Late responses are dropped
+            self.assertFalse(self.responses.resolve(first, "OK"))
+        asyncio.run(run())
+        self.assertEqual(self.responses.stats.round_trips("screen capture"), 1)
+        self.assertEqual(self.responses.stats.round_trips("touch click"), 1)
+
+    def test_timeout_and_cancellation_unregister_command(self):
+        async def run():
+            message_id = self.responses.register("screen capture")
+            with self.assertRaises(asyncio.TimeoutError):
+                await self.responses.wait(message_id, 0.01)
+            message_id = self.responses.register("screen capture")
+            task = asyncio.create_task(self.responses.wait(message_id, 10))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertEqual(len(self.responses), 0)
+        asyncio.run(run())
+        self.assertEqual(self.responses.stats.timeouts, {"screen capture": 1})
+
+    def test_close_fails_commands_waiting(self):
+        async def run():
+            message_id = self.responses.register("more uiautomator")
+            asyncio.get_running_loop().call_soon(self.responses.close,
+                                                 WebsocketWorkerConnectionClosedException("closed"))
+            with self.assertRaises(WebsocketWorkerConnectionClosedException):
+                await self.responses.wait(message_id, 10)
+        asyncio.run(run())
+
+    def test_message_ids_wrap_around_skipping_pending_ones(self):
+        async def run():
+            pending = self.responses.register("touch click")
+            self.responses._last_message_id = ResponseMultiplexer.MAX_MESSAGE_ID - 1
+            self.assertEqual(self.responses.register("touch click"), 2)
+            self.assertEqual(pending, 1)
+        asyncio.run(run())
+
+    def test_command_names(self):
+        self.assertEqual(ResponseMultiplexer.get_command_name("screen capture jpeg 80\r\n"), "screen capture")
+        self.assertEqual(ResponseMultiplexer.get_command_name("touch keyevent 3"), "touch keyevent")
+        self.assertEqual(ResponseMultiplexer.get_command_name(b"\x00", 1), "bytes 1")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import asyncio
+import math
+import random
+import unittest
+
+import numpy as np
+
+from mapadroid.db.model import SettingsGeofence
+from mapadroid.geofence.geofenceHelper import GeofenceHelper
+from mapadroid.utils.collections import Location
+from mapadroid.utils.geo import (get_distance_of_two_points_in_meters,
+                                 get_middle_of_coord_list)
+from mapadroid.utils.s2Helper import S2Helper
+
+
+class TestS2Helper(unittest.TestCase):
+    def setUp(self) -> None:
+        # Long and thin to have most edges of the rings pruned
+        include_fence = SettingsGeofence(fence_data='["[thin]", "50.0,7.9", "50.0,8.4", "50.01,8.4", "50.02,7.9"]')
+        exclude_fence = SettingsGeofence(fence_data='["[hole]", "50.0,8.0", "50.0,8.1", "50.02,8.1", "50.02,8.0"]')
+        self.geofence_helper: GeofenceHelper = GeofenceHelper(include_fence, exclude_fence)
+
+    def __generate_locations_per_location(self, distance: float):
+        south, west, north, east = self.geofence_helper.get_polygon_from_fence()
+        corners = [Location(south, west), Location(south, east), Location(north, west), Location(north, east)]
+        center = get_middle_of_coord_list(corners)
+        step_limit = math.ceil(max(get_distance_of_two_points_in_meters(center.lat, center.lng, corner.lat,
+                                                                        corner.lng) for corner in corners) / distance)
+        locations = []
+        for ring in range(1, step_limit):
+            for side in range(0, 6):
+                star_loc = S2Helper.get_new_coords(center, distance * ring, 90 + 60 * side)
+                for index in range(0, ring):
+                    locations.append(S2Helper.get_new_coords(star_loc, distance * index, 210 + 60 * side))
+        locations.append(center)
+        return self.geofence_helper.get_geofenced_coordinates(locations)
+
+    def test_new_coords_match_scalar_version(self):
+        random.seed(42)
+        starts = [(random.uniform(-80, 80), random.uniform(-180, 180)) for _ in range(200)]
+        distances = [random.uniform(0, 100000) for _ in starts]
+        bearings = [random.uniform(0, 360) for _ in starts]
+        lats, lngs = S2Helper.get_new_coords_array([start[0] for start in starts], [start[1] for start in starts],
+                                                   distances, bearings)
+        expected = [S2Helper.get_new_coords(Location(*start), distance, bearing)
+                    for start, distance, bearing in zip(starts, distances, bearings)]
+        np.testing.assert_allclose(lats, [location.lat for location in expected], atol=1e-9)
+        np.testing.assert_allclose(lngs, [location.lng for location in expected], atol=1e-9)
+
+    def test_generate_locations_matches_per_location_version(self):
+        expected = self.__generate_locations_per_location(300)
+        locations = asyncio.run(S2Helper.generate_locations(300, self.geofence_helper))
+        self.assertGreater(len(locations), 0)
+        self.assertEqual(len(locations), len(expected))
+        np.testing.assert_allclose(np.array([(location.lat, location.lng) for location in locations]),
+                                   np.array([(location.lat, location.lng) for location in expected]), atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from mapadroid.ocr.pogoWindows import PogoWindows
+from mapadroid.ocr.ScreenshotBuffer import ScreenshotBuffer
+from mapadroid.ocr.utils import check_pogo_mainscreen, look_for_button_internal
+from mapadroid.utils.madGlobals import ScreenshotType
+
+
+class TestScreenshotBuffer(unittest.TestCase):
+    def setUp(self) -> None:
+        image = np.full((1280, 720, 3), 255, dtype=np.uint8)
+        # Button lines and the avatar circle at the bottom left
+        cv2.rectangle(image, (200, 900), (520, 980), (0, 0, 0), 3)
+        cv2.circle(image, (80, 1180), 50, (0, 0, 0), 3)
+        self.encoded = cv2.imencode(".png", image)[1].tobytes()
+        self.image = image
+
+    def test_image_is_decoded_once(self):
+        async def run():
+            screenshot = ScreenshotBuffer(self.encoded, ScreenshotType.PNG)
+            decodes = ScreenshotBuffer.get_stats().decodes
+            images = await asyncio.gather(screenshot.get_image(), screenshot.get_image())
+            await screenshot.share()
+            self.assertIs(images[0], images[1])
+            np.testing.assert_array_equal(images[0], self.image)
+            self.assertEqual(ScreenshotBuffer.get_stats().decodes, decodes + 1)
+            screenshot.close()
+        asyncio.run(run())
+
+    def test_corrupted_screenshot(self):
+        async def run():
+            screenshot = ScreenshotBuffer(b"not an image")
+            self.assertIsNone(await screenshot.get_image())
+            self.assertIsNone(await screenshot.share())
+        asyncio.run(run())
+
+    def test_write_to_stores_screenshot_as_received(self):
+        async def run():
+            with tempfile.TemporaryDirectory() as temp_dir:
+                path = os.path.join(temp_dir, "screenshot.png")
+                self.assertTrue(await ScreenshotBuffer(self.encoded, ScreenshotType.PNG).write_to(path))
+                with open(path, "rb") as fh:
+                    self.assertEqual(fh.read(), self.encoded)
+        asyncio.run(run())
+
+    def test_stages_run_in_process_pool_on_shared_image(self):
+        async def run():
+            with tempfile.TemporaryDirectory() as temp_dir:
+                pogo_windows = PogoWindows(temp_dir, 1)
+                screenshot = ScreenshotBuffer(self.encoded, ScreenshotType.PNG)
+                try:
+                    self.assertEqual(await pogo_windows.check_pogo_mainscreen(screenshot, "test"),
+                                     check_pogo_mainscreen(self.image, "test"))
+                    self.assertEqual(await pogo_windows.look_for_button(screenshot, 2.20, 3.01),
+                                     look_for_button_internal(self.image, 2.20, 3.01, False))
+                    self.assertEqual(await pogo_windows.look_for_button(None, 2.20, 3.01), None)
+                finally:
+                    screenshot.close()
+                    await pogo_windows.shutdown()
+            self.assertIn("check_pogo_mainscreen", ScreenshotBuffer.get_stats().stages)
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
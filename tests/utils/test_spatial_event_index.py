@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from mapadroid.route.routecalc.SpatialEventIndex import SpatialEventIndex
+from mapadroid.utils.collections import Location
+from mapadroid.utils.geo import get_distance_of_two_points_in_meters
+
+
+class TestSpatialEventIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        random.seed(42)
+        self.events = [(random.randint(0, 600), Location(round(random.uniform(50.0, 50.01), 4),
+                                                         round(random.uniform(8.0, 8.015), 4)))
+                       for _ in range(500)]
+        self.index = SpatialEventIndex(self.events + self.events[:10], 140)
+
+    def test_duplicates_dropped_in_order(self):
+        self.assertEqual(self.index.events, list(dict.fromkeys(self.events)))
+
+    def test_pairs_within(self):
+        firsts, others, _ = self.index.pairs_within(140, 300)
+        expected = [(first, other) for first, event in enumerate(self.index.events)
+                    for other, other_event in enumerate(self.index.events)
+                    if 0 <= event[0] - other_event[0] <= 300
+                    and get_distance_of_two_points_in_meters(event[1].lat, event[1].lng,
+                                                             other_event[1].lat, other_event[1].lng) <= 140]
+        self.assertEqual(list(zip(firsts.tolist(), others.tolist())), expected)
+
+    def test_candidates_within_contain_events_in_radius(self):
+        center = Location(50.005, 8.007)
+        for event in self.index.events[:100]:
+            self.index.remove(event)
+        remaining = self.index.events[100:]
+        for radius in (10, 70, 500, 5000):
+            candidates = self.index.candidates_within(center, radius)
+            self.assertEqual(candidates, [event for event in remaining if event in set(candidates)])
+            for event in remaining:
+                if get_distance_of_two_points_in_meters(center.lat, center.lng, event[1].lat, event[1].lng) <= radius:
+                    self.assertIn(event, candidates)
+
+    def test_most_west(self):
+        remaining = list(self.index.events)
+        while remaining:
+            expected = min(remaining, key=lambda event: (event[1].lng, -event[1].lat))
+            self.assertEqual(self.index.most_west(), expected)
+            self.index.remove(expected)
+            remaining.remove(expected)
+        self.assertEqual(len(self.index), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+import asyncio
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Optional
+
+import grpc
+from grpc.aio import AioRpcError, Metadata
+
+from mapadroid.data_handler.grpc.StatsBatchBuffer import StatsBatchBuffer
+from mapadroid.data_handler.grpc.StatsHandlerClient import StatsHandlerClient
+from mapadroid.grpc.compiled.stats_handler.stats_handler_pb2 import Stats
+from mapadroid.utils.madGlobals import MadGlobals, MonSeenTypes
+
+
+def wild_mons(worker: str, timestamp: int, *encounter_ids: int) -> Stats:
+    stats = Stats()
+    stats.worker.name = worker
+    stats.timestamp = timestamp
+    stats.wild_mons.encounter_ids.extend(encounter_ids)
+    return stats
+
+
+def raid(worker: str, timestamp: int, amount: int) -> Stats:
+    stats = Stats()
+    stats.worker.name = worker
+    stats.timestamp = timestamp
+    stats.raid.amount = amount
+    return stats
+
+
+def quest(worker: str, timestamp: int) -> Stats:
+    stats = Stats()
+    stats.worker.name = worker
+    stats.timestamp = timestamp
+    stats.quest.SetInParent()
+    return stats
+
+
+class TestStatsBatchBuffer(unittest.TestCase):
+    def test_stats_are_coalesced_in_order(self):
+        buffer = StatsBatchBuffer(max_items=100)
+        self.assertTrue(buffer.add(wild_mons("worker", 1, 1, 2)))
+        self.assertTrue(buffer.add(quest("worker", 1)))
+        self.assertTrue(buffer.add(raid("worker", 1, 1)))
+        self.assertTrue(buffer.add(wild_mons("worker", 1, 3)))
+        self.assertTrue(buffer.add(quest("worker", 1)))
+        self.assertTrue(buffer.add(raid("worker", 1, 2)))
+        # Other workers and timestamps are not coalesced
+        self.assertTrue(buffer.add(wild_mons("other", 1, 4)))
+        self.assertTrue(buffer.add(wild_mons("worker", 2, 5)))
+        self.assertEqual(len(buffer), 9)
+        stats = buffer.drain()
+        self.assertEqual([entry.WhichOneof("data_to_collect") for entry in stats],
+                         ["wild_mons", "quest", "raid", "quest", "wild_mons", "wild_mons"])
+        self.assertEqual(list(stats[0].wild_mons.encounter_ids), [1, 2, 3])
+        self.assertEqual(stats[2].raid.amount, 3)
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.drain(), [])
+        # Nothing is coalesced into drained stats
+        buffer.add(wild_mons("worker", 1, 6))
+        self.assertEqual(list(buffer.drain()[0].wild_mons.encounter_ids), [6])
+        self.assertEqual(list(stats[0].wild_mons.encounter_ids), [1, 2, 3])
+
+    def test_stats_are_dropped_once_full(self):
+        buffer = StatsBatchBuffer(max_items=3)
+        self.assertTrue(buffer.add(wild_mons("worker", 1, 1, 2)))
+        self.assertFalse(buffer.is_full())
+        self.assertTrue(buffer.add(quest("worker", 1)))
+        self.assertTrue(buffer.is_full())
+        self.assertFalse(buffer.add(quest("worker", 1)))
+        self.assertFalse(buffer.add(raid("worker", 1, 1)))
+        self.assertEqual(buffer.dropped, 2)
+        self.assertEqual(len(buffer.drain()), 2)
+        self.assertFalse(buffer.is_full())
+        self.assertTrue(buffer.add(quest("worker", 1)))
+        # The amount dropped is kept across drains
+        self.assertEqual(buffer.dropped, 2)
+
+    def test_drained_stats_are_restored_in_front(self):
+        buffer = StatsBatchBuffer(max_items=3)
+        buffer.add(wild_mons("worker", 1, 1, 2))
+        drained = buffer.drain()
+        buffer.add(quest("worker", 1))
+        buffer.add(wild_mons("worker", 1, 3))
+        buffer.restore(drained)
+        # Restored stats are kept even if the buffer is full
+        self.assertEqual(len(buffer), 4)
+        self.assertTrue(buffer.is_full())
+        self.assertEqual([list(entry.wild_mons.encounter_ids) for entry in buffer.drain()], [[1, 2], [], [3]])
+
+
+class FakeChannel:
+    """
+    Records the stats sent via StatsCollect and StatsCollectStream, the latter failing with the code given if any
+    """
+    def __init__(self, stream_error_code=None, gate: Optional[asyncio.Event] = None):
+        self.stream_error_code = stream_error_code
+        # Streaming waits for the gate to be opened if given
+        self.gate = gate
+        self.single = []
+        self.batches = []
+
+    def unary_unary(self, method, **kwargs):
+        async def call(request):
+            self.single.append(request)
+        return call
+
+    def stream_unary(self, method, **kwargs):
+        async def call(request_iterator):
+            if self.stream_error_code is not None:
+                raise AioRpcError(self.stream_error_code, Metadata(), Metadata())
+            if self.gate is not None:
+                await self.gate.wait()
+            async for batch in request_iterator:
+                self.batches.append(list(batch.stats))
+        return call
+
+
+class TestStatsHandlerClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.application_args = MadGlobals.application_args
+        MadGlobals.application_args = SimpleNamespace(statshandler_flush_interval=60)
+
+    def tearDown(self) -> None:
+        MadGlobals.application_args = self.application_args
+
+    def __collect(self, channel: FakeChannel, rounds: int = 1) -> StatsHandlerClient:
+        async def run():
+            client = StatsHandlerClient(channel)
+            for _ in range(rounds):
+                await client.start()
+                await client.stats_collect_wild_mon("worker", [1, 2], datetime.fromtimestamp(1000))
+                await client.stats_collect_wild_mon("worker", [3], datetime.fromtimestamp(1000))
+                await client.stats_collect_quest("worker", datetime.fromtimestamp(1000))
+                await client.stats_collect_seen_type([4], MonSeenTypes.wild, datetime.fromtimestamp(1000))
+                await client.shutdown()
+            return client
+        return asyncio.run(run())
+
+    def test_stats_are_streamed_in_batches(self):
+        channel = FakeChannel()
+        self.__collect(channel)
+        self.assertEqual(channel.single, [])
+        self.assertEqual(len(channel.batches), 1)
+        self.assertEqual([entry.WhichOneof("data_to_collect") for entry in channel.batches[0]],
+                         ["wild_mons", "quest", "seen_type"])
+        self.assertEqual(list(channel.batches[0][0].wild_mons.encounter_ids), [1, 2, 3])
+
+    def test_stats_are_sent_one_by_one_if_streaming_is_not_implemented(self):
+        channel = FakeChannel(grpc.StatusCode.UNIMPLEMENTED)
+        self.__collect(channel, rounds=2)
+        self.assertEqual(channel.batches, [])
+        self.assertEqual(len(channel.single), 6)
+
+    def test_stats_are_not_resent_one_by_one_upon_other_errors(self):
+        channel = FakeChannel(grpc.StatusCode.UNAVAILABLE)
+        self.__collect(channel, rounds=2)
+        self.assertEqual(channel.batches, [])
+        self.assertEqual(channel.single, [])
+
+    def test_stats_are_dropped_once_shut_down(self):
+        async def run():
+            channel = FakeChannel()
+            client = StatsHandlerClient(channel)
+            await client.start()
+            await client.shutdown()
+            await client.stats_collect_quest("worker", datetime.fromtimestamp(1000))
+            self.assertEqual(len(client._buffer), 0)
+            self.assertIsNone(client._flush_task)
+        asyncio.run(run())
+
+    def test_shutdown_waits_for_flush_in_flight(self):
+        async def run():
+            channel = FakeChannel(gate=asyncio.Event())
+            client = StatsHandlerClient(channel)
+            await client.start()
+            await client.stats_collect_quest("worker", datetime.fromtimestamp(1000))
+            client._flush_requested.set()
+            await asyncio.sleep(0.01)
+            # The stats are streamed, the stream is waiting for the gate
+            self.assertEqual(len(client._buffer), 0)
+            shutdown = asyncio.create_task(client.shutdown())
+            await asyncio.sleep(0.01)
+            self.assertFalse(shutdown.done())
+            channel.gate.set()
+            await asyncio.wait_for(shutdown, 1)
+            self.assertEqual(len(channel.batches), 1)
+        asyncio.run(run())
+
+    def test_stats_of_cancelled_flush_are_restored(self):
+        async def run():
+            channel = FakeChannel(gate=asyncio.Event())
+            client = StatsHandlerClient(channel)
+            await client.start()
+            await client.stats_collect_quest("worker", datetime.fromtimestamp(1000))
+            client._flush_requested.set()
+            await asyncio.sleep(0.01)
+            self.assertEqual(len(client._buffer), 0)
+            client._flush_task.cancel()
+            await asyncio.sleep(0.01)
+            self.assertEqual(len(client._buffer), 1)
+            client._flush_task = None
+            channel.gate.set()
+            await client.shutdown()
+            self.assertEqual(len(channel.batches), 1)
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import mysql
+
+from mapadroid.data_handler.stats.holder.stats_detect.StatsDetectHolder import StatsDetectHolder
+from mapadroid.data_handler.stats.holder.stats_detect_seen.StatsDetectSeenTypeEntry import StatsDetectSeenTypeEntry
+from mapadroid.data_handler.stats.holder.wild_mon_stats.WildMonStatsEntry import WildMonStatsEntry
+from mapadroid.db.helper.TrsStatsDetectSeenTypeHelper import TrsStatsDetectSeenTypeHelper
+from mapadroid.db.helper.TrsStatsDetectWildMonRawHelper import TrsStatsDetectWildMonRawHelper
+from mapadroid.db.helper.TrsStatsLocationRawHelper import TrsStatsLocationRawHelper
+from mapadroid.db.model import TrsStatsLocationRaw
+from mapadroid.utils.madGlobals import MadGlobals
+
+
+class RecordingSession:
+    """
+    Records the statements executed as compiled for MySQL
+    """
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(dialect=mysql.dialect())
+        self.statements.append((" ".join(str(compiled).split()), compiled.params))
+
+
+class TestStatsBulkStatements(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session = RecordingSession()
+
+    def test_wild_mon_stats_are_merged_by_the_db(self):
+        scanned = datetime(2023, 1, 1, 12)
+        entries = [WildMonStatsEntry("worker", encounter_id, scanned) for encounter_id in range(5)]
+        asyncio.run(TrsStatsDetectWildMonRawHelper.create_or_update_bulk(self.session, entries, 2))
+        self.assertEqual(len(self.session.statements), 3)
+        sql, params = self.session.statements[0]
+        self.assertIn("ON DUPLICATE KEY UPDATE", sql)
+        update = sql.split("ON DUPLICATE KEY UPDATE", 1)[1]
+        self.assertIn("first_scanned = LEAST(trs_stats_detect_wild_mon_raw.first_scanned, "
+                      "VALUES(first_scanned))", update)
+        self.assertIn("last_scanned = GREATEST(trs_stats_detect_wild_mon_raw.last_scanned, "
+                      "VALUES(last_scanned))", update)
+        self.assertIn("count = (trs_stats_detect_wild_mon_raw.count + VALUES(count))", update)
+        self.assertIn("is_shiny = (trs_stats_detect_wild_mon_raw.is_shiny = 1 OR VALUES(is_shiny) = 1)", update)
+        self.assertEqual(params["encounter_id_m1"], 1)
+
+    def test_seen_types_keep_the_earliest_time(self):
+        entry = StatsDetectSeenTypeEntry(1)
+        asyncio.run(TrsStatsDetectSeenTypeHelper.create_or_update_bulk(self.session, [entry], 100))
+        update = self.session.statements[0][0].split("ON DUPLICATE KEY UPDATE", 1)[1]
+        for column in ("encounter", "wild", "nearby_stop", "nearby_cell", "lure_encounter", "lure_wild"):
+            self.assertIn("{column} = coalesce(LEAST(trs_stats_detect_seen_type.{column}, VALUES({column})), "
+                          "trs_stats_detect_seen_type.{column}, VALUES({column}))".format(column=column), update)
+
+    def test_location_raw_duplicates_keep_the_existing_row(self):
+        stat = TrsStatsLocationRaw(worker="worker", fix_ts=1, lat=1.0, lng=2.0, data_ts=2, type=0, walker="mon_mitm",
+                                   success=1, period=3, transporttype=0)
+        asyncio.run(TrsStatsLocationRawHelper.add_bulk(self.session, [stat], 100))
+        sql = self.session.statements[0][0]
+        self.assertTrue(sql.startswith("INSERT INTO trs_stats_location_raw"))
+        self.assertTrue(sql.endswith("ON DUPLICATE KEY UPDATE period = trs_stats_location_raw.period"))
+
+    def test_detect_stats_of_workers_are_inserted_at_once(self):
+        application_args = MadGlobals.application_args
+        MadGlobals.application_args = SimpleNamespace(game_stats_submit_batch_size=100)
+        try:
+            holders = [StatsDetectHolder("worker{}".format(index)) for index in range(3)]
+            holders[1].add_raid(datetime.now(), amount=2)
+            asyncio.run(StatsDetectHolder.submit_all(self.session, holders))
+        finally:
+            MadGlobals.application_args = application_args
+        self.assertEqual(len(self.session.statements), 1)
+        sql, params = self.session.statements[0]
+        self.assertTrue(sql.startswith("INSERT INTO trs_stats_detect "))
+        self.assertEqual([params["worker_m{}".format(index)] for index in range(3)], ["worker0", "worker1", "worker2"])
+        self.assertEqual(params["raid_m1"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import collections
+import unittest
+
+from mapadroid.route.RoutePoolEntry import RoutePoolEntry
+from mapadroid.route.SubrouteRebalancer import SubrouteRebalancer
+from mapadroid.utils.collections import Location
+from mapadroid.utils.madGlobals import PositionType
+
+
+class TestSubrouteRebalancer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.route = [Location(50.0 + i * 0.001, 8.0) for i in range(103)]
+        self.routepool = {}
+        self.rebalancer = SubrouteRebalancer()
+
+    def __add_worker(self, origin: str) -> None:
+        self.routepool[origin] = RoutePoolEntry(0.0, [], time_added=0.0, queue=collections.deque(),
+                                                rounds=0, last_position_type=PositionType.NORMAL,
+                                                worker_sleeping=0.0, prio_coord=None, current_pos=Location(0, 0))
+
+    def __rebalance(self, route=None) -> int:
+        return self.rebalancer.rebalance(route or self.route, self.routepool, list(self.routepool))
+
+    def test_subroutes_are_consecutive_parts_of_the_route(self):
+        for origin in ("a", "b", "c"):
+            self.__add_worker(origin)
+        self.assertEqual(self.__rebalance(), 3)
+        self.assertEqual([len(entry.subroute) for entry in self.routepool.values()], [35, 34, 34])
+        self.assertEqual([location for entry in self.routepool.values() for location in entry.subroute], self.route)
+        for entry in self.routepool.values():
+            self.assertEqual(list(entry.queue), entry.subroute)
+
+    def test_leaving_worker_hands_subroute_to_neighbours(self):
+        for origin in ("a", "b", "c", "d"):
+            self.__add_worker(origin)
+        self.__rebalance()
+        for _ in range(5):
+            self.routepool["c"].queue.popleft()
+        queue_of_d = self.routepool["d"].queue
+        self.routepool.pop("b")
+        self.assertEqual(self.__rebalance(), 2)
+        self.assertEqual(self.rebalancer.stats.incremental, 1)
+        self.assertEqual(self.routepool["a"].subroute, self.route[:39])
+        self.assertEqual(self.routepool["c"].subroute, self.route[39:78])
+        # Worker c resumes at the spot it was heading to, worker d is left as it is
+        self.assertEqual(list(self.routepool["c"].queue), self.route[57:78])
+        self.assertIs(self.routepool["d"].queue, queue_of_d)
+        # Nothing changed
+        self.assertEqual(self.__rebalance(), 0)
+
+    def test_joining_worker_takes_over_half_of_longest_subroute(self):
+        for origin in ("a", "b"):
+            self.__add_worker(origin)
+        self.__rebalance()
+        for _ in range(45):
+            self.routepool["a"].queue.popleft()
+        self.__add_worker("c")
+        self.assertEqual(self.__rebalance(), 2)
+        self.assertEqual(self.routepool["c"].subroute, self.route[26:52])
+        # Worker a was heading to a spot now part of the subroute of c
+        self.assertEqual(list(self.routepool["a"].queue), [self.route[25]])
+        self.assertEqual(self.routepool["b"].subroute, self.route[52:])
+
+    def test_churn_covers_round(self):
+        origins = ["worker{}".format(i) for i in range(20)]
+        for origin in origins[:10]:
+            self.__add_worker(origin)
+        self.__rebalance()
+        for step, origin in enumerate(origins[10:]):
+            self.routepool.pop(origins[step])
+            self.__add_worker(origin)
+            self.__rebalance()
+            self.assertEqual(sorted(location.lat for entry in self.routepool.values() for location in entry.subroute),
+                             [location.lat for location in self.route])
+            self.assertTrue(all(entry.subroute for entry in self.routepool.values()))
+
+    def test_changed_coords_rebuild_all_subroutes(self):
+        for origin in ("a", "b"):
+            self.__add_worker(origin)
+        self.__rebalance()
+        self.assertEqual(self.__rebalance(self.route[1:]), 2)
+        self.assertEqual(self.rebalancer.stats.full, 2)
+        self.assertEqual(self.routepool["a"].subroute, self.route[1:52])
+
+
+if __name__ == '__main__':
+    unittest.main()
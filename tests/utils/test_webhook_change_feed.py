@@ -0,0 +1,66 @@
+import asyncio
+import time
+import unittest
+
+from mapadroid.webhook.WebhookChangeFeed import WebhookChangeFeed
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, name):
+        value = self.values.get(name)
+        return str(value).encode() if value is not None else None
+
+    async def set(self, name, value):
+        self.values[name] = value
+
+
+def mon(encounter_id, cp, updated=1):
+    return {"type": "pokemon", "message": {"encounter_id": encounter_id, "cp": cp, "updated": updated}}
+
+
+class TestWebhookChangeFeed(unittest.TestCase):
+    def setUp(self) -> None:
+        self.redis = FakeRedis()
+        self.feed = WebhookChangeFeed(self.redis, max_entries=100)
+
+    def test_unchanged_payloads_are_dropped(self):
+        self.assertEqual(self.feed.filter_changed([mon(1, 10), mon(2, 20)]), [mon(1, 10), mon(2, 20)])
+        self.feed.mark_sent([mon(1, 10), mon(2, 20)])
+        # Volatile fields do not count as a change
+        self.assertEqual(self.feed.filter_changed([mon(1, 10, updated=2), mon(2, 21)]), [mon(2, 21)])
+        self.feed.mark_sent([mon(2, 21)])
+        self.assertEqual(self.feed.filter_changed([mon(2, 20)]), [mon(2, 20)])
+
+    def test_payloads_are_only_dropped_once_delivered(self):
+        self.assertEqual(self.feed.filter_changed([mon(1, 10), mon(2, 20)]), [mon(1, 10), mon(2, 20)])
+        # Only the first payload has been delivered
+        self.feed.mark_sent([mon(1, 10)])
+        self.assertEqual(self.feed.filter_changed([mon(1, 10), mon(2, 20)]), [mon(2, 20)])
+
+    def test_duplicates_within_payloads_are_dropped(self):
+        self.assertEqual(self.feed.filter_changed([mon(1, 10), mon(1, 10, updated=2), mon(1, 11)]),
+                         [mon(1, 10), mon(1, 11)])
+
+    def test_payloads_without_identity_are_always_sent(self):
+        payload = {"type": "unknown", "message": {"value": 1}}
+        self.assertEqual(self.feed.filter_changed([payload]), [payload])
+        self.assertEqual(self.feed.filter_changed([payload]), [payload])
+
+    def test_watermark_is_stored_and_loaded(self):
+        self.assertIsNone(asyncio.run(self.feed.load_watermark()))
+        watermark = int(time.time()) - 60
+        asyncio.run(self.feed.store_watermark(watermark))
+        self.assertEqual(asyncio.run(self.feed.load_watermark()), watermark)
+
+    def test_old_watermark_is_ignored(self):
+        asyncio.run(self.feed.store_watermark(int(time.time()) - WebhookChangeFeed.WATERMARK_MAX_AGE - 10))
+        self.assertIsNone(asyncio.run(self.feed.load_watermark()))
+        asyncio.run(self.feed.store_watermark(int(time.time()) - WebhookChangeFeed.WATERMARK_MAX_AGE + 10))
+        self.assertIsNotNone(asyncio.run(self.feed.load_watermark()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+import ujson
+from redis.exceptions import ResponseError
+
+from mapadroid.webhook.WebhookEventStream import WebhookEventStream
+
+
+class FakeRedis:
+    """
+    Keeps a single stream in memory, message IDs being "<n>-0"
+    """
+    def __init__(self):
+        self.values = {}
+        self.messages = []
+        self.reads = []
+
+    async def get(self, name):
+        value = self.values.get(name)
+        return value.encode() if value is not None else None
+
+    async def set(self, name, value):
+        self.values[name] = value
+
+    async def xadd(self, name, fields, maxlen=None, approximate=True):
+        message_id = "{}-0".format(len(self.messages) + 1)
+        self.messages.append((message_id.encode(), {key.encode(): value.encode() for key, value in fields.items()}))
+        return message_id.encode()
+
+    async def xinfo_stream(self, name):
+        if not self.messages:
+            raise ResponseError("no such key")
+        return {"last-generated-id": self.messages[-1][0]}
+
+    async def xread(self, streams, count=None, block=None):
+        (name, position), = streams.items()
+        self.reads.append(position)
+        after = int(position.split("-")[0])
+        messages = [message for message in self.messages if int(message[0].decode().split("-")[0]) > after][:count]
+        return [[name.encode(), messages]] if messages else []
+
+
+def publish(stream: WebhookEventStream, **changes) -> None:
+    session = SimpleNamespace(info={})
+    for entity_type, entity_ids in changes.items():
+        WebhookEventStream.record(session, entity_type, entity_ids)
+    asyncio.run(stream.publish_recorded(session))
+
+
+class TestWebhookEventStream(unittest.TestCase):
+    def setUp(self) -> None:
+        self.redis = FakeRedis()
+        self.stream = WebhookEventStream(self.redis)
+
+    def test_position_of_missing_stream(self):
+        self.assertEqual(asyncio.run(self.stream.load_position()), "0-0")
+        self.assertEqual(self.redis.values[WebhookEventStream.POSITION_KEY], "0-0")
+
+    def test_position_of_existing_stream_is_resolved(self):
+        publish(self.stream, pokemon=[1])
+        publish(self.stream, pokemon=[2])
+        position = asyncio.run(self.stream.load_position())
+        self.assertEqual(position, "2-0")
+        # Messages published after resolving the position are read
+        publish(self.stream, pokemon=[3])
+        position, changes = asyncio.run(self.stream.read_batch(position, timeout=0, batch_window=0))
+        self.assertEqual((position, dict(changes)), ("3-0", {"pokemon": {3}}))
+
+    def test_persisted_position_is_used(self):
+        publish(self.stream, pokemon=[1])
+        asyncio.run(self.stream.store_position("0-0"))
+        self.assertEqual(asyncio.run(self.stream.load_position()), "0-0")
+
+    def test_position_is_kept_if_nothing_has_been_read(self):
+        position = asyncio.run(self.stream.load_position())
+        self.assertEqual(asyncio.run(self.stream.read_batch(position, timeout=0, batch_window=0)), ("0-0", {}))
+        self.assertNotIn("$", self.redis.reads)
+
+    def test_messages_are_merged_into_batches(self):
+        position = asyncio.run(self.stream.load_position())
+        publish(self.stream, pokemon=[1, 2], gym=["a"])
+        publish(self.stream, pokemon=[2, 3], weather=[5])
+        position, changes = asyncio.run(self.stream.read_batch(position, timeout=0, batch_window=0.01, count=1))
+        self.assertEqual(position, "2-0")
+        self.assertEqual(dict(changes), {"pokemon": {1, 2, 3}, "gym": {"a"}, "weather": {5}})
+        self.assertEqual(self.redis.reads, ["0-0", "1-0"])
+
+    def test_nothing_is_published_without_changes(self):
+        asyncio.run(self.stream.publish_recorded(SimpleNamespace(info={})))
+        self.assertEqual(self.redis.messages, [])
+        publish(self.stream, quest=["stop"])
+        self.assertEqual(ujson.loads(self.redis.messages[0][1][b"quest"]), ["stop"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import mysql
+
+from mapadroid.db.helper.GymHelper import GymHelper
+from mapadroid.db.helper.PokemonHelper import PokemonHelper
+from mapadroid.db.helper.PokestopHelper import PokestopHelper
+from mapadroid.db.helper.RaidHelper import RaidHelper
+from mapadroid.db.helper.WeatherHelper import WeatherHelper
+from mapadroid.utils.madGlobals import MonSeenTypes
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return self
+
+
+class RecordingSession:
+    """
+    Records the statements executed as compiled for MySQL and returns the rows given
+    """
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.statements = []
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(dialect=mysql.dialect())
+        self.statements.append((" ".join(str(compiled).split()), compiled.params))
+        return FakeResult(self.rows)
+
+
+class TestWebhookReaderQueries(unittest.TestCase):
+    def setUp(self) -> None:
+        self.session = RecordingSession()
+
+    def test_nothing_is_queried_without_ids(self):
+        self.assertEqual(asyncio.run(GymHelper.get_with_details(self.session, [])), [])
+        self.assertEqual(asyncio.run(RaidHelper.get_raids_of_gyms(self.session, set())), [])
+        self.assertEqual(asyncio.run(WeatherHelper.get_of_cells(self.session, [])), [])
+        self.assertEqual(asyncio.run(PokemonHelper.get_by_encounter_ids(self.session, [])), [])
+        self.assertEqual(asyncio.run(PokestopHelper.get_with_lure_or_incidents(self.session, [])), {})
+        self.assertEqual(self.session.statements, [])
+
+    def test_entities_are_selected_by_id(self):
+        asyncio.run(GymHelper.get_with_details(self.session, ["gym"]))
+        asyncio.run(RaidHelper.get_raids_of_gyms(self.session, ["gym"]))
+        asyncio.run(WeatherHelper.get_of_cells(self.session, ["cell"]))
+        asyncio.run(PokestopHelper.get_with_lure_or_incidents(self.session, ["stop"]))
+        for (sql, params), (column, value) in zip(self.session.statements,
+                                                  [("gym.gym_id", "gym"), ("raid.gym_id", "gym"),
+                                                   ("weather.s2_cell_id", "cell"),
+                                                   ("pokestop.pokestop_id", "stop")]):
+            self.assertIn("{} IN (".format(column), sql)
+            self.assertIn([value], params.values())
+            self.assertNotIn("last_modified >=", sql)
+
+    def test_mons_are_selected_by_encounter_id_and_seen_type(self):
+        asyncio.run(PokemonHelper.get_by_encounter_ids(self.session, [1, 2], {MonSeenTypes.wild}))
+        sql, params = self.session.statements[0]
+        self.assertIn("pokemon.encounter_id IN (", sql)
+        self.assertIn("pokemon.seen_type IN (", sql)
+        self.assertIn([1, 2], params.values())
+        self.assertIn([MonSeenTypes.wild.name], params.values())
+        self.assertNotIn("last_modified", sql.split("WHERE", 1)[1])
+
+    def test_raids_of_gyms_without_location_are_dropped(self):
+        located = (SimpleNamespace(), SimpleNamespace(), SimpleNamespace(latitude=1.0, longitude=2.0))
+        unlocated = (SimpleNamespace(), SimpleNamespace(), SimpleNamespace(latitude=None, longitude=None))
+        session = RecordingSession([located, unlocated])
+        self.assertEqual(asyncio.run(RaidHelper.get_raids_of_gyms(session, ["a", "b"])), [located])
+
+
+if __name__ == '__main__':
+    unittest.main()